@@ -2,5 +2,8 @@ from .auth import router as auth_router
 from .documents import router as documents_router
 from .analysis import router as analysis_router
 from .questionnaire import router as questionnaire_router
+from .ipp import router as ipp_router
+from .jobs import router as jobs_router
+from .rankings import router as rankings_router
 
-__all__ = ["auth_router", "documents_router", "analysis_router", "questionnaire_router"]
\ No newline at end of file
+__all__ = ["auth_router", "documents_router", "analysis_router", "questionnaire_router", "ipp_router", "jobs_router", "rankings_router"]
\ No newline at end of file
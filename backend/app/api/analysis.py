@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+import math
 
 from database.connection import get_db
 from app.core.schemas import (
@@ -13,110 +15,218 @@ from app.core.schemas import (
 )
 from app.auth.dependencies import get_current_active_user
 from app.models.user import User
+from app.services.analysis_scheduler import AdmissionRejected, analysis_scheduler
 from app.services.analysis_service import analysis_service
+from app.services.idempotency_service import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyMismatch,
+    fingerprint,
+    idempotency_service
+)
 
 router = APIRouter(prefix="/analysis", tags=["Document Analysis"])
 
+LITE_MESSAGE = "Quick analysis started. This usually takes under 30 seconds."
+REUSED_MESSAGE = "These documents were already analyzed; showing your completed analysis."
+
+class _Admission:
+    """Admits the request's analysis if the service launches one (a reused result needs no queue slot)"""
+
+    def __init__(self, user: User):
+        self.user = user
+        self.wait = 0.0
+
+    def __call__(self) -> None:
+        # Raises AdmissionRejected when the queue is saturated
+        self.wait = analysis_scheduler.admit(self.user.id)
+
+def _rejected(e: AdmissionRejected) -> HTTPException:
+    """429 with Retry-After for a saturated queue"""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(e),
+        headers={"Retry-After": str(math.ceil(e.retry_after))}
+    )
+
+def _claim(db: Session, user: User, key: Optional[str], endpoint: str, request_hash: str):
+    """Idempotency-Key claim for this request (None without the header)"""
+    try:
+        return idempotency_service.claim(db, user.id, key, endpoint, request_hash)
+    except IdempotencyKeyMismatch as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except IdempotencyKeyInProgress as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+def _replay(response: Response, claim) -> StartAnalysisResponse:
+    response.headers["Idempotent-Replayed"] = "true"
+    return StartAnalysisResponse(**claim.response)
+
+def _start_message(analysis, default: str) -> str:
+    if analysis.status == "completed":
+        return REUSED_MESSAGE
+    if analysis.analysis_tier == "lite":
+        return LITE_MESSAGE
+    return default
+
+def _queue_estimate(wait: float) -> dict:
+    return {
+        "estimated_wait_seconds": round(wait, 1),
+        "estimated_start_at": datetime.utcnow() + timedelta(seconds=wait)
+    }
+
 @router.post("/start", response_model=StartAnalysisResponse)
 async def start_document_analysis(
     request: StartAnalysisRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Start LLM analysis of uploaded resume and job description
     """
-    try:
-        analysis = await analysis_service.start_document_analysis(
-            db=db,
-            user=current_user,
-            resume_document_id=request.resume_document_id,
-            job_document_id=request.job_document_id
-        )
+    claim = _claim(db, current_user, idempotency_key, "analysis/start", fingerprint(request.model_dump_json()))
+    if claim and claim.response is not None:
+        return _replay(response, claim)
+    
+    with idempotency_service.release_on_error(db, claim):
+        admission = _Admission(current_user)
+        try:
+            analysis = await analysis_service.start_document_analysis(
+                db=db,
+                user=current_user,
+                resume_document_id=request.resume_document_id,
+                job_document_id=request.job_document_id,
+                pipeline_mode=request.pipeline_mode,
+                supersede=request.supersede_previous,
+                tier=request.tier,
+                force_rerun=request.force_rerun,
+                admit=admission
+            )
         
-        return StartAnalysisResponse(
-            analysis_id=analysis.id,
-            message="Document analysis started. This may take 1-2 minutes to complete.",
-            status=analysis.status
-        )
+            result = StartAnalysisResponse(
+                analysis_id=analysis.id,
+                message=_start_message(analysis, "Document analysis started. This may take 1-2 minutes to complete."),
+                status=analysis.status,
+                analysis_tier=analysis.analysis_tier,
+                **_queue_estimate(admission.wait)
+            )
+            idempotency_service.complete(db, claim, result.model_dump(mode="json"))
+            return result
         
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to start analysis: {str(e)}"
-        )
+        except AdmissionRejected as e:
+            raise _rejected(e)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to start analysis: {str(e)}"
+            )
 
 @router.post("/resume/start", response_model=StartAnalysisResponse)
 async def start_resume_analysis(
     request: StartResumeAnalysisRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Start LLM analysis of resume only (for Context stage)
     """
-    try:
-        analysis = await analysis_service.start_resume_analysis(
-            db=db,
-            user=current_user,
-            resume_document_id=request.resume_document_id
-        )
+    claim = _claim(db, current_user, idempotency_key, "analysis/resume/start", fingerprint(request.model_dump_json()))
+    if claim and claim.response is not None:
+        return _replay(response, claim)
+    
+    with idempotency_service.release_on_error(db, claim):
+        admission = _Admission(current_user)
+        try:
+            analysis = await analysis_service.start_resume_analysis(
+                db=db,
+                user=current_user,
+                resume_document_id=request.resume_document_id,
+                supersede=request.supersede_previous,
+                force_rerun=request.force_rerun,
+                admit=admission
+            )
         
-        return StartAnalysisResponse(
-            analysis_id=analysis.id,
-            message="Resume analysis started with enhanced Ignatian insights. This may take 30-60 seconds.",
-            status=analysis.status
-        )
+            result = StartAnalysisResponse(
+                analysis_id=analysis.id,
+                message=_start_message(analysis, "Resume analysis started with enhanced Ignatian insights. This may take 30-60 seconds."),
+                status=analysis.status,
+                **_queue_estimate(admission.wait)
+            )
+            idempotency_service.complete(db, claim, result.model_dump(mode="json"))
+            return result
         
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to start resume analysis: {str(e)}"
-        )
+        except AdmissionRejected as e:
+            raise _rejected(e)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to start resume analysis: {str(e)}"
+            )
 
 @router.post("/job/start", response_model=StartAnalysisResponse)
 async def start_job_analysis(
     request: StartJobAnalysisRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Start LLM analysis of job description and match with existing resume (for Experience stage)
     """
-    try:
-        analysis = await analysis_service.start_job_analysis(
-            db=db,
-            user=current_user,
-            existing_analysis_id=request.existing_analysis_id,
-            job_document_id=request.job_document_id
-        )
+    claim = _claim(db, current_user, idempotency_key, "analysis/job/start", fingerprint(request.model_dump_json()))
+    if claim and claim.response is not None:
+        return _replay(response, claim)
+    
+    with idempotency_service.release_on_error(db, claim):
+        admission = _Admission(current_user)
+        try:
+            analysis = await analysis_service.start_job_analysis(
+                db=db,
+                user=current_user,
+                existing_analysis_id=request.existing_analysis_id,
+                job_document_id=request.job_document_id,
+                pipeline_mode=request.pipeline_mode,
+                supersede=request.supersede_previous,
+                tier=request.tier,
+                admit=admission
+            )
         
-        return StartAnalysisResponse(
-            analysis_id=analysis.id,
-            message="Job analysis and matching started. This may take 30-45 seconds.",
-            status=analysis.status
-        )
+            result = StartAnalysisResponse(
+                analysis_id=analysis.id,
+                message=_start_message(analysis, "Job analysis and matching started. This may take 30-45 seconds."),
+                status=analysis.status,
+                analysis_tier=analysis.analysis_tier,
+                **_queue_estimate(admission.wait)
+            )
+            idempotency_service.complete(db, claim, result.model_dump(mode="json"))
+            return result
         
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to start job analysis: {str(e)}"
-        )
+        except AdmissionRejected as e:
+            raise _rejected(e)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to start job analysis: {str(e)}"
+            )
 
 @router.get("/{analysis_id}", response_model=DocumentAnalysisResponse)
 async def get_analysis(
@@ -135,6 +245,34 @@ async def get_analysis(
             detail="Analysis not found"
         )
     
+    analysis = analysis_service.refresh_stale_steps(db, analysis)
+    return DocumentAnalysisResponse.model_validate(analysis)
+
+@router.post("/{analysis_id}/cancel", response_model=DocumentAnalysisResponse)
+async def cancel_analysis(
+    analysis_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Cancel a pending or processing analysis, stopping its LLM calls
+    """
+    analysis = analysis_service.get_user_analysis(db, current_user, analysis_id)
+    
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+    
+    try:
+        analysis = analysis_service.cancel_analysis(db, current_user, analysis_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    
     return DocumentAnalysisResponse.model_validate(analysis)
 
 @router.get("/", response_model=List[DocumentAnalysisResponse])
@@ -164,4 +302,5 @@ async def get_latest_analysis_status(
             detail="No analyses found"
         )
     
+    analysis = analysis_service.refresh_stale_steps(db, analysis)
     return DocumentAnalysisResponse.model_validate(analysis)
\ No newline at end of file
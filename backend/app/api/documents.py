@@ -1,47 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, UploadFile, File, Form
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from database.connection import get_db
-from app.core.schemas import DocumentUploadResponse, DocumentResponse, DocumentListResponse, DocumentTypeEnum, MessageResponse
+from app.core.schemas import DocumentUploadResponse, DocumentResponse, DocumentListResponse, DocumentTypeEnum, MessageResponse, NearDuplicateDocument
 from app.auth.dependencies import get_current_active_user
 from app.models.user import User
 # from app.models.document import DocumentType
 from app.services.document_service import document_service
+from app.services.idempotency_service import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyMismatch,
+    fingerprint,
+    idempotency_service
+)
+from app.services.near_duplicate_service import near_duplicate_service
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
 @router.post("/upload", response_model=DocumentUploadResponse)
 async def upload_document(
+    response: Response,
     document_type: DocumentTypeEnum = Form(...),
     file: UploadFile = File(...),
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Upload a document (resume or job description)
     """
-    try:
-        # Upload document
-        document = await document_service.upload_document(
-            db=db,
-            user=current_user,
-            file=file,
-            document_type=document_type.value
-        )
-        
-        return DocumentUploadResponse.model_validate(document)
-        
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Document upload failed: {str(e)}"
-        )
+    claim = None
+    if idempotency_key:
+        content = await file.read()
+        await file.seek(0)
+        try:
+            claim = idempotency_service.claim(
+                db, current_user.id, idempotency_key, "documents/upload",
+                fingerprint(document_type.value, file.filename, content)
+            )
+        except IdempotencyKeyMismatch as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        except IdempotencyKeyInProgress as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        if claim.response is not None:
+            response.headers["Idempotent-Replayed"] = "true"
+            return DocumentUploadResponse(**claim.response)
+    
+    with idempotency_service.release_on_error(db, claim):
+        try:
+            # Upload document
+            document = await document_service.upload_document(
+                db=db,
+                user=current_user,
+                file=file,
+                document_type=document_type.value
+            )
+            
+            result = DocumentUploadResponse.model_validate(document)
+            if document.document_type == DocumentTypeEnum.JOB_DESCRIPTION.value:
+                near_duplicate = near_duplicate_service.offer(db, current_user, document)
+                if near_duplicate:
+                    result.near_duplicate = NearDuplicateDocument(**near_duplicate)
+            idempotency_service.complete(db, claim, result.model_dump(mode="json"))
+            return result
+            
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Document upload failed: {str(e)}"
+            )
 
 @router.get("/", response_model=DocumentListResponse)
 async def get_user_documents(
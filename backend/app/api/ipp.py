@@ -0,0 +1,189 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Any, Dict
+import json
+
+from database.connection import get_db
+from app.core.schemas import (
+    IPPProgressResponse,
+    IPPStageResponse,
+    ReflectionRequest,
+    StageResponsesRequest
+)
+from app.auth.dependencies import get_current_active_user
+from app.models.analysis import DocumentAnalysis
+from app.models.user import User
+from app.services.analysis_service import analysis_service
+from app.services.ipp_stage_service import ipp_stage_service
+
+router = APIRouter(prefix="/ipp", tags=["IPP Stages"])
+
+def get_owned_analysis(
+    analysis_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> DocumentAnalysis:
+    analysis = analysis_service.get_user_analysis(db, current_user, analysis_id)
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+    return analysis
+
+def stage_response(db: Session, analysis: DocumentAnalysis, stage: str, data: Dict[str, Any]) -> IPPStageResponse:
+    progress = ipp_stage_service.get_progress(db, analysis)
+    return IPPStageResponse(
+        analysis_id=analysis.id,
+        stage=stage,
+        status=data.get("status", "not_started"),
+        completed=bool(getattr(progress, f"{stage}_completed")),
+        data=data or None
+    )
+
+def bad_request(e: ValueError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=str(e)
+    )
+
+@router.get("/{analysis_id}/progress", response_model=IPPProgressResponse)
+async def get_ipp_progress(
+    analysis: DocumentAnalysis = Depends(get_owned_analysis),
+    db: Session = Depends(get_db)
+):
+    """
+    Get IPP stage completion for an analysis
+    """
+    return IPPProgressResponse.model_validate(ipp_stage_service.get_progress(db, analysis))
+
+@router.get("/{analysis_id}/{stage}", response_model=IPPStageResponse)
+async def get_stage(
+    stage: str,
+    analysis: DocumentAnalysis = Depends(get_owned_analysis),
+    db: Session = Depends(get_db)
+):
+    """
+    Get generated Reflection, Action or Evaluation data (poll while status is "generating")
+    """
+    if stage not in ("reflection", "action", "evaluation"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown IPP stage")
+    return stage_response(db, analysis, stage, ipp_stage_service.get_stage(db, analysis, stage))
+
+@router.post("/{analysis_id}/reflection", response_model=IPPStageResponse)
+async def generate_reflection(
+    request: ReflectionRequest,
+    analysis: DocumentAnalysis = Depends(get_owned_analysis),
+    db: Session = Depends(get_db)
+):
+    """
+    Synthesize selected experiences and generate Ignatian reflection prompts
+    """
+    try:
+        data = ipp_stage_service.request_reflection(db, analysis, request.selected_experiences)
+    except ValueError as e:
+        raise bad_request(e)
+    return stage_response(db, analysis, "reflection", data)
+
+@router.post("/{analysis_id}/reflection/responses", response_model=IPPStageResponse)
+async def submit_reflection_responses(
+    request: StageResponsesRequest,
+    analysis: DocumentAnalysis = Depends(get_owned_analysis),
+    db: Session = Depends(get_db)
+):
+    """
+    Save reflection responses and complete the Reflection stage
+    """
+    try:
+        data = ipp_stage_service.submit_reflection_responses(db, analysis, request.responses)
+    except ValueError as e:
+        raise bad_request(e)
+    return stage_response(db, analysis, "reflection", data)
+
+@router.post("/{analysis_id}/action", response_model=IPPStageResponse)
+async def generate_action_project(
+    analysis: DocumentAnalysis = Depends(get_owned_analysis),
+    db: Session = Depends(get_db)
+):
+    """
+    Generate the portfolio project for the Action stage
+    """
+    try:
+        data = ipp_stage_service.request_action(db, analysis)
+    except ValueError as e:
+        raise bad_request(e)
+    return stage_response(db, analysis, "action", data)
+
+@router.post("/{analysis_id}/action/complete", response_model=IPPStageResponse)
+async def complete_action(
+    analysis: DocumentAnalysis = Depends(get_owned_analysis),
+    db: Session = Depends(get_db)
+):
+    """
+    Accept the portfolio project and complete the Action stage
+    """
+    try:
+        data = ipp_stage_service.complete_action(db, analysis)
+    except ValueError as e:
+        raise bad_request(e)
+    return stage_response(db, analysis, "action", data)
+
+@router.post("/{analysis_id}/evaluation", response_model=IPPStageResponse)
+async def generate_interview_questions(
+    analysis: DocumentAnalysis = Depends(get_owned_analysis),
+    db: Session = Depends(get_db)
+):
+    """
+    Generate interview questions for the Evaluation stage
+    """
+    try:
+        data = ipp_stage_service.request_evaluation(db, analysis)
+    except ValueError as e:
+        raise bad_request(e)
+    return stage_response(db, analysis, "evaluation", data)
+
+@router.get("/{analysis_id}/evaluation/stream")
+async def stream_interview_questions(
+    format: str = Query("sse", pattern="^(sse|ndjson)$"),
+    analysis: DocumentAnalysis = Depends(get_owned_analysis),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream interview questions one by one as they are generated (SSE or NDJSON)
+    
+    Each question is also saved to evaluation_data as it arrives; the last
+    event has type "done".
+    """
+    try:
+        ipp_stage_service.request_evaluation(db, analysis)
+    except ValueError as e:
+        raise bad_request(e)
+    
+    async def events():
+        async for event in ipp_stage_service.stream_evaluation(analysis.id):
+            if format == "sse":
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            else:
+                yield json.dumps(event) + "\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/{analysis_id}/evaluation/responses", response_model=IPPStageResponse)
+async def submit_interview_responses(
+    request: StageResponsesRequest,
+    analysis: DocumentAnalysis = Depends(get_owned_analysis),
+    db: Session = Depends(get_db)
+):
+    """
+    Save practice interview responses and complete the Evaluation stage
+    """
+    try:
+        data = ipp_stage_service.submit_interview_responses(db, analysis, request.responses)
+    except ValueError as e:
+        raise bad_request(e)
+    return stage_response(db, analysis, "evaluation", data)
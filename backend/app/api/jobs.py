@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from database.connection import get_db
+from app.core.schemas import OverlapAnalysisResponse
+from app.auth.dependencies import get_current_active_user
+from app.models.user import User
+from app.services.overlap_service import overlap_service
+
+router = APIRouter(prefix="/jobs", tags=["Exploration"])
+
+@router.get("/overlap-analysis/{job_ids}", response_model=OverlapAnalysisResponse)
+async def get_overlap_analysis(
+    job_ids: str,
+    resume_document_id: Optional[int] = Query(None, description="Defaults to the most recent resume"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Compare 2-5 job descriptions (comma-separated document IDs) against a resume
+    
+    Returns per-job coverage scores, pairwise and n-way requirement overlaps,
+    Venn diagram regions and the missing skills most jobs ask for. Computed
+    locally from the skills taxonomy; no LLM calls.
+    """
+    try:
+        job_document_ids = [int(value) for value in job_ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="job_ids must be comma-separated document IDs"
+        )
+    
+    try:
+        return overlap_service.analyze(db, current_user, job_document_ids, resume_document_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
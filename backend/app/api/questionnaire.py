@@ -13,6 +13,7 @@ from app.core.schemas import (
 from app.models.user import User
 from app.models.questionnaire import UserBackgroundQuestionnaire
 from app.auth.dependencies import get_current_active_user
+from app.services.analysis_service import analysis_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -135,12 +136,16 @@ async def update_background_questionnaire(
             )
         
         # Update questionnaire
+        previous_responses = dict(questionnaire.responses or {})
         questionnaire.responses = questionnaire_data.responses
         questionnaire.updated_at = datetime.utcnow()
         
         if questionnaire_data.is_complete:
             questionnaire.completed_at = datetime.utcnow()
         
+        # Analyses that read the changed answers recompute those steps on their next read
+        analysis_service.mark_questionnaire_changed(db, questionnaire, previous_responses)
+        
         db.commit()
         db.refresh(questionnaire)
         
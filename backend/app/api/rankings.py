@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from database.connection import get_db
+from app.core.schemas import RankingResponse
+from app.auth.dependencies import get_current_instructor
+from app.models.user import User
+from app.services.ranking_index import ranking_index
+
+router = APIRouter(prefix="/rankings", tags=["Rankings"])
+
+@router.get("/resumes/{resume_document_id}/jobs", response_model=RankingResponse)
+async def rank_jobs_for_resume(
+    resume_document_id: int,
+    k: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_instructor)
+):
+    """
+    Rank stored job postings for one student's resume (instructors only)
+    """
+    try:
+        return ranking_index.rank_jobs(db, resume_document_id, k)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/jobs/{job_document_id}/resumes", response_model=RankingResponse)
+async def rank_resumes_for_job(
+    job_document_id: int,
+    k: int = Query(10, ge=1, le=100),
+    user_ids: Optional[str] = Query(None, description="Comma-separated user IDs of the cohort"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_instructor)
+):
+    """
+    Rank a cohort's resumes against one job posting (instructors only)
+    """
+    try:
+        cohort = [int(value) for value in user_ids.split(",") if value.strip()] if user_ids else None
+        return ranking_index.rank_resumes(db, job_document_id, k, cohort)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
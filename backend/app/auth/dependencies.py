@@ -6,6 +6,7 @@ from typing import Optional
 from database.connection import get_db
 from app.models.user import User
 from app.auth.google_oauth import google_oauth_service
+from config.settings import settings
 
 security = HTTPBearer()
 
@@ -52,6 +53,17 @@ async def get_current_active_user(
     """Get current active user (alias for clarity)"""
     return current_user
 
+async def get_current_instructor(
+    current_user: User = Depends(get_current_active_user)
+) -> User:
+    """Get current user if they are listed in INSTRUCTOR_EMAILS"""
+    if current_user.email.lower() not in settings.instructor_emails_list:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Instructor access required"
+        )
+    return current_user
+
 def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
     db: Session = Depends(get_db)
@@ -0,0 +1,77 @@
+"""
+Cohort import
+=============
+
+Onboards a whole class: every resume in a directory or zip archive is stored
+for its student (matched by a roster CSV with file,email,name columns, an
+email as the file name, or the first email in the resume) and analyzed
+against each job posting. Progress is kept in the cohort_import_steps ledger,
+so running the same command again after an interruption resumes where it
+stopped without repeating finished work:
+    python -m app.cli.cohort_import resumes.zip --job posting.pdf --instructor prof@lmu.edu --name bus301-fall
+    python -m app.cli.cohort_import resumes/ --job a.pdf --job b.docx --instructor prof@lmu.edu \\
+        --name bus301-fall --roster roster.csv --concurrency 8 --rpm 300
+
+With --batch the analyses go through the provider's batch API (see
+app/services/llm_batch.py): slower to finish, but they do not use the
+real-time rate limit that interactive users depend on.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="directory or zip archive of resumes")
+    parser.add_argument("--job", action="append", required=True, help="job posting file (repeat for several)")
+    parser.add_argument("--instructor", required=True, help="instructor email (must be in INSTRUCTOR_EMAILS)")
+    parser.add_argument("--name", required=True, help="import name; reuse it to resume an interrupted import")
+    parser.add_argument("--roster", help="CSV with file,email,name columns")
+    parser.add_argument("--concurrency", type=int, help="analyses in flight (default COHORT_IMPORT_CONCURRENCY)")
+    parser.add_argument("--rpm", type=float, help="provider calls per minute (default COHORT_IMPORT_REQUESTS_PER_MINUTE)")
+    parser.add_argument("--workers", type=int, help="text extraction processes (default one per CPU)")
+    parser.add_argument("--pipeline-mode", choices=["multi_call", "fused"])
+    parser.add_argument("--batch", action="store_const", const="batch", dest="execution",
+                        help="submit prompts as offline batches (default COHORT_IMPORT_EXECUTION)")
+    args = parser.parse_args()
+
+    from config.logging_config import setup_logging
+    from config.settings import settings
+    from database.connection import SessionLocal
+    from app.core.rate_limit import RateLimiter
+    from app.services.cohort_import_service import cohort_import_service
+    from app.services.llm_service import llm_service
+
+    setup_logging(settings.environment)
+    llm_service.rate_limiter = RateLimiter(args.rpm if args.rpm is not None else settings.cohort_import_requests_per_minute)
+
+    db = SessionLocal()
+    try:
+        summary = asyncio.run(cohort_import_service.run(
+            db,
+            name=args.name,
+            instructor_email=args.instructor,
+            source=args.source,
+            job_paths=args.job,
+            roster_path=args.roster,
+            concurrency=args.concurrency,
+            pipeline_mode=args.pipeline_mode,
+            extract_workers=args.workers,
+            execution=args.execution
+        ))
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        db.close()
+
+    print(json.dumps(summary, indent=2))
+    if summary["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
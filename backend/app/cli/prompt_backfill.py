@@ -0,0 +1,65 @@
+"""
+Prompt-version backfill
+=======================
+
+Upgrades stored analyses after ``LLMService.prompt_version`` changes: only the
+steps recorded under an older prompt version are re-run, reusing current
+resume and job analyses where they exist. It runs at low priority, with its
+own provider-call budget and pausing while students' analyses are in
+progress. The position is checkpointed in prompt_backfill_runs, so running
+the command again continues where an interrupted run stopped:
+    python -m app.cli.prompt_backfill
+    python -m app.cli.prompt_backfill --rpm 60 --limit 500
+    python -m app.cli.prompt_backfill --batch          # offline batches, see app/services/llm_batch.py
+    python -m app.cli.prompt_backfill --restart        # rescan from the first analysis
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, help="stop after checking this many analyses")
+    parser.add_argument("--rpm", type=float, help="provider calls per minute (default PROMPT_BACKFILL_REQUESTS_PER_MINUTE)")
+    parser.add_argument("--restart", action="store_true", help="scan again from the first analysis")
+    parser.add_argument("--batch", action="store_const", const="batch", default="realtime", dest="execution",
+                        help="submit prompts as offline batches")
+    parser.add_argument("--pipeline-mode", choices=["multi_call", "fused"], help="how to re-run the matching steps")
+    args = parser.parse_args()
+
+    from config.logging_config import setup_logging
+    from config.settings import settings
+    from database.connection import SessionLocal
+    from app.services.prompt_backfill_service import prompt_backfill_service
+
+    setup_logging(settings.environment)
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+    db = SessionLocal()
+    try:
+        summary = asyncio.run(prompt_backfill_service.run(
+            db,
+            limit=args.limit,
+            requests_per_minute=args.rpm,
+            restart=args.restart,
+            execution=args.execution,
+            pipeline_mode=args.pipeline_mode
+        ))
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        db.close()
+
+    print(json.dumps(summary, indent=2))
+    if summary["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Deadlines for analysis pipelines
+================================
+
+A pipeline runs under an overall deadline (``pipeline_deadline``). Its steps
+split the time left between them by weight (``StepPlan``): each step gets
+``weight / remaining weight`` of what is left when it starts, so time a fast
+step does not use carries over to the later ones. A step that overruns its
+budget raises ``StepTimeout`` so the pipeline can fall back instead of hanging.
+
+LLM calls read the innermost budget with ``current_budget``: the time left
+becomes the client timeout, and ``max_tokens`` is capped to what the provider
+can generate in that time. A call with too little time left is refused and
+marks the budget exceeded, which the step reports as a timeout too.
+"""
+
+import asyncio
+import contextvars
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+
+@dataclass
+class Budget:
+    deadline: float  # time.monotonic()
+    exceeded: bool = False  # a call inside gave up for lack of time
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+
+class StepTimeout(Exception):
+    """A pipeline step ran past its share of the deadline"""
+
+    def __init__(self, step: str, budget: float):
+        super().__init__(f"{step} did not finish within its {budget:.0f}s budget")
+        self.step = step
+        self.budget = budget
+
+
+class DeadlineExceeded(Exception):
+    """Not enough time left in the budget to make an LLM call"""
+
+
+_budget: contextvars.ContextVar[Optional[Budget]] = contextvars.ContextVar("deadline_budget", default=None)
+
+
+def current_budget() -> Optional[Budget]:
+    """Innermost budget of the work in this context (None: unbounded)"""
+    return _budget.get()
+
+
+@contextmanager
+def pipeline_deadline(seconds: float) -> Iterator[Optional[Budget]]:
+    """Overall deadline for the work in this context (and tasks it starts); ``seconds`` <= 0 disables it"""
+    if seconds <= 0:
+        yield None
+        return
+    parent = _budget.get()
+    deadline = time.monotonic() + seconds
+    budget = Budget(min(deadline, parent.deadline) if parent else deadline)
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+@contextmanager
+def no_deadline() -> Iterator[None]:
+    """Run the work in this context without any deadline inherited from the caller"""
+    token = _budget.set(None)
+    try:
+        yield
+    finally:
+        _budget.reset(token)
+
+
+class StepPlan:
+    """Splits the time left before the deadline across a pipeline's remaining steps by weight"""
+
+    def __init__(self, weights: Dict[str, float]):
+        self._remaining = dict(weights)
+
+    @asynccontextmanager
+    async def step(self, name: str) -> AsyncIterator[Optional[Budget]]:
+        """Run the body within this step's budget; raises StepTimeout when it overruns"""
+        weight = self._remaining.pop(name, 0.0)
+        parent = _budget.get()
+        if parent is None:
+            yield None
+            return
+
+        share = weight / (weight + sum(self._remaining.values())) if weight else 1.0
+        seconds = parent.remaining() * share
+        budget = Budget(time.monotonic() + seconds)
+        token = _budget.set(budget)
+        try:
+            async with asyncio.timeout(seconds):
+                yield budget
+        except TimeoutError:
+            raise StepTimeout(name, seconds) from None
+        finally:
+            _budget.reset(token)
+        if budget.exceeded:
+            # A call was refused or timed out; the step swallowed that into an error result
+            raise StepTimeout(name, seconds)
@@ -0,0 +1,73 @@
+"""
+Incremental JSON array extraction
+=================================
+
+Pulls complete objects out of a JSON array while the surrounding document is
+still being streamed, so items can be used before the completion finishes.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JSONArrayStream:
+    """Yields each complete object of the array under ``key`` as text arrives"""
+
+    def __init__(self, key: str):
+        self._key_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self.buffer = ""
+        self.done = False
+        self._pos: Optional[int] = None  # scan position once the array has started
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start: Optional[int] = None
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Add streamed text; returns the objects completed by it"""
+        self.buffer += text
+        items: List[Dict[str, Any]] = []
+        if self.done:
+            return items
+
+        if self._pos is None:
+            match = self._key_pattern.search(self.buffer)
+            if not match:
+                return items
+            self._pos = match.end()
+
+        while self._pos < len(self.buffer):
+            char = self.buffer[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._object_start = self._pos
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._object_start is not None:
+                    raw = self.buffer[self._object_start:self._pos + 1]
+                    try:
+                        items.append(json.loads(raw))
+                    except ValueError:
+                        logger.warning(f"Skipping malformed streamed item: {raw[:80]}...")
+                    self._object_start = None
+            elif char == "]" and self._depth == 0:
+                self.done = True
+                self._pos += 1
+                break
+            self._pos += 1
+
+        return items
@@ -0,0 +1,269 @@
+"""
+Prometheus metrics for LLM calls
+================================
+
+Per-call instrumentation for ``LLMService``: wall time, time-to-first-token,
+prompt/completion tokens, estimated cost, cache hits, retries and JSON parse
+failures. These ``llm_*`` series are labeled by ``method`` (the LLMService
+method that issued the call), ``model`` and ``prompt_version`` so the slowest
+or most expensive IPP step can be identified from the ``/metrics`` endpoint.
+
+The ``analysis_*`` series count analysis runs rather than calls, each with its
+own labels: scheduler queue waits by ``priority``, admission decisions by
+``outcome``, memoization lookups by ``kind`` and ``outcome``, chosen tiers by
+``tier`` and ``reason``, and step timeouts by ``step`` and ``outcome``.
+
+When running several uvicorn workers, set ``PROMETHEUS_MULTIPROC_DIR`` to a
+shared writable directory so the endpoint aggregates all workers.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LLM_LABELS = ["method", "model", "prompt_version"]
+
+# USD per one million tokens as (prompt, completion)
+MODEL_PRICING_PER_MILLION = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180)
+
+llm_request_duration = Histogram(
+    "llm_request_duration_seconds",
+    "Wall time of a single LLM completion call",
+    LLM_LABELS,
+    buckets=LATENCY_BUCKETS,
+)
+llm_time_to_first_token = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time until the first completion token arrived",
+    LLM_LABELS,
+    buckets=LATENCY_BUCKETS,
+)
+llm_requests = Counter(
+    "llm_requests_total",
+    "LLM completion calls by outcome",
+    LLM_LABELS + ["outcome"],
+)
+llm_prompt_tokens = Counter(
+    "llm_prompt_tokens_total",
+    "Prompt tokens reported by the provider",
+    LLM_LABELS,
+)
+llm_completion_tokens = Counter(
+    "llm_completion_tokens_total",
+    "Completion tokens reported by the provider",
+    LLM_LABELS,
+)
+llm_cost = Counter(
+    "llm_cost_usd_total",
+    "Estimated LLM spend in USD based on MODEL_PRICING_PER_MILLION",
+    LLM_LABELS,
+)
+llm_cache_hits = Counter(
+    "llm_cache_hits_total",
+    "LLM results served from a cache instead of a provider call",
+    LLM_LABELS,
+)
+llm_retries = Counter(
+    "llm_retries_total",
+    "LLM calls retried after a transient provider error",
+    LLM_LABELS,
+)
+llm_parse_failures = Counter(
+    "llm_parse_failures_total",
+    "LLM responses that could not be parsed as JSON",
+    LLM_LABELS,
+)
+analysis_queue_wait = Histogram(
+    "analysis_queue_wait_seconds",
+    "Time an analysis waited in the fair-share scheduler before starting",
+    ["priority"],
+    buckets=LATENCY_BUCKETS,
+)
+analysis_admissions = Counter(
+    "analysis_admissions_total",
+    "Analysis start requests by admission outcome",
+    ["outcome"],
+)
+analysis_memo_lookups = Counter(
+    "analysis_memo_lookups_total",
+    "Analysis starts checked for a completed analysis with identical inputs",
+    ["kind", "outcome"],
+)
+analysis_tiers = Counter(
+    "analysis_tier_total",
+    "Started match analyses by tier and why that tier was chosen",
+    ["tier", "reason"],
+)
+analysis_step_timeouts = Counter(
+    "analysis_step_timeouts_total",
+    "Analysis steps that overran their deadline budget, by how the analysis recovered",
+    ["step", "outcome"],
+)
+
+
+@dataclass
+class UsageTally:
+    """Running totals for every LLM call made inside a ``track_usage`` block"""
+    calls: int = 0
+    cache_hits: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    llm_seconds: float = 0.0
+    methods: dict = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+_active_tallies: ContextVar[Tuple[UsageTally, ...]] = ContextVar("llm_usage_tallies", default=())
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageTally]:
+    """Collect token, cost and latency totals for the calls made in this context"""
+    tally = UsageTally()
+    token = _active_tallies.set(_active_tallies.get() + (tally,))
+    try:
+        yield tally
+    finally:
+        _active_tallies.reset(token)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate the USD cost of a call from the pricing table"""
+    prompt_price, completion_price = MODEL_PRICING_PER_MILLION.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def record_llm_call(
+    method: str,
+    model: str,
+    prompt_version: str,
+    duration: float,
+    time_to_first_token: Optional[float],
+    prompt_tokens: int,
+    completion_tokens: int,
+) -> None:
+    """Record a successful provider call"""
+    labels = (method, model, prompt_version)
+    cost = estimate_cost(model, prompt_tokens, completion_tokens)
+
+    llm_request_duration.labels(*labels).observe(duration)
+    if time_to_first_token is not None:
+        llm_time_to_first_token.labels(*labels).observe(time_to_first_token)
+    llm_requests.labels(*labels, "success").inc()
+    llm_prompt_tokens.labels(*labels).inc(prompt_tokens)
+    llm_completion_tokens.labels(*labels).inc(completion_tokens)
+    llm_cost.labels(*labels).inc(cost)
+
+    for tally in _active_tallies.get():
+        tally.calls += 1
+        tally.prompt_tokens += prompt_tokens
+        tally.completion_tokens += completion_tokens
+        tally.cost_usd += cost
+        tally.llm_seconds += duration
+        tally.methods[method] = tally.methods.get(method, 0) + 1
+
+
+def record_llm_error(method: str, model: str, prompt_version: str, duration: float) -> None:
+    """Record a provider call that failed after all retries"""
+    llm_request_duration.labels(method, model, prompt_version).observe(duration)
+    llm_requests.labels(method, model, prompt_version, "error").inc()
+
+
+def record_retry(method: str, model: str, prompt_version: str) -> None:
+    llm_retries.labels(method, model, prompt_version).inc()
+
+
+def record_cache_hit(
+    method: str,
+    model: str,
+    prompt_version: str,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+) -> None:
+    """Record a result served from a cache; tallies keep the tokens it would have cost"""
+    llm_cache_hits.labels(method, model, prompt_version).inc()
+    for tally in _active_tallies.get():
+        tally.cache_hits += 1
+        tally.prompt_tokens += prompt_tokens
+        tally.completion_tokens += completion_tokens
+        tally.methods[method] = tally.methods.get(method, 0) + 1
+
+
+def record_parse_failure(method: str, model: str, prompt_version: str) -> None:
+    llm_parse_failures.labels(method, model, prompt_version).inc()
+
+
+def record_analysis_queue_wait(priority: str, seconds: float) -> None:
+    analysis_queue_wait.labels(priority).observe(seconds)
+
+
+def record_analysis_admission(outcome: str) -> None:
+    """``outcome`` is admitted or rejected"""
+    analysis_admissions.labels(outcome).inc()
+
+
+def record_analysis_memo_lookup(kind: str, outcome: str) -> None:
+    """``kind`` is resume or match; ``outcome`` is hit or miss"""
+    analysis_memo_lookups.labels(kind, outcome).inc()
+
+
+def record_analysis_tier(tier: str, reason: str) -> None:
+    """``reason`` is requested, overloaded or default"""
+    analysis_tiers.labels(tier, reason).inc()
+
+
+def record_analysis_step_timeout(step: str, outcome: str) -> None:
+    """``outcome`` is cached, lite, failed, or swept (failed by the sweeper; step "pipeline")"""
+    analysis_step_timeouts.labels(step, outcome).inc()
+
+
+class Stopwatch:
+    """Small helper tracking total elapsed time and time to first token"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+
+    def mark_first_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,126 @@
+"""
+Rate limiting for LLM calls
+===========================
+
+A token bucket shared by every coroutine that calls the provider: calls are
+admitted at ``requests_per_minute`` on average, with bursts up to ``burst``.
+Waiters are served by priority class (see ``call_priority``), then in arrival
+order, so one busy caller cannot starve the others and background work only
+gets the slots interactive work leaves over.
+
+Background work can add a tighter budget of its own with ``limited_by``: calls
+made in that context wait for both the scoped limiter and the shared one.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from app.core.tasks import create_detached_task
+
+# Lower is served first; matches job_queue.JobPriority.INTERACTIVE
+DEFAULT_PRIORITY = 0
+
+_call_priority: contextvars.ContextVar[int] = contextvars.ContextVar("llm_call_priority", default=DEFAULT_PRIORITY)
+
+
+@contextmanager
+def call_priority(priority: int) -> Iterator[None]:
+    """Priority class of the LLM calls made in this context (and tasks it starts)"""
+    token = _call_priority.set(int(priority))
+    try:
+        yield
+    finally:
+        _call_priority.reset(token)
+
+
+def current_priority() -> int:
+    return _call_priority.get()
+
+
+class RateLimiter:
+    """Async token bucket (``requests_per_minute`` <= 0 disables limiting)"""
+
+    def __init__(self, requests_per_minute: float, burst: Optional[int] = None):
+        self.requests_per_minute = requests_per_minute
+        self.rate = requests_per_minute / 60.0
+        self.burst = burst or max(1, int(self.rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: Optional[int] = None) -> float:
+        """Wait for a call slot; returns the seconds spent waiting"""
+        if not self.enabled:
+            return 0.0
+
+        started = time.monotonic()
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is not None and self._dispatcher.get_loop() is not loop:
+            # Scripts calling asyncio.run() repeatedly get a fresh loop each time
+            self._waiters, self._dispatcher = [], None
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (current_priority() if priority is None else priority, next(self._sequence), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = create_detached_task(self._dispatch())
+        # A cancelled waiter is skipped by the dispatcher without using a token
+        await future
+        return time.monotonic() - started
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def _dispatch(self) -> None:
+        """Hand out tokens to waiters, highest priority first, as they accrue"""
+        while self._waiters:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+
+
+_scoped_limiters: contextvars.ContextVar[Tuple[RateLimiter, ...]] = contextvars.ContextVar("scoped_rate_limiters", default=())
+
+
+@contextmanager
+def limited_by(limiter: RateLimiter) -> Iterator[None]:
+    """Also throttle LLM calls made in this context (and tasks it starts) by ``limiter``"""
+    token = _scoped_limiters.set(_scoped_limiters.get() + (limiter,))
+    try:
+        yield
+    finally:
+        _scoped_limiters.reset(token)
+
+
+async def acquire_scoped() -> float:
+    """Wait on every limiter installed by ``limited_by``; returns the seconds spent waiting"""
+    waited = 0.0
+    for limiter in _scoped_limiters.get():
+        waited += await limiter.acquire()
+    return waited
@@ -47,6 +47,12 @@ class DocumentTypeEnum(str, Enum):
     RESUME = "resume"
     JOB_DESCRIPTION = "job_description"
 
+class NearDuplicateDocument(BaseModel):
+    document_id: int
+    original_filename: str
+    similarity: float  # estimated Jaccard similarity of word shingles
+    analyzed: bool
+
 class DocumentUploadResponse(BaseModel):
     id: int
     document_type: DocumentTypeEnum
@@ -56,6 +62,7 @@ class DocumentUploadResponse(BaseModel):
     mime_type: str
     created_at: datetime
     content_text: Optional[str] = None
+    near_duplicate: Optional[NearDuplicateDocument] = None  # an earlier upload of the same posting
     
     class Config:
         from_attributes = True
@@ -83,6 +90,7 @@ class AnalysisStatusEnum(str, Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 class DocumentAnalysisResponse(BaseModel):
     id: int
@@ -100,27 +108,50 @@ class DocumentAnalysisResponse(BaseModel):
     progress_step: Optional[str] = None
     progress_message: Optional[str] = None
     error_message: Optional[str] = None
+    analysis_tier: Optional[str] = None  # full, or lite until upgraded in the background
+    reused_from_analysis_id: Optional[int] = None  # results copied from an analysis with identical inputs
+    stale_steps: Optional[List[str]] = None  # steps being recomputed after questionnaire edits
     created_at: datetime
     completed_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
 
+class PipelineModeEnum(str, Enum):
+    MULTI_CALL = "multi_call"
+    FUSED = "fused"
+
+class AnalysisTierEnum(str, Enum):
+    FULL = "full"
+    LITE = "lite"
+
 class StartAnalysisRequest(BaseModel):
     resume_document_id: int
     job_document_id: int
+    pipeline_mode: Optional[PipelineModeEnum] = None  # defaults to ANALYSIS_PIPELINE_MODE
+    supersede_previous: Optional[bool] = None  # cancel in-progress analyses; defaults to ANALYSIS_SUPERSEDE_PREVIOUS
+    tier: Optional[AnalysisTierEnum] = None  # defaults to full, or lite while the service is overloaded
+    force_rerun: bool = False  # run even if a completed analysis of identical inputs exists
 
 class StartResumeAnalysisRequest(BaseModel):
     resume_document_id: int
+    supersede_previous: Optional[bool] = None
+    force_rerun: bool = False
 
 class StartJobAnalysisRequest(BaseModel):
     existing_analysis_id: int
     job_document_id: int
+    pipeline_mode: Optional[PipelineModeEnum] = None
+    supersede_previous: Optional[bool] = None
+    tier: Optional[AnalysisTierEnum] = None
 
 class StartAnalysisResponse(BaseModel):
     analysis_id: int
     message: str
     status: AnalysisStatusEnum
+    estimated_wait_seconds: Optional[float] = None  # time queued behind other analyses
+    estimated_start_at: Optional[datetime] = None
+    analysis_tier: Optional[str] = None
 
 # Questionnaire schemas
 class BackgroundQuestionnaireCreate(BaseModel):
@@ -142,5 +173,97 @@ class BackgroundQuestionnaireResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# IPP stage schemas
+class IPPStageStatusEnum(str, Enum):
+    NOT_STARTED = "not_started"
+    GENERATING = "generating"
+    READY = "ready"
+    FAILED = "failed"
+
+class ReflectionRequest(BaseModel):
+    selected_experiences: Optional[List[Dict[str, Any]]] = None  # defaults to the top experience connections
+
+class StageResponsesRequest(BaseModel):
+    responses: Dict[str, str]  # prompt or question id -> student's answer
+
+class IPPStageResponse(BaseModel):
+    analysis_id: int
+    stage: str
+    status: IPPStageStatusEnum
+    completed: bool
+    data: Optional[Dict[str, Any]] = None
+
+class IPPProgressResponse(BaseModel):
+    analysis_id: int
+    context_completed: bool
+    experience_completed: bool
+    reflection_completed: bool
+    action_completed: bool
+    evaluation_completed: bool
+    context_completed_at: Optional[datetime] = None
+    experience_completed_at: Optional[datetime] = None
+    reflection_completed_at: Optional[datetime] = None
+    action_completed_at: Optional[datetime] = None
+    evaluation_completed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+# Exploration Mode schemas
+class JobCoverage(BaseModel):
+    document_id: int
+    title: str
+    requirement_count: int
+    coverage_score: float
+    matched_skills: List[str]
+    missing_skills: List[str]
+    unique_requirements: List[str]
+
+class PairwiseOverlap(BaseModel):
+    job_document_ids: List[int]
+    shared_count: int
+    jaccard: float
+    shared_skills: List[str]
+
+class VennRegion(BaseModel):
+    job_document_ids: List[int]
+    size: int
+    skills: List[str]
+    covered_skills: List[str]
+
+class GapPriority(BaseModel):
+    skill: str
+    job_count: int
+    job_document_ids: List[int]
+
+class OverlapAnalysisResponse(BaseModel):
+    resume_document_id: int
+    jobs: List[JobCoverage]
+    pairwise: List[PairwiseOverlap]
+    venn_regions: List[VennRegion]
+    common_requirements: List[str]
+    requirements_shared_by: List[int]  # index k: requirements shared by exactly k+1 jobs
+    overall_coverage: float
+    gap_priorities: List[GapPriority]
+
+# Ranking schemas
+class RankedSkill(BaseModel):
+    skill: str
+    contribution: float  # share of the score
+
+class RankedDocument(BaseModel):
+    document_id: int
+    user_id: int
+    title: str
+    score: float
+    matched_skills: List[RankedSkill]
+    missing_requirements: List[str]
+
+class RankingResponse(BaseModel):
+    document_id: int
+    indexed: int
+    results: List[RankedDocument]
+    elapsed_ms: float
+
 # Forward reference resolution
 TokenResponse.model_rebuild()
\ No newline at end of file
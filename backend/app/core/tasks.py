@@ -0,0 +1,19 @@
+"""
+Detached background tasks
+=========================
+
+``asyncio.create_task`` copies the caller's context, so a task started from
+inside an analysis would inherit its deadline budget, call priority, scoped
+rate limiters and usage tally for as long as it lives. Shared workers and
+background tasks that outlive the code that starts them use
+``create_detached_task`` instead and start from an empty context.
+"""
+
+import asyncio
+import contextvars
+from typing import Any, Coroutine
+
+
+def create_detached_task(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """Start ``coro`` in a fresh context instead of a copy of the caller's"""
+    return asyncio.create_task(coro, context=contextvars.Context())
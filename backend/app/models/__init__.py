@@ -1,6 +1,8 @@
 from .user import User, Base
-from .document import Document
-from .analysis import DocumentAnalysis, IPPStageProgress
+from .document import Document, DocumentLSHBucket
+from .analysis import DocumentAnalysis, IPPStageProgress, PrecomputedJobAnalysis, ResumeSectionAnalysis, PromptBackfillRun
 from .questionnaire import UserBackgroundQuestionnaire
+from .cohort import CohortImport, CohortImportStep
+from .idempotency import IdempotencyKey
 
-__all__ = ["User", "Base", "Document", "DocumentAnalysis", "IPPStageProgress", "UserBackgroundQuestionnaire"]
\ No newline at end of file
+__all__ = ["User", "Base", "Document", "DocumentLSHBucket", "DocumentAnalysis", "IPPStageProgress", "PrecomputedJobAnalysis", "ResumeSectionAnalysis", "PromptBackfillRun", "UserBackgroundQuestionnaire", "CohortImport", "CohortImportStep", "IdempotencyKey"]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -33,6 +33,18 @@ class DocumentAnalysis(Base):
     progress_step = Column(String(100), nullable=True)  # Current step being processed
     progress_message = Column(Text, nullable=True)  # User-friendly message
     error_message = Column(Text, nullable=True)
+    analysis_tier = Column(String(20), default="full")  # full, or lite (compact analysis under load)
+    
+    # Hash of the pipeline inputs (document texts, questionnaire, prompt version), for reuse of identical runs
+    input_fingerprint = Column(String(64), nullable=True, index=True)
+    reused_from_analysis_id = Column(Integer, ForeignKey(f"{settings.db_schema}.document_analyses.id"), nullable=True)
+    
+    # Steps to recompute on next read because questionnaire answers they read have changed
+    stale_steps = Column(JSON, nullable=True)  # Array of step names
+    
+    # When the current run must be finished; the sweeper fails active analyses stuck past it
+    deadline_at = Column(DateTime, nullable=True)
+    execution = Column(String(20), nullable=True)  # realtime, or batch (offline provider batch: no deadline)
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -80,4 +92,61 @@ class IPPStageProgress(Base):
     
     # Relationships
     user = relationship("User", back_populates="ipp_progress")
-    analysis = relationship("DocumentAnalysis")
\ No newline at end of file
+    analysis = relationship("DocumentAnalysis")
+
+class PrecomputedJobAnalysis(Base):
+    """Job description analysis started speculatively at upload time"""
+    __tablename__ = "precomputed_job_analyses"
+    __table_args__ = (
+        UniqueConstraint("document_id", "prompt_version", name="uq_precomputed_job_analyses_document_version"),
+        {"schema": settings.db_schema},
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey(f"{settings.db_schema}.documents.id", ondelete="CASCADE"), nullable=False)
+    prompt_version = Column(String(50), nullable=False)
+    
+    status = Column(String(50), default="processing")  # processing, completed, failed
+    job_analysis = Column(JSON, nullable=True)
+    error_message = Column(Text, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+    
+    document = relationship("Document")
+
+class ResumeSectionAnalysis(Base):
+    """Structured extraction of one resume section, keyed by the section's text hash"""
+    __tablename__ = "resume_section_analyses"
+    __table_args__ = (
+        UniqueConstraint("user_id", "section_hash", "prompt_version", name="uq_resume_section_analyses_user_hash_version"),
+        {"schema": settings.db_schema},
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey(f"{settings.db_schema}.users.id", ondelete="CASCADE"), nullable=False)
+    section_hash = Column(String(64), nullable=False)
+    prompt_version = Column(String(50), nullable=False)
+    section_kind = Column(String(50), nullable=False)
+    
+    extraction = Column(JSON, nullable=False)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class PromptBackfillRun(Base):
+    """Checkpoint of a prompt-version backfill: analyses up to last_analysis_id have been checked"""
+    __tablename__ = "prompt_backfill_runs"
+    __table_args__ = {"schema": settings.db_schema}
+    
+    id = Column(Integer, primary_key=True, index=True)
+    target_version = Column(String(50), unique=True, nullable=False)
+    last_analysis_id = Column(Integer, default=0, nullable=False)
+    
+    status = Column(String(50), default="running")  # running, completed
+    scanned = Column(Integer, default=0)
+    upgraded = Column(Integer, default=0)
+    failures = Column(JSON, nullable=True)  # [{"analysis_id", "steps", "error"}]
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.models.user import Base
+from config.settings import settings
+
+class CohortImport(Base):
+    """A bulk import of a class's resumes against one or more job postings"""
+    __tablename__ = "cohort_imports"
+    __table_args__ = {"schema": settings.db_schema}
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), unique=True, nullable=False)
+    instructor_user_id = Column(Integer, ForeignKey(f"{settings.db_schema}.users.id"), nullable=False)
+    source = Column(Text, nullable=False)  # resume directory or zip archive
+    
+    status = Column(String(50), default="running")  # running, completed, completed_with_errors
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+    
+    steps = relationship("CohortImportStep", back_populates="cohort_import", cascade="all, delete-orphan")
+
+class CohortImportStep(Base):
+    """Progress ledger entry: one file, document, job analysis or student analysis of an import"""
+    __tablename__ = "cohort_import_steps"
+    __table_args__ = (
+        UniqueConstraint("import_id", "step_key", name="uq_cohort_import_steps_import_key"),
+        {"schema": settings.db_schema},
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    import_id = Column(Integer, ForeignKey(f"{settings.db_schema}.cohort_imports.id", ondelete="CASCADE"), nullable=False)
+    step_key = Column(String(255), nullable=False)  # e.g. "file:<sha256>", "analysis:<resume hash>:<job hash>"
+    
+    status = Column(String(50), default="pending")  # pending, running, completed, duplicate, failed
+    user_id = Column(Integer, ForeignKey(f"{settings.db_schema}.users.id"), nullable=True)
+    document_id = Column(Integer, ForeignKey(f"{settings.db_schema}.documents.id"), nullable=True)
+    analysis_id = Column(Integer, ForeignKey(f"{settings.db_schema}.document_analyses.id"), nullable=True)
+    detail = Column(JSON, nullable=True)
+    error_message = Column(Text, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    cohort_import = relationship("CohortImport", back_populates="steps")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Enum, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -23,8 +23,22 @@ class Document(Base):
     content_text = Column(Text, nullable=True)  # Extracted text content
     file_size = Column(Integer, nullable=False)
     mime_type = Column(String(100), nullable=False)
+    minhash_signature = Column(LargeBinary, nullable=True)  # Job descriptions only, see near_duplicate_service
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationship to user
-    user = relationship("User", back_populates="documents")
\ No newline at end of file
+    user = relationship("User", back_populates="documents")
+
+class DocumentLSHBucket(Base):
+    """One LSH band of a job description's MinHash signature"""
+    __tablename__ = "document_lsh_buckets"
+    __table_args__ = (
+        Index("ix_document_lsh_buckets_band_bucket", "band", "bucket"),
+        {"schema": settings.db_schema},
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey(f"{settings.db_schema}.documents.id", ondelete="CASCADE"), nullable=False, index=True)
+    band = Column(Integer, nullable=False)
+    bucket = Column(BigInteger, nullable=False)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, UniqueConstraint
+from datetime import datetime
+
+from app.models.user import Base
+from config.settings import settings
+
+class IdempotencyKey(Base):
+    """A client's Idempotency-Key for a POST endpoint and the response it produced"""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "idempotency_key", name="uq_idempotency_keys_user_key"),
+        {"schema": settings.db_schema},
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey(f"{settings.db_schema}.users.id", ondelete="CASCADE"), nullable=False, index=True)
+    idempotency_key = Column(String(255), nullable=False)
+    endpoint = Column(String(100), nullable=False)
+    request_hash = Column(String(64), nullable=False)  # sha256 of the request payload
+    
+    response = Column(JSON, nullable=True)  # None while the first request is still running
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
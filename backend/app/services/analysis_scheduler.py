@@ -0,0 +1,232 @@
+"""
+Fair-share analysis scheduler
+=============================
+
+Sits in front of the analysis pipelines so one student starting twenty
+analyses cannot starve the rest of a class session:
+
+- at most ``concurrency`` analyses run at once, and at most
+  ``per_user_limit`` of them for any one user
+- among waiting analyses the highest priority class goes first (interactive
+  Context/Experience work before pre-generation and backfills)
+- within a class, users are served by weighted fair queuing: each analysis
+  gets a virtual finish time ``max(virtual clock, user's last finish) +
+  1 / weight``, and the smallest finish time runs next, so users with many
+  queued analyses take turns with everyone else instead of going first
+
+A running analysis makes its LLM calls at its priority class, so the shared
+rate limiter admits them in the same order.
+
+Admission control: ``admit`` estimates how long a new analysis would wait
+(from the queue ahead of it and a running average of analysis run time) and
+raises ``AdmissionRejected`` with a retry delay once the queue depth or the
+estimated wait passes ``ANALYSIS_ADMISSION_MAX_QUEUE`` /
+``ANALYSIS_ADMISSION_MAX_WAIT_SECONDS``, so admitted analyses keep a bounded
+wait instead of everyone queuing for minutes.
+
+Load shedding: before rejecting anyone, ``choose_tier`` switches new match
+analyses to the lite tier (see ``lite_analysis``) while the estimated wait or
+recent provider latency is above ``ANALYSIS_LITE_WAIT_THRESHOLD_SECONDS`` /
+``ANALYSIS_LITE_LATENCY_THRESHOLD_SECONDS``, so throughput degrades gradually.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core import metrics
+from app.core.rate_limit import call_priority
+from app.services.job_queue import JobPriority
+from app.services.llm_service import llm_service
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest observation in the running averages
+SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """The analysis queue is saturated; ``retry_after`` is a suggested delay in seconds"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class ScheduledAnalysis:
+    user_id: int
+    priority: JobPriority
+    start: float  # virtual start and finish times
+    finish: float
+    sequence: int
+    ready: asyncio.Future
+    submitted_at: float = field(default_factory=time.monotonic)
+
+
+class AnalysisScheduler:
+    """Weighted fair queuing across users with per-user caps and priority classes"""
+
+    def __init__(self, concurrency: int, per_user_limit: int, expected_duration: float = 60.0):
+        self.concurrency = max(1, concurrency)
+        self.per_user_limit = max(1, per_user_limit)
+        self.average_duration = expected_duration
+        self.average_wait = 0.0
+        self._waiting: List[ScheduledAnalysis] = []
+        self._running: Dict[int, int] = {}
+        self._last_finish: Dict[int, float] = {}
+        self._virtual_time = 0.0
+        self._sequence = itertools.count()
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiting)
+
+    def estimated_wait(self, user_id: Optional[int], priority: JobPriority = JobPriority.INTERACTIVE) -> float:
+        """Seconds until a new analysis for ``user_id`` at ``priority`` would start"""
+        ahead = sum(1 for entry in self._waiting if entry.priority <= priority)
+        free = self.concurrency - self.running
+        wait = 0.0
+        if ahead >= free:
+            # Running analyses are about half done on average
+            rounds = math.ceil((ahead - free + 1) / self.concurrency)
+            wait = rounds * self.average_duration - self.average_duration / 2
+
+        own = self._running.get(user_id, 0) + sum(1 for entry in self._waiting if entry.user_id == user_id)
+        if own >= self.per_user_limit:
+            wait = max(wait, (own // self.per_user_limit) * self.average_duration - self.average_duration / 2)
+        return max(0.0, wait)
+
+    def admit(self, user_id: int, priority: JobPriority = JobPriority.INTERACTIVE) -> float:
+        """Estimated wait for a new analysis; raises AdmissionRejected when the queue is saturated"""
+        wait = self.estimated_wait(user_id, priority)
+        max_queue = settings.analysis_admission_max_queue
+        max_wait = settings.analysis_admission_max_wait_seconds
+
+        retry_after = 0.0
+        if max_queue and self.queued >= max_queue:
+            # Until enough queued analyses have started to get back under the limit
+            retry_after = math.ceil((self.queued - max_queue + 1) / self.concurrency) * self.average_duration
+        if max_wait and wait > max_wait:
+            retry_after = max(retry_after, wait - max_wait)
+        if retry_after:
+            metrics.record_analysis_admission("rejected")
+            logger.warning(f"Rejecting analysis for user {user_id}: {self.queued} queued, "
+                           f"estimated wait {wait:.0f}s, retry after {retry_after:.0f}s")
+            raise AdmissionRejected(
+                "Analysis queue is full right now. Please try again shortly.",
+                retry_after=max(1.0, retry_after)
+            )
+
+        metrics.record_analysis_admission("admitted")
+        return wait
+
+    def overloaded(self, user_id: Optional[int] = None) -> bool:
+        """Whether interactive work is queuing or the provider is slow enough to shed load to the lite tier"""
+        max_wait = settings.analysis_lite_wait_threshold_seconds
+        max_latency = settings.analysis_lite_latency_threshold_seconds
+        if max_wait and self.estimated_wait(user_id) > max_wait:
+            return True
+        return bool(max_latency and llm_service.recent_latency > max_latency)
+
+    def choose_tier(self, user_id: int, requested: Optional[str] = None) -> str:
+        """Tier for a new match analysis: the requested one, else lite while overloaded"""
+        if requested:
+            tier, reason = requested, "requested"
+        elif settings.analysis_lite_auto and self.overloaded(user_id):
+            tier, reason = "lite", "overloaded"
+            logger.info(f"Running analysis for user {user_id} as lite: estimated wait "
+                        f"{self.estimated_wait(user_id):.0f}s, provider latency {llm_service.recent_latency:.1f}s")
+        else:
+            tier, reason = "full", "default"
+        metrics.record_analysis_tier(tier, reason)
+        return tier
+
+    async def run(
+        self,
+        user_id: int,
+        factory: Callable[[], Awaitable[Any]],
+        priority: JobPriority = JobPriority.INTERACTIVE,
+        weight: float = 1.0
+    ) -> Any:
+        """Wait for this user's turn, then run ``factory()`` at ``priority``"""
+        entry = self._enqueue(user_id, priority, weight)
+        self._dispatch()
+        try:
+            await entry.ready
+        except asyncio.CancelledError:
+            if entry in self._waiting:
+                self._waiting.remove(entry)
+            elif entry.ready.done() and not entry.ready.cancelled():
+                # Granted a slot just as it was cancelled
+                self._release(user_id)
+            raise
+
+        waited = time.monotonic() - entry.submitted_at
+        self.average_wait += SMOOTHING * (waited - self.average_wait)
+        metrics.record_analysis_queue_wait(priority.name.lower(), waited)
+        logger.debug(f"Analysis for user {user_id} ({priority.name}) started after {waited:.2f}s in queue")
+        started = time.monotonic()
+        try:
+            with call_priority(priority):
+                result = await factory()
+            self.average_duration += SMOOTHING * (time.monotonic() - started - self.average_duration)
+            return result
+        finally:
+            self._release(user_id)
+
+    def _enqueue(self, user_id: int, priority: JobPriority, weight: float) -> ScheduledAnalysis:
+        if not self._waiting and not self._running:
+            # Idle: restart the virtual clock so past usage is not held against anyone
+            self._virtual_time = 0.0
+            self._last_finish.clear()
+        start = max(self._virtual_time, self._last_finish.get(user_id, 0.0))
+        finish = start + 1.0 / max(weight, 1e-6)
+        self._last_finish[user_id] = finish
+        entry = ScheduledAnalysis(
+            user_id=user_id,
+            priority=priority,
+            start=start,
+            finish=finish,
+            sequence=next(self._sequence),
+            ready=asyncio.get_running_loop().create_future()
+        )
+        self._waiting.append(entry)
+        return entry
+
+    def _dispatch(self) -> None:
+        """Start waiting analyses while there is capacity"""
+        # Entries whose task was cancelled but has not run its cleanup yet
+        self._waiting = [entry for entry in self._waiting if not entry.ready.done()]
+        while self.running < self.concurrency:
+            eligible = [entry for entry in self._waiting if self._running.get(entry.user_id, 0) < self.per_user_limit]
+            if not eligible:
+                return
+            entry = min(eligible, key=lambda e: (e.priority, e.finish, e.sequence))
+            self._waiting.remove(entry)
+            self._running[entry.user_id] = self._running.get(entry.user_id, 0) + 1
+            # The clock advances to the start tag of the analysis now in service
+            self._virtual_time = max(self._virtual_time, entry.start)
+            entry.ready.set_result(None)
+
+    def _release(self, user_id: int) -> None:
+        self._running[user_id] -= 1
+        if not self._running[user_id]:
+            del self._running[user_id]
+        self._dispatch()
+
+# Global instance
+analysis_scheduler = AnalysisScheduler(
+    concurrency=settings.analysis_scheduler_concurrency,
+    per_user_limit=settings.analysis_scheduler_per_user_limit,
+    expected_duration=settings.analysis_expected_seconds
+)
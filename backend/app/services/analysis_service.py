@@ -1,29 +1,618 @@
 import asyncio
-from datetime import datetime
-from typing import Optional
+import hashlib
+import json
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from sqlalchemy.orm import Session
 import time
 import logging
 
+from app.core import metrics
+from app.core.deadline import StepPlan, StepTimeout, pipeline_deadline
+from app.core.tasks import create_detached_task
 from app.models.user import User
 from app.models.document import Document
 from app.models.analysis import DocumentAnalysis, IPPStageProgress
 from app.models.questionnaire import UserBackgroundQuestionnaire
-from app.services.llm_service import llm_service
+from app.services.analysis_scheduler import analysis_scheduler
+from app.services.ipp_stage_service import ipp_stage_service
+from app.services.job_queue import JobPriority
+from app.services.lite_analysis import TIERS, is_lite, lite_match_fields
+from app.services.llm_batch import batch_execution_active
+from app.services.llm_service import QUESTIONNAIRE_CONTEXT_FIELDS, llm_service
+from app.services.ranking_index import ranking_index
+from app.services.resume_section_service import resume_section_service
+from app.services.skill_extractor import skill_extractor
+from app.services.speculative_analysis_service import speculative_analysis_service
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+PIPELINE_MODES = ("multi_call", "fused")
+
+# Analyses that can still be cancelled
+ACTIVE_STATUSES = ("pending", "processing")
+
+# Result fields copied when a completed analysis is reused for identical inputs
+RESULT_FIELDS = (
+    "resume_analysis", "job_analysis", "connections_analysis", "context_summary",
+    "role_fit_narrative", "strengths", "gaps",
+)
+
+# Stored steps, in pipeline order; connections_analysis stands for the whole match
+# (connections, summary, narrative, strengths and gaps are produced together)
+STEPS = ("resume_analysis", "job_analysis", "connections_analysis")
+
+# Background questionnaire answers each step reads through the user context
+QUESTIONNAIRE_DEPENDENCIES = {
+    "resume_analysis": tuple(QUESTIONNAIRE_CONTEXT_FIELDS),
+}
+
+# Steps computed from other steps' results
+STEP_DEPENDENCIES = {
+    "connections_analysis": ("resume_analysis", "job_analysis"),
+}
+
+# Relative shares of the analysis deadline, by pipeline mode (see app.core.deadline)
+STEP_WEIGHTS = {
+    "multi_call": {
+        "resume_analysis": 3, "job_analysis": 2, "find_connections": 2, "extract_evidence": 2, "generate_summary": 1,
+    },
+    "fused": {"resume_analysis": 3, "job_analysis": 2, "match": 4},
+}
+
+def usable_step(step: Any) -> bool:
+    """A stored step that holds a result rather than an error"""
+    return isinstance(step, dict) and "error" not in step
+
+class AnalysisCancelled(Exception):
+    """Raised inside a pipeline whose analysis was cancelled by another worker"""
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def input_fingerprint(
+    kind: str,
+    resume_text: str,
+    job_text: Optional[str] = None,
+    questionnaire_responses: Optional[Dict[str, Any]] = None,
+    pipeline_mode: Optional[str] = None
+) -> str:
+    """Hash of everything a pipeline's results depend on: inputs, prompt version and mode"""
+    questionnaire = json.dumps(questionnaire_responses, sort_keys=True) if questionnaire_responses else ""
+    return _sha256("\0".join((
+        kind,
+        llm_service.prompt_version,
+        pipeline_mode or "",
+        _sha256(resume_text),
+        _sha256(job_text or ""),
+        _sha256(questionnaire),
+    )))
+
+def questionnaire_context(responses: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """User context for the prompts from background questionnaire answers"""
+    if not responses:
+        return {}
+    return {
+        'has_questionnaire': True,
+        **{field: responses.get(field, '') for field in QUESTIONNAIRE_CONTEXT_FIELDS},
+        'values_focus': 'deep personal context available'
+    }
+
+def with_dependents(analysis: DocumentAnalysis, steps: Iterable[str]) -> List[str]:
+    """``steps`` plus the steps of ``analysis`` computed from them, in pipeline order"""
+    produced = {"resume_analysis"}
+    if analysis.job_document_id is not None:
+        produced |= {"job_analysis", "connections_analysis"}
+    stale = set(steps)
+    for step in STEPS:
+        if stale & set(STEP_DEPENDENCIES.get(step, ())):
+            stale.add(step)
+    return [step for step in STEPS if step in stale & produced]
+
+def questionnaire_dependent_steps(analysis: DocumentAnalysis, changed_fields: Set[str]) -> List[str]:
+    """Steps of ``analysis`` that read any of ``changed_fields``, directly or through another step"""
+    return with_dependents(analysis, (
+        step for step, fields in QUESTIONNAIRE_DEPENDENCIES.items() if changed_fields & set(fields)
+    ))
+
 class AnalysisService:
     
+    def __init__(self):
+        # Background pipelines started by this process, so they can be cancelled
+        self._tasks: Dict[int, asyncio.Task] = {}
+        # Background upgrades of lite analyses (held so they are not garbage collected)
+        self._upgrades: Set[asyncio.Task] = set()
+        # Background recomputes of stale steps, by analysis
+        self._refreshes: Dict[int, asyncio.Task] = {}
+    
+    def _launch(self, analysis_id: int, user_id: int, factory: Callable[[], Awaitable[None]]) -> asyncio.Task:
+        """Run a pipeline in the background once the fair-share scheduler gives the user a slot"""
+        task = asyncio.create_task(analysis_scheduler.run(
+            user_id, partial(self._run_with_deadline, factory, analysis_id), priority=JobPriority.INTERACTIVE
+        ))
+        self._tasks[analysis_id] = task
+        task.add_done_callback(lambda done: self._tasks.pop(analysis_id, None) if self._tasks.get(analysis_id) is done else None)
+        return task
+    
+    async def _run_with_deadline(self, factory: Callable[[], Awaitable[Any]], analysis_id: Optional[int] = None) -> Any:
+        """Run a pipeline under the analysis deadline, recorded on the row for the sweeper"""
+        # Offline batches take as long as the provider needs; nobody is waiting on them
+        batch = batch_execution_active()
+        seconds = 0 if batch else settings.analysis_deadline_seconds
+        if analysis_id is not None:
+            from database.connection import get_db
+            db = next(get_db())
+            try:
+                db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).update({
+                    "deadline_at": datetime.utcnow() + timedelta(seconds=seconds) if seconds > 0 else None,
+                    "execution": "batch" if batch else "realtime"
+                }, synchronize_session=False)
+                db.commit()
+            finally:
+                db.close()
+        with pipeline_deadline(seconds):
+            return await factory()
+    
+    def _step_plan(self, pipeline_mode: str, skip: Tuple[str, ...] = ()) -> StepPlan:
+        return StepPlan({step: weight for step, weight in STEP_WEIGHTS[pipeline_mode].items() if step not in skip})
+    
+    def cancel_analysis(self, db: Session, user: User, analysis_id: int) -> DocumentAnalysis:
+        """Stop a pending or processing analysis and mark it cancelled"""
+        analysis = self.get_user_analysis(db, user, analysis_id)
+        if not analysis:
+            raise ValueError("Analysis not found")
+        if analysis.status not in ACTIVE_STATUSES:
+            raise ValueError(f"Analysis is already {analysis.status}")
+        self._cancel(db, analysis, "Analysis cancelled.")
+        return analysis
+    
+    def _cancel(self, db: Session, analysis: DocumentAnalysis, message: str) -> None:
+        analysis.status = "cancelled"
+        analysis.progress_step = "cancelled"
+        analysis.progress_message = message
+        db.commit()
+        
+        # Cancelling the task also aborts its in-flight provider requests;
+        # a pipeline in another worker stops at its next step (_raise_if_cancelled)
+        task = self._tasks.get(analysis.id)
+        if task and not task.done():
+            task.cancel()
+        logger.info(f"Analysis {analysis.id} cancelled")
+    
+    def _supersede(self, db: Session, user: User, match: bool, keep_id: Optional[int] = None) -> None:
+        """Cancel the user's in-progress analyses of the same kind (resume-only, or resume and job match)"""
+        previous = db.query(DocumentAnalysis).filter(
+            DocumentAnalysis.user_id == user.id,
+            DocumentAnalysis.status.in_(ACTIVE_STATUSES),
+            DocumentAnalysis.job_document_id.isnot(None) if match else DocumentAnalysis.job_document_id.is_(None)
+        ).all()
+        for analysis in previous:
+            if analysis.id != keep_id:
+                self._cancel(db, analysis, "Replaced by a newer analysis.")
+    
+    def _should_supersede(self, supersede: Optional[bool]) -> bool:
+        return settings.analysis_supersede_previous if supersede is None else supersede
+    
+    def _reuse_completed(
+        self,
+        db: Session,
+        user: User,
+        fingerprint: str,
+        resume_document_id: int,
+        job_document_id: Optional[int] = None,
+        questionnaire_id: Optional[int] = None
+    ) -> Optional[DocumentAnalysis]:
+        """The user's completed analysis with identical inputs, or a copy of it for these documents
+        
+        Re-entering a stage with the same documents returns the earlier
+        analysis itself; a re-upload of the same text gets a completed copy
+        linked through ``reused_from_analysis_id``.
+        """
+        kind = "match" if job_document_id else "resume"
+        if not settings.analysis_memoization:
+            return None
+        candidates = db.query(DocumentAnalysis).filter(
+            DocumentAnalysis.user_id == user.id,
+            DocumentAnalysis.input_fingerprint == fingerprint,
+            DocumentAnalysis.status == "completed",
+            DocumentAnalysis.analysis_tier == "full"
+        ).order_by(DocumentAnalysis.completed_at.desc()).all()
+        # Steps that returned an error dict still complete; never hand those out again
+        source = next((
+            analysis for analysis in candidates
+            if not any(isinstance(getattr(analysis, field), dict) and "error" in getattr(analysis, field)
+                       for field in ("resume_analysis", "job_analysis", "connections_analysis"))
+        ), None)
+        metrics.record_analysis_memo_lookup(kind, "hit" if source else "miss")
+        if not source:
+            return None
+        
+        if source.resume_document_id == resume_document_id and source.job_document_id == job_document_id:
+            logger.info(f"Reusing completed analysis {source.id} for identical inputs")
+            db.refresh(source)
+            return source
+        
+        clone = DocumentAnalysis(
+            user_id=user.id,
+            resume_document_id=resume_document_id,
+            job_document_id=job_document_id,
+            background_questionnaire_id=questionnaire_id,
+            status="processing",
+            analysis_tier="full",
+            input_fingerprint=fingerprint,
+            reused_from_analysis_id=source.id,
+            **{field: getattr(source, field) for field in RESULT_FIELDS}
+        )
+        db.add(clone)
+        db.commit()
+        db.refresh(clone)
+        logger.info(f"Analysis {clone.id} copied from completed analysis {source.id} with identical inputs")
+        if job_document_id:
+            self._complete_full_analysis(db, clone)
+        else:
+            self._complete_resume_analysis(db, clone)
+        return clone
+    
+    def _raise_if_cancelled(self, db: Session, analysis: DocumentAnalysis) -> None:
+        """Stop between steps if the analysis was cancelled elsewhere"""
+        db.refresh(analysis, attribute_names=["status"])
+        if analysis.status == "cancelled":
+            raise AnalysisCancelled()
+    
+    def _handle_task_cancelled(self, db: Session, analysis_id: int) -> None:
+        """Record a cancelled pipeline task (via _cancel, a restart of the same analysis, or shutdown)"""
+        logger.info(f"Analysis {analysis_id} task cancelled")
+        if self._tasks.get(analysis_id) not in (None, asyncio.current_task()):
+            return  # a new run of the same analysis has taken over
+        db.rollback()
+        analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
+        # Failed by the sweeper (or cancelled already): keep that status
+        if analysis and analysis.status in ACTIVE_STATUSES:
+            analysis.status = "cancelled"
+            analysis.progress_step = "cancelled"
+            analysis.progress_message = "Analysis cancelled."
+            db.commit()
+    
+    def _still_active(self, db: Session, analysis: DocumentAnalysis) -> bool:
+        """Whether the run still owns the row (the sweeper or a cancel may have ended it meanwhile)"""
+        with db.no_autoflush:
+            status = db.query(DocumentAnalysis.status).filter(DocumentAnalysis.id == analysis.id).scalar()
+        if status in ACTIVE_STATUSES:
+            return True
+        logger.warning(f"Analysis {analysis.id} finished after it was marked {status}; discarding the results")
+        db.rollback()
+        return False
+    
+    def _fail_timed_out(self, db: Session, analysis_id: int, timeout: StepTimeout) -> None:
+        logger.error(f"Analysis {analysis_id} failed: {timeout}")
+        db.rollback()
+        analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
+        if analysis and analysis.status in ACTIVE_STATUSES:
+            analysis.status = "failed"
+            analysis.error_message = str(timeout)
+            analysis.progress_step = "failed"
+            analysis.progress_message = "Analysis is taking too long right now. Please try again."
+            db.commit()
+    
+    def _cached_resume_analysis(self, db: Session, analysis: DocumentAnalysis) -> Optional[dict]:
+        """A full resume analysis of the same document from another analysis (the backfill updates old prompt versions)"""
+        siblings = db.query(DocumentAnalysis).filter(
+            DocumentAnalysis.resume_document_id == analysis.resume_document_id,
+            DocumentAnalysis.id != analysis.id,
+            DocumentAnalysis.status == "completed"
+        ).order_by(DocumentAnalysis.completed_at.desc()).all()
+        for sibling in siblings:
+            step = sibling.resume_analysis
+            if usable_step(step) and not is_lite(step):
+                return dict(step)
+        return None
+    
+    def _fall_back_to_cached_resume(self, db: Session, analysis_id: int, timeout: StepTimeout) -> None:
+        """The resume step overran its budget: complete with an earlier analysis of the same resume, or fail"""
+        db.rollback()
+        analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
+        cached = self._cached_resume_analysis(db, analysis) if analysis else None
+        if not cached or analysis.status not in ACTIVE_STATUSES:
+            metrics.record_analysis_step_timeout(timeout.step, "failed")
+            self._fail_timed_out(db, analysis_id, timeout)
+            return
+        
+        logger.warning(f"Analysis {analysis_id}: {timeout}; using a cached resume analysis")
+        metrics.record_analysis_step_timeout(timeout.step, "cached")
+        analysis.resume_analysis = cached
+        # It may predate the current questionnaire answers; refresh on the next read
+        analysis.stale_steps = ["resume_analysis"]
+        analysis.input_fingerprint = None
+        self._complete_resume_analysis(db, analysis)
+    
+    async def _fall_back_after_timeout(
+        self,
+        db: Session,
+        analysis_id: int,
+        timeout: StepTimeout,
+        complete: Callable[[Session, DocumentAnalysis], bool]
+    ) -> None:
+        """A match pipeline step overran its budget: finish as a lite analysis, or fail
+        
+        Stored resume and job analyses are kept; a missing one comes from an
+        earlier analysis of the same document, or else from the compact lite
+        prompt within the time left. Matching and the summary are done locally.
+        """
+        db.rollback()
+        analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
+        if not analysis or analysis.status not in ACTIVE_STATUSES:
+            return
+        logger.warning(f"Analysis {analysis_id}: {timeout}; falling back to a lite analysis")
+        
+        try:
+            resume_doc = db.query(Document).filter(Document.id == analysis.resume_document_id).first()
+            job_doc = db.query(Document).filter(Document.id == analysis.job_document_id).first()
+            if not resume_doc or not job_doc or not resume_doc.content_text or not job_doc.content_text:
+                raise ValueError("Document text content not available")
+            resume_text, job_text = resume_doc.content_text, job_doc.content_text
+            
+            resume_analysis = analysis.resume_analysis if usable_step(analysis.resume_analysis) else self._cached_resume_analysis(db, analysis)
+            job_analysis = analysis.job_analysis if usable_step(analysis.job_analysis) else \
+                speculative_analysis_service.completed_job_analysis(db, analysis.job_document_id)
+            pending = {}
+            if resume_analysis is None:
+                pending["resume_analysis"] = llm_service.analyze_resume_lite(resume_text)
+            if job_analysis is None:
+                pending["job_analysis"] = llm_service.analyze_job_description_lite(job_text)
+            if pending:
+                async with StepPlan({"lite_fallback": 1}).step("lite_fallback"):
+                    results = dict(zip(pending, await asyncio.gather(*pending.values())))
+                for field, result in results.items():
+                    if "error" in result:
+                        raise ValueError(f"{field.replace('_', ' ').capitalize()} failed: {result['error']}")
+                resume_analysis = results.get("resume_analysis", resume_analysis)
+                job_analysis = results.get("job_analysis", job_analysis)
+            
+            fields = lite_match_fields(
+                resume_analysis, resume_text, job_analysis, job_text,
+                prompt_version=llm_service.prompt_version,
+                upgrade_pending=settings.analysis_lite_auto_upgrade
+            )
+            self._raise_if_cancelled(db, analysis)
+            analysis.resume_analysis = resume_analysis
+            analysis.job_analysis = job_analysis
+            for field, value in fields.items():
+                setattr(analysis, field, value)
+            analysis.analysis_tier = "lite"
+            # Lite results are never reused for identical inputs
+            analysis.input_fingerprint = None
+            if not complete(db, analysis):
+                return
+            metrics.record_analysis_step_timeout(timeout.step, "lite")
+            if settings.analysis_lite_auto_upgrade:
+                self._schedule_upgrade(analysis.id, analysis.user_id)
+        except AnalysisCancelled:
+            logger.info(f"Analysis {analysis_id} stopped after cancellation")
+        except Exception as e:
+            logger.warning(f"Lite fallback for analysis {analysis_id} failed: {str(e)}")
+            metrics.record_analysis_step_timeout(timeout.step, "failed")
+            self._fail_timed_out(db, analysis_id, timeout)
+    
+    def _resolve_pipeline_mode(self, pipeline_mode: Optional[str]) -> str:
+        """Per-request mode, falling back to the ANALYSIS_PIPELINE_MODE setting"""
+        mode = getattr(pipeline_mode, "value", pipeline_mode) or settings.analysis_pipeline_mode
+        if mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown pipeline mode: {mode}")
+        return mode
+    
+    def _resolve_tier(self, user: User, tier: Optional[str]) -> str:
+        """Requested tier, or the scheduler's choice (lite while overloaded)"""
+        tier = getattr(tier, "value", tier)
+        if tier and tier not in TIERS:
+            raise ValueError(f"Unknown analysis tier: {tier}")
+        return analysis_scheduler.choose_tier(user.id, tier)
+    
+    def _local_skill_candidates(self, resume_text: str, job_text: str) -> Optional[dict]:
+        """Exact skill matches found without the LLM (None when disabled or unavailable)"""
+        if not settings.local_skill_matching or not resume_text or not job_text:
+            return None
+        try:
+            started = time.perf_counter()
+            candidates = skill_extractor.match_documents(resume_text, job_text)
+            logger.info(f"Local skill matching found {len(candidates['direct_matches'])} matches, "
+                        f"{len(candidates['job_only'])} unmatched job skills in {(time.perf_counter() - started) * 1000:.1f}ms")
+            return candidates
+        except Exception as e:
+            # The prompts work without candidates; never fail the analysis over them
+            logger.warning(f"Local skill matching unavailable: {str(e)}")
+            return None
+    
+    async def _run_fused_match(
+        self,
+        db: Session,
+        analysis: DocumentAnalysis,
+        resume_analysis: dict,
+        resume_text: str,
+        job_analysis: dict,
+        job_text: str
+    ):
+        """Connections, evidence and summary from a single combined LLM call"""
+        
+        logger.info(f"Running fused match for analysis {analysis.id}")
+        analysis.progress_step = "matching"
+        analysis.progress_message = "Connecting your background to the role and preparing your summary..."
+        db.commit()
+        
+        match = await llm_service.analyze_job_match(
+            resume_analysis, resume_text, job_analysis, job_text,
+            skill_candidates=self._local_skill_candidates(resume_text, job_text)
+        )
+        
+        for field, value in self._fused_match_fields(match).items():
+            setattr(analysis, field, value)
+        db.commit()
+    
+    def _fused_match_fields(self, match: dict) -> dict:
+        """DocumentAnalysis fields from an ``analyze_job_match`` result"""
+        connections = dict(match.get("connections", {}))
+        if "skill_alignment" in match:
+            connections["skill_alignment"] = match["skill_alignment"]
+        if "metadata" in match and "metadata" not in connections:
+            # Keeps the prompt version with the stored connections
+            connections["metadata"] = match["metadata"]
+        
+        summary_result = match.get("summary", {})
+        return {
+            "connections_analysis": connections,
+            "context_summary": summary_result.get("context_summary", ""),
+            "role_fit_narrative": summary_result.get("role_fit_narrative", ""),
+            "strengths": summary_result.get("strengths", []),
+            "gaps": summary_result.get("gaps", []),
+        }
+    
+    async def compute_match(
+        self,
+        resume_analysis: dict,
+        resume_text: str,
+        job_analysis: dict,
+        job_text: str,
+        pipeline_mode: Optional[str] = None
+    ) -> dict:
+        """Connections and summary fields for stored resume and job analyses, without touching progress
+        
+        Used to re-run only the matching steps of an existing analysis; raises
+        ValueError if a step returned an error instead of a result.
+        """
+        pipeline_mode = self._resolve_pipeline_mode(pipeline_mode)
+        skill_candidates = self._local_skill_candidates(resume_text, job_text)
+        
+        if pipeline_mode == "fused":
+            match = await llm_service.analyze_job_match(
+                resume_analysis, resume_text, job_analysis, job_text, skill_candidates=skill_candidates
+            )
+            if "error" in match:
+                raise ValueError(f"Job match failed: {match['error']}")
+            return self._fused_match_fields(match)
+        
+        connections = await llm_service.find_connections(resume_analysis, job_analysis, skill_candidates=skill_candidates)
+        if "error" in connections:
+            raise ValueError(f"Finding connections failed: {connections['error']}")
+        detailed_evidence = await llm_service.extract_detailed_evidence(resume_text, job_text, skill_candidates=skill_candidates)
+        if detailed_evidence and "skill_alignment" in detailed_evidence:
+            connections["skill_alignment"] = detailed_evidence["skill_alignment"]
+        
+        summary_result = await llm_service.generate_context_summary(resume_analysis, job_analysis, connections)
+        if "error" in summary_result:
+            raise ValueError(f"Context summary failed: {summary_result['error']}")
+        return {
+            "connections_analysis": connections,
+            "context_summary": summary_result.get("context_summary", ""),
+            "role_fit_narrative": summary_result.get("role_fit_narrative", ""),
+            "strengths": summary_result.get("strengths", []),
+            "gaps": summary_result.get("gaps", []),
+        }
+    
     async def start_document_analysis(
         self, 
         db: Session, 
         user: User, 
         resume_document_id: int, 
-        job_document_id: int
+        job_document_id: int,
+        pipeline_mode: Optional[str] = None,
+        supersede: Optional[bool] = None,
+        tier: Optional[str] = None,
+        force_rerun: bool = False,
+        admit: Optional[Callable[[], Any]] = None
     ) -> DocumentAnalysis:
-        """Start analysis of uploaded documents"""
+        """Start analysis of uploaded documents
+        
+        With ``supersede`` (default ANALYSIS_SUPERSEDE_PREVIOUS) the user's
+        in-progress resume and job analyses are cancelled first. ``tier``
+        "lite" runs the reduced pipeline; by default it is chosen only while
+        the service is overloaded. A completed analysis of identical inputs
+        is returned instead of a new run unless ``force_rerun`` is set.
+        ``admit`` is called only when a new pipeline is launched, and may
+        raise to refuse it.
+        """
         
+        pipeline_mode = self._resolve_pipeline_mode(pipeline_mode)
+        resume_doc, job_doc = self._get_match_documents(db, user, resume_document_id, job_document_id)
+        fingerprint = input_fingerprint("match", resume_doc.content_text, job_doc.content_text, pipeline_mode=pipeline_mode)
+        if not force_rerun:
+            reused = self._reuse_completed(db, user, fingerprint, resume_document_id, job_document_id)
+            if reused:
+                if self._should_supersede(supersede):
+                    self._supersede(db, user, match=True, keep_id=reused.id)
+                return reused
+        
+        if admit:
+            admit()
+        tier = self._resolve_tier(user, tier)
+        analysis, resume_text, job_text = self._create_document_analysis(
+            db, user, resume_document_id, job_document_id, analysis_tier=tier,
+            # Only full-tier results are reused
+            input_fingerprint=fingerprint if tier == "full" else None
+        )
+        if self._should_supersede(supersede):
+            self._supersede(db, user, match=True, keep_id=analysis.id)
+        
+        # Start async analysis
+        if tier == "lite":
+            factory = partial(self._perform_lite_analysis, analysis.id, resume_text, job_text)
+        else:
+            factory = partial(self._perform_analysis, analysis.id, resume_text, job_text, pipeline_mode=pipeline_mode)
+        self._launch(analysis.id, user.id, factory)
+        
+        return analysis
+    
+    def create_document_analysis(self, db: Session, user: User, resume_document_id: int, job_document_id: int) -> DocumentAnalysis:
+        """Create a pending analysis to be run later with ``run_analysis`` (bulk imports)"""
+        analysis, _, _ = self._create_document_analysis(db, user, resume_document_id, job_document_id)
+        return analysis
+    
+    async def run_analysis(self, db: Session, analysis: DocumentAnalysis, pipeline_mode: Optional[str] = None) -> DocumentAnalysis:
+        """Run (or re-run) a resume and job analysis to completion and return the refreshed row"""
+        pipeline_mode = self._resolve_pipeline_mode(pipeline_mode)
+        resume_doc = db.query(Document).filter(Document.id == analysis.resume_document_id).first()
+        job_doc = db.query(Document).filter(Document.id == analysis.job_document_id).first()
+        if not resume_doc or not job_doc or not resume_doc.content_text or not job_doc.content_text:
+            raise ValueError("Document text content not available")
+        
+        analysis.input_fingerprint = input_fingerprint(
+            "match", resume_doc.content_text, job_doc.content_text, pipeline_mode=pipeline_mode
+        )
+        db.commit()
+        await self._run_with_deadline(partial(
+            self._perform_analysis, analysis.id, resume_doc.content_text, job_doc.content_text, pipeline_mode=pipeline_mode
+        ), analysis.id)
+        db.refresh(analysis)
+        return analysis
+    
+    def _create_document_analysis(
+        self,
+        db: Session,
+        user: User,
+        resume_document_id: int,
+        job_document_id: int,
+        analysis_tier: str = "full",
+        input_fingerprint: Optional[str] = None
+    ) -> Tuple[DocumentAnalysis, str, str]:
+        resume_doc, job_doc = self._get_match_documents(db, user, resume_document_id, job_document_id)
+        
+        # Create analysis record
+        analysis = DocumentAnalysis(
+            user_id=user.id,
+            resume_document_id=resume_document_id,
+            job_document_id=job_document_id,
+            status="pending",
+            analysis_tier=analysis_tier,
+            input_fingerprint=input_fingerprint
+        )
+        
+        db.add(analysis)
+        db.commit()
+        db.refresh(analysis)
+        
+        return analysis, resume_doc.content_text, job_doc.content_text
+    
+    def _get_match_documents(self, db: Session, user: User, resume_document_id: int, job_document_id: int) -> Tuple[Document, Document]:
         # Verify documents exist and belong to user
         resume_doc = db.query(Document).filter(
             Document.id == resume_document_id,
@@ -43,24 +632,9 @@ class AnalysisService:
         if not resume_doc.content_text or not job_doc.content_text:
             raise ValueError("Document text content not available")
         
-        # Create analysis record
-        analysis = DocumentAnalysis(
-            user_id=user.id,
-            resume_document_id=resume_document_id,
-            job_document_id=job_document_id,
-            status="pending"
-        )
-        
-        db.add(analysis)
-        db.commit()
-        db.refresh(analysis)
-        
-        # Start async analysis
-        asyncio.create_task(self._perform_analysis(analysis.id, resume_doc.content_text, job_doc.content_text))
-        
-        return analysis
+        return resume_doc, job_doc
     
-    async def _perform_analysis(self, analysis_id: int, resume_text: str, job_text: str):
+    async def _perform_analysis(self, analysis_id: int, resume_text: str, job_text: str, pipeline_mode: str = "multi_call"):
         """Perform the actual LLM analysis (runs asynchronously)"""
         
         # Get a new database session for the background task
@@ -77,17 +651,20 @@ class AnalysisService:
             analysis.progress_step = "initializing"
             analysis.progress_message = "Starting document analysis..."
             db.commit()
+            plan = self._step_plan(pipeline_mode)
             
             # Add small delay to show initial progress
             await asyncio.sleep(0.5)
             
             # Step 1: Analyze resume
+            self._raise_if_cancelled(db, analysis)
             logger.info(f"Analyzing resume for analysis {analysis_id}")
             analysis.progress_step = "analyzing_resume"
             analysis.progress_message = "Analyzing your resume to extract skills, experience, and qualifications..."
             db.commit()
             
-            resume_analysis = await llm_service.analyze_resume(resume_text)
+            async with plan.step("resume_analysis"):
+                resume_analysis = await resume_section_service.analyze_resume(db, analysis.user_id, resume_text)
             
             analysis.resume_analysis = resume_analysis
             db.commit()
@@ -96,12 +673,16 @@ class AnalysisService:
             await asyncio.sleep(0.3)
             
             # Step 2: Analyze job description
+            self._raise_if_cancelled(db, analysis)
             logger.info(f"Analyzing job description for analysis {analysis_id}")
             analysis.progress_step = "analyzing_job"
             analysis.progress_message = "Analyzing the job description to understand requirements and expectations..."
             db.commit()
             
-            job_analysis = await llm_service.analyze_job_description(job_text)
+            async with plan.step("job_analysis"):
+                job_analysis = await speculative_analysis_service.get_job_analysis(
+                    db, analysis.job_document_id, job_text
+                )
             
             analysis.job_analysis = job_analysis
             db.commit()
@@ -109,24 +690,40 @@ class AnalysisService:
             # Small delay after job analysis
             await asyncio.sleep(0.3)
             
+            self._raise_if_cancelled(db, analysis)
+            if pipeline_mode == "fused":
+                async with plan.step("match"):
+                    await self._run_fused_match(db, analysis, resume_analysis, resume_text, job_analysis, job_text)
+                self._raise_if_cancelled(db, analysis)
+                self._complete_full_analysis(db, analysis)
+                return
+            
             # Step 3: Find connections
             logger.info(f"Finding connections for analysis {analysis_id}")
             analysis.progress_step = "finding_connections"
             analysis.progress_message = "Identifying connections between your background and the job requirements..."
             db.commit()
             
-            connections = await llm_service.find_connections(resume_analysis, job_analysis)
+            skill_candidates = self._local_skill_candidates(resume_text, job_text)
+            async with plan.step("find_connections"):
+                connections = await llm_service.find_connections(
+                    resume_analysis, job_analysis, skill_candidates=skill_candidates
+                )
             
             # Small delay before evidence extraction
             await asyncio.sleep(0.3)
             
             # Step 3b: Extract detailed evidence with quotes
+            self._raise_if_cancelled(db, analysis)
             logger.info(f"Extracting detailed evidence for analysis {analysis_id}")
             analysis.progress_step = "extracting_evidence"
             analysis.progress_message = "Extracting specific evidence and quotes from your documents..."
             db.commit()
             
-            detailed_evidence = await llm_service.extract_detailed_evidence(resume_text, job_text)
+            async with plan.step("extract_evidence"):
+                detailed_evidence = await llm_service.extract_detailed_evidence(
+                    resume_text, job_text, skill_candidates=skill_candidates
+                )
             
             # Merge detailed evidence into connections if successful
             if detailed_evidence and "skill_alignment" in detailed_evidence:
@@ -139,14 +736,16 @@ class AnalysisService:
             await asyncio.sleep(0.3)
             
             # Step 4: Generate context summary
+            self._raise_if_cancelled(db, analysis)
             logger.info(f"Generating context summary for analysis {analysis_id}")
             analysis.progress_step = "generating_summary"
             analysis.progress_message = "Creating your personalized context summary and recommendations..."
             db.commit()
             
-            summary_result = await llm_service.generate_context_summary(
-                resume_analysis, job_analysis, connections
-            )
+            async with plan.step("generate_summary"):
+                summary_result = await llm_service.generate_context_summary(
+                    resume_analysis, job_analysis, connections
+                )
             
             # Log the result for debugging
             logger.debug(f"Context summary result keys: {summary_result.keys()}")
@@ -159,24 +758,16 @@ class AnalysisService:
             analysis.role_fit_narrative = summary_result.get("role_fit_narrative", "")
             analysis.strengths = summary_result.get("strengths", [])
             analysis.gaps = summary_result.get("gaps", [])
-            analysis.status = "completed"
-            analysis.completed_at = datetime.utcnow()
-            analysis.progress_step = "completed"
-            analysis.progress_message = "Analysis complete!"
-            db.commit()
-            
-            # Create IPP progress record
-            ipp_progress = IPPStageProgress(
-                user_id=analysis.user_id,
-                analysis_id=analysis.id,
-                context_completed=True,
-                context_completed_at=datetime.utcnow()
-            )
-            db.add(ipp_progress)
-            db.commit()
-            
-            logger.info(f"Analysis {analysis_id} completed successfully")
+            self._raise_if_cancelled(db, analysis)
+            self._complete_full_analysis(db, analysis)
             
+        except AnalysisCancelled:
+            logger.info(f"Analysis {analysis_id} stopped after cancellation")
+        except asyncio.CancelledError:
+            self._handle_task_cancelled(db, analysis_id)
+            raise
+        except StepTimeout as e:
+            await self._fall_back_after_timeout(db, analysis_id, e, self._complete_full_analysis)
         except Exception as e:
             logger.error(f"Analysis {analysis_id} failed: {str(e)}", exc_info=True)
             analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
@@ -190,6 +781,33 @@ class AnalysisService:
         finally:
             db.close()
     
+    def _complete_full_analysis(self, db: Session, analysis: DocumentAnalysis) -> bool:
+        """Mark a full analysis completed and record Context stage progress; False when it was failed or cancelled meanwhile"""
+        if not self._still_active(db, analysis):
+            return False
+        analysis.status = "completed"
+        analysis.completed_at = datetime.utcnow()
+        analysis.progress_step = "completed"
+        analysis.progress_message = "Analysis complete!"
+        db.commit()
+        
+        # Create IPP progress record
+        ipp_progress = IPPStageProgress(
+            user_id=analysis.user_id,
+            analysis_id=analysis.id,
+            context_completed=True,
+            context_completed_at=datetime.utcnow()
+        )
+        db.add(ipp_progress)
+        db.commit()
+        
+        logger.info(f"Analysis {analysis.id} completed successfully")
+        ranking_index.index_analysis(db, analysis)
+        if analysis.analysis_tier != "lite":
+            # Pre-generation is the kind of background work lite analyses shed; the upgrade schedules it
+            ipp_stage_service.schedule_pregeneration(db, analysis)
+        return True
+    
     def get_user_analysis(self, db: Session, user: User, analysis_id: int) -> Optional[DocumentAnalysis]:
         """Get analysis by ID for a specific user"""
         return db.query(DocumentAnalysis).filter(
@@ -213,9 +831,18 @@ class AnalysisService:
         self, 
         db: Session, 
         user: User, 
-        resume_document_id: int
+        resume_document_id: int,
+        supersede: Optional[bool] = None,
+        force_rerun: bool = False,
+        admit: Optional[Callable[[], Any]] = None
     ) -> DocumentAnalysis:
-        """Start analysis of resume only (for Context stage)"""
+        """Start analysis of resume only (for Context stage)
+        
+        A completed analysis of the same resume text and questionnaire answers
+        is returned instead of a new run unless ``force_rerun`` is set.
+        ``admit`` is called only when a new pipeline is launched, and may
+        raise to refuse it.
+        """
         
         # Verify resume document exists and belongs to user
         resume_doc = db.query(Document).filter(
@@ -236,20 +863,40 @@ class AnalysisService:
             UserBackgroundQuestionnaire.completed_at.isnot(None)
         ).order_by(UserBackgroundQuestionnaire.created_at.desc()).first()
         
+        # Only the answers the prompts read, so edits to other answers still reuse the analysis
+        fingerprint = input_fingerprint(
+            "resume", resume_doc.content_text,
+            questionnaire_responses=questionnaire_context(questionnaire.responses if questionnaire else None)
+        )
+        if not force_rerun:
+            reused = self._reuse_completed(
+                db, user, fingerprint, resume_document_id, questionnaire_id=questionnaire.id if questionnaire else None
+            )
+            if reused:
+                if self._should_supersede(supersede):
+                    self._supersede(db, user, match=False, keep_id=reused.id)
+                return reused
+        
+        if admit:
+            admit()
         # Create analysis record with only resume
         analysis = DocumentAnalysis(
             user_id=user.id,
             resume_document_id=resume_document_id,
             job_document_id=None,  # No job document for resume-only analysis
             background_questionnaire_id=questionnaire.id if questionnaire else None,
-            status="pending"
+            status="pending",
+            input_fingerprint=fingerprint
         )
         db.add(analysis)
         db.commit()
         db.refresh(analysis)
+        if self._should_supersede(supersede):
+            self._supersede(db, user, match=False, keep_id=analysis.id)
         
         # Start asynchronous analysis
-        asyncio.create_task(self._perform_resume_only_analysis(
+        self._launch(analysis.id, user.id, partial(
+            self._perform_resume_only_analysis,
             analysis_id=analysis.id,
             resume_text=resume_doc.content_text,
             questionnaire_data=questionnaire.responses if questionnaire else None
@@ -279,28 +926,19 @@ class AnalysisService:
             await asyncio.sleep(0.5)
             
             # Analyze resume with enhanced Ignatian prompts
+            self._raise_if_cancelled(db, analysis)
             logger.info(f"Analyzing resume with Ignatian focus for analysis {analysis_id}")
             analysis.progress_step = "analyzing_resume"
             analysis.progress_message = "Extracting skills, values, character strengths, and growth indicators from your resume..."
             db.commit()
             
             # Build user context with questionnaire data if available
-            user_context = {}
-            if questionnaire_data:
+            user_context = questionnaire_context(questionnaire_data)
+            if user_context:
                 logger.info(f"Including questionnaire data in resume analysis for enhanced personalization")
-                user_context = {
-                    'has_questionnaire': True,
-                    'career_values': questionnaire_data.get('career_values', ''),
-                    'mission_alignment': questionnaire_data.get('mission_alignment', ''),
-                    'service_experience': questionnaire_data.get('service_experience', ''),
-                    'helping_others': questionnaire_data.get('helping_others', ''),
-                    'learning_style': questionnaire_data.get('learning_style', ''),
-                    'work_environment': questionnaire_data.get('work_environment', ''),
-                    'collaboration_style': questionnaire_data.get('collaboration_style', ''),
-                    'values_focus': 'deep personal context available'
-                }
-            
-            resume_analysis = await llm_service.analyze_resume(resume_text, user_context)
+            
+            async with StepPlan({"resume_analysis": 1}).step("resume_analysis"):
+                resume_analysis = await resume_section_service.analyze_resume(db, analysis.user_id, resume_text, user_context)
             
             # Log to verify new fields are present
             logger.info(f"Resume analysis keys: {resume_analysis.keys()}")
@@ -309,15 +947,17 @@ class AnalysisService:
             if 'values_indicators' in resume_analysis:
                 logger.info(f"Found values_indicators in analysis")
             
+            self._raise_if_cancelled(db, analysis)
             analysis.resume_analysis = resume_analysis
-            analysis.status = "completed"
-            analysis.completed_at = datetime.utcnow()
-            analysis.progress_step = "completed"
-            analysis.progress_message = "Resume analysis complete with Ignatian insights!"
-            db.commit()
-            
-            logger.info(f"Resume-only analysis {analysis_id} completed successfully")
+            self._complete_resume_analysis(db, analysis)
             
+        except AnalysisCancelled:
+            logger.info(f"Resume analysis {analysis_id} stopped after cancellation")
+        except asyncio.CancelledError:
+            self._handle_task_cancelled(db, analysis_id)
+            raise
+        except StepTimeout as e:
+            self._fall_back_to_cached_resume(db, analysis_id, e)
         except Exception as e:
             logger.error(f"Resume analysis {analysis_id} failed: {str(e)}", exc_info=True)
             analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
@@ -331,14 +971,173 @@ class AnalysisService:
         finally:
             db.close()
     
+    def _complete_resume_analysis(self, db: Session, analysis: DocumentAnalysis) -> bool:
+        """Mark a resume-only analysis completed; False when it was failed or cancelled meanwhile"""
+        if not self._still_active(db, analysis):
+            return False
+        analysis.status = "completed"
+        analysis.completed_at = datetime.utcnow()
+        analysis.progress_step = "completed"
+        analysis.progress_message = "Resume analysis complete with Ignatian insights!"
+        db.commit()
+        
+        logger.info(f"Resume-only analysis {analysis.id} completed successfully")
+        ranking_index.index_analysis(db, analysis)
+        return True
+    
+    def mark_questionnaire_changed(
+        self,
+        db: Session,
+        questionnaire: UserBackgroundQuestionnaire,
+        previous_responses: Optional[Dict[str, Any]]
+    ) -> int:
+        """Mark the steps that read changed answers stale on analyses built from ``questionnaire``
+        
+        Only those steps are recomputed, on the analysis's next read (see
+        ``refresh_stale_steps``). Call before committing the questionnaire
+        update so both land together. Returns the number of analyses marked.
+        """
+        previous = previous_responses or {}
+        current = questionnaire.responses or {}
+        changed = {field for field in set(previous) | set(current) if previous.get(field) != current.get(field)}
+        if not changed:
+            return 0
+        
+        analyses = db.query(DocumentAnalysis).filter(
+            DocumentAnalysis.background_questionnaire_id == questionnaire.id,
+            DocumentAnalysis.status.in_(("completed",) + ACTIVE_STATUSES)
+        ).all()
+        marked = 0
+        for analysis in analyses:
+            steps = questionnaire_dependent_steps(analysis, changed)
+            if not steps:
+                continue
+            analysis.stale_steps = [step for step in STEPS if step in set(steps) | set(analysis.stale_steps or [])]
+            # The results no longer match the answers in their fingerprint
+            analysis.input_fingerprint = None
+            marked += 1
+        if marked:
+            logger.info(f"Questionnaire {questionnaire.id} changed ({', '.join(sorted(changed))}): "
+                        f"marked {marked} analyses stale")
+        return marked
+    
+    def refresh_stale_steps(self, db: Session, analysis: DocumentAnalysis) -> DocumentAnalysis:
+        """Start recomputing a completed analysis's stale steps in the background
+        
+        Called when the analysis is read; the current results are returned
+        meanwhile, with ``stale_steps`` telling the client an update is coming.
+        """
+        if not analysis.stale_steps or analysis.status != "completed" or not settings.analysis_refresh_stale_on_read:
+            return analysis
+        analysis_id = analysis.id
+        running = self._refreshes.get(analysis_id)
+        if running and not running.done():
+            return analysis
+        
+        analysis.progress_step = "refreshing"
+        analysis.progress_message = "Updating your analysis with your latest questionnaire answers..."
+        db.commit()
+        task = create_detached_task(analysis_scheduler.run(
+            analysis.user_id, partial(self._run_with_deadline, partial(self._refresh_stale_steps, analysis_id)),
+            priority=JobPriority.INTERACTIVE
+        ))
+        self._refreshes[analysis_id] = task
+        task.add_done_callback(lambda done: self._refreshes.pop(analysis_id, None) if self._refreshes.get(analysis_id) is done else None)
+        return analysis
+    
+    async def _refresh_stale_steps(self, analysis_id: int) -> None:
+        # Get a new database session for the background task
+        from database.connection import get_db
+        db = next(get_db())
+        
+        try:
+            analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
+            if not analysis or analysis.status != "completed" or not analysis.stale_steps:
+                return
+            requested = list(analysis.stale_steps)
+            # A job may have been added to a resume-only analysis since it was marked
+            steps = with_dependents(analysis, requested)
+            started = time.perf_counter()
+            
+            resume_doc = db.query(Document).filter(Document.id == analysis.resume_document_id).first()
+            if not resume_doc or not resume_doc.content_text:
+                raise ValueError("Resume text content not available")
+            questionnaire = db.query(UserBackgroundQuestionnaire).filter(
+                UserBackgroundQuestionnaire.id == analysis.background_questionnaire_id
+            ).first() if analysis.background_questionnaire_id else None
+            responses = dict(questionnaire.responses or {}) if questionnaire else None
+            user_context = questionnaire_context(responses)
+            
+            plan = StepPlan({"resume_analysis": 3, "match": 5} if "connections_analysis" in steps else {"resume_analysis": 1})
+            updates: Dict[str, Any] = {}
+            if "resume_analysis" in steps:
+                async with plan.step("resume_analysis"):
+                    resume_analysis = await resume_section_service.analyze_resume(
+                        db, analysis.user_id, resume_doc.content_text, user_context
+                    )
+                if "error" in resume_analysis:
+                    raise ValueError(f"Resume analysis failed: {resume_analysis['error']}")
+                updates["resume_analysis"] = resume_analysis
+            if "connections_analysis" in steps:
+                job_doc = db.query(Document).filter(Document.id == analysis.job_document_id).first()
+                if not job_doc or not job_doc.content_text or not analysis.job_analysis:
+                    raise ValueError("Job analysis not available")
+                async with plan.step("match"):
+                    updates.update(await self.compute_match(
+                        updates.get("resume_analysis", analysis.resume_analysis), resume_doc.content_text,
+                        analysis.job_analysis, job_doc.content_text
+                    ))
+            
+            # The answers may have changed again, or the analysis been re-run, meanwhile
+            db.refresh(analysis)
+            if questionnaire:
+                db.refresh(questionnaire)
+            if (analysis.status != "completed" or analysis.stale_steps != requested
+                    or (questionnaire and (questionnaire.responses or {}) != responses)):
+                logger.info(f"Discarding refresh of analysis {analysis_id}: it changed while refreshing")
+                return
+            
+            for field, value in updates.items():
+                setattr(analysis, field, value)
+            if "connections_analysis" in steps:
+                analysis.analysis_tier = "full"
+            if analysis.job_document_id is None:
+                analysis.input_fingerprint = input_fingerprint(
+                    "resume", resume_doc.content_text, questionnaire_responses=user_context
+                )
+            analysis.stale_steps = None
+            analysis.progress_step = "completed"
+            analysis.progress_message = "Analysis updated with your latest questionnaire answers."
+            db.commit()
+            logger.info(f"Refreshed {', '.join(steps)} of analysis {analysis_id} in {time.perf_counter() - started:.2f}s")
+            
+            ranking_index.index_analysis(db, analysis)
+        except Exception as e:
+            # The steps stay stale, so the next read tries again
+            logger.warning(f"Refresh of stale steps of analysis {analysis_id} failed: {str(e)}")
+            db.rollback()
+            analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
+            if analysis and analysis.progress_step == "refreshing":
+                analysis.progress_step = "completed"
+                analysis.progress_message = "Could not update your analysis with your latest answers yet."
+                db.commit()
+        finally:
+            db.close()
+    
     async def start_job_analysis(
         self,
         db: Session,
         user: User,
         existing_analysis_id: int,
-        job_document_id: int
+        job_document_id: int,
+        pipeline_mode: Optional[str] = None,
+        supersede: Optional[bool] = None,
+        tier: Optional[str] = None,
+        admit: Optional[Callable[[], Any]] = None
     ) -> DocumentAnalysis:
-        """Start job analysis using existing resume analysis"""
+        """Start job analysis using existing resume analysis (``admit`` as in start_document_analysis)"""
+        
+        pipeline_mode = self._resolve_pipeline_mode(pipeline_mode)
         
         # Get existing analysis
         existing_analysis = db.query(DocumentAnalysis).filter(
@@ -365,23 +1164,49 @@ class AnalysisService:
         if not job_doc.content_text:
             raise ValueError("Job document text content not available")
         
+        if admit:
+            admit()
+        tier = self._resolve_tier(user, tier)
+        if self._should_supersede(supersede):
+            self._supersede(db, user, match=True, keep_id=existing_analysis.id)
+        # A run still going on this analysis would overwrite the new one
+        running = self._tasks.get(existing_analysis.id)
+        if running and not running.done():
+            running.cancel()
+        
         # Update the existing analysis with job document
         existing_analysis.job_document_id = job_document_id
         existing_analysis.status = "pending"
+        existing_analysis.analysis_tier = tier
+        # Resume analysis plus a job: no longer the result of a single memoizable run
+        existing_analysis.input_fingerprint = None
         existing_analysis.progress_step = "initializing"
         existing_analysis.progress_message = "Starting job analysis..."
         db.commit()
         
         # Start async job analysis
-        asyncio.create_task(self._perform_job_analysis(
-            analysis_id=existing_analysis.id,
-            resume_analysis=existing_analysis.resume_analysis,
-            job_text=job_doc.content_text
-        ))
+        if tier == "lite":
+            resume_doc = db.query(Document).filter(Document.id == existing_analysis.resume_document_id).first()
+            factory = partial(
+                self._perform_lite_analysis,
+                existing_analysis.id,
+                resume_doc.content_text if resume_doc and resume_doc.content_text else "",
+                job_doc.content_text,
+                resume_analysis=existing_analysis.resume_analysis
+            )
+        else:
+            factory = partial(
+                self._perform_job_analysis,
+                analysis_id=existing_analysis.id,
+                resume_analysis=existing_analysis.resume_analysis,
+                job_text=job_doc.content_text,
+                pipeline_mode=pipeline_mode
+            )
+        self._launch(existing_analysis.id, user.id, factory)
         
         return existing_analysis
     
-    async def _perform_job_analysis(self, analysis_id: int, resume_analysis: dict, job_text: str):
+    async def _perform_job_analysis(self, analysis_id: int, resume_analysis: dict, job_text: str, pipeline_mode: str = "multi_call"):
         """Perform job analysis and matching with existing resume data"""
         
         # Get a new database session for the background task
@@ -398,41 +1223,60 @@ class AnalysisService:
             analysis.progress_step = "analyzing_job"
             analysis.progress_message = "Analyzing the job description to understand requirements..."
             db.commit()
+            plan = self._step_plan(pipeline_mode, skip=("resume_analysis",))
             
             # Analyze job description
             logger.info(f"Analyzing job description for analysis {analysis_id}")
-            job_analysis = await llm_service.analyze_job_description(job_text)
+            async with plan.step("job_analysis"):
+                job_analysis = await speculative_analysis_service.get_job_analysis(
+                    db, analysis.job_document_id, job_text
+                )
             
             analysis.job_analysis = job_analysis
             db.commit()
             
             await asyncio.sleep(0.3)
             
+            # Resume text for evidence extraction and local skill matching
+            resume_doc = db.query(Document).filter(
+                Document.id == analysis.resume_document_id
+            ).first()
+            resume_text = resume_doc.content_text if resume_doc and resume_doc.content_text else ""
+            
+            self._raise_if_cancelled(db, analysis)
+            if pipeline_mode == "fused":
+                async with plan.step("match"):
+                    await self._run_fused_match(db, analysis, resume_analysis, resume_text, job_analysis, job_text)
+                self._raise_if_cancelled(db, analysis)
+                self._complete_job_analysis(db, analysis)
+                return
+            
             # Find connections using existing resume analysis
             logger.info(f"Finding connections for analysis {analysis_id}")
             analysis.progress_step = "finding_connections"
             analysis.progress_message = "Identifying connections between your background and the job..."
             db.commit()
             
-            connections = await llm_service.find_connections(resume_analysis, job_analysis)
+            skill_candidates = self._local_skill_candidates(resume_text, job_text)
+            async with plan.step("find_connections"):
+                connections = await llm_service.find_connections(
+                    resume_analysis, job_analysis, skill_candidates=skill_candidates
+                )
             
             await asyncio.sleep(0.3)
             
             # Extract detailed evidence
+            self._raise_if_cancelled(db, analysis)
             logger.info(f"Extracting detailed evidence for analysis {analysis_id}")
             analysis.progress_step = "extracting_evidence"
             analysis.progress_message = "Finding specific evidence from your experience..."
             db.commit()
             
-            # Get resume text for evidence extraction
-            resume_doc = db.query(Document).filter(
-                Document.id == analysis.resume_document_id
-            ).first()
-            
-            if resume_doc and resume_doc.content_text:
-                detailed_evidence = await llm_service.extract_detailed_evidence(
-                    resume_doc.content_text, job_text
-                )
+            if resume_text:
+                async with plan.step("extract_evidence"):
+                    detailed_evidence = await llm_service.extract_detailed_evidence(
+                        resume_text, job_text, skill_candidates=skill_candidates
+                    )
                 
                 if detailed_evidence and "skill_alignment" in detailed_evidence:
                     connections["skill_alignment"] = detailed_evidence["skill_alignment"]
@@ -443,14 +1287,16 @@ class AnalysisService:
             await asyncio.sleep(0.3)
             
             # Generate summary
+            self._raise_if_cancelled(db, analysis)
             logger.info(f"Generating summary for analysis {analysis_id}")
             analysis.progress_step = "generating_summary"
             analysis.progress_message = "Creating your personalized insights..."
             db.commit()
             
-            summary_result = await llm_service.generate_context_summary(
-                resume_analysis, job_analysis, connections
-            )
+            async with plan.step("generate_summary"):
+                summary_result = await llm_service.generate_context_summary(
+                    resume_analysis, job_analysis, connections
+                )
             
             if "context_summary" in summary_result:
                 analysis.context_summary = summary_result["context_summary"]
@@ -461,16 +1307,100 @@ class AnalysisService:
             if "gaps" in summary_result:
                 analysis.gaps = summary_result["gaps"]
             
-            analysis.status = "completed"
-            analysis.completed_at = datetime.utcnow()
-            analysis.progress_step = "completed"
-            analysis.progress_message = "Analysis complete!"
+            self._raise_if_cancelled(db, analysis)
+            self._complete_job_analysis(db, analysis)
+            
+        except AnalysisCancelled:
+            logger.info(f"Job analysis {analysis_id} stopped after cancellation")
+        except asyncio.CancelledError:
+            self._handle_task_cancelled(db, analysis_id)
+            raise
+        except StepTimeout as e:
+            await self._fall_back_after_timeout(db, analysis_id, e, self._complete_job_analysis)
+        except Exception as e:
+            logger.error(f"Job analysis {analysis_id} failed: {str(e)}", exc_info=True)
+            analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
+            if analysis:
+                analysis.status = "failed"
+                analysis.error_message = str(e)
+                analysis.progress_step = "failed"
+                analysis.progress_message = f"Analysis failed: {str(e)}"
+                db.commit()
+        
+        finally:
+            db.close()
+
+    async def _perform_lite_analysis(self, analysis_id: int, resume_text: str, job_text: str, resume_analysis: Optional[dict] = None):
+        """Lite tier: compact resume and job analyses in parallel, then local matching and a templated summary
+        
+        ``resume_analysis`` is the stored one when only a job was added to an
+        existing analysis (Experience stage).
+        """
+        
+        # Get a new database session for the background task
+        from database.connection import get_db
+        db = next(get_db())
+        
+        try:
+            analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
+            if not analysis:
+                return
+            
+            analysis.status = "processing"
+            analysis.progress_step = "analyzing_documents"
+            analysis.progress_message = "Preparing a quick analysis of your documents..."
             db.commit()
             
-            logger.info(f"Job analysis {analysis_id} completed successfully")
+            # A finished full job analysis costs nothing to reuse
+            job_analysis = speculative_analysis_service.completed_job_analysis(db, analysis.job_document_id)
+            pending = {}
+            if resume_analysis is None:
+                pending["resume_analysis"] = llm_service.analyze_resume_lite(resume_text)
+            if job_analysis is None:
+                pending["job_analysis"] = llm_service.analyze_job_description_lite(job_text)
+            async with StepPlan({"lite_analysis": 1}).step("lite_analysis"):
+                results = dict(zip(pending, await asyncio.gather(*pending.values())))
+            for field, result in results.items():
+                if "error" in result:
+                    raise ValueError(f"{field.replace('_', ' ').capitalize()} failed: {result['error']}")
+                setattr(analysis, field, result)
+            db.commit()
+            resume_analysis = results.get("resume_analysis", resume_analysis)
+            job_analysis = results.get("job_analysis", job_analysis)
+            
+            self._raise_if_cancelled(db, analysis)
+            analysis.progress_step = "matching"
+            analysis.progress_message = "Matching your skills to the role..."
+            db.commit()
             
+            fields = lite_match_fields(
+                resume_analysis, resume_text, job_analysis, job_text,
+                prompt_version=llm_service.prompt_version,
+                upgrade_pending=settings.analysis_lite_auto_upgrade
+            )
+            for field, value in fields.items():
+                setattr(analysis, field, value)
+            
+            self._raise_if_cancelled(db, analysis)
+            if "resume_analysis" in results:
+                # Context stage (resume and job), as in _perform_analysis
+                completed = self._complete_full_analysis(db, analysis)
+            else:
+                completed = self._complete_job_analysis(db, analysis)
+            if completed and settings.analysis_lite_auto_upgrade:
+                self._schedule_upgrade(analysis.id, analysis.user_id)
+            
+        except AnalysisCancelled:
+            logger.info(f"Lite analysis {analysis_id} stopped after cancellation")
+        except asyncio.CancelledError:
+            self._handle_task_cancelled(db, analysis_id)
+            raise
+        except StepTimeout as e:
+            # Lite is already the fallback
+            metrics.record_analysis_step_timeout(e.step, "failed")
+            self._fail_timed_out(db, analysis_id, e)
         except Exception as e:
-            logger.error(f"Job analysis {analysis_id} failed: {str(e)}", exc_info=True)
+            logger.error(f"Lite analysis {analysis_id} failed: {str(e)}", exc_info=True)
             analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
             if analysis:
                 analysis.status = "failed"
@@ -481,6 +1411,87 @@ class AnalysisService:
         
         finally:
             db.close()
+    
+    def _schedule_upgrade(self, analysis_id: int, user_id: int) -> None:
+        # Scheduled from inside the lite run: the upgrade gets its own full deadline, not what is left of that one
+        task = create_detached_task(self._upgrade_lite_analysis(analysis_id, user_id))
+        self._upgrades.add(task)
+        task.add_done_callback(self._upgrades.discard)
+    
+    async def _upgrade_lite_analysis(self, analysis_id: int, user_id: int) -> None:
+        """Replace a lite analysis with the full one once the service is no longer overloaded"""
+        while analysis_scheduler.overloaded():
+            await asyncio.sleep(settings.analysis_lite_upgrade_poll_seconds)
+        await analysis_scheduler.run(
+            user_id, partial(self._run_with_deadline, partial(self._run_upgrade, analysis_id)), priority=JobPriority.BACKGROUND
+        )
+    
+    async def _run_upgrade(self, analysis_id: int) -> None:
+        # Get a new database session for the background task
+        from database.connection import get_db
+        db = next(get_db())
+        
+        try:
+            analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
+            if not analysis or analysis.analysis_tier != "lite" or analysis.status != "completed":
+                return
+            job_document_id = analysis.job_document_id
+            resume_doc = db.query(Document).filter(Document.id == analysis.resume_document_id).first()
+            job_doc = db.query(Document).filter(Document.id == job_document_id).first()
+            if not resume_doc or not job_doc or not resume_doc.content_text or not job_doc.content_text:
+                raise ValueError("Document text content not available")
+            
+            logger.info(f"Upgrading lite analysis {analysis_id} to the full analysis")
+            started = time.perf_counter()
+            resume_analysis = analysis.resume_analysis
+            plan = StepPlan({"analyses": 1, "match": 1})
+            async with plan.step("analyses"):
+                if is_lite(resume_analysis):
+                    resume_analysis = await resume_section_service.analyze_resume(db, analysis.user_id, resume_doc.content_text)
+                job_analysis = await speculative_analysis_service.get_job_analysis(db, job_document_id, job_doc.content_text)
+            for name, result in (("Resume", resume_analysis), ("Job", job_analysis)):
+                if "error" in result:
+                    raise ValueError(f"{name} analysis failed: {result['error']}")
+            async with plan.step("match"):
+                fields = await self.compute_match(resume_analysis, resume_doc.content_text, job_analysis, job_doc.content_text)
+            
+            # The analysis may have been re-run (or given another job) meanwhile
+            db.refresh(analysis)
+            if analysis.analysis_tier != "lite" or analysis.status != "completed" or analysis.job_document_id != job_document_id:
+                logger.info(f"Discarding upgrade of analysis {analysis_id}: it changed while upgrading")
+                return
+            
+            analysis.resume_analysis = resume_analysis
+            analysis.job_analysis = job_analysis
+            for field, value in fields.items():
+                setattr(analysis, field, value)
+            analysis.analysis_tier = "full"
+            db.commit()
+            logger.info(f"Upgraded lite analysis {analysis_id} in {time.perf_counter() - started:.2f}s")
+            
+            ranking_index.index_analysis(db, analysis)
+            ipp_stage_service.schedule_pregeneration(db, analysis)
+        except Exception as e:
+            # The lite results stay in place; the prompt backfill retries lite analyses too
+            logger.warning(f"Upgrade of lite analysis {analysis_id} failed: {str(e)}")
+        finally:
+            db.close()
+    
+    def _complete_job_analysis(self, db: Session, analysis: DocumentAnalysis) -> bool:
+        """Mark a job analysis completed; False when it was failed or cancelled meanwhile"""
+        if not self._still_active(db, analysis):
+            return False
+        analysis.status = "completed"
+        analysis.completed_at = datetime.utcnow()
+        analysis.progress_step = "completed"
+        analysis.progress_message = "Analysis complete!"
+        db.commit()
+        
+        logger.info(f"Job analysis {analysis.id} completed successfully")
+        ranking_index.index_analysis(db, analysis)
+        if analysis.analysis_tier != "lite":
+            ipp_stage_service.schedule_pregeneration(db, analysis)
+        return True
 
 # Global instance
 analysis_service = AnalysisService()
\ No newline at end of file
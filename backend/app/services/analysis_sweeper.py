@@ -0,0 +1,102 @@
+"""
+Analysis sweeper
+================
+
+Pipelines enforce their own deadline (see ``app.core.deadline``), but a
+worker that dies or a task wedged outside a step leaves its analysis
+``pending`` or ``processing`` for good, with the frontend polling it forever.
+Every ``ANALYSIS_SWEEP_INTERVAL_SECONDS`` the sweeper fails active analyses
+that are past their ``deadline_at``, and ones that have not moved for longer
+than any run could take (the admission wait plus the deadline). Runs made
+through offline batches (``execution`` ``batch``) are left alone.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.tasks import create_detached_task
+from app.models.analysis import DocumentAnalysis
+from app.services.analysis_service import ACTIVE_STATUSES, analysis_service
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Left to the pipeline's own deadline handling before the sweeper steps in
+GRACE = timedelta(seconds=30)
+
+
+class AnalysisSweeper:
+    """Periodically fails analyses stuck past their deadline"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def sweep(self, db: Session) -> int:
+        """Fail stuck analyses; returns how many"""
+        deadline = settings.analysis_deadline_seconds
+        if deadline <= 0:
+            return 0
+        now = datetime.utcnow()
+        idle_limit = timedelta(seconds=deadline + settings.analysis_admission_max_wait_seconds) + GRACE
+
+        stuck = db.query(DocumentAnalysis).filter(
+            DocumentAnalysis.status.in_(ACTIVE_STATUSES),
+            or_(
+                and_(DocumentAnalysis.status == "processing", DocumentAnalysis.deadline_at < now - GRACE),
+                # Queued runs (deadline_at is set when they start) and runs from before deadlines;
+                # offline batch runs have no deadline and may sit with the provider for hours
+                and_(DocumentAnalysis.updated_at < now - idle_limit,
+                     or_(DocumentAnalysis.execution.is_(None), DocumentAnalysis.execution != "batch"))
+            )
+        ).all()
+        for analysis in stuck:
+            logger.warning(f"Failing analysis {analysis.id} stuck in {analysis.status} "
+                           f"({analysis.progress_step}) past its deadline")
+            analysis.status = "failed"
+            analysis.error_message = "Analysis did not finish before its deadline"
+            analysis.progress_step = "failed"
+            analysis.progress_message = "Analysis is taking too long right now. Please try again."
+            metrics.record_analysis_step_timeout("pipeline", "swept")
+        db.commit()
+
+        for analysis in stuck:
+            # A wedged task in this process stops holding its scheduler slot
+            task = analysis_service._tasks.get(analysis.id)
+            if task and not task.done():
+                task.cancel()
+        return len(stuck)
+
+    def start(self) -> None:
+        """Start sweeping in the background (no-op when disabled or already running)"""
+        if settings.analysis_sweep_interval_seconds <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = create_detached_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        from database.connection import get_db
+        while True:
+            await asyncio.sleep(settings.analysis_sweep_interval_seconds)
+            db = next(get_db())
+            try:
+                self.sweep(db)
+            except Exception as e:
+                logger.warning(f"Analysis sweep failed: {str(e)}")
+                db.rollback()
+            finally:
+                db.close()
+
+# Global instance
+analysis_sweeper = AnalysisSweeper()
@@ -0,0 +1,423 @@
+import asyncio
+import csv
+import hashlib
+import re
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+import logging
+
+from app.models.analysis import DocumentAnalysis
+from app.models.cohort import CohortImport, CohortImportStep
+from app.models.document import Document, DocumentType
+from app.models.user import User
+from app.services.analysis_service import analysis_service
+from app.services.document_service import document_service
+from app.services.llm_batch import batch_execution
+from app.services.speculative_analysis_service import speculative_analysis_service
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+# Steps that need no more work on a re-run
+DONE = ("completed", "duplicate")
+
+COHORT_IMPORT_EXECUTIONS = ("realtime", "batch")
+
+
+@dataclass
+class SourceFile:
+    name: str  # path relative to the import source, or the zip member name
+    path: str  # local copy to read
+    file_hash: str
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Content hash that ignores spacing and case, so a PDF and a DOCX of one resume match"""
+    return hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+
+
+def extract_file(path: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Process-pool worker: (mime type, text, error)"""
+    try:
+        mime_type = document_service.get_mime_type(path)
+        return mime_type, document_service.extract_text_content(path, mime_type), None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def load_roster(path: Optional[str]) -> Dict[str, Tuple[str, str]]:
+    """``file,email,name`` CSV keyed by lowercase file name and by stem"""
+    if not path:
+        return {}
+    roster = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            file_name = (row.get("file") or "").strip()
+            email = (row.get("email") or "").strip()
+            if not file_name or not email:
+                continue
+            entry = (email, (row.get("name") or "").strip())
+            roster[Path(file_name).name.lower()] = entry
+            roster[Path(file_name).stem.lower()] = entry
+    return roster
+
+
+class CohortImportService:
+    """Bulk onboarding: every resume in a directory or zip against one or more postings
+
+    Text is extracted in a process pool and resumes are deduplicated by a hash
+    of their text. Each unit of work (file, document, job analysis, student
+    copy of a posting, analysis) is a row in the ``cohort_import_steps``
+    ledger keyed by content hashes and committed as soon as it finishes, so
+    running the same import again after an interruption skips finished work
+    and only re-runs what was pending or failed. Analyses run with bounded
+    concurrency; their provider calls go through the LLM rate limiter, or
+    with ``execution="batch"`` through offline batches that leave the
+    real-time rate limit to interactive users.
+    """
+
+    async def run(
+        self,
+        db: Session,
+        name: str,
+        instructor_email: str,
+        source: str,
+        job_paths: List[str],
+        roster_path: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        pipeline_mode: Optional[str] = None,
+        extract_workers: Optional[int] = None,
+        execution: Optional[str] = None
+    ) -> Dict[str, Any]:
+        execution = execution or settings.cohort_import_execution
+        if execution not in COHORT_IMPORT_EXECUTIONS:
+            raise ValueError(f"Unknown cohort import execution: {execution}")
+        with batch_execution(execution == "batch"):
+            return await self._run(db, name, instructor_email, source, job_paths, roster_path,
+                                   concurrency, pipeline_mode, extract_workers)
+
+    async def _run(
+        self,
+        db: Session,
+        name: str,
+        instructor_email: str,
+        source: str,
+        job_paths: List[str],
+        roster_path: Optional[str],
+        concurrency: Optional[int],
+        pipeline_mode: Optional[str],
+        extract_workers: Optional[int]
+    ) -> Dict[str, Any]:
+        if not job_paths:
+            raise ValueError("At least one job posting is required")
+        instructor = self._find_user(db, instructor_email)
+        if not instructor or instructor.email.lower() not in settings.instructor_emails_list:
+            raise ValueError(f"{instructor_email} is not a registered instructor (see INSTRUCTOR_EMAILS)")
+
+        cohort = db.query(CohortImport).filter(CohortImport.name == name).first()
+        if cohort and cohort.instructor_user_id != instructor.id:
+            raise ValueError(f"Import {name} belongs to another instructor")
+        if not cohort:
+            cohort = CohortImport(name=name, instructor_user_id=instructor.id, source=str(source))
+            db.add(cohort)
+            db.commit()
+            db.refresh(cohort)
+        else:
+            logger.info(f"Resuming cohort import {name}")
+            cohort.status = "running"
+            db.commit()
+
+        roster = load_roster(roster_path)
+        workers = extract_workers or settings.cohort_import_extract_workers or None
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = await self._ingest(db, cohort, pool, self._job_files(job_paths), DocumentType.JOB_DESCRIPTION.value,
+                                      lambda source_file, text: instructor)
+            with self._source_files(source) as resume_files:
+                resumes = await self._ingest(db, cohort, pool, resume_files, DocumentType.RESUME.value,
+                                             lambda source_file, text: self._resolve_student(db, source_file, text, roster))
+
+        ready_jobs = []
+        for job_step in jobs:
+            if await self._ensure_job_analysis(db, cohort, job_step):
+                ready_jobs.append(job_step)
+
+        semaphore = asyncio.Semaphore(concurrency or settings.cohort_import_concurrency)
+        pairs = [(resume_step, job_step) for resume_step in resumes for job_step in ready_jobs]
+        logger.info(f"Cohort import {name}: {len(resumes)} resumes x {len(ready_jobs)} postings = {len(pairs)} analyses")
+        await asyncio.gather(*(
+            self._analyze_pair(db, cohort, resume_step, job_step, semaphore, pipeline_mode)
+            for resume_step, job_step in pairs
+        ))
+
+        summary = self.summary(db, cohort)
+        cohort.status = "completed_with_errors" if summary["failed"] else "completed"
+        cohort.completed_at = datetime.utcnow()
+        db.commit()
+        summary["status"] = cohort.status
+        return summary
+
+    def summary(self, db: Session, cohort: CohortImport) -> Dict[str, Any]:
+        """Step counts by kind and status, plus the failures"""
+        counts: Dict[str, Dict[str, int]] = {}
+        failed = []
+        for step in db.query(CohortImportStep).filter(CohortImportStep.import_id == cohort.id):
+            kind = step.step_key.split(":", 1)[0]
+            counts.setdefault(kind, {})
+            counts[kind][step.status] = counts[kind].get(step.status, 0) + 1
+            if step.status == "failed":
+                failed.append({"step": step.step_key, "source": (step.detail or {}).get("source"), "error": step.error_message})
+        return {"import_id": cohort.id, "name": cohort.name, "steps": counts, "failed": failed}
+
+    async def _ingest(self, db: Session, cohort: CohortImport, pool: ProcessPoolExecutor, files: List[SourceFile],
+                      document_type: str, owner_for) -> List[CohortImportStep]:
+        """Store new files as documents; returns the document steps of this kind (including earlier runs)"""
+        kind = "job" if document_type == DocumentType.JOB_DESCRIPTION.value else "resume"
+        pending = [source_file for source_file in files
+                   if self._step(db, cohort, f"file:{source_file.file_hash}").status not in DONE]
+
+        loop = asyncio.get_running_loop()
+        extracted = await asyncio.gather(*(loop.run_in_executor(pool, extract_file, source_file.path) for source_file in pending))
+        logger.info(f"Extracted text from {len(pending)} {kind} files ({len(files) - len(pending)} already imported)")
+
+        for source_file, (mime_type, text, error) in zip(pending, extracted):
+            file_step = self._step(db, cohort, f"file:{source_file.file_hash}")
+            file_step.detail = {"source": source_file.name}
+            if error or not text or not text.strip():
+                self._fail(db, file_step, error or "No text could be extracted")
+                continue
+
+            text_hash = hash_text(text)
+            document_step = self._find_step(db, cohort, f"{kind}:{text_hash}")
+            if document_step and document_step.status == "completed":
+                file_step.status = "duplicate"
+                file_step.document_id = document_step.document_id
+                file_step.detail = {"source": source_file.name, "duplicate_of": (document_step.detail or {}).get("source")}
+                db.commit()
+                continue
+
+            try:
+                owner = owner_for(source_file, text)
+                document = document_service.store_local_file(
+                    db, owner, source_file.path, document_type,
+                    original_filename=Path(source_file.name).name,
+                    content_text=text,
+                    mime_type=mime_type,
+                    schedule_job_analysis=False
+                )
+            except Exception as e:
+                db.rollback()
+                self._fail(db, file_step, str(e))
+                continue
+
+            document_step = self._step(db, cohort, f"{kind}:{text_hash}")
+            for step in (document_step, file_step):
+                step.status = "completed"
+                step.user_id = owner.id
+                step.document_id = document.id
+            document_step.detail = {"source": source_file.name}
+            file_step.detail = {"source": source_file.name, "text_hash": text_hash}
+            db.commit()
+
+        return db.query(CohortImportStep).filter(
+            CohortImportStep.import_id == cohort.id,
+            CohortImportStep.step_key.like(f"{kind}:%"),
+            CohortImportStep.status == "completed"
+        ).order_by(CohortImportStep.id).all()
+
+    async def _ensure_job_analysis(self, db: Session, cohort: CohortImport, job_step: CohortImportStep) -> bool:
+        """Analyze each posting once; student copies reuse the stored result"""
+        text_hash = job_step.step_key.split(":", 1)[1]
+        step = self._step(db, cohort, f"job_analysis:{text_hash}")
+        if speculative_analysis_service.completed_job_analysis(db, job_step.document_id) is not None:
+            if step.status != "completed":
+                step.status = "completed"
+                db.commit()
+            return True
+
+        document = db.query(Document).filter(Document.id == job_step.document_id).first()
+        job_analysis = await speculative_analysis_service.get_job_analysis(db, document.id, document.content_text)
+        if not isinstance(job_analysis, dict) or "error" in job_analysis:
+            self._fail(db, step, (job_analysis or {}).get("details") or "Job analysis failed")
+            return False
+
+        speculative_analysis_service.store_job_analysis(db, document.id, job_analysis)
+        step.status = "completed"
+        step.document_id = document.id
+        db.commit()
+        return True
+
+    async def _analyze_pair(self, db: Session, cohort: CohortImport, resume_step: CohortImportStep,
+                            job_step: CohortImportStep, semaphore: asyncio.Semaphore, pipeline_mode: Optional[str]) -> None:
+        resume_hash = resume_step.step_key.split(":", 1)[1]
+        job_hash = job_step.step_key.split(":", 1)[1]
+        step = self._step(db, cohort, f"analysis:{resume_hash}:{job_hash}")
+        if step.status == "completed":
+            return
+
+        async with semaphore:
+            try:
+                student = db.query(User).filter(User.id == resume_step.user_id).first()
+                job_copy_id = self._student_job_copy(db, cohort, job_step, student)
+
+                analysis = None
+                if step.analysis_id:
+                    analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == step.analysis_id).first()
+                if analysis is None:
+                    analysis = analysis_service.create_document_analysis(db, student, resume_step.document_id, job_copy_id)
+                if analysis.status != "completed":
+                    # Recorded before running, so an interrupted analysis is re-run rather than duplicated
+                    step.status = "running"
+                    step.user_id = student.id
+                    step.analysis_id = analysis.id
+                    step.detail = {"source": (resume_step.detail or {}).get("source")}
+                    db.commit()
+                    analysis = await analysis_service.run_analysis(db, analysis, pipeline_mode)
+
+                if analysis.status == "completed":
+                    step.status = "completed"
+                    step.analysis_id = analysis.id
+                    step.error_message = None
+                    db.commit()
+                else:
+                    self._fail(db, step, analysis.error_message or f"Analysis ended as {analysis.status}")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Cohort analysis {step.step_key} failed: {str(e)}")
+                self._fail(db, step, str(e))
+
+    def _student_job_copy(self, db: Session, cohort: CohortImport, job_step: CohortImportStep, student: User) -> int:
+        """The student's own copy of a posting (analyses need both documents owned by the student)"""
+        job_hash = job_step.step_key.split(":", 1)[1]
+        step = self._step(db, cohort, f"copy:{job_hash}:{student.id}")
+        if step.status == "completed":
+            return step.document_id
+
+        source = db.query(Document).filter(Document.id == job_step.document_id).first()
+        document = document_service.store_local_file(
+            db, student, source.file_path, DocumentType.JOB_DESCRIPTION.value,
+            original_filename=source.original_filename,
+            content_text=source.content_text,
+            mime_type=source.mime_type,
+            schedule_job_analysis=False
+        )
+        job_analysis = speculative_analysis_service.completed_job_analysis(db, source.id)
+        if job_analysis is not None:
+            speculative_analysis_service.store_job_analysis(db, document.id, job_analysis)
+
+        step.status = "completed"
+        step.user_id = student.id
+        step.document_id = document.id
+        db.commit()
+        return document.id
+
+    def _resolve_student(self, db: Session, source_file: SourceFile, text: str, roster: Dict[str, Tuple[str, str]]) -> User:
+        """Student for a resume: roster entry, then an email as the file name, then the first email in the text"""
+        file_name = Path(source_file.name).name.lower()
+        email, name = roster.get(file_name) or roster.get(Path(file_name).stem) or (None, "")
+        if not email and EMAIL_PATTERN.fullmatch(Path(source_file.name).stem):
+            email = Path(source_file.name).stem
+        if not email:
+            match = EMAIL_PATTERN.search(text)
+            email = match.group(0) if match else None
+        if not email:
+            raise ValueError("No student email found; add the file to the roster")
+
+        user = self._find_user(db, email)
+        if user:
+            return user
+
+        first_line = next((line.strip() for line in text.splitlines() if line.strip()), "")
+        user = User(
+            # Linked to the Google account by email on the student's first login
+            google_id=f"pending:{email.lower()}",
+            email=email.lower(),
+            name=name or (first_line.title() if 0 < len(first_line) <= 80 else email.split("@")[0])
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+
+    def _find_user(self, db: Session, email: str) -> Optional[User]:
+        return db.query(User).filter(func.lower(User.email) == email.strip().lower()).first()
+
+    def _find_step(self, db: Session, cohort: CohortImport, step_key: str) -> Optional[CohortImportStep]:
+        return db.query(CohortImportStep).filter(
+            CohortImportStep.import_id == cohort.id,
+            CohortImportStep.step_key == step_key
+        ).first()
+
+    def _step(self, db: Session, cohort: CohortImport, step_key: str) -> CohortImportStep:
+        step = self._find_step(db, cohort, step_key)
+        if not step:
+            step = CohortImportStep(import_id=cohort.id, step_key=step_key, status="pending")
+            db.add(step)
+            db.commit()
+        return step
+
+    def _fail(self, db: Session, step: CohortImportStep, error: str) -> None:
+        step.status = "failed"
+        step.error_message = error
+        db.commit()
+
+    def _job_files(self, job_paths: List[str]) -> List[SourceFile]:
+        files = []
+        for path in job_paths:
+            if not Path(path).is_file():
+                raise ValueError(f"Job posting not found: {path}")
+            files.append(SourceFile(name=Path(path).name, path=str(path), file_hash=hash_file(path)))
+        return files
+
+    @contextmanager
+    def _source_files(self, source: str) -> Iterator[List[SourceFile]]:
+        """Resume files in a directory (recursively) or a zip archive, extracted to a temporary directory"""
+        source_path = Path(source)
+        allowed = document_service.allowed_extensions
+        if source_path.is_dir():
+            yield [
+                SourceFile(name=str(path.relative_to(source_path)), path=str(path), file_hash=hash_file(str(path)))
+                for path in sorted(source_path.rglob("*"))
+                if path.is_file() and path.suffix.lower() in allowed and not path.name.startswith(".")
+            ]
+            return
+
+        if not zipfile.is_zipfile(source_path):
+            raise ValueError(f"{source} is neither a directory nor a zip archive")
+
+        with tempfile.TemporaryDirectory(prefix="cohort-import-") as directory, zipfile.ZipFile(source_path) as archive:
+            files = []
+            for position, info in enumerate(archive.infolist()):
+                member = Path(info.filename)
+                if info.is_dir() or member.suffix.lower() not in allowed or member.name.startswith(".") or "__MACOSX" in member.parts:
+                    continue
+                if info.file_size > document_service.max_file_size:
+                    logger.warning(f"Skipping {info.filename}: larger than {document_service.max_file_size} bytes")
+                    continue
+                # Members are written under generated names, so paths in the archive cannot escape the directory
+                target = Path(directory) / f"{position}{member.suffix.lower()}"
+                with archive.open(info) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                files.append(SourceFile(name=info.filename, path=str(target), file_hash=hash_file(str(target))))
+            yield files
+
+# Global instance
+cohort_import_service = CohortImportService()
@@ -1,4 +1,5 @@
 import os
+import shutil
 import uuid
 from pathlib import Path
 from typing import BinaryIO, Optional
@@ -8,11 +9,16 @@ import magic
 import PyPDF2
 import docx
 from io import BytesIO
+import logging
 
 from app.models.document import Document, DocumentType
 from app.models.user import User
+from app.services.near_duplicate_service import near_duplicate_service
+from app.services.speculative_analysis_service import speculative_analysis_service
 from config.settings import settings
 
+logger = logging.getLogger(__name__)
+
 class DocumentService:
     def __init__(self):
         self.upload_dir = Path("uploads")
@@ -134,12 +140,61 @@ class DocumentService:
         # Extract text content
         content_text = self.extract_text_content(file_path, mime_type)
         
+        return self._create_document(db, user, document_type, file_path, file.filename, file_size, mime_type, content_text)
+
+    def store_local_file(
+        self,
+        db: Session,
+        user: User,
+        source_path: str,
+        document_type: str,
+        original_filename: Optional[str] = None,
+        content_text: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        schedule_job_analysis: bool = True
+    ) -> Document:
+        """Store a file from local disk (bulk imports); already extracted text can be passed in"""
+        source = Path(source_path)
+        original_filename = original_filename or source.name
+        
+        file_ext = Path(original_filename).suffix.lower()
+        if file_ext not in self.allowed_extensions:
+            raise ValueError(f"File type not allowed. Allowed types: {', '.join(self.allowed_extensions)}")
+        
+        file_size = source.stat().st_size
+        if file_size > self.max_file_size:
+            raise ValueError(f"File size too large. Maximum size is {self.max_file_size // (1024*1024)}MB")
+        
+        file_path = str(self.upload_dir / self.generate_filename(original_filename))
+        shutil.copyfile(source, file_path)
+        
+        mime_type = mime_type or self.get_mime_type(file_path)
+        if content_text is None:
+            content_text = self.extract_text_content(file_path, mime_type)
+        
+        return self._create_document(
+            db, user, document_type, file_path, original_filename, file_size, mime_type, content_text,
+            schedule_job_analysis=schedule_job_analysis
+        )
+
+    def _create_document(
+        self,
+        db: Session,
+        user: User,
+        document_type: str,
+        file_path: str,
+        original_filename: str,
+        file_size: int,
+        mime_type: str,
+        content_text: Optional[str],
+        schedule_job_analysis: bool = True
+    ) -> Document:
         # Create database record
         document = Document(
             user_id=user.id,
             document_type=document_type,
             filename=Path(file_path).name,
-            original_filename=file.filename,
+            original_filename=original_filename,
             file_path=file_path,
             content_text=content_text,
             file_size=file_size,
@@ -150,6 +205,15 @@ class DocumentService:
         db.commit()
         db.refresh(document)
         
+        if document_type == DocumentType.JOB_DESCRIPTION.value:
+            try:
+                near_duplicate_service.index_document(db, document)
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Could not index job description {document.id} for near-duplicate lookup: {str(e)}")
+            if schedule_job_analysis:
+                speculative_analysis_service.schedule_job_analysis(db, document)
+        
         return document
 
     def get_user_documents(self, db: Session, user: User) -> list[Document]:
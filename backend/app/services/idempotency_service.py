@@ -0,0 +1,142 @@
+"""
+Idempotency keys
+================
+
+Clients may send an ``Idempotency-Key`` header with POST requests that start
+expensive work (analysis starts, uploads). The first request with a key claims
+it in ``idempotency_keys`` and stores its response body when it succeeds; a
+repeat of the same request (a double-click, or a retry after a timeout)
+returns that stored response instead of creating another row and pipeline.
+
+Keys are scoped to the user, live for ``IDEMPOTENCY_KEY_TTL_HOURS``, and must
+not be reused for a different request. A request that fails releases its key
+so the client can retry it.
+"""
+
+import hashlib
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.idempotency import IdempotencyKey
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 255
+
+# A claim this old without a response belongs to a request that died; let a retry take over
+ABANDONED_AFTER = timedelta(minutes=5)
+
+
+class IdempotencyKeyMismatch(ValueError):
+    """The key was already used for a different request"""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """The first request with this key has not finished yet"""
+
+
+def fingerprint(*parts: Any) -> str:
+    """Hash of a request's payload (str or bytes parts)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IdempotencyService:
+    """Claims, replays and releases Idempotency-Key records"""
+
+    def claim(self, db: Session, user_id: int, key: Optional[str], endpoint: str, request_hash: str) -> Optional[IdempotencyKey]:
+        """Claim ``key`` for this request; None without a key
+
+        A returned record with a ``response`` is a completed earlier request to
+        replay. Raises IdempotencyKeyMismatch or IdempotencyKeyInProgress.
+        """
+        if not key:
+            return None
+        if len(key) > MAX_KEY_LENGTH:
+            raise IdempotencyKeyMismatch(f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters")
+
+        now = datetime.utcnow()
+        # Expired keys are dropped lazily, one user at a time
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.expires_at <= now
+        ).delete(synchronize_session="fetch")
+        db.commit()
+
+        record = self._get(db, user_id, key)
+        if record is None:
+            record = IdempotencyKey(
+                user_id=user_id,
+                idempotency_key=key,
+                endpoint=endpoint,
+                request_hash=request_hash,
+                expires_at=now + timedelta(hours=settings.idempotency_key_ttl_hours)
+            )
+            db.add(record)
+            try:
+                db.commit()
+                return record
+            except IntegrityError:
+                # A concurrent request with the same key won the claim
+                db.rollback()
+                record = self._get(db, user_id, key)
+                if record is None:
+                    raise IdempotencyKeyInProgress("A request with this Idempotency-Key is already in progress")
+
+        if record.endpoint != endpoint or record.request_hash != request_hash:
+            raise IdempotencyKeyMismatch("Idempotency-Key was already used for a different request")
+        if record.response is None:
+            if record.created_at and now - record.created_at < ABANDONED_AFTER:
+                raise IdempotencyKeyInProgress("A request with this Idempotency-Key is already in progress")
+            logger.info(f"Taking over abandoned idempotency key for user {user_id} on {endpoint}")
+            record.created_at = now
+            db.commit()
+            return record
+
+        logger.info(f"Replaying idempotent {endpoint} response for user {user_id}")
+        return record
+
+    def complete(self, db: Session, record: Optional[IdempotencyKey], response: Dict[str, Any]) -> None:
+        """Store the response a claimed key replays from now on"""
+        if record is None:
+            return
+        record.response = response
+        db.commit()
+
+    @contextmanager
+    def release_on_error(self, db: Session, record: Optional[IdempotencyKey]) -> Iterator[None]:
+        """Release the claim if the request fails, so the client can retry with the same key"""
+        try:
+            yield
+        except BaseException:
+            if record is not None and record.response is None:
+                self._release(db, record.id)
+            raise
+
+    def _release(self, db: Session, record_id: int) -> None:
+        try:
+            db.rollback()
+            db.query(IdempotencyKey).filter(IdempotencyKey.id == record_id).delete(synchronize_session="fetch")
+            db.commit()
+        except Exception as e:
+            # Worst case the key stays claimed until ABANDONED_AFTER
+            logger.warning(f"Could not release idempotency key {record_id}: {str(e)}")
+            db.rollback()
+
+    def _get(self, db: Session, user_id: int, key: str) -> Optional[IdempotencyKey]:
+        return db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.idempotency_key == key
+        ).first()
+
+# Global instance
+idempotency_service = IdempotencyService()
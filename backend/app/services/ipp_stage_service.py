@@ -0,0 +1,319 @@
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy.orm import Session
+import logging
+
+from app.models.analysis import DocumentAnalysis, IPPStageProgress
+from app.services.job_queue import JobPriority, job_queue
+from app.services.llm_service import llm_service
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# IPPStageProgress column holding each generated stage
+STAGE_COLUMNS = {
+    "reflection": "reflection_data",
+    "action": "action_data",
+    "evaluation": "evaluation_data",
+}
+
+# How many experience connections to synthesize when the student has not chosen yet
+DEFAULT_EXPERIENCE_COUNT = 3
+
+# Longest a client stream follows a generation before giving up
+STREAM_TIMEOUT_SECONDS = 300
+
+class IPPStageService:
+    """Reflection, Action and Evaluation artifacts backed by the job queue
+
+    Each stage's data is stored with a ``status`` (generating, ready, failed)
+    and the hash of the inputs it was generated from. Requests whose inputs
+    match a ready result return it immediately; otherwise a job is queued and
+    the client polls. When a stage's inputs become available, the next stage is
+    pre-generated at background priority so it is usually ready by the time the
+    student gets there.
+    """
+
+    def get_progress(self, db: Session, analysis: DocumentAnalysis) -> IPPStageProgress:
+        """Get or create the IPP progress record for an analysis"""
+        progress = db.query(IPPStageProgress).filter(
+            IPPStageProgress.analysis_id == analysis.id
+        ).order_by(IPPStageProgress.created_at.desc()).first()
+
+        if not progress:
+            progress = IPPStageProgress(user_id=analysis.user_id, analysis_id=analysis.id)
+            db.add(progress)
+            db.commit()
+            db.refresh(progress)
+        return progress
+
+    def get_stage(self, db: Session, analysis: DocumentAnalysis, stage: str) -> Dict[str, Any]:
+        progress = self.get_progress(db, analysis)
+        return getattr(progress, STAGE_COLUMNS[stage]) or {}
+
+    def schedule_pregeneration(self, db: Session, analysis: DocumentAnalysis) -> None:
+        """Pre-generate Reflection artifacts once Context/Experience matching is done"""
+        if not settings.ipp_pregeneration or not analysis.connections_analysis:
+            return
+        try:
+            self.request_reflection(db, analysis, priority=JobPriority.BACKGROUND)
+        except Exception as e:
+            # Pre-generation is best effort and must not fail the analysis
+            logger.warning(f"Reflection pre-generation for analysis {analysis.id} not scheduled: {str(e)}")
+
+    def request_reflection(
+        self,
+        db: Session,
+        analysis: DocumentAnalysis,
+        selected_experiences: Optional[List[Dict[str, Any]]] = None,
+        priority: JobPriority = JobPriority.INTERACTIVE
+    ) -> Dict[str, Any]:
+        """Synthesis and reflection prompts for the chosen (or default) experiences"""
+        if not analysis.connections_analysis:
+            raise ValueError("Analysis has no connections yet; complete the job analysis first")
+
+        progress = self.get_progress(db, analysis)
+        if selected_experiences is None:
+            selected_experiences = self._default_experiences(analysis.connections_analysis)
+        else:
+            progress.experience_completed = True
+            progress.experience_completed_at = datetime.utcnow()
+            progress.experience_data = {"selected_experiences": selected_experiences}
+            db.commit()
+
+        inputs = {
+            "selected_experiences": selected_experiences,
+            "connections_analysis": analysis.connections_analysis,
+        }
+        return self._request(db, analysis, progress, "reflection", inputs, priority)
+
+    def submit_reflection_responses(self, db: Session, analysis: DocumentAnalysis, responses: Dict[str, str]) -> Dict[str, Any]:
+        """Save reflection answers and start pre-generating the Action project"""
+        progress = self.get_progress(db, analysis)
+        data = progress.reflection_data or {}
+        if data.get("status") != "ready":
+            raise ValueError("Reflection prompts are not ready yet")
+
+        progress.reflection_data = {**data, "responses": responses}
+        progress.reflection_completed = True
+        progress.reflection_completed_at = datetime.utcnow()
+        db.commit()
+
+        if settings.ipp_pregeneration:
+            self.request_action(db, analysis, priority=JobPriority.BACKGROUND)
+        return progress.reflection_data
+
+    def request_action(self, db: Session, analysis: DocumentAnalysis, priority: JobPriority = JobPriority.INTERACTIVE) -> Dict[str, Any]:
+        """Portfolio project built from the synthesis and reflection responses"""
+        progress = self.get_progress(db, analysis)
+        reflection = progress.reflection_data or {}
+        if reflection.get("status") != "ready":
+            raise ValueError("Reflection synthesis is not ready yet")
+
+        inputs = {
+            "synthesis": reflection.get("synthesis", {}),
+            "reflection_responses": reflection.get("responses", {}),
+        }
+        return self._request(db, analysis, progress, "action", inputs, priority)
+
+    def complete_action(self, db: Session, analysis: DocumentAnalysis) -> Dict[str, Any]:
+        progress = self.get_progress(db, analysis)
+        data = progress.action_data or {}
+        if data.get("status") != "ready":
+            raise ValueError("Portfolio project is not ready yet")
+
+        progress.action_completed = True
+        progress.action_completed_at = datetime.utcnow()
+        db.commit()
+        return data
+
+    def request_evaluation(self, db: Session, analysis: DocumentAnalysis, priority: JobPriority = JobPriority.INTERACTIVE) -> Dict[str, Any]:
+        """Interview questions for the portfolio project"""
+        progress = self.get_progress(db, analysis)
+        action = progress.action_data or {}
+        if action.get("status") != "ready":
+            raise ValueError("Portfolio project is not ready yet")
+
+        inputs = {
+            "project_plan": action.get("project", {}),
+            "connections_analysis": analysis.connections_analysis or {},
+        }
+        return self._request(db, analysis, progress, "evaluation", inputs, priority)
+
+    def submit_interview_responses(self, db: Session, analysis: DocumentAnalysis, responses: Dict[str, str]) -> Dict[str, Any]:
+        progress = self.get_progress(db, analysis)
+        data = progress.evaluation_data or {}
+        if data.get("status") != "ready":
+            raise ValueError("Interview questions are not ready yet")
+
+        progress.evaluation_data = {**data, "responses": responses}
+        progress.evaluation_completed = True
+        progress.evaluation_completed_at = datetime.utcnow()
+        db.commit()
+        return progress.evaluation_data
+
+    def _request(
+        self,
+        db: Session,
+        analysis: DocumentAnalysis,
+        progress: IPPStageProgress,
+        stage: str,
+        inputs: Dict[str, Any],
+        priority: JobPriority
+    ) -> Dict[str, Any]:
+        """Return a ready result for these inputs or queue (or promote) its generation"""
+        column = STAGE_COLUMNS[stage]
+        inputs_hash = self._hash_inputs(inputs)
+        data = getattr(progress, column) or {}
+
+        if data.get("inputs_hash") == inputs_hash and data.get("status") == "ready":
+            return data
+
+        if data.get("inputs_hash") != inputs_hash or data.get("status") == "failed":
+            data = {"status": "generating", "inputs_hash": inputs_hash, "requested_at": datetime.utcnow().isoformat()}
+            setattr(progress, column, data)
+            db.commit()
+
+        logger.info(f"Queueing {stage} generation for analysis {analysis.id} ({priority.name})")
+        job_queue.submit(
+            f"{stage}:{analysis.id}:{inputs_hash}",
+            lambda: self._generate(analysis.id, stage, inputs, inputs_hash),
+            priority=priority
+        )
+        return data
+
+    async def _generate(self, analysis_id: int, stage: str, inputs: Dict[str, Any], inputs_hash: str):
+        """Job body: run the stage's LLM calls and store the result"""
+
+        try:
+            if stage == "reflection":
+                synthesis = await llm_service.generate_reflection_synthesis(
+                    inputs["selected_experiences"], inputs["connections_analysis"]
+                )
+                prompts = await llm_service.generate_ignatian_reflection_prompts(synthesis)
+                artifacts = {"selected_experiences": inputs["selected_experiences"], "synthesis": synthesis, "prompts": prompts}
+            elif stage == "action":
+                project = await llm_service.generate_portfolio_project(
+                    inputs["synthesis"], inputs["reflection_responses"]
+                )
+                artifacts = {"project": project}
+            else:
+                # Persist each question as it streams in so students can start practicing early
+                questions = []
+                async for question in llm_service.stream_interview_questions(
+                    inputs["project_plan"], inputs["connections_analysis"]
+                ):
+                    questions.append(question)
+                    self._store_partial(analysis_id, stage, inputs_hash, {"questions": list(questions)})
+                artifacts = {"questions": questions}
+            failed = any(isinstance(value, dict) and value.get("error") for value in artifacts.values())
+            error = "LLM generation failed" if failed else None
+        except Exception as e:
+            logger.error(f"{stage} generation for analysis {analysis_id} failed: {str(e)}", exc_info=True)
+            artifacts, error = {}, str(e)
+
+        # Get a new database session for the background job
+        from database.connection import get_db
+        db = next(get_db())
+
+        try:
+            analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
+            if not analysis:
+                return
+            progress = self.get_progress(db, analysis)
+            column = STAGE_COLUMNS[stage]
+            current = getattr(progress, column) or {}
+
+            # The student changed the inputs while this job was running
+            if current.get("inputs_hash") != inputs_hash:
+                logger.info(f"Discarding stale {stage} result for analysis {analysis_id}")
+                return
+
+            setattr(progress, column, {
+                **current,
+                **artifacts,
+                "status": "failed" if error else "ready",
+                "error": error,
+                "generated_at": datetime.utcnow().isoformat(),
+            })
+            db.commit()
+
+            if stage == "action" and not error and settings.ipp_pregeneration:
+                self.request_evaluation(db, analysis, priority=JobPriority.BACKGROUND)
+
+        finally:
+            db.close()
+
+    async def stream_evaluation(self, analysis_id: int, poll_interval: float = 0.2) -> AsyncIterator[Dict[str, Any]]:
+        """Yield interview questions as they are persisted, then a final status event
+        
+        Generation runs in the job queue (promoted to interactive priority);
+        this follows evaluation_data so it also works when the job runs in
+        another worker.
+        """
+        
+        # Get a new database session for the lifetime of the stream
+        from database.connection import get_db
+        db = next(get_db())
+        
+        try:
+            analysis = db.query(DocumentAnalysis).filter(DocumentAnalysis.id == analysis_id).first()
+            data = self.request_evaluation(db, analysis)
+            inputs_hash = data.get("inputs_hash")
+            sent = 0
+            deadline = time.monotonic() + STREAM_TIMEOUT_SECONDS
+            
+            while True:
+                questions = data.get("questions") or []
+                for index in range(sent, len(questions)):
+                    yield {"type": "question", "index": index, "question": questions[index]}
+                sent = len(questions)
+                
+                if data.get("status") in ("ready", "failed"):
+                    yield {"type": "done", "status": data["status"], "count": sent, "error": data.get("error")}
+                    return
+                if data.get("inputs_hash") != inputs_hash or time.monotonic() > deadline:
+                    yield {"type": "done", "status": "interrupted", "count": sent, "error": None}
+                    return
+                
+                await asyncio.sleep(poll_interval)
+                db.expire_all()
+                data = self.get_stage(db, analysis, "evaluation")
+        
+        finally:
+            db.close()
+    
+    def _store_partial(self, analysis_id: int, stage: str, inputs_hash: str, artifacts: Dict[str, Any]) -> None:
+        """Save intermediate results while a stage is still generating"""
+        from database.connection import get_db
+        db = next(get_db())
+        
+        try:
+            progress = db.query(IPPStageProgress).filter(
+                IPPStageProgress.analysis_id == analysis_id
+            ).order_by(IPPStageProgress.created_at.desc()).first()
+            if not progress:
+                return
+            column = STAGE_COLUMNS[stage]
+            current = getattr(progress, column) or {}
+            if current.get("inputs_hash") != inputs_hash:
+                return
+            setattr(progress, column, {**current, **artifacts})
+            db.commit()
+        finally:
+            db.close()
+    
+    def _default_experiences(self, connections_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+        experiences = connections_analysis.get("experience_connections") or []
+        return [item for item in experiences if isinstance(item, dict)][:DEFAULT_EXPERIENCE_COUNT]
+
+    def _hash_inputs(self, inputs: Dict[str, Any]) -> str:
+        encoded = json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+# Global instance
+ipp_stage_service = IPPStageService()
@@ -0,0 +1,128 @@
+"""
+In-process background job queue
+===============================
+
+Bounded pool of asyncio workers pulling from a priority queue. Interactive
+work (a student waiting on a result) runs before background pre-generation.
+Jobs are deduplicated by key: submitting a key that is already queued or
+running returns the existing future, and a higher priority promotes it.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.deadline import no_deadline
+from app.core.rate_limit import call_priority
+from app.core.tasks import create_detached_task
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JobPriority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 10  # pre-generation
+    BACKFILL = 20  # re-running stored analyses
+
+
+@dataclass
+class Job:
+    key: str
+    factory: Callable[[], Awaitable[Any]]
+    priority: JobPriority
+    future: asyncio.Future
+    submitted_at: float = field(default_factory=time.monotonic)
+    started: bool = False
+
+
+class JobQueue:
+    """Priority queue plus worker tasks; workers start on first submit"""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: Dict[str, Job] = {}
+        self._sequence = itertools.count()
+
+    def submit(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        priority: JobPriority = JobPriority.INTERACTIVE
+    ) -> asyncio.Future:
+        """Queue ``factory()`` under ``key``; returns a future for its result"""
+        self._ensure_workers()
+
+        job = self._jobs.get(key)
+        if job and not job.future.done():
+            if priority < job.priority and not job.started:
+                logger.info(f"Promoting job {key} to {priority.name}")
+                job.priority = priority
+                self._queue.put_nowait((priority, next(self._sequence), job))
+            return job.future
+
+        job = Job(key=key, factory=factory, priority=priority, future=asyncio.get_running_loop().create_future())
+        self._jobs[key] = job
+        self._queue.put_nowait((priority, next(self._sequence), job))
+        return job.future
+
+    def get(self, key: str) -> Optional[Job]:
+        return self._jobs.get(key)
+
+    async def stop(self) -> None:
+        """Cancel the workers (queued jobs are dropped)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def _ensure_workers(self) -> None:
+        # Scripts calling asyncio.run() repeatedly get a fresh loop each time
+        if self._workers and self._workers[0].get_loop() is not asyncio.get_running_loop():
+            self._workers, self._queue, self._jobs = [], None, {}
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        if not self._workers:
+            # Workers outlive whichever submit started them; never run jobs under its context
+            self._workers = [
+                create_detached_task(self._worker(index)) for index in range(self.concurrency)
+            ]
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            # A promoted job has a second, stale entry in the queue
+            if job.started or job.future.done():
+                continue
+
+            job.started = True
+            waited = time.monotonic() - job.submitted_at
+            logger.debug(f"Worker {index} running job {job.key} ({job.priority.name}) after {waited:.2f}s in queue")
+            try:
+                # Its LLM calls wait behind higher-priority work at the rate limiter
+                with call_priority(job.priority), no_deadline():
+                    result = await job.factory()
+            except asyncio.CancelledError:
+                job.future.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"Job {job.key} failed: {str(e)}", exc_info=True)
+                job.future.set_exception(e)
+                # Nobody may be awaiting this future; don't warn about it
+                job.future.exception()
+            else:
+                job.future.set_result(result)
+            finally:
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+
+
+# Global instance
+job_queue = JobQueue(concurrency=settings.job_queue_concurrency)
@@ -0,0 +1,142 @@
+"""
+Lite analysis tier
+==================
+
+When the analysis queue or the provider is slow, match analyses can run as a
+"lite" tier instead of the full pipeline: compact resume and job analyses
+(``LLMService.analyze_resume_lite`` / ``analyze_job_description_lite``), skill
+matching by the local skill extractor instead of ``find_connections`` and
+evidence extraction, and a summary filled in from templates instead of
+``generate_context_summary``. That is two small LLM calls in parallel instead
+of five large sequential ones.
+
+The results use the same fields as a full analysis so the frontend renders
+them unchanged; ``metadata.analysis_tier`` and
+``DocumentAnalysis.analysis_tier`` mark them as lite so they can be upgraded
+to the full analysis later.
+"""
+
+import logging
+from typing import Any, Dict, List
+
+from app.services.skill_extractor import skill_extractor, to_direct_matches, to_skill_matches
+
+logger = logging.getLogger(__name__)
+
+TIERS = ("full", "lite")
+
+# Items listed in the templated summary
+MAX_STRENGTHS = 5
+MAX_GAPS = 4
+
+
+def is_lite(step: Any) -> bool:
+    """Whether a stored analysis step was produced by the lite tier"""
+    metadata = step.get("metadata") if isinstance(step, dict) else None
+    return isinstance(metadata, dict) and metadata.get("analysis_tier") == "lite"
+
+
+def lite_match_fields(
+    resume_analysis: Dict[str, Any],
+    resume_text: str,
+    job_analysis: Dict[str, Any],
+    job_text: str,
+    prompt_version: str,
+    upgrade_pending: bool = False
+) -> Dict[str, Any]:
+    """DocumentAnalysis connections and summary fields built without the LLM"""
+    try:
+        candidates = skill_extractor.match_documents(resume_text, job_text)
+    except Exception as e:
+        # An analysis with no local matches is still better than none
+        logger.warning(f"Local skill matching unavailable for lite analysis: {str(e)}")
+        candidates = {"direct_matches": [], "job_only": [], "resume_only": []}
+
+    matched = [candidate["skill"] for candidate in candidates["direct_matches"]]
+    missing = [candidate["skill"] for candidate in candidates["job_only"]]
+    required = len(matched) + len(missing)
+
+    connections = {
+        "metadata": {
+            "analysis_version": prompt_version,
+            "analysis_tier": "lite",
+            "matching_algorithm": "local_skill_match",
+        },
+        "skill_matches": to_skill_matches(candidates),
+        "skill_alignment": {"direct_matches": to_direct_matches(candidates)},
+        "experience_connections": _experience_connections(resume_analysis),
+        "unique_strengths": matched[:MAX_STRENGTHS],
+        "development_areas": missing[:MAX_GAPS],
+        "overall_fit_score": round(10 * len(matched) / required, 1) if required else None,
+    }
+
+    summary = _summary(resume_analysis, job_analysis, candidates, upgrade_pending)
+    return {"connections_analysis": connections, **summary}
+
+
+def _experience_connections(resume_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The candidate's roles, in the find_connections schema, without the LLM's interpretation"""
+    connections = []
+    for item in resume_analysis.get("experience") or []:
+        if not isinstance(item, dict) or not item.get("role"):
+            continue
+        experience = ", ".join(part for part in (item.get("role"), item.get("organization")) if part)
+        achievements = [a for a in item.get("key_achievements") or [] if isinstance(a, str)]
+        connections.append({
+            "candidate_experience": experience,
+            "role_relevance": "; ".join(achievements),
+            "transferable_lessons": "",
+            "storytelling_potential": "",
+        })
+    return connections
+
+
+def _summary(
+    resume_analysis: Dict[str, Any],
+    job_analysis: Dict[str, Any],
+    candidates: Dict[str, Any],
+    upgrade_pending: bool
+) -> Dict[str, Any]:
+    job_title = job_analysis.get("job_title") or "this role"
+    company = job_analysis.get("company")
+    role = f"{job_title} at {company}" if company else job_title
+
+    matches = candidates["direct_matches"]
+    missing = [candidate["skill"] for candidate in candidates["job_only"]]
+    matched_names = [candidate["skill"] for candidate in matches]
+    required = len(matches) + len(missing)
+
+    if matches:
+        fit = (f"Your resume shows {len(matches)} of the {required} skills the posting for {role} names, "
+               f"including {_join(matched_names[:3])}.")
+    else:
+        fit = f"Your resume does not yet name the specific skills the posting for {role} lists."
+
+    paragraphs = [fit]
+    roles = [item.get("role") for item in resume_analysis.get("experience") or [] if isinstance(item, dict) and item.get("role")]
+    if roles:
+        paragraphs.append(f"Experiences to draw on as you explore this role: {_join(roles[:3])}.")
+    if missing:
+        paragraphs.append(f"Areas to explore and develop: {_join(missing[:MAX_GAPS])}.")
+    note = ("This is a quick analysis prepared while demand is high; "
+            "a detailed analysis will replace it automatically." if upgrade_pending else
+            "This is a quick analysis based on the skills named in your documents.")
+    paragraphs.append(note)
+
+    return {
+        "context_summary": "\n\n".join(paragraphs),
+        "role_fit_narrative": fit,
+        "strengths": [
+            f"{candidate['skill']}: {candidate['candidate_evidence'][0]}" for candidate in matches[:MAX_STRENGTHS]
+        ],
+        "gaps": [
+            f"{skill} is listed in the job description but not yet evident in your resume" for skill in missing[:MAX_GAPS]
+        ],
+    }
+
+
+def _join(items: List[str]) -> str:
+    """Join as an English list ("a, b and c")"""
+    if len(items) <= 2:
+        return " and ".join(items)
+    return f"{', '.join(items[:-1])} and {items[-1]}"
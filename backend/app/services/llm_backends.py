@@ -0,0 +1,210 @@
+"""
+Pluggable LLM backends
+======================
+
+``LLMService`` builds prompts and parses results; a backend only turns a
+system prompt plus user prompt into a completion. Backends:
+
+- ``openai``: the real provider (or any OpenAI-compatible server via
+  ``LLM_BASE_URL``, e.g. ``devtools/fake_llm_server.py``)
+- ``fake``: in-process deterministic stand-in returning schema-valid canned
+  responses with configurable latency and injected 429/500 errors
+
+Either can be wrapped for record/replay via ``LLM_CASSETTE_MODE`` (see
+``llm_cassettes.py``).
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import openai
+
+from config.settings import settings
+from app.core.metrics import Stopwatch
+from app.services.llm_fakes import FakeResponder, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Receives completion text as it streams in
+DeltaCallback = Callable[[str], None]
+
+
+@dataclass
+class LLMRequest:
+    """A single chat completion request as issued by LLMService"""
+    method: str
+    model: str
+    system_prompt: str
+    prompt: str
+    temperature: float = 0.7
+    max_tokens: int = 4000
+    presence_penalty: float = 0.1
+    frequency_penalty: float = 0.1
+    timeout: Optional[float] = None  # seconds; None waits indefinitely
+
+
+@dataclass
+class LLMCompletion:
+    """Completion text plus the usage and timing needed for metrics"""
+    content: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    time_to_first_token: Optional[float] = None
+    cached: bool = False  # served from a recording instead of a provider call
+
+
+class LLMBackendError(Exception):
+    """Raised by backends; ``retryable`` marks rate limits and transient failures"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+class LLMBackend(ABC):
+    """Interface every completion backend implements"""
+
+    name = "base"
+
+    @abstractmethod
+    async def complete(self, request: LLMRequest, on_delta: Optional[DeltaCallback] = None) -> LLMCompletion:
+        """Return the completion for a request or raise LLMBackendError
+
+        ``on_delta`` is called with each piece of text as it arrives.
+        """
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI chat completions (streamed, to measure time-to-first-token)"""
+
+    name = "openai"
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None):
+        # Retries are handled in LLMService._call_openai so they can be counted
+        self.client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.base_url = base_url
+
+    async def complete(self, request: LLMRequest, on_delta: Optional[DeltaCallback] = None) -> LLMCompletion:
+        stopwatch = Stopwatch()
+        # Lets OpenAI-compatible stand-ins pick the canned response directly
+        extra_headers = {"X-LLM-Method": request.method} if self.base_url else None
+
+        try:
+            stream = await self.client.chat.completions.create(
+                model=request.model,
+                messages=[
+                    {"role": "system", "content": request.system_prompt},
+                    {"role": "user", "content": request.prompt}
+                ],
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+                presence_penalty=request.presence_penalty,
+                frequency_penalty=request.frequency_penalty,
+                stream=True,
+                stream_options={"include_usage": True},
+                extra_headers=extra_headers,
+                timeout=request.timeout
+            )
+
+            content_parts = []
+            usage = None
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    stopwatch.mark_first_token()
+                    content_parts.append(chunk.choices[0].delta.content)
+                    if on_delta:
+                        on_delta(chunk.choices[0].delta.content)
+
+        except (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError) as e:
+            raise LLMBackendError(str(e), status_code=getattr(e, "status_code", None), retryable=True)
+        except openai.APIError as e:
+            raise LLMBackendError(str(e), status_code=getattr(e, "status_code", None))
+
+        return LLMCompletion(
+            content="".join(content_parts),
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            time_to_first_token=stopwatch.time_to_first_token
+        )
+
+
+# Characters per simulated stream chunk, as in devtools/fake_llm_server.py
+STREAM_CHUNK_SIZE = 48
+
+
+class FakeBackend(LLMBackend):
+    """In-process stand-in with the same behaviour as devtools/fake_llm_server.py"""
+
+    name = "fake"
+
+    def __init__(self, responder: Optional[FakeResponder] = None):
+        self.responder = responder or FakeResponder.from_settings()
+
+    async def complete(self, request: LLMRequest, on_delta: Optional[DeltaCallback] = None) -> LLMCompletion:
+        reply = self.responder.respond(request.prompt, method=request.method)
+
+        if request.timeout is not None and reply.latency > request.timeout:
+            # Like the OpenAI client's APITimeoutError, which the real backend reports as retryable
+            await asyncio.sleep(request.timeout)
+            raise LLMBackendError(f"Fake request timed out after {request.timeout:.1f}s", retryable=True)
+
+        if reply.status_code != 200:
+            await asyncio.sleep(reply.latency)
+            raise LLMBackendError(
+                f"Injected fake error {reply.status_code}",
+                status_code=reply.status_code,
+                retryable=True
+            )
+
+        if on_delta:
+            # Spread chunks over the generation time like a streamed response
+            time_to_first_token = reply.time_to_first_token or 0.0
+            pieces = [reply.content[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(reply.content), STREAM_CHUNK_SIZE)]
+            per_piece = max(0.0, reply.latency - time_to_first_token) / max(1, len(pieces))
+            await asyncio.sleep(time_to_first_token)
+            for piece in pieces:
+                on_delta(piece)
+                await asyncio.sleep(per_piece)
+        else:
+            await asyncio.sleep(reply.latency)
+
+        return LLMCompletion(
+            content=reply.content,
+            prompt_tokens=estimate_tokens(request.system_prompt) + estimate_tokens(request.prompt),
+            completion_tokens=estimate_tokens(reply.content),
+            time_to_first_token=reply.time_to_first_token
+        )
+
+
+def create_backend(name: Optional[str] = None, cassette_mode: Optional[str] = None) -> LLMBackend:
+    """Create the backend configured by ``LLM_BACKEND`` and ``LLM_CASSETTE_MODE``"""
+    from app.services.llm_cassettes import CassetteBackend, RecordingBackend
+
+    name = name or settings.llm_backend
+    cassette_mode = cassette_mode or settings.llm_cassette_mode
+
+    if cassette_mode == "replay":
+        return CassetteBackend(
+            settings.llm_cassette_dir,
+            match=settings.llm_cassette_match,
+            replay_latency=settings.llm_cassette_replay_latency
+        )
+
+    if name == "openai":
+        backend = OpenAIBackend(api_key=settings.openai_api_key, base_url=settings.llm_base_url)
+    elif name == "fake":
+        backend = FakeBackend()
+    else:
+        raise ValueError(f"Unknown LLM backend: {name}")
+
+    if cassette_mode == "record":
+        return RecordingBackend(backend, settings.llm_cassette_dir)
+    if cassette_mode != "off":
+        raise ValueError(f"Unknown LLM cassette mode: {cassette_mode}")
+    return backend
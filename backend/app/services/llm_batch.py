@@ -0,0 +1,357 @@
+"""
+Offline batch execution
+=======================
+
+Non-interactive work (cohort imports, backfills) does not need an answer in
+seconds, so its prompts can go through the provider's batch API instead of
+competing with students for the real-time rate limit. ``BatchBackend``
+collects the requests issued while :func:`batch_execution` is active, writes
+them to a JSONL file in the batch API format, submits the file, polls until
+the batch finishes and resolves each waiting call with its line of the output
+file. The awaiting ``DocumentAnalysis`` steps simply resume when their result
+arrives.
+
+Batch clients implement one file-in/file-out contract:
+
+- ``openai``: the OpenAI Batch API (``/v1/batches``, 24h completion window)
+- ``local``: answers the input file with the fake responder, for tests and
+  development without a provider
+
+Interactive requests never enter a batch: only calls made inside
+``batch_execution()`` are routed here.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import openai
+
+from config.settings import settings
+from app.core.tasks import create_detached_task
+from app.services.llm_backends import DeltaCallback, LLMBackend, LLMBackendError, LLMCompletion, LLMRequest
+from app.services.llm_fakes import FakeResponder, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Batch API statuses after which no more results will appear
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+_batch_execution = contextvars.ContextVar("llm_batch_execution", default=False)
+
+
+@contextmanager
+def batch_execution(enabled: bool = True) -> Iterator[None]:
+    """Route LLM calls made in this context (and tasks it starts) through the batch backend"""
+    token = _batch_execution.set(enabled)
+    try:
+        yield
+    finally:
+        _batch_execution.reset(token)
+
+
+def batch_execution_active() -> bool:
+    return _batch_execution.get()
+
+
+def request_line(custom_id: str, request: LLMRequest) -> Dict[str, Any]:
+    """One input line of a batch file"""
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": request.model,
+            "messages": [
+                {"role": "system", "content": request.system_prompt},
+                {"role": "user", "content": request.prompt}
+            ],
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+            "presence_penalty": request.presence_penalty,
+            "frequency_penalty": request.frequency_penalty
+        }
+    }
+
+
+def method_of(custom_id: str) -> str:
+    """Custom ids are ``<method>:<n>`` so results can be attributed without the input file"""
+    return custom_id.split(":", 1)[0]
+
+
+def parse_result_line(line: Dict[str, Any]) -> LLMCompletion:
+    """Turn one output line into a completion or raise LLMBackendError"""
+    response = line.get("response") or {}
+    status_code = response.get("status_code")
+    error = line.get("error")
+    if error or status_code != 200:
+        message = (error or {}).get("message") or f"Batch request failed with status {status_code}"
+        raise LLMBackendError(message, status_code=status_code, retryable=status_code in (None, 429) or (status_code or 0) >= 500)
+
+    body = response.get("body") or {}
+    usage = body.get("usage") or {}
+    choices = body.get("choices") or [{}]
+    return LLMCompletion(
+        content=(choices[0].get("message") or {}).get("content") or "",
+        prompt_tokens=usage.get("prompt_tokens", 0),
+        completion_tokens=usage.get("completion_tokens", 0)
+    )
+
+
+class BatchClient(ABC):
+    """Submits a batch input file and fetches its output file"""
+
+    name = "base"
+
+    @abstractmethod
+    async def submit(self, input_path: Path) -> str:
+        """Submit a JSONL input file; returns the batch id"""
+
+    @abstractmethod
+    async def status(self, batch_id: str) -> str:
+        """Current batch status (see ``TERMINAL_STATUSES``)"""
+
+    @abstractmethod
+    async def download(self, batch_id: str, output_path: Path) -> None:
+        """Write every result line (successes and per-request errors) to ``output_path``"""
+
+
+class OpenAIBatchClient(BatchClient):
+    """The OpenAI Batch API"""
+
+    name = "openai"
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None):
+        self.client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+    async def submit(self, input_path: Path) -> str:
+        with open(input_path, "rb") as f:
+            uploaded = await self.client.files.create(file=f, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h"
+        )
+        return batch.id
+
+    async def status(self, batch_id: str) -> str:
+        batch = await self.client.batches.retrieve(batch_id)
+        return batch.status
+
+    async def download(self, batch_id: str, output_path: Path) -> None:
+        batch = await self.client.batches.retrieve(batch_id)
+        with open(output_path, "w", encoding="utf-8") as out:
+            # Expired and cancelled batches still return the requests that finished
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    content = await self.client.files.content(file_id)
+                    out.write(content.text.rstrip("\n") + "\n")
+
+
+class LocalBatchClient(BatchClient):
+    """Answers batch files with the fake responder
+
+    The output is written at submission; the batch reports ``in_progress``
+    until the slowest simulated request would have finished. Injected fake
+    errors become per-request error lines, as the Batch API reports them.
+    """
+
+    name = "local"
+
+    def __init__(self, responder: Optional[FakeResponder] = None):
+        self.responder = responder or FakeResponder.from_settings()
+        self._batches: Dict[str, Tuple[Path, float]] = {}
+
+    async def submit(self, input_path: Path) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex[:12]}"
+        output_path = input_path.with_name(f"{batch_id}-staged.jsonl")
+        turnaround = 0.0
+
+        with open(input_path, "r", encoding="utf-8") as f, open(output_path, "w", encoding="utf-8") as out:
+            for raw in f:
+                if not raw.strip():
+                    continue
+                line = json.loads(raw)
+                messages = line["body"]["messages"]
+                prompt = messages[-1]["content"]
+                reply = self.responder.respond(prompt, method=method_of(line["custom_id"]))
+                turnaround = max(turnaround, reply.latency)
+                out.write(json.dumps(self._result_line(line["custom_id"], messages, reply)) + "\n")
+
+        self._batches[batch_id] = (output_path, time.monotonic() + turnaround)
+        return batch_id
+
+    def _result_line(self, custom_id: str, messages: List[Dict[str, str]], reply) -> Dict[str, Any]:
+        if reply.status_code != 200:
+            return {
+                "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                "custom_id": custom_id,
+                "response": {"status_code": reply.status_code, "body": {}},
+                "error": {"code": str(reply.status_code), "message": f"Injected fake error {reply.status_code}"}
+            }
+        return {
+            "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+            "custom_id": custom_id,
+            "response": {
+                "status_code": 200,
+                "body": {
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": reply.content}, "finish_reason": "stop"}],
+                    "usage": {
+                        "prompt_tokens": sum(estimate_tokens(message["content"]) for message in messages),
+                        "completion_tokens": estimate_tokens(reply.content)
+                    }
+                }
+            },
+            "error": None
+        }
+
+    async def status(self, batch_id: str) -> str:
+        if batch_id not in self._batches:
+            return "failed"
+        _, ready_at = self._batches[batch_id]
+        return "completed" if time.monotonic() >= ready_at else "in_progress"
+
+    async def download(self, batch_id: str, output_path: Path) -> None:
+        staged, _ = self._batches.pop(batch_id)
+        staged.replace(output_path)
+
+
+class BatchBackend(LLMBackend):
+    """Collects requests into batch files and resolves callers from the results
+
+    A batch is submitted when ``max_requests`` prompts are waiting or
+    ``window_seconds`` after the first of them arrived, whichever is first.
+    Several batches may be in flight at once. Streaming callbacks receive the
+    whole completion in one piece when the batch finishes.
+    """
+
+    name = "batch"
+
+    def __init__(
+        self,
+        client: BatchClient,
+        batch_dir: str,
+        max_requests: int = 1000,
+        window_seconds: float = 10.0,
+        poll_seconds: float = 60.0
+    ):
+        self.client = client
+        self.batch_dir = Path(batch_dir)
+        self.max_requests = max(1, max_requests)
+        self.window_seconds = window_seconds
+        self.poll_seconds = poll_seconds
+        self._pending: List[Tuple[str, LLMRequest, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._in_flight: set = set()
+        self._sequence = 0
+
+    async def complete(self, request: LLMRequest, on_delta: Optional[DeltaCallback] = None) -> LLMCompletion:
+        future = asyncio.get_running_loop().create_future()
+        self._sequence += 1
+        self._pending.append((f"{request.method}:{self._sequence}", request, future))
+
+        if len(self._pending) >= self.max_requests:
+            self._submit_pending()
+        elif self._timer is None:
+            self._timer = create_detached_task(self._submit_after_window())
+
+        completion = await future
+        if on_delta and completion.content:
+            on_delta(completion.content)
+        return completion
+
+    async def _submit_after_window(self) -> None:
+        await asyncio.sleep(self.window_seconds)
+        self._timer = None
+        if self._pending:
+            self._submit_pending()
+
+    def _submit_pending(self) -> None:
+        entries, self._pending = self._pending, []
+        task = create_detached_task(self._run_batch(entries))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _run_batch(self, entries: List[Tuple[str, LLMRequest, asyncio.Future]]) -> None:
+        try:
+            results = await self._execute(entries)
+        except Exception as e:
+            logger.error(f"LLM batch of {len(entries)} requests failed: {str(e)}")
+            for _, _, future in entries:
+                if not future.done():
+                    future.set_exception(LLMBackendError(f"Batch failed: {str(e)}", retryable=True))
+            return
+
+        for custom_id, _, future in entries:
+            if future.done():
+                continue  # the caller gave up
+            line = results.get(custom_id)
+            if line is None:
+                future.set_exception(LLMBackendError(f"No batch result for {custom_id}", retryable=True))
+                continue
+            try:
+                future.set_result(parse_result_line(line))
+            except LLMBackendError as e:
+                future.set_exception(e)
+
+    async def _execute(self, entries: List[Tuple[str, LLMRequest, asyncio.Future]]) -> Dict[str, Dict[str, Any]]:
+        """Write, submit and poll one batch; returns its result lines by custom id"""
+        self.batch_dir.mkdir(parents=True, exist_ok=True)
+        batch_key = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        input_path = self.batch_dir / f"{batch_key}-input.jsonl"
+        output_path = self.batch_dir / f"{batch_key}-output.jsonl"
+
+        with open(input_path, "w", encoding="utf-8") as f:
+            for custom_id, request, _ in entries:
+                f.write(json.dumps(request_line(custom_id, request)) + "\n")
+
+        started = time.monotonic()
+        batch_id = await self.client.submit(input_path)
+        logger.info(f"Submitted LLM batch {batch_id} with {len(entries)} requests ({input_path.name})")
+
+        while True:
+            status = await self.client.status(batch_id)
+            if status in TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(self.poll_seconds)
+        if status == "failed":
+            raise LLMBackendError(f"Batch {batch_id} failed", retryable=True)
+
+        await self.client.download(batch_id, output_path)
+        results = {}
+        with open(output_path, "r", encoding="utf-8") as f:
+            for raw in f:
+                if raw.strip():
+                    line = json.loads(raw)
+                    results[line["custom_id"]] = line
+        logger.info(f"LLM batch {batch_id} {status} in {time.monotonic() - started:.1f}s: "
+                    f"{len(results)}/{len(entries)} results")
+        return results
+
+
+def create_batch_backend(client_name: Optional[str] = None) -> BatchBackend:
+    """Create the batch backend configured by ``LLM_BATCH_CLIENT`` and ``LLM_BATCH_*``"""
+    client_name = client_name or settings.llm_batch_client or ("local" if settings.llm_backend == "fake" else "openai")
+    if client_name == "openai":
+        client: BatchClient = OpenAIBatchClient(api_key=settings.openai_api_key, base_url=settings.llm_base_url)
+    elif client_name == "local":
+        client = LocalBatchClient()
+    else:
+        raise ValueError(f"Unknown LLM batch client: {client_name}")
+
+    return BatchBackend(
+        client,
+        settings.llm_batch_dir,
+        max_requests=settings.llm_batch_max_requests,
+        window_seconds=settings.llm_batch_window_seconds,
+        poll_seconds=settings.llm_batch_poll_seconds
+    )
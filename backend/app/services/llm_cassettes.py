@@ -0,0 +1,150 @@
+"""
+Record/replay cassettes for LLM traffic
+=======================================
+
+``LLM_CASSETTE_MODE=record`` wraps the configured backend and appends every
+prompt/response pair, with token usage and latency, to a gzip-compressed JSON
+Lines cassette in ``LLM_CASSETTE_DIR``. ``LLM_CASSETTE_MODE=replay`` serves
+those recordings back keyed by prompt hash, so pipelines can be benchmarked
+with real payload sizes and prompt-template changes can be exercised offline.
+
+With ``LLM_CASSETTE_MATCH=method`` a replay miss (e.g. after editing a prompt
+template) falls back to a recording of the same method instead of failing.
+"""
+
+import asyncio
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from app.services.llm_backends import DeltaCallback, LLMBackend, LLMBackendError, LLMCompletion, LLMRequest
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_SUFFIX = ".jsonl.gz"
+
+
+def prompt_hash(request: LLMRequest) -> str:
+    """Stable key for a request: model plus the exact system and user prompts"""
+    payload = json.dumps([request.model, request.system_prompt, request.prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def read_cassette(path: Path) -> Iterator[dict]:
+    """Yield entries from a cassette, tolerating a truncated final block"""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    except EOFError:
+        # Recorder was killed before closing; flushed entries are still valid
+        logger.warning(f"Cassette {path} was not closed cleanly; using entries read so far")
+
+
+class RecordingBackend(LLMBackend):
+    """Passes calls through to another backend and records each exchange"""
+
+    name = "record"
+
+    def __init__(self, inner: LLMBackend, cassette_dir: str, cassette_name: Optional[str] = None):
+        self.inner = inner
+        directory = Path(cassette_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        cassette_name = cassette_name or datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        self.path = directory / f"{cassette_name}{CASSETTE_SUFFIX}"
+        self._file = gzip.open(self.path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+        logger.info(f"Recording LLM traffic to {self.path}")
+
+    async def complete(self, request: LLMRequest, on_delta: Optional[DeltaCallback] = None) -> LLMCompletion:
+        started = time.perf_counter()
+        completion = await self.inner.complete(request, on_delta=on_delta)
+        entry = {
+            "key": prompt_hash(request),
+            "method": request.method,
+            "model": request.model,
+            "system_prompt": request.system_prompt,
+            "prompt": request.prompt,
+            "response": completion.content,
+            "prompt_tokens": completion.prompt_tokens,
+            "completion_tokens": completion.completion_tokens,
+            "latency": round(time.perf_counter() - started, 4),
+            "time_to_first_token": completion.time_to_first_token,
+            "recorded_at": datetime.utcnow().isoformat()
+        }
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+        return completion
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class CassetteBackend(LLMBackend):
+    """Serves recorded responses keyed by prompt hash"""
+
+    name = "replay"
+
+    def __init__(self, cassette_dir: str, match: str = "exact", replay_latency: bool = False):
+        if match not in ("exact", "method"):
+            raise ValueError(f"Unknown cassette match mode: {match}")
+        self.match = match
+        self.replay_latency = replay_latency
+        self.by_key: Dict[str, List[dict]] = {}
+        self.by_method: Dict[str, List[dict]] = {}
+        self._cursor: Dict[str, int] = {}
+        self.load(cassette_dir)
+
+    def load(self, cassette_dir: str) -> None:
+        paths = sorted(Path(cassette_dir).glob(f"*{CASSETTE_SUFFIX}"))
+        count = 0
+        for path in paths:
+            for entry in read_cassette(path):
+                self.by_key.setdefault(entry["key"], []).append(entry)
+                self.by_method.setdefault(entry["method"], []).append(entry)
+                count += 1
+        logger.info(f"Loaded {count} recorded LLM exchanges from {len(paths)} cassettes in {cassette_dir}")
+
+    def _next(self, bucket: str, entries: List[dict]) -> dict:
+        """Rotate through repeated recordings of the same prompt"""
+        index = self._cursor.get(bucket, 0)
+        self._cursor[bucket] = index + 1
+        return entries[index % len(entries)]
+
+    def find(self, request: LLMRequest) -> Optional[dict]:
+        key = prompt_hash(request)
+        if key in self.by_key:
+            return self._next(key, self.by_key[key])
+        if self.match == "method" and request.method in self.by_method:
+            return self._next(f"method:{request.method}", self.by_method[request.method])
+        return None
+
+    async def complete(self, request: LLMRequest, on_delta: Optional[DeltaCallback] = None) -> LLMCompletion:
+        entry = self.find(request)
+        if entry is None:
+            raise LLMBackendError(f"No recorded response for {request.method} (prompt hash {prompt_hash(request)[:12]})")
+
+        if self.replay_latency:
+            await asyncio.sleep(entry.get("latency") or 0)
+        if on_delta:
+            on_delta(entry["response"])
+
+        return LLMCompletion(
+            content=entry["response"],
+            prompt_tokens=entry.get("prompt_tokens", 0),
+            completion_tokens=entry.get("completion_tokens", 0),
+            time_to_first_token=entry.get("time_to_first_token"),
+            cached=True
+        )
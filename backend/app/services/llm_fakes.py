@@ -0,0 +1,481 @@
+"""
+Deterministic LLM stand-in
+==========================
+
+Canned, schema-valid responses for every ``LLMService`` method plus latency
+and fault models. Shared by the in-process ``FakeBackend`` and the
+OpenAI-compatible HTTP server in ``devtools/fake_llm_server.py`` so load tests
+can exercise ``AnalysisService`` end to end without network or API spend.
+
+Latency specs are strings such as ``fixed:1.5``, ``uniform:0.5,2``,
+``normal:3,0.8`` or ``lognormal:1.2,0.4`` (seconds; lognormal takes the mu and
+sigma of the underlying normal). With ``tokens_per_second`` set, the sampled
+value becomes the time to first token and generation time grows with the
+response length, like a real provider.
+"""
+
+import copy
+import json
+import random
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config.settings import settings
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) for fake usage numbers"""
+    return max(1, len(text) // 4)
+
+
+# Prompt markers used when a request does not name its method explicitly
+METHOD_MARKERS = [
+    ("complete candidate-to-role match in ONE response", "analyze_job_match"),
+    ("Analyze the following resume", "analyze_resume"),
+    ("Analyze this job description", "analyze_job_description"),
+    ("Extract EXACT QUOTES", "extract_detailed_evidence"),
+    ("analysis of connections between this candidate and role", "find_connections"),
+    ("structured analysis for the Context stage", "generate_context_summary"),
+    ("synthesize the student's selected experiences", "generate_reflection_synthesis"),
+    ("Generate personalized Ignatian reflection prompts", "generate_ignatian_reflection_prompts"),
+    ("Design a portfolio project", "generate_portfolio_project"),
+    ("Generate sophisticated interview questions", "generate_interview_questions"),
+]
+
+
+def detect_method(prompt: str) -> str:
+    """Infer which LLMService method produced a prompt"""
+    for marker, method in METHOD_MARKERS:
+        if marker in prompt:
+            return method
+    return "unknown"
+
+
+CANNED_RESPONSES: Dict[str, Any] = {
+    "analyze_resume": {
+        "metadata": {"analysis_version": "fake", "confidence_score": 0.85, "analysis_timestamp": "2025-01-01T00:00:00Z"},
+        "personal_info": {"name": "Jordan Rivera", "contact_details": "email and phone provided", "location": "Los Angeles, CA"},
+        "skills": {"technical": ["Python", "SQL", "Excel", "Tableau"], "soft": ["Communication", "Leadership"]},
+        "technical_skills": [
+            {"skill": "Python", "category": "technical", "proficiency_level": "intermediate", "evidence": "Built a data cleaning pipeline in Python"},
+            {"skill": "SQL", "category": "analytical", "proficiency_level": "intermediate", "evidence": "Queried sales data for weekly reports"}
+        ],
+        "soft_skills": [
+            {"skill": "Communication", "evidence": "Presented findings to leadership", "ignatian_alignment": "Serves others through clear explanation"}
+        ],
+        "experience": [
+            {
+                "role": "Data Analyst Intern",
+                "organization": "Acme Corp",
+                "duration": "Summer 2024",
+                "key_achievements": ["Automated weekly reporting", "Reduced report prep time by 40%"],
+                "service_impact": "Freed the sales team to spend more time with customers",
+                "transferable_skills": ["Data analysis", "Stakeholder communication"],
+                "growth_indicators": "Took initiative beyond assigned tasks"
+            }
+        ],
+        "education": {"degree": "B.S. Business Analytics", "institution": "Loyola Marymount University", "achievements": ["Dean's List"], "extracurricular": ["Volunteer tutor"]},
+        "projects": [
+            {"title": "Food Bank Dashboard", "description": "Tableau dashboard tracking donations", "impact": "Helped allocate volunteers", "skills_demonstrated": ["Tableau", "Empathy"]}
+        ],
+        "strengths": [{"strength": "Analytical thinking", "evidence": "Automated reporting", "workplace_value": "Faster decisions"}],
+        "career_level": "entry-level",
+        "industries": ["Technology", "Nonprofit"],
+        "character_strengths": [
+            {"strength": "Compassion", "evidence": "Volunteer tutoring", "ignatian_dimension": "service", "potential_in_workplace": "Customer empathy"}
+        ],
+        "values_indicators": {
+            "service_orientation": ["Volunteer tutor"],
+            "collaboration": ["Worked with the sales team"],
+            "continuous_learning": ["Self-taught Python"],
+            "excellence_pursuit": ["Dean's List"],
+            "cultural_awareness": ["Bilingual Spanish/English"]
+        },
+        "growth_mindset": {"indicators": ["Learned Tableau for a volunteer project"], "development_areas": ["Statistics"], "readiness_for_growth": "High"},
+        "career_trajectory": {"current_level": "entry-level", "progression_pattern": "Academic to applied analytics", "readiness_indicators": "Internship experience", "growth_areas": ["Machine learning"]},
+        "recommended_next_steps": ["Build a public portfolio", "Deepen statistics knowledge", "Seek mentorship"]
+    },
+    "analyze_job_description": {
+        "metadata": {"analysis_version": "fake", "confidence_score": 0.9, "analysis_timestamp": "2025-01-01T00:00:00Z"},
+        "job_title": "Junior Data Analyst",
+        "company": "Bright Futures Inc.",
+        "role_overview": {"department": "Analytics", "location": "Remote", "employment_type": "full-time"},
+        "required_skills": ["SQL", "Python", "Data visualization", "Communication"],
+        "preferred_skills": ["Tableau", "Statistics"],
+        "technical_requirements": {
+            "required_skills": [
+                {"skill": "SQL", "importance": "critical", "proficiency_level": "intermediate", "application_context": "Querying product data"},
+                {"skill": "Python", "importance": "important", "proficiency_level": "intermediate", "application_context": "Automating analyses"}
+            ],
+            "tools_technologies": ["PostgreSQL", "Tableau", "Python"]
+        },
+        "responsibilities": ["Build dashboards", "Analyze customer behaviour", "Present insights"],
+        "qualifications": ["Bachelor's degree", "0-2 years of experience"],
+        "job_level": "entry-level",
+        "industry": "Education technology",
+        "key_requirements": ["SQL", "Python", "Dashboards", "Communication", "Curiosity"],
+        "company_values": ["Student success", "Collaboration"],
+        "organizational_culture": {
+            "stated_values": ["Student success"],
+            "cultural_indicators": [{"indicator": "diverse team", "interpretation": "Inclusive culture", "ignatian_alignment": "Cura personalis"}],
+            "collaboration_style": "team-based",
+            "learning_environment": "Mentorship and learning budget",
+            "service_orientation": "Improves access to education"
+        },
+        "growth_opportunities": {"career_progression": "Analyst II in 18 months", "skill_development": "Learning budget", "mentorship": "Assigned mentor", "cross_functional": "Works with product"},
+        "ignatian_alignment_assessment": {"service_to_others": "Helps students learn", "personal_growth": "Mentorship", "values_integration": "Mission-driven", "discernment_factors": "Remote collaboration"}
+    },
+    "extract_detailed_evidence": {
+        "skill_alignment": {
+            "direct_matches": [
+                {
+                    "skill": "\"SQL\"",
+                    "job_requirement_snippet": "Strong SQL skills",
+                    "candidate_evidence": ["Queried sales data for weekly reports", "Built SQL views for the dashboard"],
+                    "connection_explanations": ["Shows routine SQL use on business data.", "Shows SQL supporting visualization."],
+                    "role_application": "Querying product data",
+                    "confidence_score": 8,
+                    "strength_level": "strong",
+                    "source_reference": "Requirements"
+                }
+            ],
+            "skill_gaps": [
+                {
+                    "missing_skill": "\"Statistics\"",
+                    "job_requirement_snippet": "Familiarity with statistics",
+                    "importance": "important",
+                    "learning_pathway": "Online statistics course",
+                    "mitigation_strategy": "Highlight coursework",
+                    "portfolio_project_opportunity": "A/B test analysis",
+                    "source_reference": "Preferred qualifications"
+                }
+            ]
+        }
+    },
+    "find_connections": {
+        "metadata": {"analysis_version": "fake", "confidence_score": 0.88, "matching_algorithm": "ignatian_holistic_v2"},
+        "skill_matches": [{"skill": "SQL", "confidence_score": 8.5, "evidence": "Queried sales data"}],
+        "experience_connections": [
+            {
+                "candidate_experience": "Data Analyst Intern at Acme Corp",
+                "role_relevance": "Direct preparation for dashboard work",
+                "transferable_lessons": "Automating repetitive analysis",
+                "storytelling_potential": "Automation story with measurable impact"
+            }
+        ],
+        "growth_opportunities": [
+            {"area": "Statistics", "current_level": "basic", "target_level": "intermediate", "development_timeline": "3 months", "support_needed": "Online course"}
+        ],
+        "value_alignment": {"shared_values": ["Service", "Learning"], "cultural_fit_indicators": ["Volunteer tutoring"], "service_orientation": "Tutoring shows care for learners"},
+        "unique_strengths": ["Combines analytics with service"],
+        "development_areas": ["Statistics"],
+        "portfolio_project_themes": [
+            {"theme": "Education equity dashboard", "skills_demonstrated": ["SQL", "Tableau"], "service_dimension": "Helps schools", "feasibility_score": 8.5}
+        ],
+        "ignatian_reflection_points": [
+            {"category": "service_to_others", "question": "How could this role let you serve learners?", "context": "Connects tutoring to work"}
+        ],
+        "overall_fit_score": 8.2,
+        "next_steps_suggestions": [
+            {"action": "Complete a statistics course", "timeline": "Next 3 months", "resources_needed": "Course access", "success_criteria": "Certificate"}
+        ]
+    },
+    "generate_context_summary": {
+        "context_summary": "You bring a blend of analytical skill and genuine care for others.\n\nYour internship and volunteer work connect naturally to this role.",
+        "role_fit_narrative": "Your SQL and dashboard experience map directly onto this analyst role, and your tutoring shows a heart for learners.",
+        "strengths": ["SQL querying", "Dashboard building", "Communicating insights"],
+        "gaps": ["Statistics", "Experimentation"]
+    },
+    "generate_reflection_synthesis": {
+        "metadata": {"analysis_version": "fake", "confidence_score": 0.92},
+        "narrative_summary": "Across your experiences you turn data into help for real people.",
+        "core_patterns": [
+            {"pattern_name": "Data for good", "description": "Uses analysis to help others", "evidence": ["Food bank dashboard"], "significance": "Points to mission-driven analytics"}
+        ],
+        "values_constellation": {
+            "primary_values": [{"value": "Service", "definition": "Helping others succeed", "evidence": ["Tutoring"], "workplace_application": "Customer focus"}],
+            "values_integration": "Service and excellence reinforce each other"
+        },
+        "unique_gifts_strengths": [{"gift": "Translation", "description": "Explains data simply", "impact_potential": "Empowers non-experts", "cultivation_opportunities": "Public speaking"}],
+        "service_orientation_analysis": {"service_patterns": ["Tutoring"], "service_motivation": "Care for learners", "service_growth_edge": "Scaling impact through tools"},
+        "calling_purpose_indicators": {"energy_sources": ["Teaching"], "authenticity_markers": ["Explaining insights"], "impact_desires": ["Education equity"]},
+        "reflection_invitations": [
+            {"category": "service_calling", "invitation": "Consider who you most want to serve", "guiding_questions": ["Who benefits from your work?"]}
+        ]
+    },
+    "generate_ignatian_reflection_prompts": {
+        "prompts": [
+            {
+                "id": "values-1",
+                "category": "values_alignment",
+                "question": "Which of your experiences felt most aligned with who you are?",
+                "context": "Discernment begins with noticing consolation.",
+                "personal_connection": "Your tutoring and dashboard work",
+                "follow_up": "What value was present in that moment?",
+                "contemplation_guidance": "Take ten quiet minutes to recall the experience in detail."
+            },
+            {
+                "id": "service-1",
+                "category": "service_to_others",
+                "question": "Who do you most want your work to serve?",
+                "context": "Men and women for and with others.",
+                "personal_connection": "The students you tutored",
+                "follow_up": "How would they describe your impact?",
+                "contemplation_guidance": "Write a short letter from their perspective."
+            }
+        ]
+    },
+    "generate_portfolio_project": {
+        "metadata": {"project_version": "fake", "design_confidence": 0.91},
+        "project_overview": {
+            "title": "Education Equity Insights Dashboard",
+            "tagline": "Helping schools see and close opportunity gaps",
+            "overview": "An interactive dashboard built on public education data.",
+            "unique_value_proposition": "Combines rigorous analysis with accessible storytelling",
+            "calling_connection": "Expresses your call to serve learners through data"
+        },
+        "objectives_outcomes": {
+            "primary_objectives": ["Collect public data", "Build the dashboard", "Share with a school partner"],
+            "learning_objectives": ["Statistics", "Data storytelling"],
+            "impact_objectives": ["Inform resource allocation"],
+            "career_objectives": ["Demonstrate analyst readiness"]
+        },
+        "technical_demonstration": {
+            "core_skills_showcased": [{"skill": "SQL", "application": "Data modeling", "proficiency_level": "intermediate"}],
+            "technology_stack": ["PostgreSQL", "Python", "Tableau"],
+            "complexity_indicators": ["Joins across multiple public datasets"]
+        },
+        "values_service_integration": {
+            "values_expression": [{"value": "Justice", "manifestation": "Highlights inequities", "impact": "Informs decisions"}],
+            "service_dimensions": [{"stakeholder_group": "School administrators", "service_provided": "Actionable insights", "impact_measurement": "Decisions informed"}],
+            "common_good_contribution": "More equitable education"
+        },
+        "implementation_roadmap": {
+            "phases": [
+                {"phase_name": "Discovery", "duration": "2 weeks", "key_activities": ["Find datasets"], "deliverables": ["Data inventory"], "milestone_indicators": ["Datasets selected"]}
+            ],
+            "total_timeline": "8 weeks",
+            "resource_requirements": ["Public datasets", "Tableau Public"]
+        },
+        "deliverables_portfolio": [
+            {"deliverable_name": "Dashboard", "description": "Interactive Tableau dashboard", "skills_demonstrated": ["Visualization"], "presentation_format": "Tableau Public link"}
+        ],
+        "interview_preparation": {
+            "storytelling_framework": {"situation": "Schools lacked insight", "task": "Surface gaps", "action": "Built dashboard", "result": "Partner school used it", "reflection": "Data can serve justice"},
+            "technical_talking_points": [{"topic": "Data modeling", "key_points": ["Normalization"], "evidence": "Schema diagram"}],
+            "values_integration_stories": [{"scenario": "Choosing metrics", "decision_process": "Consulted teachers", "values_expression": "Cura personalis", "impact_story": "Metrics teachers trust"}]
+        }
+    },
+    "generate_interview_questions": {
+        "questions": [
+            {
+                "id": "behavioral-1",
+                "category": "behavioral",
+                "question": "Tell me about a time you automated a manual process.",
+                "context": "Assesses initiative and technical problem solving.",
+                "competencies_assessed": ["Initiative", "Python"],
+                "preparation_guidance": {
+                    "story_framework": "Use the Acme reporting automation",
+                    "key_points_to_highlight": ["40% time savings"],
+                    "evidence_to_include": ["Before/after prep time"],
+                    "values_integration": "Freed colleagues to serve customers",
+                    "technical_depth": "Moderate",
+                    "growth_demonstration": "Learned pandas on the job"
+                },
+                "sample_response_structure": {"opening": "Set the context", "body": "Walk through the automation", "conclusion": "Share the impact"},
+                "follow_up_questions": ["What would you do differently?"],
+                "authenticity_tips": ["Be specific about your role"]
+            },
+            {
+                "id": "project-1",
+                "category": "project_specific",
+                "question": "Walk me through your education equity dashboard.",
+                "context": "Assesses depth of portfolio work.",
+                "competencies_assessed": ["Data modeling", "Communication"],
+                "preparation_guidance": {
+                    "story_framework": "Use the STAR-R framework from your project plan",
+                    "key_points_to_highlight": ["Stakeholder input"],
+                    "evidence_to_include": ["Usage by partner school"],
+                    "values_integration": "Justice in metric selection",
+                    "technical_depth": "Deep",
+                    "growth_demonstration": "Statistics learned"
+                },
+                "sample_response_structure": {"opening": "Why you built it", "body": "How you built it", "conclusion": "What it changed"},
+                "follow_up_questions": ["How did you validate the data?"],
+                "authenticity_tips": ["Share what surprised you"]
+            }
+        ]
+    },
+}
+
+
+# The fused job match combines the three sequential matching steps
+CANNED_RESPONSES["analyze_job_match"] = {
+    "metadata": {"analysis_version": "fake", "confidence_score": 0.88, "matching_algorithm": "ignatian_fused_v1"},
+    "connections": {k: v for k, v in CANNED_RESPONSES["find_connections"].items() if k != "metadata"},
+    "skill_alignment": CANNED_RESPONSES["extract_detailed_evidence"]["skill_alignment"],
+    "summary": CANNED_RESPONSES["generate_context_summary"],
+}
+
+# Sectioned portfolio generation: a planning call plus one call per section
+CANNED_RESPONSES["plan_portfolio_project"] = {
+    key: CANNED_RESPONSES["generate_portfolio_project"][key]
+    for key in ("metadata", "project_overview", "objectives_outcomes")
+}
+for _section in ("technical_demonstration", "values_service_integration", "implementation_roadmap",
+                 "deliverables_portfolio", "interview_preparation"):
+    CANNED_RESPONSES[f"portfolio_section_{_section}"] = {_section: CANNED_RESPONSES["generate_portfolio_project"][_section]}
+    METHOD_MARKERS.insert(0, (f'Write the "{_section}" section', f"portfolio_section_{_section}"))
+METHOD_MARKERS.insert(0, ("Plan a portfolio project", "plan_portfolio_project"))
+
+# Sectioned resume analysis: one extraction per section, then a synthesis call
+CANNED_RESPONSES["analyze_resume_section"] = {
+    key: CANNED_RESPONSES["analyze_resume"][key]
+    for key in ("technical_skills", "soft_skills", "experience")
+}
+CANNED_RESPONSES["synthesize_resume_analysis"] = {
+    key: CANNED_RESPONSES["analyze_resume"][key]
+    for key in ("metadata", "strengths", "career_level", "industries", "character_strengths", "values_indicators",
+                "growth_mindset", "career_trajectory", "recommended_next_steps")
+}
+METHOD_MARKERS.insert(0, ("Extract the structured content of ONE resume section", "analyze_resume_section"))
+METHOD_MARKERS.insert(0, ("Combine these per-section resume extracts", "synthesize_resume_analysis"))
+
+# Lite tier: compact resume and job analyses
+CANNED_RESPONSES["analyze_resume_lite"] = {
+    key: CANNED_RESPONSES["analyze_resume"][key]
+    for key in ("metadata", "personal_info", "skills", "experience", "education", "strengths", "career_level")
+}
+CANNED_RESPONSES["analyze_job_description_lite"] = {
+    key: CANNED_RESPONSES["analyze_job_description"][key]
+    for key in ("metadata", "job_title", "company", "required_skills", "preferred_skills", "responsibilities",
+                "qualifications", "job_level", "key_requirements", "company_values")
+}
+METHOD_MARKERS.insert(0, ("Summarize this resume in compact form", "analyze_resume_lite"))
+METHOD_MARKERS.insert(0, ("Summarize this job posting in compact form", "analyze_job_description_lite"))
+
+
+class LatencyModel:
+    """Samples simulated provider latency from a spec string"""
+
+    def __init__(self, spec: str = "fixed:0", rng: Optional[random.Random] = None):
+        self.spec = spec
+        self.rng = rng or random.Random()
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p.strip()] or [0.0]
+
+        if kind not in {"fixed", "uniform", "normal", "lognormal"}:
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            value = self.params[0]
+        elif self.kind == "uniform":
+            value = self.rng.uniform(self.params[0], self.params[1])
+        elif self.kind == "normal":
+            value = self.rng.gauss(self.params[0], self.params[1])
+        else:
+            value = self.rng.lognormvariate(self.params[0], self.params[1])
+        return max(0.0, value)
+
+
+class FaultInjector:
+    """Decides whether a simulated call fails with 429 or 500"""
+
+    def __init__(self, rate_429: float = 0.0, rate_500: float = 0.0, rng: Optional[random.Random] = None):
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.rng = rng or random.Random()
+
+    def pick_status(self) -> int:
+        roll = self.rng.random()
+        if roll < self.rate_429:
+            return 429
+        if roll < self.rate_429 + self.rate_500:
+            return 500
+        return 200
+
+
+@dataclass
+class FakeReply:
+    status_code: int
+    content: str
+    latency: float
+    time_to_first_token: Optional[float]
+    method: str
+
+
+class FakeResponder:
+    """Produces deterministic replies; recorded responses override canned ones"""
+
+    # Fraction of the total latency spent before the first token
+    first_token_fraction = 0.15
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        faults: Optional[FaultInjector] = None,
+        responses_dir: Optional[str] = None,
+        seed: Optional[int] = None,
+        tokens_per_second: float = 0.0
+    ):
+        rng = random.Random(seed)
+        self.tokens_per_second = tokens_per_second
+        self.latency = latency or LatencyModel("fixed:0", rng)
+        self.latency.rng = rng
+        self.faults = faults or FaultInjector(rng=rng)
+        self.faults.rng = rng
+        self.responses = copy.deepcopy(CANNED_RESPONSES)
+        # Responders are shared between the server's request handlers
+        self._lock = threading.Lock()
+
+        if responses_dir:
+            self.load_responses(responses_dir)
+
+    @classmethod
+    def from_settings(cls) -> "FakeResponder":
+        return cls(
+            latency=LatencyModel(settings.llm_fake_latency),
+            faults=FaultInjector(settings.llm_fake_error_rate_429, settings.llm_fake_error_rate_500),
+            responses_dir=settings.llm_fake_responses_dir,
+            seed=settings.llm_fake_seed,
+            tokens_per_second=settings.llm_fake_tokens_per_second
+        )
+
+    def load_responses(self, responses_dir: str) -> None:
+        """Load recorded ``<method>.json`` files, replacing canned responses"""
+        for path in Path(responses_dir).glob("*.json"):
+            with open(path, "r", encoding="utf-8") as f:
+                self.responses[path.stem] = json.load(f)
+
+    def respond(self, prompt: str, method: Optional[str] = None) -> FakeReply:
+        if not method or method not in self.responses:
+            method = detect_method(prompt)
+
+        with self._lock:
+            latency = self.latency.sample()
+            status_code = self.faults.pick_status()
+
+        if status_code != 200:
+            # Errors come back quickly, like a real rate limiter
+            return FakeReply(status_code, "", min(latency, 0.05), None, method)
+
+        payload = self.responses.get(method, {"error": f"No canned response for {method}"})
+        content = json.dumps(payload)
+
+        if self.tokens_per_second:
+            time_to_first_token = latency
+            latency += estimate_tokens(content) / self.tokens_per_second
+        else:
+            time_to_first_token = latency * self.first_token_fraction
+
+        return FakeReply(
+            status_code=200,
+            content=content,
+            latency=latency,
+            time_to_first_token=time_to_first_token,
+            method=method
+        )
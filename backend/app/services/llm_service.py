@@ -1,16 +1,81 @@
-import openai
+import asyncio
 import logging
 import json
 import re
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, AsyncIterator, Optional, List
 from sqlalchemy.orm import Session
 
 from config.settings import settings
+from app.core import metrics
+from app.core.deadline import DeadlineExceeded, current_budget
+from app.core.json_stream import JSONArrayStream
+from app.core.rate_limit import RateLimiter, acquire_scoped
+from app.services.llm_backends import DeltaCallback, LLMBackend, LLMBackendError, LLMRequest, create_backend
+from app.services.llm_batch import batch_execution_active, create_batch_backend
+from app.services.skill_extractor import skill_extractor, to_direct_matches, to_skill_matches
 from app.models.document import Document
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
+# Weight of the latest call in ``LLMService.recent_latency`` and ``recent_throughput``
+LATENCY_SMOOTHING = 0.2
+
+# Below these a call cannot produce a usable result inside its time budget
+MIN_CALL_SECONDS = 5.0
+MIN_COMPLETION_TOKENS = 256
+
+# Background questionnaire answers the prompts read from the user context, with their labels
+QUESTIONNAIRE_CONTEXT_FIELDS = {
+    "career_values": "Career values",
+    "mission_alignment": "Mission alignment",
+    "service_experience": "Service experience",
+    "helping_others": "Helping others",
+    "learning_style": "Learning style",
+    "work_environment": "Preferred work environment",
+    "collaboration_style": "Collaboration style",
+}
+
+# Portfolio project sections generated in parallel in "sectioned" mode: (focus, JSON schema)
+PORTFOLIO_SECTIONS = {
+    "technical_demonstration": (
+        "the technical skills and stack the project showcases",
+        """{
+    "core_skills_showcased": [{"skill": "technical skill demonstrated", "application": "how it's used in the project", "proficiency_level": "level they'll achieve"}],
+    "technology_stack": ["specific tools, languages, platforms used"],
+    "complexity_indicators": ["aspects that show technical sophistication"]
+  }""",
+    ),
+    "values_service_integration": (
+        "Ignatian integration: how the project expresses their values and serves others",
+        """{
+    "values_expression": [{"value": "core value", "manifestation": "how it's expressed in the project", "impact": "difference this makes"}],
+    "service_dimensions": [{"stakeholder_group": "who is served", "service_provided": "how they're helped", "impact_measurement": "how to measure the benefit"}],
+    "common_good_contribution": "how this serves the broader community"
+  }""",
+    ),
+    "implementation_roadmap": (
+        "milestones: phases, timeline and resources",
+        """{
+    "phases": [{"phase_name": "phase title", "duration": "time estimate", "key_activities": ["main tasks in this phase"], "deliverables": ["outputs produced in this phase"], "milestone_indicators": ["how to know this phase is complete"]}],
+    "total_timeline": "overall project duration",
+    "resource_requirements": ["tools, data, access, or support needed"]
+  }""",
+    ),
+    "deliverables_portfolio": (
+        "the concrete deliverables and how each is presented",
+        """[{"deliverable_name": "specific output", "description": "what this deliverable includes", "skills_demonstrated": ["competencies this showcases"], "presentation_format": "how this will be presented"}]""",
+    ),
+    "interview_preparation": (
+        "how to talk about the project in interviews (the evaluation of their work)",
+        """{
+    "storytelling_framework": {"situation": "project context", "task": "challenge addressed", "action": "what they did", "result": "what they accomplished", "reflection": "what this means for their development and calling"},
+    "technical_talking_points": [{"topic": "technical area to discuss", "key_points": ["main things to highlight"], "evidence": "specific examples to share"}],
+    "values_integration_stories": [{"scenario": "situation that demonstrates values", "decision_process": "how they chose their approach", "values_expression": "how their values guided them", "impact_story": "difference this made"}]
+  }""",
+    ),
+}
+
 class LLMService:
     """
     Consolidated LLM Service with improved prompt engineering, few-shot learning,
@@ -18,10 +83,26 @@ class LLMService:
     Pedagogical Paradigm implementation.
     """
     
-    def __init__(self):
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        self.backend = backend or create_backend()
         self.model = "gpt-4o-mini"  # Using the latest efficient model
         self.prompt_version = "v2.1"
+        self.max_retries = 2
+        self.retry_backoff_seconds = 1.0
+        self.rate_limiter = RateLimiter(settings.llm_requests_per_minute)
+        # Running average of real-time provider call duration (seconds), for load shedding
+        self.recent_latency = 0.0
+        # Running average of generation speed (completion tokens per second), for time budgets
+        self.recent_throughput = settings.llm_expected_tokens_per_second
+        # Created on first use by calls made inside llm_batch.batch_execution()
+        self.batch_backend: Optional[LLMBackend] = None
+    
+    def _backend_for_call(self) -> LLMBackend:
+        if not batch_execution_active():
+            return self.backend
+        if self.batch_backend is None:
+            self.batch_backend = create_batch_backend()
+        return self.batch_backend
     
     def _get_system_prompt(self, user_context: Optional[Dict[str, Any]] = None) -> str:
         """Enhanced system prompt with user context and detailed Ignatian guidance"""
@@ -65,6 +146,13 @@ STUDENT CONTEXT:
 Tailor your responses to this student's specific context and developmental stage."""
             base_prompt += user_details
 
+            answers = [
+                f"- {label}: {user_context[field]}"
+                for field, label in QUESTIONNAIRE_CONTEXT_FIELDS.items() if user_context.get(field)
+            ]
+            if answers:
+                base_prompt += "\n\nIN THE STUDENT'S OWN WORDS (background questionnaire):\n" + "\n".join(answers)
+
         return base_prompt
     
     async def analyze_resume(self, resume_text: str, user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -199,8 +287,8 @@ Return ONLY valid JSON without any markdown formatting or additional text.
         logger.debug(f"Prompt includes: character_strengths, values_indicators, growth_mindset fields")
         
         try:
-            response = await self._call_openai(prompt, user_context)
-            result = self._parse_json_response(response)
+            response = await self._call_openai(prompt, user_context, method="analyze_resume")
+            result = self._parse_json_response(response, method="analyze_resume")
             
             # Ensure backward compatibility by maintaining old structure
             if "technical_skills" in result and "skills" not in result:
@@ -221,6 +309,155 @@ Return ONLY valid JSON without any markdown formatting or additional text.
             logger.error(f"Error analyzing resume: {str(e)}")
             return self._create_error_response("resume analysis", str(e))
     
+    async def analyze_resume_section(self, section_kind: str, section_text: str) -> Dict[str, Any]:
+        """Structured extraction of one resume section (no user context, so results can be cached by text)"""
+        
+        prompt = f"""TASK: Extract the structured content of ONE resume section. Other sections are extracted separately and merged afterwards, so report only what this section itself shows and do not guess at the rest of the resume.
+
+SECTION TYPE: {section_kind}
+
+OUTPUT SCHEMA (JSON) - include only the keys this section provides evidence for:
+{{
+  "personal_info": {{
+    "name": "extracted or 'Not provided'",
+    "contact_details": "summary of available contact info",
+    "location": "city/state if mentioned"
+  }},
+  "experience": [
+    {{
+      "role": "position title",
+      "organization": "company name",
+      "duration": "time period",
+      "key_achievements": ["achievement 1", "achievement 2"],
+      "service_impact": "how this role served others or created value",
+      "transferable_skills": ["skill that transfers to other roles"],
+      "growth_indicators": "what this shows about their development"
+    }}
+  ],
+  "education": {{
+    "degree": "degree type and field",
+    "institution": "school name",
+    "achievements": ["relevant achievements"],
+    "extracurricular": ["activities showing character/values"]
+  }},
+  "projects": [
+    {{
+      "title": "project name",
+      "description": "what they accomplished",
+      "impact": "value created or problem solved",
+      "skills_demonstrated": ["technical and soft skills shown"]
+    }}
+  ],
+  "technical_skills": [
+    {{
+      "skill": "skill name",
+      "category": "technical/software/analytical/etc",
+      "proficiency_level": "beginner/intermediate/advanced/expert",
+      "evidence": "where this skill was demonstrated"
+    }}
+  ],
+  "soft_skills": [
+    {{
+      "skill": "skill name",
+      "evidence": "specific example from this section",
+      "ignatian_alignment": "how this connects to service/growth/collaboration"
+    }}
+  ],
+  "values_evidence": {{
+    "service_orientation": ["examples of serving others/community"],
+    "collaboration": ["evidence of teamwork"],
+    "continuous_learning": ["examples of seeking growth"],
+    "excellence_pursuit": ["evidence of striving for quality"],
+    "cultural_awareness": ["signs of global/diverse perspective"]
+  }}
+}}
+
+RESUME SECTION:
+{section_text}
+
+Return ONLY valid JSON without any markdown formatting or additional text.
+"""
+        
+        try:
+            response = await self._call_openai(prompt, method="analyze_resume_section", max_tokens=1500)
+            return self._parse_json_response(response, method="analyze_resume_section")
+        except Exception as e:
+            logger.error(f"Error analyzing resume section: {str(e)}")
+            return self._create_error_response("resume section analysis", str(e))
+    
+    async def synthesize_resume_analysis(self, extracts: Dict[str, Any], user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Whole-resume judgements (strengths, trajectory, values) from merged section extracts"""
+        
+        prompt = f"""TASK: Combine these per-section resume extracts into the overall assessment, using chain-of-thought reasoning and the Ignatian principle of understanding CONTEXT. The extracts already hold the experience, education, projects and skills; judge the person's journey as a whole.
+
+REASONING PROCESS:
+1. Read the extracts to understand the person's journey
+2. Identify patterns across experiences that reveal character and values
+3. Assess career trajectory and growth mindset indicators
+4. Consider how their background connects to Ignatian values
+
+OUTPUT SCHEMA (JSON):
+{{
+  "metadata": {{
+    "analysis_version": "{self.prompt_version}",
+    "confidence_score": 0.85,
+    "analysis_timestamp": "timestamp"
+  }},
+  "strengths": [
+    {{
+      "strength": "key strength",
+      "evidence": "specific example",
+      "workplace_value": "how this benefits employers"
+    }}
+  ],
+  "career_level": "entry-level/mid-level/senior/executive",
+  "industries": ["relevant industries/domains"],
+  "character_strengths": [
+    {{
+      "strength": "identified character trait",
+      "evidence": "specific examples",
+      "ignatian_dimension": "service/excellence/growth/collaboration",
+      "potential_in_workplace": "how this would benefit employers"
+    }}
+  ],
+  "values_indicators": {{
+    "service_orientation": ["examples of serving others/community"],
+    "collaboration": ["evidence of teamwork"],
+    "continuous_learning": ["examples of seeking growth"],
+    "excellence_pursuit": ["evidence of striving for quality"],
+    "cultural_awareness": ["signs of global/diverse perspective"]
+  }},
+  "growth_mindset": {{
+    "indicators": ["specific examples of learning from challenges"],
+    "development_areas": ["areas they're actively improving"],
+    "readiness_for_growth": "assessment of openness to new challenges"
+  }},
+  "career_trajectory": {{
+    "current_level": "entry-level/emerging professional/experienced",
+    "progression_pattern": "description of how they've grown",
+    "readiness_indicators": "signs of preparation for next level",
+    "growth_areas": ["areas for continued development"]
+  }},
+  "recommended_next_steps": [
+    "specific suggestion for their development",
+    "area to explore further",
+    "opportunity to pursue"
+  ]
+}}
+
+RESUME EXTRACTS:
+{json.dumps(extracts, indent=2)}
+
+Return ONLY valid JSON without any markdown formatting or additional text.
+"""
+        
+        try:
+            response = await self._call_openai(prompt, user_context, method="synthesize_resume_analysis", max_tokens=2500)
+            return self._parse_json_response(response, method="synthesize_resume_analysis")
+        except Exception as e:
+            logger.error(f"Error synthesizing resume analysis: {str(e)}")
+            return self._create_error_response("resume analysis", str(e))
+    
     async def analyze_job_description(self, job_text: str, user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analyze job description and extract key requirements with enhanced cultural values extraction"""
         
@@ -311,8 +548,8 @@ Return ONLY valid JSON without any markdown formatting or additional text.
 """
         
         try:
-            response = await self._call_openai(prompt, user_context)
-            result = self._parse_json_response(response)
+            response = await self._call_openai(prompt, user_context, method="analyze_job_description")
+            result = self._parse_json_response(response, method="analyze_job_description")
             
             # Ensure backward compatibility
             if "metadata" in result:
@@ -324,8 +561,82 @@ Return ONLY valid JSON without any markdown formatting or additional text.
             logger.error(f"Error analyzing job description: {str(e)}")
             return self._create_error_response("job description analysis", str(e))
     
-    async def extract_detailed_evidence(self, resume_text: str, job_text: str) -> Dict[str, Any]:
-        """Extract specific quotes and evidence from resume and job description"""
+    async def analyze_resume_lite(self, resume_text: str, user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Compact resume analysis for the lite tier: the core fields of ``analyze_resume`` only"""
+        
+        prompt = f"""TASK: Summarize this resume in compact form. Extract only the facts below; keep every string short.
+
+OUTPUT SCHEMA (JSON):
+{{
+  "metadata": {{
+    "analysis_version": "{self.prompt_version}",
+    "analysis_tier": "lite"
+  }},
+  "personal_info": {{"name": "full name if present", "location": "location if present"}},
+  "skills": {{"technical": ["technical skills"], "soft": ["soft skills"]}},
+  "experience": [
+    {{"role": "job title", "organization": "employer", "duration": "dates", "key_achievements": ["up to 2 achievements"]}}
+  ],
+  "education": {{"degree": "degree", "institution": "school"}},
+  "strengths": [{{"strength": "strength", "evidence": "short evidence"}}],
+  "career_level": "entry-level/mid-level/senior"
+}}
+
+Resume text:
+{resume_text}
+
+Return ONLY valid JSON without any markdown formatting or additional text.
+"""
+        
+        try:
+            response = await self._call_openai(prompt, user_context, method="analyze_resume_lite", max_tokens=1200)
+            return self._mark_lite(self._parse_json_response(response, method="analyze_resume_lite"))
+        except Exception as e:
+            logger.error(f"Error in lite resume analysis: {str(e)}")
+            return self._create_error_response("resume analysis", str(e))
+    
+    async def analyze_job_description_lite(self, job_text: str, user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Compact job description analysis for the lite tier: the core fields of ``analyze_job_description`` only"""
+        
+        prompt = f"""TASK: Summarize this job posting in compact form. Extract only the facts below; keep every string short.
+
+OUTPUT SCHEMA (JSON):
+{{
+  "metadata": {{
+    "analysis_version": "{self.prompt_version}",
+    "analysis_tier": "lite"
+  }},
+  "job_title": "position title",
+  "company": "company name if mentioned",
+  "required_skills": ["essential skills"],
+  "preferred_skills": ["nice-to-have skills"],
+  "responsibilities": ["up to 5 key responsibilities"],
+  "qualifications": ["education and experience requirements"],
+  "job_level": "entry-level/mid-level/senior",
+  "key_requirements": ["top 5 requirements"],
+  "company_values": ["stated values or culture"]
+}}
+
+Job posting text:
+{job_text}
+
+Return ONLY valid JSON without any markdown formatting or additional text.
+"""
+        
+        try:
+            response = await self._call_openai(prompt, user_context, method="analyze_job_description_lite", max_tokens=1000)
+            return self._mark_lite(self._parse_json_response(response, method="analyze_job_description_lite"))
+        except Exception as e:
+            logger.error(f"Error in lite job description analysis: {str(e)}")
+            return self._create_error_response("job description analysis", str(e))
+    
+    async def extract_detailed_evidence(self, resume_text: str, job_text: str, skill_candidates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Extract specific quotes and evidence from resume and job description
+        
+        ``skill_candidates`` (from skill_extractor.match_documents) are exact
+        matches found locally; the model only judges the remaining requirements
+        and the local matches are merged into direct_matches afterwards.
+        """
         
         prompt = """
         Extract EXACT QUOTES from the job description and resume to show evidence of matches and gaps.
@@ -335,7 +646,7 @@ Return ONLY valid JSON without any markdown formatting or additional text.
         
         Resume:
         {resume_text}
-        
+        {skill_candidates}
         Provide a JSON response with this EXACT structure:
         {{
             "skill_alignment": {{
@@ -383,7 +694,7 @@ Return ONLY valid JSON without any markdown formatting or additional text.
         9. Try to find 2 different pieces of evidence from the resume for each requirement when possible
         10. Each evidence quote should be from a different section/experience in the resume
         11. Never put "— (no direct evidence)" in the direct_matches section - those belong in skill_gaps
-        12. Include at least 3-5 direct matches (with real evidence) and 2-4 gaps
+        12. Include at least 3-5 direct matches (with real evidence) and 2-4 gaps, counting any pre-matched skills
         13. Return ONLY the JSON object, no other text or formatting
         """
         
@@ -391,15 +702,23 @@ Return ONLY valid JSON without any markdown formatting or additional text.
             response = await self._call_openai(
                 prompt.format(
                     job_text=job_text,
-                    resume_text=resume_text
-                )
+                    resume_text=resume_text,
+                    skill_candidates=self._skill_candidates_section(skill_candidates)
+                ),
+                method="extract_detailed_evidence"
             )
-            return self._parse_json_response(response)
+            result = self._parse_json_response(response, method="extract_detailed_evidence")
+            if skill_candidates and isinstance(result.get("skill_alignment"), dict):
+                alignment = result["skill_alignment"]
+                alignment["direct_matches"] = self._merge_local_matches(
+                    to_direct_matches(skill_candidates), alignment.get("direct_matches")
+                )
+            return result
         except Exception as e:
             logger.error(f"Error extracting detailed evidence: {str(e)}")
             return self._create_error_response("evidence extraction", str(e))
     
-    async def find_connections(self, resume_analysis: Dict[str, Any], job_analysis: Dict[str, Any], user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def find_connections(self, resume_analysis: Dict[str, Any], job_analysis: Dict[str, Any], user_context: Optional[Dict[str, Any]] = None, skill_candidates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Enhanced connections analysis using sophisticated matching algorithms"""
         
         prompt = f"""TASK: Using the Ignatian Pedagogical Paradigm, conduct a sophisticated analysis of connections between this candidate and role. Focus on authentic alignment, growth potential, and service opportunities.
@@ -497,15 +816,20 @@ CANDIDATE ANALYSIS:
 
 ROLE ANALYSIS:  
 {json.dumps(job_analysis, indent=2)}
-
+{self._skill_candidates_section(skill_candidates, field="skill_matches")}
 Apply the Ignatian framework and sophisticated matching process to provide a comprehensive connections analysis.
 Focus on authentic alignment, meaningful growth opportunities, and how this role could serve as a genuine calling in their career journey.
 Return ONLY valid JSON without any markdown formatting or additional text.
 """
         
         try:
-            response = await self._call_openai(prompt, user_context)
-            return self._parse_json_response(response)
+            response = await self._call_openai(prompt, user_context, method="find_connections")
+            result = self._parse_json_response(response, method="find_connections")
+            if skill_candidates and "error" not in result:
+                result["skill_matches"] = self._merge_local_matches(
+                    to_skill_matches(skill_candidates), result.get("skill_matches")
+                )
+            return result
         except Exception as e:
             logger.error(f"Error finding connections: {str(e)}")
             return self._create_error_response("connections analysis", str(e))
@@ -550,11 +874,12 @@ Return ONLY valid JSON without any markdown formatting or additional text.
                     connections=connections,
                     job_title=job_title,
                     company_name=company_name
-                )
+                ),
+                method="generate_context_summary"
             )
             
             # Parse the JSON response using the existing method
-            result = self._parse_json_response(response)
+            result = self._parse_json_response(response, method="generate_context_summary")
             
             # Check if parsing was successful
             if "error" in result:
@@ -586,6 +911,94 @@ Return ONLY valid JSON without any markdown formatting or additional text.
                 "gaps": []
             }
     
+    async def analyze_job_match(self, resume_analysis: Dict[str, Any], resume_text: str, job_analysis: Dict[str, Any], job_text: str, user_context: Optional[Dict[str, Any]] = None, skill_candidates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fused matching: connections, quoted evidence and context summary in one structured call
+        
+        Replaces the sequential find_connections, extract_detailed_evidence and
+        generate_context_summary calls, which all re-read the same inputs.
+        """
+        
+        company_name = job_analysis.get('company', 'the company')
+        job_title = job_analysis.get('job_title', 'the role')
+        
+        prompt = f"""TASK: Using the Ignatian Pedagogical Paradigm, produce a complete candidate-to-role match in ONE response: holistic connections, exact-quote evidence, and the Context stage summary.
+
+IGNATIAN ANALYSIS FRAMEWORK:
+1. CONTEXT ASSESSMENT: How well does their background prepare them for this environment?
+2. EXPERIENCE CONNECTIONS: What experiences translate most powerfully to this role?
+3. REFLECTION OPPORTUNITIES: What deeper questions should they explore about fit and calling?
+4. ACTION POTENTIAL: What specific projects would demonstrate their value and growth?
+5. EVALUATION CRITERIA: How can they assess success and continued development?
+
+EVIDENCE RULES:
+1. Use EXACT QUOTES from the resume and job description texts below - do not paraphrase
+2. A requirement is a direct match only if you can quote evidence from the resume; otherwise it is a skill gap
+3. candidate_evidence holds 1-2 quotes from different resume sections; connection_explanations has one entry per quote
+4. Include 3-5 direct matches and 2-4 gaps
+
+OUTPUT SCHEMA (JSON):
+{{
+  "metadata": {{
+    "analysis_version": "{self.prompt_version}",
+    "confidence_score": 0.88,
+    "matching_algorithm": "ignatian_fused_v1"
+  }},
+  "connections": {{
+    "skill_matches": [{{"skill": "matched skill", "confidence_score": 8.5, "evidence": "specific evidence from resume"}}],
+    "experience_connections": [{{"candidate_experience": "experience", "role_relevance": "how it prepares them", "transferable_lessons": "what applies", "storytelling_potential": "how to present it"}}],
+    "growth_opportunities": [{{"area": "competency", "current_level": "now", "target_level": "needed", "development_timeline": "timeframe", "support_needed": "resources"}}],
+    "value_alignment": {{"shared_values": ["value"], "cultural_fit_indicators": ["evidence"], "service_orientation": "commitment to serving others"}},
+    "unique_strengths": ["what makes them stand out"],
+    "development_areas": ["skills to develop"],
+    "portfolio_project_themes": [{{"theme": "focus", "skills_demonstrated": ["skill"], "service_dimension": "who it serves", "feasibility_score": 8.5}}],
+    "ignatian_reflection_points": [{{"category": "values_alignment/service_to_others/personal_mission/growth_opportunities", "question": "reflection question", "context": "why it matters"}}],
+    "overall_fit_score": 8.5,
+    "next_steps_suggestions": [{{"action": "next step", "timeline": "when", "resources_needed": "support", "success_criteria": "how to know"}}]
+  }},
+  "skill_alignment": {{
+    "direct_matches": [{{"skill": "job requirement", "job_requirement_snippet": "exact job quote", "candidate_evidence": ["exact resume quote"], "connection_explanations": ["why it demonstrates the requirement"], "role_application": "how it applies", "confidence_score": 8, "strength_level": "strong", "source_reference": "job description section"}}],
+    "skill_gaps": [{{"missing_skill": "job requirement", "job_requirement_snippet": "exact job quote", "importance": "critical/important/nice-to-have", "learning_pathway": "how to develop", "mitigation_strategy": "how to address", "portfolio_project_opportunity": "project idea", "source_reference": "job description section"}}]
+  }},
+  "summary": {{
+    "context_summary": "2-3 paragraph encouraging, reflective narrative of their strengths and promising connections",
+    "role_fit_narrative": "2-3 sentences on why this candidate makes sense for {job_title} at {company_name}",
+    "strengths": ["3-5 job requirements clearly evident in the resume"],
+    "gaps": ["2-4 job requirements not yet evident, framed as growth opportunities"]
+  }}
+}}
+
+CANDIDATE ANALYSIS:
+{json.dumps(resume_analysis)}
+
+ROLE ANALYSIS:
+{json.dumps(job_analysis)}
+
+RESUME TEXT:
+{resume_text}
+
+JOB DESCRIPTION TEXT:
+{job_text}
+{self._skill_candidates_section(skill_candidates, field="skill_matches and direct_matches")}
+Return ONLY valid JSON without any markdown formatting or additional text.
+"""
+        
+        try:
+            # The combined schema needs more room than a single-step response
+            response = await self._call_openai(prompt, user_context, method="analyze_job_match", max_tokens=8000)
+            result = self._parse_json_response(response, method="analyze_job_match")
+            if skill_candidates and isinstance(result.get("connections"), dict):
+                result["connections"]["skill_matches"] = self._merge_local_matches(
+                    to_skill_matches(skill_candidates), result["connections"].get("skill_matches")
+                )
+            if skill_candidates and isinstance(result.get("skill_alignment"), dict):
+                result["skill_alignment"]["direct_matches"] = self._merge_local_matches(
+                    to_direct_matches(skill_candidates), result["skill_alignment"].get("direct_matches")
+                )
+            return result
+        except Exception as e:
+            logger.error(f"Error in fused job match analysis: {str(e)}")
+            return self._create_error_response("fused job match analysis", str(e))
+    
     # Enhanced methods from enhanced_llm_service.py
     
     async def generate_reflection_synthesis(self, selected_experiences: List[Dict[str, Any]], connections_analysis: Dict[str, Any], user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -672,8 +1085,8 @@ Return ONLY valid JSON without any markdown formatting or additional text.
 """
         
         try:
-            response = await self._call_openai(prompt, user_context)
-            return self._parse_json_response(response)
+            response = await self._call_openai(prompt, user_context, method="generate_reflection_synthesis")
+            return self._parse_json_response(response, method="generate_reflection_synthesis")
         except Exception as e:
             logger.error(f"Error generating reflection synthesis: {str(e)}")
             return self._create_error_response("reflection synthesis", str(e))
@@ -720,15 +1133,22 @@ Return ONLY valid JSON without any markdown formatting or additional text.
 """
         
         try:
-            response = await self._call_openai(prompt, user_context)
-            result = self._parse_json_response(response)
+            response = await self._call_openai(prompt, user_context, method="generate_ignatian_reflection_prompts")
+            result = self._parse_json_response(response, method="generate_ignatian_reflection_prompts")
             return result.get('prompts', [])
         except Exception as e:
             logger.error(f"Error generating reflection prompts: {str(e)}")
             return self._create_fallback_reflection_prompts()
     
-    async def generate_portfolio_project(self, synthesis_analysis: Dict[str, Any], reflection_responses: Dict[str, str], user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Enhanced portfolio project generation based on complete Ignatian journey"""
+    async def generate_portfolio_project(self, synthesis_analysis: Dict[str, Any], reflection_responses: Dict[str, str], user_context: Optional[Dict[str, Any]] = None, mode: Optional[str] = None) -> Dict[str, Any]:
+        """Enhanced portfolio project generation based on complete Ignatian journey
+        
+        ``mode`` (default ``PORTFOLIO_GENERATION_MODE``) is "single" for one
+        large call or "sectioned" to plan first and generate sections in parallel.
+        """
+        
+        if (mode or settings.portfolio_generation_mode) == "sectioned":
+            return await self._generate_portfolio_project_sectioned(synthesis_analysis, reflection_responses, user_context)
         
         prompt = f"""TASK: Design a portfolio project that authentically integrates this student's technical capabilities, values, and calling based on their complete Ignatian journey of synthesis and reflection.
 
@@ -855,16 +1275,119 @@ Return ONLY valid JSON without any markdown formatting or additional text.
 """
         
         try:
-            response = await self._call_openai(prompt, user_context)
-            return self._parse_json_response(response)
+            response = await self._call_openai(prompt, user_context, method="generate_portfolio_project")
+            return self._parse_json_response(response, method="generate_portfolio_project")
         except Exception as e:
             logger.error(f"Error generating portfolio project: {str(e)}")
             return self._create_error_response("portfolio project generation", str(e))
     
+    async def _generate_portfolio_project_sectioned(self, synthesis_analysis: Dict[str, Any], reflection_responses: Dict[str, str], user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Map-reduce portfolio generation: a short planning call, then all sections concurrently
+        
+        The single-call path is bound by sequential generation of a ~4000 token
+        plan; here the longest path is the plan plus the slowest section.
+        """
+        
+        journey = f"""SYNTHESIS ANALYSIS:
+{json.dumps(synthesis_analysis, indent=2)}
+
+REFLECTION RESPONSES:
+{json.dumps(reflection_responses, indent=2)}"""
+        
+        plan_prompt = f"""TASK: Plan a portfolio project that authentically integrates this student's technical capabilities, values, and calling. Fix the title, scope and objectives only; the detailed sections are written separately.
+
+IGNATIAN PROJECT DESIGN PRINCIPLES: authenticity, service to others, excellence, growth, integration of head, heart and hands, real-world impact.
+
+OUTPUT SCHEMA (JSON):
+{{
+  "metadata": {{
+    "project_version": "{self.prompt_version}",
+    "design_confidence": 0.91,
+    "generation_mode": "sectioned"
+  }},
+  "project_overview": {{
+    "title": "compelling project title",
+    "tagline": "one-sentence description of the project's purpose",
+    "overview": "2-3 paragraph description of what this project accomplishes",
+    "unique_value_proposition": "what makes this project special and impactful",
+    "calling_connection": "how this project expresses their unique calling"
+  }},
+  "objectives_outcomes": {{
+    "primary_objectives": ["main goal 1", "main goal 2", "main goal 3"],
+    "learning_objectives": ["skill/knowledge they'll develop"],
+    "impact_objectives": ["difference this will make for others"],
+    "career_objectives": ["how this advances their professional goals"]
+  }}
+}}
+
+{journey}
+
+Return ONLY valid JSON without any markdown formatting or additional text.
+"""
+        
+        try:
+            plan_response = await self._call_openai(plan_prompt, user_context, method="plan_portfolio_project", max_tokens=1200)
+            plan = self._parse_json_response(plan_response, method="plan_portfolio_project")
+        except Exception as e:
+            logger.error(f"Error planning portfolio project: {str(e)}")
+            return self._create_error_response("portfolio project generation", str(e))
+        
+        if "error" in plan:
+            return self._create_error_response("portfolio project generation", plan.get("details", plan["error"]))
+        
+        project_scope = json.dumps({
+            "project_overview": plan.get("project_overview", {}),
+            "objectives_outcomes": plan.get("objectives_outcomes", {}),
+        }, indent=2)
+        
+        async def generate_section(name: str) -> Any:
+            focus, schema = PORTFOLIO_SECTIONS[name]
+            method = f"portfolio_section_{name}"
+            prompt = f"""TASK: Write the "{name}" section of this student's portfolio project plan, covering {focus}. Stay consistent with the fixed project plan below; do not rename or rescope the project.
+
+FIXED PROJECT PLAN:
+{project_scope}
+
+{journey}
+
+OUTPUT SCHEMA (JSON):
+{{
+  "{name}": {schema}
+}}
+
+Return ONLY valid JSON without any markdown formatting or additional text.
+"""
+            response = await self._call_openai(prompt, user_context, method=method, max_tokens=1500)
+            return self._parse_json_response(response, method=method).get(name)
+        
+        names = list(PORTFOLIO_SECTIONS)
+        sections = await asyncio.gather(*(generate_section(name) for name in names), return_exceptions=True)
+        
+        project = dict(plan)
+        for name, section in zip(names, sections):
+            if isinstance(section, Exception) or section is None:
+                logger.warning(f"Portfolio section {name} failed: {section}")
+                continue
+            project[name] = section
+        return project
+    
     async def generate_interview_questions(self, project_plan: Dict[str, Any], connections_analysis: Dict[str, Any], user_context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Enhanced interview question generation with sophisticated preparation guidance"""
         
-        prompt = f"""TASK: Generate sophisticated interview questions tailored to this student's portfolio project and background, with detailed preparation guidance for authentic, values-driven responses.
+        prompt = self._interview_questions_prompt(project_plan, connections_analysis)
+        
+        try:
+            response = await self._call_openai(prompt, user_context, method="generate_interview_questions")
+            result = self._parse_json_response(response, method="generate_interview_questions")
+            return result.get('questions', [])
+        except Exception as e:
+            logger.error(f"Error generating interview questions: {str(e)}")
+            return self._create_fallback_interview_questions()
+    
+    def _interview_questions_prompt(self, project_plan: Dict[str, Any], connections_analysis: Dict[str, Any]) -> str:
+        """Prompt shared by generate_interview_questions and stream_interview_questions"""
+        
+        return f"""TASK: Generate sophisticated interview questions tailored to this student's portfolio project and background, with detailed preparation guidance for authentic, values-driven responses.
 
 INTERVIEW QUESTION FRAMEWORK:
 - BEHAVIORAL: Past experiences that predict future performance
@@ -911,36 +1434,180 @@ CONNECTIONS ANALYSIS CONTEXT:
 Generate 8-10 interview questions across all categories that would be realistic for their target role.
 Return ONLY valid JSON without any markdown formatting or additional text.
 """
+    
+    async def stream_interview_questions(self, project_plan: Dict[str, Any], connections_analysis: Dict[str, Any], user_context: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Like generate_interview_questions, but yields each question as soon as it is complete"""
         
+        prompt = self._interview_questions_prompt(project_plan, connections_analysis)
+        queue: asyncio.Queue = asyncio.Queue()
+        parser = JSONArrayStream("questions")
+        
+        def on_delta(text: str) -> None:
+            for question in parser.feed(text):
+                queue.put_nowait(question)
+        
+        call = asyncio.create_task(
+            self._call_openai(prompt, user_context, method="generate_interview_questions", on_delta=on_delta)
+        )
+        call.add_done_callback(lambda _: queue.put_nowait(None))
+        
+        yielded = 0
         try:
-            response = await self._call_openai(prompt, user_context)
-            result = self._parse_json_response(response)
-            return result.get('questions', [])
+            while True:
+                question = await queue.get()
+                if question is None:
+                    break
+                yielded += 1
+                yield question
+        finally:
+            if not call.done():
+                call.cancel()
+        
+        try:
+            response = call.result()
         except Exception as e:
-            logger.error(f"Error generating interview questions: {str(e)}")
-            return self._create_fallback_interview_questions()
+            logger.error(f"Error streaming interview questions: {str(e)}")
+            if not yielded:
+                for question in self._create_fallback_interview_questions():
+                    yield question
+            return
+        
+        if not yielded:
+            # The model did not return the expected shape; fall back to the regular parser
+            result = self._parse_json_response(response, method="generate_interview_questions")
+            questions = result.get('questions', []) if "error" not in result else self._create_fallback_interview_questions()
+            for question in questions:
+                yield question
     
-    async def _call_openai(self, prompt: str, user_context: Optional[Dict[str, Any]] = None) -> str:
-        """Enhanced OpenAI API call with user context and improved error handling"""
-        try:
-            system_prompt = self._get_system_prompt(user_context)
+    def _skill_candidates_section(self, skill_candidates: Optional[Dict[str, Any]], field: str = "direct_matches") -> str:
+        """Prompt block listing locally matched skills so the model skips them"""
+        if not skill_candidates:
+            return ""
+        
+        matched = [candidate["skill"] for candidate in skill_candidates.get("direct_matches", [])]
+        unmatched = [candidate["skill"] for candidate in skill_candidates.get("job_only", [])]
+        lines = ["", "PRE-MATCHED SKILLS:"]
+        if matched:
+            lines.append(f"These skills appear in both documents and are already included in {field} with quoted evidence; do NOT repeat them: {', '.join(matched)}")
+        if unmatched:
+            lines.append(f"Named in the job description but not in the resume; judge whether the resume shows them indirectly, otherwise treat them as gaps: {', '.join(unmatched)}")
+        lines.append("")
+        return "\n".join(lines)
+    
+    def _merge_local_matches(self, local: List[Dict[str, Any]], generated: Any) -> List[Dict[str, Any]]:
+        """Local matches first, then model matches for skills the local pass did not find"""
+        if not isinstance(generated, list):
+            generated = []
+        
+        local_ids = set()
+        for item in local:
+            local_ids.update(skill_extractor.skill_ids(item["skill"]))
+        
+        merged = list(local)
+        for item in generated:
+            name = item.get("skill", "") if isinstance(item, dict) else ""
+            ids = skill_extractor.skill_ids(name)
+            if ids and set(ids) <= local_ids:
+                continue
+            merged.append(item)
+        return merged
+    
+    async def _call_openai(self, prompt: str, user_context: Optional[Dict[str, Any]] = None, method: str = "unknown", max_tokens: int = 4000, on_delta: Optional[DeltaCallback] = None) -> str:
+        """Enhanced LLM call with user context, retries and per-call metrics
+        
+        ``on_delta`` receives completion text as it streams in. Once any text
+        has been delivered a failed call is no longer retried, since the
+        consumer would see the output twice. Inside ``batch_execution()`` the
+        call waits for an offline batch instead and bypasses the real-time
+        rate limiter.
+        
+        Inside a pipeline deadline (see ``app.core.deadline``) the time left
+        becomes the client timeout and caps ``max_tokens``; with too little
+        left the call raises DeadlineExceeded instead of starting.
+        """
+        backend = self._backend_for_call()
+        batched = backend is self.batch_backend
+        budget = None if batched else current_budget()
+        timeout = settings.llm_request_timeout_seconds or None
+        
+        if budget:
+            left = budget.remaining()
+            token_cap = int(left * self.recent_throughput)
+            if left < MIN_CALL_SECONDS or token_cap < MIN_COMPLETION_TOKENS:
+                budget.exceeded = True
+                raise DeadlineExceeded(f"{method} skipped: {left:.1f}s left in its budget")
+            timeout = min(timeout, left) if timeout else left
+            if token_cap < max_tokens:
+                logger.debug(f"Capping {method} max_tokens {max_tokens} -> {token_cap} for {left:.1f}s budget")
+                max_tokens = token_cap
+        
+        request = LLMRequest(
+            method=method,
+            model=self.model,
+            system_prompt=self._get_system_prompt(user_context),
+            prompt=prompt,
+            max_tokens=max_tokens,
+            timeout=timeout
+        )
+        delivered = False
+        
+        def forward(text: str) -> None:
+            nonlocal delivered
+            delivered = True
+            on_delta(text)
+        
+        for attempt in range(self.max_retries + 1):
+            if not batched:
+                # Scoped (background) budgets first, so their waits do not hold a shared slot
+                await acquire_scoped()
+                await self.rate_limiter.acquire()
+            if budget:
+                # Rate limiter waits and retries come out of the same budget
+                request.timeout = min(timeout, budget.remaining())
+            stopwatch = metrics.Stopwatch()
+            try:
+                completion = await backend.complete(request, on_delta=forward if on_delta else None)
+                
+                if completion.cached:
+                    metrics.record_cache_hit(
+                        method, self.model, self.prompt_version,
+                        prompt_tokens=completion.prompt_tokens,
+                        completion_tokens=completion.completion_tokens
+                    )
+                    return completion.content
+                
+                metrics.record_llm_call(
+                    method, self.model, self.prompt_version,
+                    duration=stopwatch.elapsed,
+                    time_to_first_token=completion.time_to_first_token,
+                    prompt_tokens=completion.prompt_tokens,
+                    completion_tokens=completion.completion_tokens
+                )
+                if not batched:
+                    self.recent_latency += LATENCY_SMOOTHING * (stopwatch.elapsed - self.recent_latency)
+                    generating = stopwatch.elapsed - (completion.time_to_first_token or 0.0)
+                    if completion.completion_tokens and generating > 0:
+                        throughput = completion.completion_tokens / generating
+                        self.recent_throughput += LATENCY_SMOOTHING * (throughput - self.recent_throughput)
+                return completion.content
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=4000,
-                presence_penalty=0.1,
-                frequency_penalty=0.1
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            raise Exception(f"OpenAI API call failed: {str(e)}")
+            except LLMBackendError as e:
+                delay = self.retry_backoff_seconds * (2 ** attempt)
+                if budget and budget.remaining() < delay + MIN_CALL_SECONDS:
+                    # Timed out, or no time left to retry: let the step fall back
+                    budget.exceeded = True
+                elif e.retryable and attempt < self.max_retries and not delivered:
+                    logger.warning(f"Transient LLM error in {method} (attempt {attempt + 1}), retrying in {delay}s: {str(e)}")
+                    metrics.record_retry(method, self.model, self.prompt_version)
+                    await asyncio.sleep(delay)
+                    continue
+                metrics.record_llm_error(method, self.model, self.prompt_version, stopwatch.elapsed)
+                raise Exception(f"OpenAI API call failed: {str(e)}")
+            except Exception as e:
+                metrics.record_llm_error(method, self.model, self.prompt_version, stopwatch.elapsed)
+                raise Exception(f"OpenAI API call failed: {str(e)}")
     
-    def _parse_json_response(self, response: str) -> Dict[str, Any]:
+    def _parse_json_response(self, response: str, method: str = "unknown") -> Dict[str, Any]:
         """Enhanced JSON parsing with better error handling and validation"""
         try:
             # Clean up the response
@@ -965,12 +1632,20 @@ Return ONLY valid JSON without any markdown formatting or additional text.
                         continue
             
             # If all parsing fails, create structured error response
+            metrics.record_parse_failure(method, self.model, self.prompt_version)
             return {
                 "error": "Failed to parse LLM response as JSON",
                 "raw_response": response,
                 "parsing_attempts": len(json_patterns)
             }
     
+    def _mark_lite(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Record the lite tier in a result's metadata (models do not reliably echo it)"""
+        if "error" not in result:
+            metadata = result.get("metadata")
+            result["metadata"] = {**(metadata if isinstance(metadata, dict) else {}), "analysis_tier": "lite"}
+        return result
+    
     def _create_error_response(self, operation: str, error_details: str) -> Dict[str, Any]:
         """Create standardized error response structure"""
         return {
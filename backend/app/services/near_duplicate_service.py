@@ -0,0 +1,209 @@
+import copy
+import hashlib
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.models.analysis import DocumentAnalysis, PrecomputedJobAnalysis
+from app.models.document import Document, DocumentLSHBucket, DocumentType
+from app.models.user import User
+from app.services.lite_analysis import is_lite
+from app.services.llm_service import llm_service
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# 128 permutations in 16 bands of 8 rows: a pair at Jaccard 0.9 shares a band
+# with probability 1 - (1 - 0.9**8)**16 > 0.9999, one at 0.5 about 6% of the time
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Word n-grams; short enough that a changed sentence only touches a few shingles
+SHINGLE_WORDS = 3
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+# Fixed seed: signatures are stored, so every worker must use the same permutations.
+# a, b < 2**31 and 32-bit shingle hashes keep a * x + b below 2**64.
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint64)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str) -> List[str]:
+    """Distinct word shingles of lowercased alphanumeric tokens"""
+    tokens = _TOKEN_PATTERN.findall((text or "").lower())
+    if len(tokens) <= SHINGLE_WORDS:
+        return [" ".join(tokens)] if tokens else []
+    return list(dict.fromkeys(" ".join(tokens[i:i + SHINGLE_WORDS]) for i in range(len(tokens) - SHINGLE_WORDS + 1)))
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """NUM_PERM minimum hashes (uint32) of the text's shingle set, or None for empty text"""
+    items = shingles(text)
+    if not items:
+        return None
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=4).digest(), "little") for item in items),
+        dtype=np.uint64,
+        count=len(items)
+    )
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return (permuted.min(axis=1) & _MAX_HASH).astype(np.uint32)
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity: the share of permutations with equal minima"""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def band_buckets(signature: np.ndarray) -> List[int]:
+    """One signed 64-bit bucket key per band"""
+    return [
+        int.from_bytes(hashlib.blake2b(signature[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest(), "little", signed=True)
+        for band in range(BANDS)
+    ]
+
+
+def encode_signature(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def decode_signature(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+class NearDuplicateService:
+    """Finds stored job descriptions that are near-copies of a new one
+
+    The same posting often arrives as slightly different text (copied from
+    LinkedIn rather than the company site, or with a trailing boilerplate
+    block), which exact hashing misses. Each job description gets a MinHash
+    signature at upload; its bands are stored in ``document_lsh_buckets`` so
+    candidates are found with one indexed query, then confirmed against
+    ``NEAR_DUPLICATE_THRESHOLD`` with the full signatures.
+    """
+
+    def index_document(self, db: Session, document: Document) -> Optional[np.ndarray]:
+        """Compute, store and bucket the signature of a job description"""
+        signature = minhash_signature(document.content_text or "")
+        if signature is None:
+            return None
+
+        document.minhash_signature = encode_signature(signature)
+        db.query(DocumentLSHBucket).filter(DocumentLSHBucket.document_id == document.id).delete()
+        for band, bucket in enumerate(band_buckets(signature)):
+            db.add(DocumentLSHBucket(document_id=document.id, band=band, bucket=bucket))
+        db.commit()
+        return signature
+
+    def find_duplicates(self, db: Session, document: Document) -> List[Dict[str, Any]]:
+        """Stored job descriptions at least as similar as the threshold, most similar first"""
+        if document.minhash_signature:
+            signature = decode_signature(document.minhash_signature)
+        else:
+            signature = self.index_document(db, document)
+        if signature is None:
+            return []
+
+        bands = [
+            and_(DocumentLSHBucket.band == band, DocumentLSHBucket.bucket == bucket)
+            for band, bucket in enumerate(band_buckets(signature))
+        ]
+        candidate_ids = db.query(DocumentLSHBucket.document_id).filter(
+            or_(*bands),
+            DocumentLSHBucket.document_id != document.id
+        ).distinct()
+
+        candidates = db.query(Document).filter(
+            Document.id.in_(candidate_ids),
+            Document.document_type == DocumentType.JOB_DESCRIPTION.value,
+            Document.minhash_signature.isnot(None)
+        ).all()
+
+        duplicates = []
+        for candidate in candidates:
+            similarity = estimate_similarity(signature, decode_signature(candidate.minhash_signature))
+            if similarity >= settings.near_duplicate_threshold:
+                duplicates.append({"document": candidate, "similarity": similarity})
+        duplicates.sort(key=lambda item: (-item["similarity"], -item["document"].id))
+        return duplicates
+
+    def reusable_job_analysis(self, db: Session, document_id: int) -> Optional[Dict[str, Any]]:
+        """Job analysis of an already analyzed near-duplicate, for the current prompt version
+
+        Job analyses depend only on the posting text, so one from another
+        user's copy is reused as well; only the analysis itself is returned.
+        """
+        if not settings.near_duplicate_job_reuse:
+            return None
+
+        try:
+            document = db.query(Document).filter(Document.id == document_id).first()
+            if not document or document.document_type != DocumentType.JOB_DESCRIPTION.value:
+                return None
+
+            for duplicate in self.find_duplicates(db, document):
+                job_analysis = self._stored_job_analysis(db, duplicate["document"].id)
+                if job_analysis is None:
+                    continue
+                logger.info(f"Job description {document_id} matches analyzed document {duplicate['document'].id} "
+                            f"(similarity {duplicate['similarity']:.2f}); reusing its job analysis")
+                job_analysis = copy.deepcopy(job_analysis)
+                if isinstance(job_analysis.get("metadata"), dict):
+                    job_analysis["metadata"]["near_duplicate_similarity"] = round(duplicate["similarity"], 3)
+                return job_analysis
+        except Exception as e:
+            logger.warning(f"Near-duplicate lookup for document {document_id} failed: {str(e)}")
+        return None
+
+    def offer(self, db: Session, user: User, document: Document) -> Optional[Dict[str, Any]]:
+        """The user's own closest near-duplicate posting, to point out after upload"""
+        try:
+            for duplicate in self.find_duplicates(db, document):
+                if duplicate["document"].user_id == user.id:
+                    return {
+                        "document_id": duplicate["document"].id,
+                        "original_filename": duplicate["document"].original_filename,
+                        "similarity": round(duplicate["similarity"], 3),
+                        "analyzed": self._stored_job_analysis(db, duplicate["document"].id) is not None,
+                    }
+        except Exception as e:
+            logger.warning(f"Near-duplicate lookup for document {document.id} failed: {str(e)}")
+        return None
+
+    def _stored_job_analysis(self, db: Session, document_id: int) -> Optional[Dict[str, Any]]:
+        """A finished job analysis of a document made with the current prompts"""
+        prompt_version = llm_service.prompt_version
+        precomputed = db.query(PrecomputedJobAnalysis).filter(
+            PrecomputedJobAnalysis.document_id == document_id,
+            PrecomputedJobAnalysis.prompt_version == prompt_version,
+            PrecomputedJobAnalysis.status == "completed"
+        ).first()
+        if precomputed and self._usable(precomputed.job_analysis):
+            return precomputed.job_analysis
+
+        analyses = db.query(DocumentAnalysis).filter(
+            DocumentAnalysis.job_document_id == document_id,
+            DocumentAnalysis.job_analysis.isnot(None)
+        ).order_by(DocumentAnalysis.created_at.desc()).all()
+        for analysis in analyses:
+            job_analysis = analysis.job_analysis
+            if self._usable(job_analysis) and (job_analysis.get("metadata") or {}).get("analysis_version") == prompt_version:
+                return job_analysis
+        return None
+
+    def _usable(self, job_analysis: Any) -> bool:
+        """A full job analysis result (not an error, and a lite analysis is no substitute for a full one)"""
+        return isinstance(job_analysis, dict) and "error" not in job_analysis and not is_lite(job_analysis)
+
+# Global instance
+near_duplicate_service = NearDuplicateService()
@@ -0,0 +1,225 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+import logging
+
+import numpy as np
+
+from app.models.analysis import DocumentAnalysis, PrecomputedJobAnalysis
+from app.models.document import Document
+from app.models.user import User
+from app.services.skill_extractor import skill_extractor
+
+logger = logging.getLogger(__name__)
+
+# Exploration Mode compares 3-5 postings (2 is allowed so partial uploads still work)
+MIN_JOBS = 2
+MAX_JOBS = 5
+
+def compute_overlap(job_skills: List[List[str]], resume_skills: List[str]) -> Dict[str, Any]:
+    """Overlap, coverage and Venn regions for jobs over canonical skill ids
+
+    Every job and the resume become rows of one boolean matrix over the shared
+    skill vocabulary, so all counts come out of a few array operations:
+    pairwise shared counts are ``J @ J.T``, and each skill's membership bitmask
+    (bit i set when job i requires it) assigns it to exactly one Venn region.
+    Ids are returned; callers attach labels.
+    """
+    count = len(job_skills)
+    if count > 62:
+        raise ValueError("Overlap analysis supports at most 62 jobs")
+
+    vocabulary = sorted(set(resume_skills).union(*job_skills))
+    column = {skill: position for position, skill in enumerate(vocabulary)}
+    jobs = np.zeros((count, len(vocabulary)), dtype=bool)
+    for row, skills in enumerate(job_skills):
+        jobs[row, [column[skill] for skill in skills]] = True
+    resume = np.zeros(len(vocabulary), dtype=bool)
+    resume[[column[skill] for skill in resume_skills]] = True
+
+    counts = jobs.astype(np.int32)
+    sizes = counts.sum(axis=1)
+    shared = counts @ counts.T
+    union = sizes[:, None] + sizes[None, :] - shared
+    jaccard = np.divide(shared, union, out=np.zeros(shared.shape), where=union > 0)
+
+    covered = jobs & resume
+    coverage = np.divide(covered.sum(axis=1), sizes, out=np.zeros(count), where=sizes > 0)
+
+    masks = (counts.astype(np.int64) << np.arange(count, dtype=np.int64)[:, None]).sum(axis=0)
+    required = masks > 0
+    demand = counts.sum(axis=0)  # number of jobs requiring each skill
+
+    # Group skills by membership mask in one sort
+    order = np.argsort(masks, kind="stable")
+    region_masks, starts = np.unique(masks[order], return_index=True)
+    groups = np.split(order, starts[1:])
+
+    def ids(selector) -> List[str]:
+        return [vocabulary[position] for position in np.flatnonzero(selector)]
+
+    regions = []
+    for mask, members in zip(region_masks.tolist(), groups):
+        if not mask:
+            continue  # resume-only skills
+        regions.append({
+            "jobs": [row for row in range(count) if mask >> row & 1],
+            "skills": [vocabulary[position] for position in members],
+            "covered": [vocabulary[position] for position in members if resume[position]],
+        })
+
+    missing = required & ~resume
+    gap_order = np.flatnonzero(missing)[np.argsort(-demand[missing], kind="stable")]
+    all_jobs = (1 << count) - 1
+
+    return {
+        "jobs": [
+            {
+                "requirements": ids(jobs[row]),
+                "matched": ids(covered[row]),
+                "missing": ids(jobs[row] & ~resume),
+                "unique": ids(masks == 1 << row),
+                "coverage": float(coverage[row]),
+            }
+            for row in range(count)
+        ],
+        "pairwise": [
+            {
+                "jobs": [a, b],
+                "shared": ids(jobs[a] & jobs[b]),
+                "jaccard": float(jaccard[a, b]),
+            }
+            for a in range(count) for b in range(a + 1, count)
+        ],
+        "regions": regions,
+        "common": ids(masks == all_jobs),
+        "shared_by": np.bincount(demand[required], minlength=count + 1)[1:].tolist(),
+        "overall_coverage": float((required & resume).sum() / required.sum()) if required.any() else 0.0,
+        "gaps": [
+            {"skill": vocabulary[position], "jobs": [row for row in range(count) if jobs[row, position]]}
+            for position in gap_order
+        ],
+    }
+
+
+class OverlapService:
+    """Exploration Mode: compare several job descriptions against one resume
+
+    Skills come from the local taxonomy (job text plus the requirement fields
+    of a stored job analysis when there is one), so the overlap, coverage and
+    Venn data cost no LLM calls.
+    """
+
+    def analyze(
+        self,
+        db: Session,
+        user: User,
+        job_document_ids: List[int],
+        resume_document_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        job_document_ids = list(dict.fromkeys(job_document_ids))
+        if not MIN_JOBS <= len(job_document_ids) <= MAX_JOBS:
+            raise ValueError(f"Choose between {MIN_JOBS} and {MAX_JOBS} job descriptions to compare")
+
+        job_docs = []
+        for document_id in job_document_ids:
+            document = self._get_document(db, user, document_id, "job_description")
+            if not document:
+                raise ValueError(f"Job description {document_id} not found")
+            job_docs.append(document)
+
+        if resume_document_id is not None:
+            resume_doc = self._get_document(db, user, resume_document_id, "resume")
+            if not resume_doc:
+                raise ValueError("Resume document not found")
+        else:
+            resume_doc = db.query(Document).filter(
+                Document.user_id == user.id,
+                Document.document_type == "resume"
+            ).order_by(Document.created_at.desc()).first()
+            if not resume_doc:
+                raise ValueError("Upload a resume before comparing jobs")
+
+        titles, job_skills = [], []
+        for document in job_docs:
+            job_analysis = self._stored_job_analysis(db, document.id)
+            titles.append((job_analysis or {}).get("job_title") or document.original_filename)
+            job_skills.append(list(skill_extractor.job_requirement_counts(document.content_text, job_analysis)))
+        resume_skills = list(skill_extractor.resume_skill_counts(resume_doc.content_text))
+
+        result = compute_overlap(job_skills, resume_skills)
+        logger.info(f"Overlap analysis for user {user.id}: {len(job_docs)} jobs, "
+                    f"{sum(len(skills) for skills in job_skills)} requirements")
+
+        label = skill_extractor.label
+
+        def labels(skill_ids: List[str]) -> List[str]:
+            return [label(skill_id) for skill_id in skill_ids]
+
+        def document_ids(rows: List[int]) -> List[int]:
+            return [job_docs[row].id for row in rows]
+
+        return {
+            "resume_document_id": resume_doc.id,
+            "jobs": [
+                {
+                    "document_id": document.id,
+                    "title": title,
+                    "requirement_count": len(job["requirements"]),
+                    "coverage_score": round(job["coverage"] * 100, 1),
+                    "matched_skills": labels(job["matched"]),
+                    "missing_skills": labels(job["missing"]),
+                    "unique_requirements": labels(job["unique"]),
+                }
+                for document, title, job in zip(job_docs, titles, result["jobs"])
+            ],
+            "pairwise": [
+                {
+                    "job_document_ids": document_ids(pair["jobs"]),
+                    "shared_count": len(pair["shared"]),
+                    "jaccard": round(pair["jaccard"], 3),
+                    "shared_skills": labels(pair["shared"]),
+                }
+                for pair in result["pairwise"]
+            ],
+            "venn_regions": [
+                {
+                    "job_document_ids": document_ids(region["jobs"]),
+                    "size": len(region["skills"]),
+                    "skills": labels(region["skills"]),
+                    "covered_skills": labels(region["covered"]),
+                }
+                for region in result["regions"]
+            ],
+            "common_requirements": labels(result["common"]),
+            "requirements_shared_by": result["shared_by"],
+            "overall_coverage": round(result["overall_coverage"] * 100, 1),
+            "gap_priorities": [
+                {"skill": label(gap["skill"]), "job_count": len(gap["jobs"]), "job_document_ids": document_ids(gap["jobs"])}
+                for gap in result["gaps"]
+            ],
+        }
+
+    def _get_document(self, db: Session, user: User, document_id: int, document_type: str) -> Optional[Document]:
+        return db.query(Document).filter(
+            Document.id == document_id,
+            Document.user_id == user.id,
+            Document.document_type == document_type
+        ).first()
+
+    def _stored_job_analysis(self, db: Session, document_id: int) -> Optional[Dict[str, Any]]:
+        """Latest job analysis already computed for a document, if any"""
+        analysis = db.query(DocumentAnalysis).filter(
+            DocumentAnalysis.job_document_id == document_id,
+            DocumentAnalysis.job_analysis.isnot(None)
+        ).order_by(DocumentAnalysis.created_at.desc()).first()
+        if analysis and isinstance(analysis.job_analysis, dict) and "error" not in analysis.job_analysis:
+            return analysis.job_analysis
+
+        precomputed = db.query(PrecomputedJobAnalysis).filter(
+            PrecomputedJobAnalysis.document_id == document_id,
+            PrecomputedJobAnalysis.status == "completed"
+        ).order_by(PrecomputedJobAnalysis.completed_at.desc()).first()
+        return precomputed.job_analysis if precomputed else None
+
+# Global instance
+overlap_service = OverlapService()
@@ -0,0 +1,248 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+import logging
+import time
+
+from app.core.rate_limit import RateLimiter, call_priority, limited_by
+from app.models.analysis import DocumentAnalysis, PromptBackfillRun
+from app.models.document import Document
+from app.services.analysis_service import analysis_service
+from app.services.job_queue import JobPriority
+from app.services.lite_analysis import is_lite
+from app.services.llm_batch import batch_execution
+from app.services.llm_service import llm_service
+from app.services.ranking_index import ranking_index
+from app.services.resume_section_service import resume_section_service
+from app.services.speculative_analysis_service import speculative_analysis_service
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Analyses read per query while scanning
+PAGE_SIZE = 100
+
+# Pending or processing analyses updated this recently count as live traffic
+LIVE_WINDOW = timedelta(minutes=10)
+
+
+def step_version(step: Any) -> Optional[str]:
+    """Prompt version recorded in a stored step's metadata"""
+    metadata = step.get("metadata") if isinstance(step, dict) else None
+    return metadata.get("analysis_version") if isinstance(metadata, dict) else None
+
+
+def outdated_steps(analysis: DocumentAnalysis, target_version: str) -> List[str]:
+    """Stored steps that must be re-run for ``target_version``
+
+    A re-run resume or job analysis invalidates the match built from it.
+    Lite-tier steps count as outdated, so lite analyses whose background
+    upgrade never ran (e.g. after a restart) are upgraded here.
+    """
+    def outdated(step: Any) -> bool:
+        return step_version(step) != target_version or is_lite(step)
+
+    steps = [
+        field for field in ("resume_analysis", "job_analysis")
+        if getattr(analysis, field) is not None and outdated(getattr(analysis, field))
+    ]
+    if analysis.connections_analysis is not None and (steps or outdated(analysis.connections_analysis)):
+        steps.append("connections_analysis")
+    return steps
+
+
+def stamp_version(step: Dict[str, Any], version: str) -> Dict[str, Any]:
+    """Record the prompt version that produced a step (models do not reliably echo it)"""
+    metadata = step.get("metadata")
+    step["metadata"] = {**(metadata if isinstance(metadata, dict) else {}), "analysis_version": version}
+    return step
+
+
+class PromptBackfillService:
+    """Upgrades stored analyses to the current prompt version
+
+    Completed analyses are scanned in id order; for each one only the steps
+    whose recorded prompt version is behind (and the matching steps that
+    depend on them) are re-run, reusing current-version resume and job
+    analyses wherever they already exist. The scan position is checkpointed
+    in ``prompt_backfill_runs`` after every analysis, so an interrupted run
+    resumes where it stopped. Provider calls go through the shared rate
+    limiter plus a tighter backfill budget, and the backfill pauses while
+    live analyses are running.
+    """
+
+    async def run(
+        self,
+        db: Session,
+        limit: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        restart: bool = False,
+        execution: str = "realtime",
+        pipeline_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        target_version = llm_service.prompt_version
+        # Fail before the scan rather than on the first outdated analysis
+        analysis_service._resolve_pipeline_mode(pipeline_mode)
+
+        checkpoint = db.query(PromptBackfillRun).filter(PromptBackfillRun.target_version == target_version).first()
+        if not checkpoint:
+            checkpoint = PromptBackfillRun(target_version=target_version, last_analysis_id=0, scanned=0, upgraded=0, failures=[])
+            db.add(checkpoint)
+        elif restart:
+            checkpoint.last_analysis_id = 0
+            checkpoint.scanned = 0
+            checkpoint.upgraded = 0
+            checkpoint.failures = []
+        checkpoint.status = "running"
+        checkpoint.completed_at = None
+        db.commit()
+
+        limiter = RateLimiter(requests_per_minute if requests_per_minute is not None else settings.prompt_backfill_requests_per_minute)
+        processed = 0
+        with limited_by(limiter), call_priority(JobPriority.BACKFILL), batch_execution(execution == "batch"):
+            while limit is None or processed < limit:
+                page = db.query(DocumentAnalysis).filter(
+                    DocumentAnalysis.id > checkpoint.last_analysis_id,
+                    DocumentAnalysis.status == "completed"
+                ).order_by(DocumentAnalysis.id).limit(PAGE_SIZE).all()
+                if not page:
+                    checkpoint.status = "completed"
+                    checkpoint.completed_at = datetime.utcnow()
+                    db.commit()
+                    break
+
+                for analysis in page:
+                    if limit is not None and processed >= limit:
+                        break
+                    await self._wait_for_quiet(db)
+                    steps = outdated_steps(analysis, target_version)
+                    if steps:
+                        await self._upgrade(db, checkpoint, analysis, steps, target_version, pipeline_mode)
+                    checkpoint.last_analysis_id = analysis.id
+                    checkpoint.scanned += 1
+                    db.commit()
+                    processed += 1
+
+        return self.summary(checkpoint)
+
+    def summary(self, checkpoint: PromptBackfillRun) -> Dict[str, Any]:
+        return {
+            "target_version": checkpoint.target_version,
+            "status": checkpoint.status,
+            "last_analysis_id": checkpoint.last_analysis_id,
+            "scanned": checkpoint.scanned,
+            "upgraded": checkpoint.upgraded,
+            "failed": checkpoint.failures or [],
+        }
+
+    async def _wait_for_quiet(self, db: Session) -> None:
+        """Low priority: hold off while students have analyses in progress"""
+        if not settings.prompt_backfill_yield_to_live:
+            return
+        while True:
+            live = db.query(DocumentAnalysis).filter(
+                DocumentAnalysis.status.in_(("pending", "processing")),
+                DocumentAnalysis.updated_at > datetime.utcnow() - LIVE_WINDOW
+            ).count()
+            if not live:
+                return
+            logger.debug(f"Prompt backfill waiting for {live} live analyses")
+            await asyncio.sleep(settings.prompt_backfill_idle_poll_seconds)
+
+    async def _upgrade(
+        self,
+        db: Session,
+        checkpoint: PromptBackfillRun,
+        analysis: DocumentAnalysis,
+        steps: List[str],
+        target_version: str,
+        pipeline_mode: Optional[str]
+    ) -> None:
+        """Re-run the outdated steps; the row is only updated if all of them succeed"""
+        started = time.perf_counter()
+        try:
+            updates = await self._rerun_steps(db, analysis, steps, target_version, pipeline_mode)
+        except Exception as e:
+            logger.warning(f"Prompt backfill of analysis {analysis.id} ({', '.join(steps)}) failed: {str(e)}")
+            checkpoint.failures = (checkpoint.failures or []) + [{"analysis_id": analysis.id, "steps": steps, "error": str(e)}]
+            db.commit()
+            return
+
+        for field, value in updates.items():
+            setattr(analysis, field, value)
+        if analysis.analysis_tier == "lite" and "connections_analysis" in steps:
+            analysis.analysis_tier = "full"
+        checkpoint.upgraded += 1
+        db.commit()
+        if analysis.connections_analysis is not None:
+            ranking_index.index_analysis(db, analysis)
+        logger.info(f"Upgraded analysis {analysis.id} to prompts {target_version} "
+                    f"({', '.join(steps)}) in {time.perf_counter() - started:.2f}s")
+
+    async def _rerun_steps(
+        self,
+        db: Session,
+        analysis: DocumentAnalysis,
+        steps: List[str],
+        target_version: str,
+        pipeline_mode: Optional[str]
+    ) -> Dict[str, Any]:
+        resume_text = self._document_text(db, analysis.resume_document_id)
+        job_text = self._document_text(db, analysis.job_document_id)
+        updates: Dict[str, Any] = {}
+
+        if "resume_analysis" in steps:
+            if resume_text is None:
+                raise ValueError("Resume text no longer available")
+            resume_analysis = self._current_resume_analysis(db, analysis, target_version)
+            if resume_analysis is None:
+                resume_analysis = await resume_section_service.analyze_resume(db, analysis.user_id, resume_text)
+                if "error" in resume_analysis:
+                    raise ValueError(f"Resume analysis failed: {resume_analysis['error']}")
+            updates["resume_analysis"] = stamp_version(resume_analysis, target_version)
+
+        if "job_analysis" in steps:
+            if job_text is None:
+                raise ValueError("Job description text no longer available")
+            job_analysis = await speculative_analysis_service.get_job_analysis(db, analysis.job_document_id, job_text)
+            if "error" in job_analysis:
+                raise ValueError(f"Job analysis failed: {job_analysis['error']}")
+            job_analysis = stamp_version(dict(job_analysis), target_version)
+            speculative_analysis_service.store_job_analysis(db, analysis.job_document_id, job_analysis)
+            updates["job_analysis"] = job_analysis
+
+        if "connections_analysis" in steps:
+            if resume_text is None or job_text is None:
+                raise ValueError("Document text no longer available")
+            fields = await analysis_service.compute_match(
+                updates.get("resume_analysis", analysis.resume_analysis), resume_text,
+                updates.get("job_analysis", analysis.job_analysis), job_text,
+                pipeline_mode=pipeline_mode
+            )
+            stamp_version(fields["connections_analysis"], target_version)
+            updates.update(fields)
+
+        return updates
+
+    def _document_text(self, db: Session, document_id: Optional[int]) -> Optional[str]:
+        if document_id is None:
+            return None
+        document = db.query(Document).filter(Document.id == document_id).first()
+        return document.content_text if document and document.content_text else None
+
+    def _current_resume_analysis(self, db: Session, analysis: DocumentAnalysis, target_version: str) -> Optional[Dict[str, Any]]:
+        """A resume analysis of the same document already at the target version (e.g. upgraded with another job)"""
+        if analysis.resume_document_id is None:
+            return None
+        siblings = db.query(DocumentAnalysis).filter(
+            DocumentAnalysis.resume_document_id == analysis.resume_document_id,
+            DocumentAnalysis.id != analysis.id
+        ).order_by(DocumentAnalysis.updated_at.desc()).all()
+        for sibling in siblings:
+            if step_version(sibling.resume_analysis) == target_version and not is_lite(sibling.resume_analysis):
+                return dict(sibling.resume_analysis)
+        return None
+
+# Global instance
+prompt_backfill_service = PromptBackfillService()
@@ -0,0 +1,235 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+import logging
+import time
+
+import numpy as np
+from scipy import sparse
+
+from app.models.analysis import DocumentAnalysis
+from app.models.document import Document
+from app.services.skill_extractor import skill_extractor
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("job", "resume")
+
+# Skills listed per ranked result
+EXPLANATION_SKILLS = 5
+
+
+class _Matrix:
+    """Row-normalized TF-IDF vectors for one kind of document"""
+
+    def __init__(self, document_ids: List[int], owners: List[int], vectors: sparse.csr_matrix):
+        self.document_ids = np.array(document_ids, dtype=np.int64)
+        self.owners = np.array(owners, dtype=np.int64)
+        self.vectors = vectors
+        self.rows = {document_id: row for row, document_id in enumerate(document_ids)}
+
+
+class RankingIndex:
+    """Resume-to-jobs and job-to-resumes ranking over taxonomy skill vectors
+
+    Every document with a completed analysis is a row of skill counts (job
+    text plus stored requirement fields for postings; resume skills plus their
+    parents for resumes). Rows are added as analyses complete, and other
+    workers' completions are picked up on the next query through a
+    ``completed_at`` watermark. The sparse matrices are rebuilt from the rows
+    only when something changed, with IDF recomputed over both kinds, so a
+    query is one sparse matrix-vector product plus a top-k partition.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[int, Tuple[Dict[str, int], Dict[str, Any]]]] = {kind: {} for kind in KINDS}
+        self._watermark: Optional[datetime] = None
+        self._dirty = True
+        self._skill_ids: List[str] = []
+        self._matrices: Dict[str, _Matrix] = {}
+
+    def index_analysis(self, db: Session, analysis: DocumentAnalysis) -> None:
+        """Add or refresh the documents of a completed analysis (best effort)"""
+        try:
+            if analysis.job_document_id and analysis.job_analysis and "error" not in analysis.job_analysis:
+                document = db.query(Document).filter(Document.id == analysis.job_document_id).first()
+                if document and document.content_text:
+                    counts = skill_extractor.job_requirement_counts(document.content_text, analysis.job_analysis)
+                    title = analysis.job_analysis.get("job_title") or document.original_filename
+                    self._upsert("job", document.id, counts, {"user_id": document.user_id, "title": title})
+
+            if analysis.resume_document_id:
+                document = db.query(Document).filter(Document.id == analysis.resume_document_id).first()
+                if document and document.content_text:
+                    counts = skill_extractor.resume_skill_counts(document.content_text)
+                    self._upsert("resume", document.id, counts, {"user_id": document.user_id, "title": document.original_filename})
+        except Exception as e:
+            logger.warning(f"Could not index analysis {analysis.id} for ranking: {str(e)}")
+
+    def sync(self, db: Session) -> None:
+        """Index analyses completed since the last sync (by any worker)"""
+        query = db.query(DocumentAnalysis).filter(
+            DocumentAnalysis.status == "completed",
+            DocumentAnalysis.completed_at.isnot(None)
+        )
+        if self._watermark is not None:
+            query = query.filter(DocumentAnalysis.completed_at >= self._watermark)
+
+        for analysis in query.order_by(DocumentAnalysis.completed_at).all():
+            self.index_analysis(db, analysis)
+            self._watermark = analysis.completed_at
+
+    def rank_jobs(self, db: Session, resume_document_id: int, k: int = 10) -> Dict[str, Any]:
+        """Stored postings that best match a resume"""
+        return self._rank(db, "resume", resume_document_id, "job", k)
+
+    def rank_resumes(self, db: Session, job_document_id: int, k: int = 10, user_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Resumes (optionally of a cohort) that best match a posting"""
+        return self._rank(db, "job", job_document_id, "resume", k, user_ids)
+
+    def _rank(
+        self,
+        db: Session,
+        query_kind: str,
+        document_id: int,
+        target_kind: str,
+        k: int,
+        user_ids: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        self.sync(db)
+        if document_id not in self._rows[query_kind]:
+            self._index_document(db, query_kind, document_id)
+        self._build()
+
+        query = self._matrices[query_kind].vectors[self._matrices[query_kind].rows[document_id]]
+        targets = self._matrices[target_kind]
+        scores = (targets.vectors @ query.T).toarray().ravel()
+
+        candidates = np.arange(len(scores))
+        if user_ids is not None:
+            candidates = candidates[np.isin(targets.owners, user_ids)]
+        candidates = candidates[scores[candidates] > 0]
+
+        if len(candidates) > k:
+            top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        else:
+            top = candidates
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        query_weights = query.toarray().ravel()
+        results = []
+        for row in top.tolist():
+            target_id = int(targets.document_ids[row])
+            results.append({
+                "document_id": target_id,
+                "user_id": self._rows[target_kind][target_id][1]["user_id"],
+                "title": self._rows[target_kind][target_id][1]["title"],
+                "score": round(float(scores[row]), 4),
+                **self._explain(query_weights, targets.vectors[row], query_kind),
+            })
+
+        return {
+            "document_id": document_id,
+            "indexed": len(targets.document_ids),
+            "results": results,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def _explain(self, query_weights: np.ndarray, target: sparse.csr_matrix, query_kind: str) -> Dict[str, Any]:
+        """Skills that contribute most to a score, and the job requirements the resume lacks"""
+        columns, weights = target.indices, target.data
+        contributions = query_weights[columns] * weights
+        score = contributions.sum()
+
+        matched = []
+        for position in np.argsort(-contributions, kind="stable")[:EXPLANATION_SKILLS]:
+            if contributions[position] <= 0:
+                break
+            matched.append({
+                "skill": skill_extractor.label(self._skill_ids[columns[position]]),
+                "contribution": round(float(contributions[position] / score), 3),
+            })
+
+        # Requirements live on the job side: the target row for resume queries, the query otherwise
+        if query_kind == "resume":
+            lacking = query_weights[columns] == 0
+            absent, missing_weights = columns[lacking], weights[lacking]
+        else:
+            present = np.zeros(len(query_weights), dtype=bool)
+            present[columns] = True
+            absent = np.flatnonzero((query_weights > 0) & ~present)
+            missing_weights = query_weights[absent]
+        missing = [
+            skill_extractor.label(self._skill_ids[column])
+            for column in absent[np.argsort(-missing_weights, kind="stable")][:EXPLANATION_SKILLS]
+        ]
+        return {"matched_skills": matched, "missing_requirements": missing}
+
+    def _index_document(self, db: Session, kind: str, document_id: int) -> None:
+        """Index a document that has no completed analysis yet (text only)"""
+        document = db.query(Document).filter(
+            Document.id == document_id,
+            Document.document_type == ("job_description" if kind == "job" else "resume")
+        ).first()
+        if not document:
+            raise ValueError(f"{'Job description' if kind == 'job' else 'Resume'} {document_id} not found")
+        if kind == "job":
+            counts = skill_extractor.job_requirement_counts(document.content_text or "")
+        else:
+            counts = skill_extractor.resume_skill_counts(document.content_text or "")
+        self._upsert(kind, document.id, counts, {"user_id": document.user_id, "title": document.original_filename})
+
+    def _upsert(self, kind: str, document_id: int, counts: Dict[str, int], meta: Dict[str, Any]) -> None:
+        current = self._rows[kind].get(document_id)
+        if current and current[0] == counts:
+            return
+        self._rows[kind][document_id] = (counts, meta)
+        self._dirty = True
+
+    def _build(self) -> None:
+        """Rebuild vocabulary, IDF and both matrices after rows changed"""
+        if not self._dirty:
+            return
+        started = time.perf_counter()
+
+        vocabulary: Dict[str, int] = {}
+        for kind in KINDS:
+            for counts, _ in self._rows[kind].values():
+                for skill_id in counts:
+                    vocabulary.setdefault(skill_id, len(vocabulary))
+
+        assembled = {}
+        document_frequency = np.zeros(len(vocabulary))
+        for kind in KINDS:
+            document_ids, owners, indptr, indices, data = [], [], [0], [], []
+            for document_id, (counts, meta) in self._rows[kind].items():
+                document_ids.append(document_id)
+                owners.append(meta["user_id"])
+                indices.extend(vocabulary[skill_id] for skill_id in counts)
+                data.extend(counts.values())
+                indptr.append(len(indices))
+            matrix = sparse.csr_matrix(
+                (np.array(data, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+                shape=(len(document_ids), len(vocabulary))
+            )
+            document_frequency += np.bincount(matrix.indices, minlength=len(vocabulary))
+            assembled[kind] = (document_ids, owners, matrix)
+
+        # Smoothed IDF over postings and resumes together; sublinear term frequency
+        total = sum(len(rows) for rows in self._rows.values())
+        idf = np.log((1 + total) / (1 + document_frequency)) + 1
+
+        for kind, (document_ids, owners, matrix) in assembled.items():
+            matrix.data = (1 + np.log(matrix.data)) * idf[matrix.indices]
+            norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            self._matrices[kind] = _Matrix(document_ids, owners, sparse.csr_matrix(sparse.diags(1 / norms) @ matrix))
+
+        self._skill_ids = list(vocabulary)
+        self._dirty = False
+        logger.info(f"Rebuilt ranking index: {len(self._rows['job'])} postings, {len(self._rows['resume'])} resumes, "
+                    f"{len(vocabulary)} skills in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+# Global instance
+ranking_index = RankingIndex()
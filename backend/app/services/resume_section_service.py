@@ -0,0 +1,174 @@
+import asyncio
+import copy
+from typing import Any, Dict, List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import logging
+import time
+
+from app.models.analysis import ResumeSectionAnalysis
+from app.services.llm_service import llm_service
+from app.services.resume_segmenter import ResumeSection, segment_resume
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+RESUME_ANALYSIS_MODES = ("single", "sectioned")
+
+# Fewer recognized sections than this and the resume is analyzed in one prompt
+MIN_SECTIONS = 2
+
+VALUES_FIELDS = ("service_orientation", "collaboration", "continuous_learning", "excellence_pursuit", "cultural_awareness")
+
+
+def merge_section_extracts(extracts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-section extractions (in document order) into the resume analysis fields"""
+    merged: Dict[str, Any] = {
+        "personal_info": {},
+        "technical_skills": [],
+        "soft_skills": [],
+        "experience": [],
+        "education": {},
+        "projects": [],
+        "values_evidence": {field: [] for field in VALUES_FIELDS},
+    }
+    seen_skills = {"technical_skills": set(), "soft_skills": set()}
+
+    for extract in extracts:
+        if not merged["personal_info"] and isinstance(extract.get("personal_info"), dict):
+            merged["personal_info"] = extract["personal_info"]
+
+        for field in ("experience", "projects"):
+            items = extract.get(field)
+            if isinstance(items, list):
+                merged[field].extend(items)
+
+        for field in ("technical_skills", "soft_skills"):
+            for item in extract.get(field) or []:
+                name = (item.get("skill") or "").strip().lower() if isinstance(item, dict) else ""
+                if name and name not in seen_skills[field]:
+                    seen_skills[field].add(name)
+                    merged[field].append(item)
+
+        education = extract.get("education")
+        if isinstance(education, dict):
+            for key, value in education.items():
+                if isinstance(value, list):
+                    merged["education"].setdefault(key, []).extend(value)
+                elif value and not merged["education"].get(key):
+                    merged["education"][key] = value
+
+        values = extract.get("values_evidence")
+        if isinstance(values, dict):
+            for field in VALUES_FIELDS:
+                if isinstance(values.get(field), list):
+                    merged["values_evidence"][field].extend(values[field])
+
+    return merged
+
+
+class ResumeSectionService:
+    """Section-by-section resume analysis with a per-section cache
+
+    The resume is split into sections locally; each section is extracted by
+    its own concurrent call and the result stored by section hash, so a revised
+    resume only re-analyzes the sections whose text changed. The merged
+    extracts then go through one synthesis call for the whole-resume
+    judgements (strengths, trajectory, values). The result has the same shape
+    as ``LLMService.analyze_resume``.
+    """
+
+    async def analyze_resume(
+        self,
+        db: Session,
+        user_id: int,
+        resume_text: str,
+        user_context: Optional[Dict[str, Any]] = None,
+        mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        mode = mode or settings.resume_analysis_mode
+        if mode not in RESUME_ANALYSIS_MODES:
+            raise ValueError(f"Unknown resume analysis mode: {mode}")
+        if mode == "sectioned":
+            sections = segment_resume(resume_text)
+            if sum(1 for section in sections if section.kind != "header") >= MIN_SECTIONS:
+                result = await self._analyze_sectioned(db, user_id, sections, user_context)
+                if result is not None:
+                    return result
+            logger.info("Falling back to single-prompt resume analysis")
+        return await llm_service.analyze_resume(resume_text, user_context)
+
+    async def _analyze_sectioned(
+        self,
+        db: Session,
+        user_id: int,
+        sections: List[ResumeSection],
+        user_context: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        started = time.perf_counter()
+        prompt_version = llm_service.prompt_version
+        extractions = self._cached_extractions(db, user_id, [section.hash for section in sections], prompt_version)
+
+        missing = list({section.hash: section for section in sections if section.hash not in extractions}.values())
+        results = await asyncio.gather(
+            *(llm_service.analyze_resume_section(section.kind, section.text) for section in missing),
+            return_exceptions=True
+        )
+
+        failed = 0
+        for section, result in zip(missing, results):
+            if isinstance(result, Exception) or not isinstance(result, dict) or "error" in result:
+                logger.warning(f"Resume section {section.label} could not be analyzed: {result}")
+                failed += 1
+                continue
+            extractions[section.hash] = result
+            self._store(db, user_id, section, prompt_version, result)
+        if failed:
+            return None
+
+        merged = merge_section_extracts([copy.deepcopy(extractions[section.hash]) for section in sections])
+        synthesis = await llm_service.synthesize_resume_analysis(merged, user_context)
+        if "error" in synthesis:
+            return None
+
+        values_evidence = merged.pop("values_evidence")
+        result = {**merged, **synthesis}
+        if not isinstance(result.get("values_indicators"), dict):
+            result["values_indicators"] = values_evidence
+        result["skills"] = {
+            "technical": [skill["skill"] for skill in result["technical_skills"]],
+            "soft": [skill["skill"] for skill in result["soft_skills"]],
+        }
+        metadata = result.setdefault("metadata", {})
+        if isinstance(metadata, dict):
+            metadata["generation_mode"] = "sectioned"
+            metadata["sections"] = {"total": len(sections), "analyzed": len(missing), "cached": len(sections) - len(missing)}
+
+        logger.info(f"Sectioned resume analysis: {len(sections)} sections, {len(missing)} analyzed, "
+                    f"{len(sections) - len(missing)} cached in {time.perf_counter() - started:.2f}s")
+        return result
+
+    def _cached_extractions(self, db: Session, user_id: int, hashes: List[str], prompt_version: str) -> Dict[str, Dict[str, Any]]:
+        rows = db.query(ResumeSectionAnalysis).filter(
+            ResumeSectionAnalysis.user_id == user_id,
+            ResumeSectionAnalysis.prompt_version == prompt_version,
+            ResumeSectionAnalysis.section_hash.in_(set(hashes))
+        ).all()
+        return {row.section_hash: row.extraction for row in rows}
+
+    def _store(self, db: Session, user_id: int, section: ResumeSection, prompt_version: str, extraction: Dict[str, Any]) -> None:
+        db.add(ResumeSectionAnalysis(
+            user_id=user_id,
+            section_hash=section.hash,
+            prompt_version=prompt_version,
+            section_kind=section.kind,
+            extraction=extraction
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            # The same section was analyzed concurrently
+            db.rollback()
+
+# Global instance
+resume_section_service = ResumeSectionService()
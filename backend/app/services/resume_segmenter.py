@@ -0,0 +1,138 @@
+"""
+Resume segmentation
+===================
+
+Splits resume text into sections (contact header, summary, education,
+experience, projects, skills, activities) by recognizing heading lines, and
+splits experience, project and activity sections into one entry per role or
+project. Each section carries a hash of its whitespace-normalized text, so an
+unchanged section of a revised resume has the same hash as before.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+SECTION_KINDS = ("header", "summary", "education", "experience", "projects", "skills", "activities")
+
+# Kinds whose sections are split into one entry per role or project
+ENTRY_KINDS = ("experience", "projects", "activities")
+
+# Exact heading phrases (lowercase, "&" spelled "and", punctuation removed)
+HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me"],
+    "education": ["education", "academic background", "academics", "education and training",
+                  "relevant coursework", "coursework"],
+    "experience": ["experience", "work experience", "professional experience", "relevant experience",
+                   "employment", "employment history", "work history", "internships", "internship experience",
+                   "leadership experience"],
+    "projects": ["projects", "academic projects", "personal projects", "selected projects", "research"],
+    "skills": ["skills", "technical skills", "skills and interests", "core competencies", "competencies",
+               "technologies", "tools and technologies", "languages", "skills and languages"],
+    "activities": ["activities", "leadership", "leadership and activities", "volunteer", "volunteer experience",
+                   "volunteering", "community service", "service", "extracurricular activities", "involvement",
+                   "campus involvement", "awards", "honors", "honors and awards", "certifications", "interests"],
+}
+
+# Keywords for all-caps headings that are not in the list above ("WORK & LEADERSHIP EXPERIENCE")
+HEADING_KEYWORDS = [
+    ("summary", "summary"), ("objective", "summary"), ("profile", "summary"),
+    ("education", "education"), ("project", "projects"), ("skill", "skills"),
+    ("volunteer", "activities"), ("service", "activities"), ("activit", "activities"),
+    ("award", "activities"), ("honor", "activities"), ("certif", "activities"),
+    ("experience", "experience"), ("employment", "experience"), ("leadership", "activities"),
+]
+
+MAX_HEADING_CHARS = 40
+MAX_KEYWORD_HEADING_WORDS = 5
+
+_HEADING_LOOKUP = {phrase: kind for kind, phrases in HEADINGS.items() for phrase in phrases}
+_BULLET = re.compile(r"^\s*[\-\*•●▪–>◦]\s*")
+_NON_LETTERS = re.compile(r"[^a-z ]+")
+
+
+@dataclass(frozen=True)
+class ResumeSection:
+    kind: str
+    heading: str  # as written ("" for the header)
+    text: str
+    hash: str
+
+    @property
+    def label(self) -> str:
+        return self.heading or self.kind
+
+
+def section_hash(kind: str, text: str) -> str:
+    """Hash of the section kind and its text with blank lines and spacing normalized"""
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    normalized = "\n".join(line for line in lines if line)
+    return hashlib.sha256(f"{kind}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+def heading_kind(line: str) -> Optional[str]:
+    """Section kind if ``line`` is a resume heading"""
+    stripped = line.strip().strip(":").strip()
+    if not stripped or len(stripped) > MAX_HEADING_CHARS or _BULLET.match(line):
+        return None
+
+    normalized = " ".join(_NON_LETTERS.sub(" ", stripped.lower().replace("&", " and ")).split())
+    if normalized in _HEADING_LOOKUP:
+        return _HEADING_LOOKUP[normalized]
+
+    if stripped.isupper() and len(normalized.split()) <= MAX_KEYWORD_HEADING_WORDS:
+        for keyword, kind in HEADING_KEYWORDS:
+            if keyword in normalized:
+                return kind
+    return None
+
+
+def split_entries(lines: List[str]) -> List[List[str]]:
+    """One block per role or project
+
+    An entry starts at a non-bullet line that follows a bullet or a blank
+    line, so both "title / bullets" and blank-line separated layouts work.
+    """
+    entries: List[List[str]] = []
+    current: List[str] = []
+    previous_bullet = False
+    previous_blank = False
+    for line in lines:
+        if not line.strip():
+            previous_blank = True
+            continue
+        bullet = bool(_BULLET.match(line))
+        if current and not bullet and (previous_bullet or previous_blank):
+            entries.append(current)
+            current = []
+        current.append(line)
+        previous_bullet, previous_blank = bullet, False
+    if current:
+        entries.append(current)
+    return entries
+
+
+def segment_resume(text: str) -> List[ResumeSection]:
+    """Sections of a resume in document order (empty sections dropped)"""
+    blocks = []  # (kind, heading, lines)
+    kind, heading, lines = "header", "", []
+    for line in (text or "").splitlines():
+        found = heading_kind(line)
+        if found:
+            blocks.append((kind, heading, lines))
+            kind, heading, lines = found, line.strip(), []
+        else:
+            lines.append(line.rstrip())
+    blocks.append((kind, heading, lines))
+
+    sections = []
+    for kind, heading, lines in blocks:
+        parts = split_entries(lines) if kind in ENTRY_KINDS else [[line for line in lines if line.strip()]]
+        for part in parts:
+            if not part:
+                continue
+            body = "\n".join(part)
+            sections.append(ResumeSection(kind=kind, heading=heading, text=body, hash=section_hash(kind, body)))
+    return sections
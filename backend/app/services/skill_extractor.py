@@ -0,0 +1,313 @@
+"""
+Local skill extraction
+======================
+
+Finds skill and tool mentions in document text with a taxonomy compiled into
+an Aho-Corasick automaton, so exact matches between a resume and a job
+description can be found without an LLM call. Surface forms (labels and
+synonyms) normalize to a taxonomy id; the ``parent`` links let a specific
+skill on the resume (PostgreSQL) satisfy a broader requirement (SQL).
+
+The taxonomy source is app/data/skills_taxonomy.json (override with
+SKILLS_TAXONOMY_PATH); it is used through the memory-mapped compiled form in
+app/services/skill_taxonomy.py.
+"""
+
+import logging
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.services.skill_taxonomy import TaxonomyIndex, load_taxonomy
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skills_taxonomy.json")
+
+# Longest snippet quoted from a line of either document
+MAX_SNIPPET_CHARS = 240
+
+# Resume quotes kept per matched skill (the evidence schema allows 1-2)
+MAX_EVIDENCE_QUOTES = 2
+
+_BULLET_PATTERN = re.compile(r"^[\s\-\*•●▪–>]+")
+
+# Parts of a stored job analysis that describe what the role requires
+JOB_REQUIREMENT_FIELDS = (
+    "required_skills", "preferred_skills", "technical_requirements",
+    "key_requirements", "responsibilities", "qualifications",
+)
+
+
+@dataclass(frozen=True)
+class SkillMention:
+    skill_id: str
+    label: str
+    category: str
+    surface: str  # text as it appears in the document
+    start: int
+    end: int
+
+
+class SkillExtractor:
+    """Taxonomy-backed skill finder; the compiled taxonomy is opened on first use"""
+
+    def __init__(self, taxonomy_path: Optional[str] = None):
+        self.taxonomy_path = taxonomy_path
+        self._index: Optional[TaxonomyIndex] = None
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._index.version if self._index else None
+
+    def load(self) -> None:
+        path = self.taxonomy_path or settings.skills_taxonomy_path or DEFAULT_TAXONOMY_PATH
+        started = time.perf_counter()
+        self._index = load_taxonomy(path)
+        logger.info(f"Opened skills taxonomy v{self._index.version} ({self._index.skill_count} skills, "
+                    f"{self._index.form_count} surface forms, {self._index.state_count} states) "
+                    f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    @property
+    def index(self) -> TaxonomyIndex:
+        if self._index is None:
+            self.load()
+        return self._index
+
+    def extract(self, text: str) -> List[SkillMention]:
+        """Skill mentions in ``text`` with character offsets, in document order
+
+        Matches must start and end on word boundaries; where mentions overlap
+        the leftmost, then longest, wins ("Power BI" rather than "BI").
+        """
+        index = self.index
+        if not text:
+            return []
+
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters change length when lowercased; keep offsets aligned
+            lowered = "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+        candidates = []
+        for start, end, form in index.iter_matches(lowered):
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if end < len(text) and text[end].isalnum():
+                continue
+            exact_form = index.form_exact(form)
+            if exact_form is not None and text[start:end] != exact_form:
+                continue
+            candidates.append((start, end, index.form_skill[form]))
+
+        candidates.sort(key=lambda item: (item[0], item[0] - item[1]))
+        mentions = []
+        covered_until = 0
+        for start, end, skill in candidates:
+            if start < covered_until:
+                continue
+            mentions.append(SkillMention(
+                skill_id=index.skill_key(skill),
+                label=index.label(skill),
+                category=index.category(skill),
+                surface=text[start:end],
+                start=start,
+                end=end
+            ))
+            covered_until = end
+        return mentions
+
+    def skill_ids(self, text: str) -> List[str]:
+        """Distinct taxonomy ids mentioned in ``text``, in order of first mention"""
+        return list(dict.fromkeys(mention.skill_id for mention in self.extract(text)))
+
+    def skill_counts(self, text: str) -> Dict[str, int]:
+        """Mentions per taxonomy id, in order of first mention"""
+        counts: Dict[str, int] = {}
+        for mention in self.extract(text):
+            counts[mention.skill_id] = counts.get(mention.skill_id, 0) + 1
+        return counts
+
+    def job_requirement_counts(self, job_text: str, job_analysis: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """Skills a job asks for: its text plus the requirement fields of a stored analysis"""
+        counts = self.skill_counts(job_text or "")
+        if job_analysis:
+            for field in JOB_REQUIREMENT_FIELDS:
+                for text in _strings(job_analysis.get(field)):
+                    for skill_id, count in self.skill_counts(text).items():
+                        counts[skill_id] = counts.get(skill_id, 0) + count
+        return counts
+
+    def resume_skill_counts(self, resume_text: str) -> Dict[str, int]:
+        """Resume skills plus their broader parents (PostgreSQL also counts toward SQL)"""
+        counts: Dict[str, int] = {}
+        for skill_id, count in self.skill_counts(resume_text or "").items():
+            for implied in [skill_id, *self.ancestors(skill_id)]:
+                counts[implied] = counts.get(implied, 0) + count
+        return counts
+
+    def label(self, skill_id: str) -> str:
+        """Display label for a taxonomy id (the id itself if unknown)"""
+        skill = self.index.find(skill_id)
+        return self.index.label(skill) if skill is not None else skill_id
+
+    def ancestors(self, skill_id: str) -> List[str]:
+        """Broader skills above ``skill_id`` (all parents, nearest first)"""
+        index = self.index
+        skill = index.find(skill_id)
+        if skill is None:
+            return []
+        seen = {skill}
+        queue = deque(index.parents(skill))
+        chain = []
+        while queue:
+            parent = queue.popleft()
+            if parent in seen:
+                continue
+            seen.add(parent)
+            chain.append(index.skill_key(parent))
+            queue.extend(index.parents(parent))
+        return chain
+
+    def match_documents(self, resume_text: str, job_text: str) -> Dict[str, Any]:
+        """Skill candidates for the matching prompts
+
+        ``direct_matches`` are job skills the resume mentions verbatim (or via
+        a more specific child skill), each with the job line quoted and up to
+        two resume lines as evidence. ``job_only`` skills still need the LLM's
+        judgement; ``resume_only`` skills are extra context.
+        """
+        job_mentions = self.extract(job_text)
+        resume_mentions = self.extract(resume_text)
+
+        resume_by_skill: Dict[str, List[SkillMention]] = {}
+        for mention in resume_mentions:
+            resume_by_skill.setdefault(mention.skill_id, []).append(mention)
+            for ancestor in self.ancestors(mention.skill_id):
+                resume_by_skill.setdefault(ancestor, []).append(mention)
+
+        first_job_mention: Dict[str, SkillMention] = {}
+        for mention in job_mentions:
+            first_job_mention.setdefault(mention.skill_id, mention)
+
+        direct_matches = []
+        job_only = []
+        for skill_id, job_mention in first_job_mention.items():
+            snippet = self._line_at(job_text, job_mention.start)
+            evidence = resume_by_skill.get(skill_id)
+            if not evidence:
+                job_only.append({"skill_id": skill_id, "skill": job_mention.label, "job_requirement_snippet": snippet})
+                continue
+
+            quotes, offsets, via = [], [], []
+            for mention in sorted(evidence, key=lambda item: item.start):
+                quote = self._line_at(resume_text, mention.start)
+                # A section heading ("EDUCATION") is not evidence
+                if quote in quotes or quote.lower() == mention.surface.lower():
+                    continue
+                quotes.append(quote)
+                offsets.append([mention.start, mention.end])
+                if mention.skill_id != skill_id:
+                    via.append(mention.label)
+                if len(quotes) == MAX_EVIDENCE_QUOTES:
+                    break
+
+            if not quotes:
+                job_only.append({"skill_id": skill_id, "skill": job_mention.label, "job_requirement_snippet": snippet})
+                continue
+
+            direct_matches.append({
+                "skill_id": skill_id,
+                "skill": job_mention.label,
+                "category": job_mention.category,
+                "job_requirement_snippet": snippet,
+                "job_offsets": [job_mention.start, job_mention.end],
+                "candidate_evidence": quotes,
+                "resume_offsets": offsets,
+                "via": sorted(set(via)),
+            })
+
+        resume_only = list(dict.fromkeys(
+            mention.label for mention in resume_mentions if mention.skill_id not in first_job_mention
+        ))
+
+        return {
+            "taxonomy_version": self.version,
+            "direct_matches": direct_matches,
+            "job_only": job_only,
+            "resume_only": resume_only,
+        }
+
+    def _line_at(self, text: str, offset: int) -> str:
+        """The line containing ``offset``, without bullets, trimmed around the offset"""
+        start = text.rfind("\n", 0, offset) + 1
+        end = text.find("\n", offset)
+        if end == -1:
+            end = len(text)
+        if end - start > MAX_SNIPPET_CHARS:
+            # Long paragraphs: fall back to the sentence around the mention
+            sentence_start = text.rfind(". ", start, offset)
+            sentence_end = text.find(". ", offset, end)
+            if sentence_start != -1:
+                start = sentence_start + 2
+            if sentence_end != -1:
+                end = sentence_end + 1
+            end = min(end, max(start + MAX_SNIPPET_CHARS, offset + 1))
+        return _BULLET_PATTERN.sub("", text[start:end]).strip()
+
+
+def _strings(value: Any) -> Iterator[str]:
+    """Every string nested in a JSON value"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def to_direct_matches(candidates: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Local candidates in the skill_alignment.direct_matches schema"""
+    matches = []
+    for candidate in candidates.get("direct_matches", []):
+        related = candidate.get("via")
+        explanation = (
+            f"Shows {', '.join(related)}, a specific form of {candidate['skill']}."
+            if related else
+            f"Names {candidate['skill']} directly."
+        )
+        matches.append({
+            "skill": candidate["skill"],
+            "job_requirement_snippet": candidate["job_requirement_snippet"],
+            "candidate_evidence": candidate["candidate_evidence"],
+            "connection_explanations": [explanation] * len(candidate["candidate_evidence"]),
+            "role_application": "",
+            "confidence_score": 7 if related else 8,
+            "strength_level": "moderate" if related else "strong",
+            "source_reference": "job description",
+            "match_source": "local",
+        })
+    return matches
+
+
+def to_skill_matches(candidates: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Local candidates in the connections skill_matches schema"""
+    return [
+        {
+            "skill": candidate["skill"],
+            "confidence_score": 7.0 if candidate.get("via") else 8.5,
+            "evidence": candidate["candidate_evidence"][0],
+            "match_source": "local",
+        }
+        for candidate in candidates.get("direct_matches", [])
+    ]
+
+
+# Global instance
+skill_extractor = SkillExtractor()
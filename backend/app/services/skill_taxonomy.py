@@ -0,0 +1,323 @@
+"""
+Compiled skills taxonomy
+========================
+
+Binary, array-backed form of app/data/skills_taxonomy.json that is opened with
+``mmap`` so every worker process shares one page-cache copy instead of
+building its own dictionaries. Opening it only reads the header; arrays are
+read in place through ``memoryview`` casts and strings are decoded on demand.
+
+Layout (native byte order, checked on open): a header, a section table, then
+uint32 arrays and one UTF-8 blob:
+
+- interned string table: ``string_offsets`` into ``strings``
+- skills: id, label and category string indexes, flags
+- hierarchy: CSR ``parent_ptr``/``parent_idx``
+- surface forms: CSR ``form_ptr`` (skill -> its forms), with each form's text,
+  skill, lowercased length and flags
+- ``id_order``: skill indexes sorted by id, for lookups
+- the Aho-Corasick automaton: CSR edges sorted by character, fail links,
+  dictionary-suffix links and CSR outputs
+
+The JSON file stays the editable source; a stale or missing ``.bin`` next to
+it is rebuilt on load (see ``load_taxonomy``), or build it ahead of time with
+``python -m devtools.compile_taxonomy``.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SKTX"
+FORMAT_VERSION = 1
+BYTE_ORDER_MARK = 0x01020304
+
+FLAG_CASE_SENSITIVE = 1
+
+HEADER = struct.Struct("=4sIIIQQ")  # magic, byte order mark, format, taxonomy version, source mtime_ns, source size
+SECTION = struct.Struct("=II")  # byte offset, item count
+
+SECTIONS = (
+    "string_offsets", "skill_id", "skill_label", "skill_category", "skill_flags",
+    "parent_ptr", "parent_idx", "form_ptr", "form_text", "form_skill", "form_length", "form_flags",
+    "id_order", "state_fail", "state_dict_link", "edge_ptr", "edge_char", "edge_target",
+    "out_ptr", "out_form", "strings",
+)
+
+
+class AhoCorasick:
+    """Multi-pattern automaton builder (goto/fail/output over dicts)"""
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        self.order: List[int] = []  # states in breadth-first order
+
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(index)
+
+        # Breadth-first so each state's fail target is finished before it is used
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self.order.append(state)
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+
+
+class TaxonomyIndex:
+    """Read-only view over a compiled taxonomy (mmap or bytes)"""
+
+    def __init__(self, buffer: Union[mmap.mmap, bytes], path: Optional[str] = None):
+        self.path = path
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < HEADER.size:
+            raise ValueError(f"Truncated compiled taxonomy: {path or 'buffer'}")
+        magic, byte_order, format_version, taxonomy_version, source_mtime_ns, source_size = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or byte_order != BYTE_ORDER_MARK or format_version != FORMAT_VERSION:
+            raise ValueError(f"Not a compatible compiled taxonomy: {path or 'buffer'}")
+        self.version = taxonomy_version
+        self.source_mtime_ns = source_mtime_ns
+        self.source_size = source_size
+
+        if len(view) < HEADER.size + SECTION.size * len(SECTIONS):
+            raise ValueError(f"Truncated compiled taxonomy: {path or 'buffer'}")
+
+        for position, name in enumerate(SECTIONS):
+            offset, count = SECTION.unpack_from(view, HEADER.size + position * SECTION.size)
+            size = count if name == "strings" else 4 * count
+            if offset + size > len(view):
+                raise ValueError(f"Truncated compiled taxonomy: {path or 'buffer'}")
+            section = view[offset:offset + size]
+            setattr(self, name, section if name == "strings" else section.cast("I"))
+
+        self.skill_count = len(self.skill_id)
+        self.form_count = len(self.form_skill)
+        self.state_count = len(self.state_fail)
+
+    def string(self, index: int) -> str:
+        return bytes(self.strings[self.string_offsets[index]:self.string_offsets[index + 1]]).decode("utf-8")
+
+    def skill_key(self, skill: int) -> str:
+        return self.string(self.skill_id[skill])
+
+    def label(self, skill: int) -> str:
+        return self.string(self.skill_label[skill])
+
+    def category(self, skill: int) -> str:
+        return self.string(self.skill_category[skill])
+
+    def parents(self, skill: int) -> List[int]:
+        return list(self.parent_idx[self.parent_ptr[skill]:self.parent_ptr[skill + 1]])
+
+    def forms(self, skill: int) -> List[str]:
+        """Label and synonyms of a skill"""
+        return [self.string(self.form_text[form]) for form in range(self.form_ptr[skill], self.form_ptr[skill + 1])]
+
+    def form_exact(self, form: int) -> Optional[str]:
+        """Surface form that must match exactly, for case-sensitive skills"""
+        if self.form_flags[form] & FLAG_CASE_SENSITIVE:
+            return self.string(self.form_text[form])
+        return None
+
+    def find(self, skill_key: str) -> Optional[int]:
+        """Skill index for a taxonomy id (binary search over ``id_order``)"""
+        low, high = 0, self.skill_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.skill_key(self.id_order[middle]) < skill_key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.skill_count and self.skill_key(self.id_order[low]) == skill_key:
+            return self.id_order[low]
+        return None
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, form) for every occurrence of a form in ``text``"""
+        edge_ptr, edge_char, edge_target = self.edge_ptr, self.edge_char, self.edge_target
+        fail, dict_link = self.state_fail, self.state_dict_link
+        out_ptr, out_form, form_length = self.out_ptr, self.out_form, self.form_length
+
+        state = 0
+        for position, char in enumerate(text):
+            code = ord(char)
+            while True:
+                low, high = edge_ptr[state], edge_ptr[state + 1]
+                edge = bisect_left(edge_char, code, low, high)
+                if edge < high and edge_char[edge] == code:
+                    state = edge_target[edge]
+                    break
+                if not state:
+                    break
+                state = fail[state]
+
+            emitting = state
+            while emitting:
+                for slot in range(out_ptr[emitting], out_ptr[emitting + 1]):
+                    form = out_form[slot]
+                    yield position + 1 - form_length[form], position + 1, form
+                emitting = dict_link[emitting]
+
+
+def compile_taxonomy(taxonomy: Dict[str, Any], source_mtime_ns: int = 0, source_size: int = 0) -> bytes:
+    """Serialize a taxonomy dict (the JSON format) into the binary layout"""
+    strings: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    skills = taxonomy["skills"]
+    positions = {skill["id"]: index for index, skill in enumerate(skills)}
+    arrays = {name: array("I") for name in SECTIONS if name != "strings"}
+
+    patterns: List[str] = []
+    arrays["parent_ptr"].append(0)
+    arrays["form_ptr"].append(0)
+    for skill in skills:
+        arrays["skill_id"].append(intern(skill["id"]))
+        arrays["skill_label"].append(intern(skill["label"]))
+        arrays["skill_category"].append(intern(skill.get("category", "")))
+        flags = FLAG_CASE_SENSITIVE if skill.get("case_sensitive") else 0
+        arrays["skill_flags"].append(flags)
+
+        parents = skill.get("parents") or ([skill["parent"]] if skill.get("parent") else [])
+        for parent in parents:
+            if parent in positions:
+                arrays["parent_idx"].append(positions[parent])
+        arrays["parent_ptr"].append(len(arrays["parent_idx"]))
+
+        seen = set()
+        for form in [skill["label"], *skill.get("synonyms", [])]:
+            key = form.lower()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            arrays["form_text"].append(intern(form))
+            arrays["form_skill"].append(positions[skill["id"]])
+            arrays["form_length"].append(len(key))
+            arrays["form_flags"].append(flags)
+            patterns.append(key)
+        arrays["form_ptr"].append(len(patterns))
+
+    arrays["id_order"].extend(sorted(range(len(skills)), key=lambda index: skills[index]["id"]))
+
+    # Flatten the automaton; states keep their builder numbering (root is 0)
+    automaton = AhoCorasick(patterns)
+    state_count = len(automaton.goto)
+    dict_link = [0] * state_count
+    for state in automaton.order:
+        fallback = automaton.fail[state]
+        dict_link[state] = fallback if automaton.output[fallback] else dict_link[fallback]
+    arrays["state_fail"].extend(automaton.fail)
+    arrays["state_dict_link"].extend(dict_link)
+    arrays["edge_ptr"].append(0)
+    arrays["out_ptr"].append(0)
+    for state in range(state_count):
+        for char, target in sorted(automaton.goto[state].items(), key=lambda item: ord(item[0])):
+            arrays["edge_char"].append(ord(char))
+            arrays["edge_target"].append(target)
+        arrays["edge_ptr"].append(len(arrays["edge_char"]))
+        arrays["out_form"].extend(automaton.output[state])
+        arrays["out_ptr"].append(len(arrays["out_form"]))
+
+    blob = bytearray()
+    arrays["string_offsets"].append(0)
+    for value in strings:  # dicts keep insertion order, i.e. index order
+        blob += value.encode("utf-8")
+        arrays["string_offsets"].append(len(blob))
+
+    table_end = HEADER.size + SECTION.size * len(SECTIONS)
+    body = bytearray()
+    table = []
+    for name in SECTIONS:
+        offset = table_end + len(body)
+        if name == "strings":
+            body += blob
+            table.append((offset, len(blob)))
+        else:
+            body += arrays[name].tobytes()
+            table.append((offset, len(arrays[name])))
+
+    header = HEADER.pack(MAGIC, BYTE_ORDER_MARK, FORMAT_VERSION, int(taxonomy.get("version") or 0), source_mtime_ns, source_size)
+    return header + b"".join(SECTION.pack(*entry) for entry in table) + bytes(body)
+
+
+def compile_file(source_path: str, output_path: str) -> None:
+    """Compile a JSON taxonomy and write it atomically (concurrent workers may race)"""
+    stat = os.stat(source_path)
+    with open(source_path, encoding="utf-8") as f:
+        data = compile_taxonomy(json.load(f), stat.st_mtime_ns, stat.st_size)
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".taxonomy-", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def open_taxonomy(path: str) -> TaxonomyIndex:
+    """Map a compiled taxonomy read-only; pages are shared between processes"""
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return TaxonomyIndex(buffer, path)
+
+
+def load_taxonomy(path: str) -> TaxonomyIndex:
+    """Open a taxonomy, compiling the JSON source to a ``.bin`` beside it when needed"""
+    if path.endswith(".bin"):
+        return open_taxonomy(path)
+
+    compiled_path = os.path.splitext(path)[0] + ".bin"
+    stat = os.stat(path)
+    try:
+        index = open_taxonomy(compiled_path)
+        if index.source_mtime_ns == stat.st_mtime_ns and index.source_size == stat.st_size:
+            return index
+        logger.info(f"Compiled taxonomy {compiled_path} is stale; rebuilding")
+    except (OSError, ValueError):
+        pass
+
+    try:
+        compile_file(path, compiled_path)
+        return open_taxonomy(compiled_path)
+    except OSError as e:
+        # Read-only deployments still work, just without sharing between workers
+        logger.warning(f"Could not write {compiled_path} ({str(e)}); using an in-memory taxonomy")
+        with open(path, encoding="utf-8") as f:
+            return TaxonomyIndex(compile_taxonomy(json.load(f), stat.st_mtime_ns, stat.st_size))
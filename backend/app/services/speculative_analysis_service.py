@@ -0,0 +1,180 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import logging
+
+from app.core.tasks import create_detached_task
+from app.models.document import Document
+from app.models.analysis import PrecomputedJobAnalysis
+from app.services.llm_service import llm_service
+from app.services.near_duplicate_service import near_duplicate_service
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class SpeculativeAnalysisService:
+    """Runs analyze_job_description when a job description is uploaded
+
+    Students usually upload the job description and start the analysis a while
+    later, so the slowest single LLM call can run during that think time.
+    Results are stored per document and prompt version; start_job_analysis
+    reuses a finished result or attaches to the run still in flight.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[int, str], asyncio.Task] = {}
+
+    def schedule_job_analysis(self, db: Session, document: Document) -> None:
+        """Start a background job analysis for a freshly uploaded job description"""
+        if not settings.speculative_job_analysis or not document.content_text:
+            return
+
+        prompt_version = llm_service.prompt_version
+        key = (document.id, prompt_version)
+        if key in self._in_flight:
+            return
+
+        precomputed = self._get_precomputed(db, document.id, prompt_version)
+        if self._completed(precomputed) is not None:
+            return
+
+        # A near-copy of an analyzed posting needs no LLM call at all
+        reused = near_duplicate_service.reusable_job_analysis(db, document.id)
+        if reused is not None:
+            self.store_job_analysis(db, document.id, reused)
+            return
+        
+        if not precomputed:
+            precomputed = PrecomputedJobAnalysis(document_id=document.id, prompt_version=prompt_version)
+            db.add(precomputed)
+        precomputed.status = "processing"
+        precomputed.error_message = None
+        precomputed.created_at = datetime.utcnow()
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker claimed this document first
+            db.rollback()
+            return
+
+        logger.info(f"Speculatively analyzing job description {document.id}")
+        # Shared by every analysis of this document, so it must not run under one caller's deadline
+        task = create_detached_task(self._run_job_analysis(document.id, prompt_version, document.content_text))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+    async def get_job_analysis(self, db: Session, document_id: Optional[int], job_text: str) -> Dict[str, Any]:
+        """Reuse a precomputed job analysis if possible, otherwise analyze now"""
+        if document_id is not None:
+            job_analysis = await self._await_precomputed(db, document_id, llm_service.prompt_version)
+            if job_analysis is not None:
+                logger.info(f"Reusing speculative job analysis for document {document_id}")
+                return job_analysis
+
+            job_analysis = near_duplicate_service.reusable_job_analysis(db, document_id)
+            if job_analysis is not None:
+                return job_analysis
+
+        return await llm_service.analyze_job_description(job_text)
+
+    def store_job_analysis(self, db: Session, document_id: int, job_analysis: Dict[str, Any]) -> None:
+        """Record a finished job analysis of a document for the current prompts, for later analyses to reuse
+
+        A completed result already stored is kept: analyses made with the same
+        prompts are interchangeable, and others may already have read it.
+        Pending, failed and error rows are replaced.
+        """
+        if not self._usable(job_analysis):
+            return
+        prompt_version = llm_service.prompt_version
+        precomputed = self._get_precomputed(db, document_id, prompt_version)
+        if self._completed(precomputed) is not None:
+            return
+        if not precomputed:
+            precomputed = PrecomputedJobAnalysis(document_id=document_id, prompt_version=prompt_version)
+            db.add(precomputed)
+        precomputed.status = "completed"
+        precomputed.job_analysis = job_analysis
+        precomputed.error_message = None
+        precomputed.completed_at = datetime.utcnow()
+        try:
+            db.commit()
+        except IntegrityError:
+            # Stored concurrently by another worker
+            db.rollback()
+
+    def completed_job_analysis(self, db: Session, document_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        """A finished precomputed job analysis for the current prompts, without waiting for one in progress"""
+        if document_id is None:
+            return None
+        return self._completed(self._get_precomputed(db, document_id, llm_service.prompt_version))
+
+    async def _await_precomputed(self, db: Session, document_id: int, prompt_version: str) -> Optional[Dict[str, Any]]:
+        task = self._in_flight.get((document_id, prompt_version))
+        if task:
+            # Shielded so a cancelled analysis does not cancel the shared run
+            return await asyncio.shield(task)
+
+        precomputed = self._get_precomputed(db, document_id, prompt_version)
+        if not precomputed:
+            return None
+
+        # Started by another worker: wait for it unless it looks abandoned
+        deadline = precomputed.created_at + timedelta(seconds=settings.speculative_job_analysis_wait_seconds)
+        while precomputed.status == "processing" and datetime.utcnow() < deadline:
+            await asyncio.sleep(1)
+            db.refresh(precomputed)
+
+        return self._completed(precomputed)
+
+    async def _run_job_analysis(self, document_id: int, prompt_version: str, job_text: str) -> Optional[Dict[str, Any]]:
+        """Background run; returns None on failure so callers fall back to a fresh call"""
+
+        # Get a new database session for the background task
+        from database.connection import get_db
+        db = next(get_db())
+
+        try:
+            precomputed = self._get_precomputed(db, document_id, prompt_version)
+            try:
+                job_analysis = await llm_service.analyze_job_description(job_text)
+                if "error" in job_analysis:
+                    # Never store an error as the document's analysis; the caller retries now
+                    raise ValueError(job_analysis["error"])
+            except Exception as e:
+                logger.warning(f"Speculative job analysis for document {document_id} failed: {str(e)}")
+                if precomputed:
+                    precomputed.status = "failed"
+                    precomputed.error_message = str(e)
+                    db.commit()
+                return None
+
+            if precomputed:
+                precomputed.job_analysis = job_analysis
+                precomputed.status = "completed"
+                precomputed.completed_at = datetime.utcnow()
+                db.commit()
+            return job_analysis
+
+        finally:
+            db.close()
+
+    def _completed(self, precomputed: Optional[PrecomputedJobAnalysis]) -> Optional[Dict[str, Any]]:
+        """The stored job analysis, if it finished with a result (rows written before errors were rejected may hold one)"""
+        if precomputed and precomputed.status == "completed" and self._usable(precomputed.job_analysis):
+            return precomputed.job_analysis
+        return None
+
+    def _usable(self, job_analysis: Any) -> bool:
+        return isinstance(job_analysis, dict) and "error" not in job_analysis
+
+    def _get_precomputed(self, db: Session, document_id: int, prompt_version: str) -> Optional[PrecomputedJobAnalysis]:
+        return db.query(PrecomputedJobAnalysis).filter(
+            PrecomputedJobAnalysis.document_id == document_id,
+            PrecomputedJobAnalysis.prompt_version == prompt_version
+        ).first()
+
+# Global instance
+speculative_analysis_service = SpeculativeAnalysisService()
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Union
+from typing import List, Optional, Union
 import os
 
 class Settings(BaseSettings):
@@ -19,6 +19,112 @@ class Settings(BaseSettings):
     # OpenAI
     openai_api_key: str
     
+    # LLM backend: "openai" (real provider or any OpenAI-compatible server) or "fake"
+    llm_backend: str = "openai"
+    llm_base_url: Optional[str] = None  # e.g. http://localhost:8100/v1 for devtools/fake_llm_server.py
+    
+    # In-process fake backend (see app/services/llm_fakes.py)
+    llm_fake_latency: str = "fixed:0"
+    llm_fake_error_rate_429: float = 0.0
+    llm_fake_error_rate_500: float = 0.0
+    llm_fake_responses_dir: Optional[str] = None
+    llm_fake_seed: Optional[int] = None
+    llm_fake_tokens_per_second: float = 0.0  # 0 disables length-dependent generation time
+    
+    # Provider calls per minute from this process (0 = unlimited)
+    llm_requests_per_minute: float = 0
+    
+    # Client timeout for LLM calls made outside an analysis deadline (0 = none)
+    llm_request_timeout_seconds: float = 120
+    # Initial generation-speed estimate used to cap max_tokens to a call's time budget, refined as calls finish
+    llm_expected_tokens_per_second: float = 60
+    
+    # Record/replay of LLM traffic (see app/services/llm_cassettes.py)
+    llm_cassette_mode: str = "off"  # off, record or replay
+    llm_cassette_dir: str = "cassettes"
+    llm_cassette_match: str = "exact"  # exact prompt hash, or fall back to any recording of the method
+    llm_cassette_replay_latency: bool = False  # sleep for the recorded latency when replaying
+    
+    # Offline batch execution for non-interactive work (see app/services/llm_batch.py)
+    llm_batch_client: Optional[str] = None  # openai (Batch API) or local (fake responder); defaults to local with the fake backend
+    llm_batch_dir: str = "batches"  # JSONL input and output files
+    llm_batch_max_requests: int = 1000  # submit once this many prompts are waiting...
+    llm_batch_window_seconds: float = 10.0  # ...or this long after the first one arrived
+    llm_batch_poll_seconds: float = 60.0
+    
+    # Analysis pipeline: "multi_call" (one GPT call per matching step) or "fused"
+    analysis_pipeline_mode: str = "multi_call"
+    
+    # Starting an analysis cancels the user's in-progress analysis of the same kind (requests can override)
+    analysis_supersede_previous: bool = False
+    
+    # Fair-share scheduling of analyses (app/services/analysis_scheduler.py): total and per-user analyses in flight
+    analysis_scheduler_concurrency: int = 8
+    analysis_scheduler_per_user_limit: int = 2
+    analysis_expected_seconds: float = 60  # initial run-time estimate, refined as analyses finish
+    
+    # Overall deadline for one analysis run, split into per-step budgets (0 disables); steps that
+    # overrun fall back to cached or lite results or fail, and the sweeper fails analyses stuck past it
+    analysis_deadline_seconds: float = 300
+    analysis_sweep_interval_seconds: float = 60  # 0 disables the sweeper
+    
+    # Admission control: starts get 429 + Retry-After beyond this queue depth or estimated wait (0 disables either)
+    analysis_admission_max_queue: int = 40
+    analysis_admission_max_wait_seconds: float = 300
+    
+    # Starting an analysis whose inputs match a completed one returns (or copies) its results instead of re-running
+    analysis_memoization: bool = True
+    
+    # Steps made stale by questionnaire edits are recomputed in the background when the analysis is next read
+    analysis_refresh_stale_on_read: bool = True
+    
+    # Idempotency-Key header on analysis starts and uploads: how long a key replays its first response
+    idempotency_key_ttl_hours: float = 24
+    
+    # Lite tier: compact analyses with local matching and a templated summary, chosen automatically
+    # while the estimated queue wait or recent provider latency is above these thresholds (0 disables either)
+    analysis_lite_auto: bool = True
+    analysis_lite_wait_threshold_seconds: float = 120
+    analysis_lite_latency_threshold_seconds: float = 45
+    analysis_lite_auto_upgrade: bool = True  # re-run lite analyses in full in the background once load drops
+    analysis_lite_upgrade_poll_seconds: float = 30
+    
+    # Portfolio project: "single" call or "sectioned" (plan, then sections in parallel)
+    portfolio_generation_mode: str = "single"
+    
+    # Resume analysis: "single" prompt, or "sectioned" (per-section extraction cached by text hash, then a synthesis call)
+    resume_analysis_mode: str = "single"
+    
+    # Analyze job descriptions in the background as soon as they are uploaded
+    speculative_job_analysis: bool = False
+    speculative_job_analysis_wait_seconds: int = 120  # how long to wait on another worker's run
+    
+    # Local skill extraction pre-fills exact skill matches so prompts only judge the rest
+    local_skill_matching: bool = True
+    skills_taxonomy_path: Optional[str] = None  # JSON source (compiled to .bin beside it) or a compiled .bin; defaults to app/data/skills_taxonomy.json
+    
+    # Reuse the job analysis of a near-duplicate posting (MinHash estimate of word-shingle Jaccard)
+    near_duplicate_job_reuse: bool = True
+    near_duplicate_threshold: float = 0.9
+    
+    # Background jobs: worker count, and whether to pre-generate the next IPP stage
+    job_queue_concurrency: int = 4
+    ipp_pregeneration: bool = True
+    
+    # Cohort imports (app/cli/cohort_import.py): analyses in flight and provider calls per minute
+    cohort_import_concurrency: int = 4
+    cohort_import_requests_per_minute: float = 60
+    cohort_import_extract_workers: int = 0  # text extraction processes; 0 = one per CPU
+    cohort_import_execution: str = "realtime"  # realtime, or batch to send analyses through the offline batch API
+    
+    # Prompt-version backfill (app/cli/prompt_backfill.py): its own call budget, and pausing while students' analyses run
+    prompt_backfill_requests_per_minute: float = 20
+    prompt_backfill_yield_to_live: bool = True
+    prompt_backfill_idle_poll_seconds: float = 5.0
+    
+    # Comma-separated emails allowed to use instructor endpoints (cohort rankings)
+    instructor_emails: Union[str, List[str]] = ""
+    
     # Application
     environment: str = "development"
     debug: bool = True
@@ -28,6 +134,13 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = False
 
+    @property
+    def instructor_emails_list(self) -> List[str]:
+        """Convert instructor_emails to a lowercase list if it's a string"""
+        if isinstance(self.instructor_emails, str):
+            return [email.strip().lower() for email in self.instructor_emails.split(",") if email.strip()]
+        return [email.lower() for email in self.instructor_emails]
+
     @property
     def allowed_origins_list(self) -> List[str]:
         """Convert allowed_origins to list if it's a string"""
@@ -0,0 +1,27 @@
+"""Add analysis tier to document analyses
+
+Revision ID: a83c5e1f7d40
+Revises: f61b8d3c5a92
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'a83c5e1f7d40'
+down_revision = 'f61b8d3c5a92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('document_analyses', schema=settings.db_schema) as batch_op:
+        batch_op.add_column(sa.Column('analysis_tier', sa.String(length=20), server_default='full', nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('document_analyses', schema=settings.db_schema) as batch_op:
+        batch_op.drop_column('analysis_tier')
@@ -0,0 +1,42 @@
+"""Add idempotency keys table
+
+Revision ID: b5e2f9c4a617
+Revises: a83c5e1f7d40
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e2f9c4a617'
+down_revision = 'a83c5e1f7d40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('idempotency_keys',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('idempotency_key', sa.String(length=255), nullable=False),
+    sa.Column('endpoint', sa.String(length=100), nullable=False),
+    sa.Column('request_hash', sa.String(length=64), nullable=False),
+    sa.Column('response', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], [f'{settings.db_schema}.users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'idempotency_key', name='uq_idempotency_keys_user_key'),
+    schema=settings.db_schema
+    )
+    op.create_index(op.f(f'ix_{settings.db_schema}_idempotency_keys_id'), 'idempotency_keys', ['id'], unique=False, schema=settings.db_schema)
+    op.create_index(op.f(f'ix_{settings.db_schema}_idempotency_keys_user_id'), 'idempotency_keys', ['user_id'], unique=False, schema=settings.db_schema)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f(f'ix_{settings.db_schema}_idempotency_keys_user_id'), table_name='idempotency_keys', schema=settings.db_schema)
+    op.drop_index(op.f(f'ix_{settings.db_schema}_idempotency_keys_id'), table_name='idempotency_keys', schema=settings.db_schema)
+    op.drop_table('idempotency_keys', schema=settings.db_schema)
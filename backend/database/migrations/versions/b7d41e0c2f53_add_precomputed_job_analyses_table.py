@@ -0,0 +1,40 @@
+"""Add precomputed job analyses table
+
+Revision ID: b7d41e0c2f53
+Revises: 9aab36dace77
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d41e0c2f53'
+down_revision = '9aab36dace77'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('precomputed_job_analyses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('document_id', sa.Integer(), nullable=False),
+    sa.Column('prompt_version', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('job_analysis', sa.JSON(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['document_id'], [f'{settings.db_schema}.documents.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('document_id', 'prompt_version', name='uq_precomputed_job_analyses_document_version'),
+    schema=settings.db_schema
+    )
+    op.create_index(op.f(f'ix_{settings.db_schema}_precomputed_job_analyses_id'), 'precomputed_job_analyses', ['id'], unique=False, schema=settings.db_schema)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f(f'ix_{settings.db_schema}_precomputed_job_analyses_id'), table_name='precomputed_job_analyses', schema=settings.db_schema)
+    op.drop_table('precomputed_job_analyses', schema=settings.db_schema)
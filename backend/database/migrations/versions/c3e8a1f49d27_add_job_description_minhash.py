@@ -0,0 +1,45 @@
+"""Add MinHash signatures and LSH buckets for job descriptions
+
+Revision ID: c3e8a1f49d27
+Revises: b7d41e0c2f53
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8a1f49d27'
+down_revision = 'b7d41e0c2f53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('documents', schema=settings.db_schema) as batch_op:
+        batch_op.add_column(sa.Column('minhash_signature', sa.LargeBinary(), nullable=True))
+
+    op.create_table('document_lsh_buckets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('document_id', sa.Integer(), nullable=False),
+    sa.Column('band', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['document_id'], [f'{settings.db_schema}.documents.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    schema=settings.db_schema
+    )
+    op.create_index(op.f(f'ix_{settings.db_schema}_document_lsh_buckets_id'), 'document_lsh_buckets', ['id'], unique=False, schema=settings.db_schema)
+    op.create_index(op.f(f'ix_{settings.db_schema}_document_lsh_buckets_document_id'), 'document_lsh_buckets', ['document_id'], unique=False, schema=settings.db_schema)
+    op.create_index('ix_document_lsh_buckets_band_bucket', 'document_lsh_buckets', ['band', 'bucket'], unique=False, schema=settings.db_schema)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_lsh_buckets_band_bucket', table_name='document_lsh_buckets', schema=settings.db_schema)
+    op.drop_index(op.f(f'ix_{settings.db_schema}_document_lsh_buckets_document_id'), table_name='document_lsh_buckets', schema=settings.db_schema)
+    op.drop_index(op.f(f'ix_{settings.db_schema}_document_lsh_buckets_id'), table_name='document_lsh_buckets', schema=settings.db_schema)
+    op.drop_table('document_lsh_buckets', schema=settings.db_schema)
+
+    with op.batch_alter_table('documents', schema=settings.db_schema) as batch_op:
+        batch_op.drop_column('minhash_signature')
@@ -0,0 +1,36 @@
+"""Add input fingerprint and reuse link to document analyses
+
+Revision ID: c9d4a7e2b158
+Revises: b5e2f9c4a617
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d4a7e2b158'
+down_revision = 'b5e2f9c4a617'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('document_analyses', schema=settings.db_schema) as batch_op:
+        batch_op.add_column(sa.Column('input_fingerprint', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('reused_from_analysis_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_document_analyses_reused_from', 'document_analyses',
+            ['reused_from_analysis_id'], ['id'], referent_schema=settings.db_schema
+        )
+    op.create_index(op.f(f'ix_{settings.db_schema}_document_analyses_input_fingerprint'), 'document_analyses', ['input_fingerprint'], unique=False, schema=settings.db_schema)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f(f'ix_{settings.db_schema}_document_analyses_input_fingerprint'), table_name='document_analyses', schema=settings.db_schema)
+    with op.batch_alter_table('document_analyses', schema=settings.db_schema) as batch_op:
+        batch_op.drop_constraint('fk_document_analyses_reused_from', type_='foreignkey')
+        batch_op.drop_column('reused_from_analysis_id')
+        batch_op.drop_column('input_fingerprint')
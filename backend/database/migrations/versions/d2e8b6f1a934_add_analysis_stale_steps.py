@@ -0,0 +1,27 @@
+"""Add stale steps to document analyses
+
+Revision ID: d2e8b6f1a934
+Revises: c9d4a7e2b158
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e8b6f1a934'
+down_revision = 'c9d4a7e2b158'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('document_analyses', schema=settings.db_schema) as batch_op:
+        batch_op.add_column(sa.Column('stale_steps', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('document_analyses', schema=settings.db_schema) as batch_op:
+        batch_op.drop_column('stale_steps')
@@ -0,0 +1,39 @@
+"""Add resume section analyses table
+
+Revision ID: d52f7b9e3a14
+Revises: c3e8a1f49d27
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'd52f7b9e3a14'
+down_revision = 'c3e8a1f49d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('resume_section_analyses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('section_hash', sa.String(length=64), nullable=False),
+    sa.Column('prompt_version', sa.String(length=50), nullable=False),
+    sa.Column('section_kind', sa.String(length=50), nullable=False),
+    sa.Column('extraction', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], [f'{settings.db_schema}.users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'section_hash', 'prompt_version', name='uq_resume_section_analyses_user_hash_version'),
+    schema=settings.db_schema
+    )
+    op.create_index(op.f(f'ix_{settings.db_schema}_resume_section_analyses_id'), 'resume_section_analyses', ['id'], unique=False, schema=settings.db_schema)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f(f'ix_{settings.db_schema}_resume_section_analyses_id'), table_name='resume_section_analyses', schema=settings.db_schema)
+    op.drop_table('resume_section_analyses', schema=settings.db_schema)
@@ -0,0 +1,64 @@
+"""Add cohort import ledger tables
+
+Revision ID: e4a9c2d7b618
+Revises: d52f7b9e3a14
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9c2d7b618'
+down_revision = 'd52f7b9e3a14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('cohort_imports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('instructor_user_id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['instructor_user_id'], [f'{settings.db_schema}.users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name'),
+    schema=settings.db_schema
+    )
+    op.create_index(op.f(f'ix_{settings.db_schema}_cohort_imports_id'), 'cohort_imports', ['id'], unique=False, schema=settings.db_schema)
+
+    op.create_table('cohort_import_steps',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('import_id', sa.Integer(), nullable=False),
+    sa.Column('step_key', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('document_id', sa.Integer(), nullable=True),
+    sa.Column('analysis_id', sa.Integer(), nullable=True),
+    sa.Column('detail', sa.JSON(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['import_id'], [f'{settings.db_schema}.cohort_imports.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], [f'{settings.db_schema}.users.id'], ),
+    sa.ForeignKeyConstraint(['document_id'], [f'{settings.db_schema}.documents.id'], ),
+    sa.ForeignKeyConstraint(['analysis_id'], [f'{settings.db_schema}.document_analyses.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('import_id', 'step_key', name='uq_cohort_import_steps_import_key'),
+    schema=settings.db_schema
+    )
+    op.create_index(op.f(f'ix_{settings.db_schema}_cohort_import_steps_id'), 'cohort_import_steps', ['id'], unique=False, schema=settings.db_schema)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f(f'ix_{settings.db_schema}_cohort_import_steps_id'), table_name='cohort_import_steps', schema=settings.db_schema)
+    op.drop_table('cohort_import_steps', schema=settings.db_schema)
+    op.drop_index(op.f(f'ix_{settings.db_schema}_cohort_imports_id'), table_name='cohort_imports', schema=settings.db_schema)
+    op.drop_table('cohort_imports', schema=settings.db_schema)
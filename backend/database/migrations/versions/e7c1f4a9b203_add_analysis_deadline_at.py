@@ -0,0 +1,27 @@
+"""Add deadline to document analyses
+
+Revision ID: e7c1f4a9b203
+Revises: d2e8b6f1a934
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c1f4a9b203'
+down_revision = 'd2e8b6f1a934'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('document_analyses', schema=settings.db_schema) as batch_op:
+        batch_op.add_column(sa.Column('deadline_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('document_analyses', schema=settings.db_schema) as batch_op:
+        batch_op.drop_column('deadline_at')
@@ -0,0 +1,27 @@
+"""Add execution to document analyses
+
+Revision ID: f3a8d5c2e671
+Revises: e7c1f4a9b203
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8d5c2e671'
+down_revision = 'e7c1f4a9b203'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('document_analyses', schema=settings.db_schema) as batch_op:
+        batch_op.add_column(sa.Column('execution', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('document_analyses', schema=settings.db_schema) as batch_op:
+        batch_op.drop_column('execution')
@@ -0,0 +1,41 @@
+"""Add prompt backfill checkpoint table
+
+Revision ID: f61b8d3c5a92
+Revises: e4a9c2d7b618
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'f61b8d3c5a92'
+down_revision = 'e4a9c2d7b618'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('prompt_backfill_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('target_version', sa.String(length=50), nullable=False),
+    sa.Column('last_analysis_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('scanned', sa.Integer(), nullable=True),
+    sa.Column('upgraded', sa.Integer(), nullable=True),
+    sa.Column('failures', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('target_version'),
+    schema=settings.db_schema
+    )
+    op.create_index(op.f(f'ix_{settings.db_schema}_prompt_backfill_runs_id'), 'prompt_backfill_runs', ['id'], unique=False, schema=settings.db_schema)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f(f'ix_{settings.db_schema}_prompt_backfill_runs_id'), table_name='prompt_backfill_runs', schema=settings.db_schema)
+    op.drop_table('prompt_backfill_runs', schema=settings.db_schema)
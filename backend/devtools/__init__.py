@@ -0,0 +1 @@
+"""Developer tooling: LLM stand-ins, load tests and benchmarks (not imported by the app)"""
@@ -0,0 +1,156 @@
+"""
+Fused vs multi-call job-match benchmark
+=======================================
+
+Runs ``_perform_job_analysis`` (or the full ``_perform_analysis``) in both
+pipeline modes and compares latency, LLM calls, tokens, estimated cost and
+output completeness (share of expected connection/evidence/summary fields that
+came back non-empty).
+
+Against the fake backend, give it a length-dependent latency so the fused
+call's larger output is not free:
+    python -m devtools.benchmark_fused_pipeline --latency lognormal:0.0,0.3 --tokens-per-second 80
+
+Against the real provider (needs OPENAI_API_KEY, spends money):
+    python -m devtools.benchmark_fused_pipeline --backend openai --iterations 3
+"""
+
+import argparse
+import asyncio
+import time
+
+from devtools import harness
+
+MODES = ("multi_call", "fused")
+
+CONNECTION_FIELDS = (
+    "skill_matches", "experience_connections", "growth_opportunities", "value_alignment",
+    "unique_strengths", "development_areas", "portfolio_project_themes",
+    "ignatian_reflection_points", "overall_fit_score", "next_steps_suggestions",
+)
+EVIDENCE_FIELDS = ("direct_matches", "skill_gaps")
+SUMMARY_FIELDS = ("context_summary", "role_fit_narrative", "strengths", "gaps")
+
+
+def completeness(analysis) -> float:
+    """Fraction of expected output fields that are present and non-empty"""
+    connections = analysis.connections_analysis or {}
+    alignment = connections.get("skill_alignment") or {}
+    present = [bool(connections.get(name)) for name in CONNECTION_FIELDS]
+    present += [bool(alignment.get(name)) for name in EVIDENCE_FIELDS]
+    present += [bool(getattr(analysis, name)) for name in SUMMARY_FIELDS]
+    return sum(present) / len(present)
+
+
+async def run_once(pipeline: str, mode: str, inputs: dict):
+    import database.connection as connection
+    from app.models.analysis import DocumentAnalysis
+    from app.services.analysis_service import analysis_service
+
+    db = connection.SessionLocal()
+    try:
+        analysis = DocumentAnalysis(
+            user_id=inputs["user_id"],
+            resume_document_id=inputs["resume_id"],
+            job_document_id=inputs["job_id"],
+            status="pending"
+        )
+        if pipeline == "job":
+            analysis.resume_analysis = inputs["resume_analysis"]
+        db.add(analysis)
+        db.commit()
+        analysis_id = analysis.id
+    finally:
+        db.close()
+
+    if pipeline == "job":
+        await analysis_service._perform_job_analysis(
+            analysis_id, inputs["resume_analysis"], inputs["job_text"], pipeline_mode=mode
+        )
+    else:
+        await analysis_service._perform_analysis(
+            analysis_id, inputs["resume_text"], inputs["job_text"], pipeline_mode=mode
+        )
+
+    return await harness.wait_for_analysis(analysis_id, poll_interval=0.01)
+
+
+async def run(pipeline: str, iterations: int, resume_text: str, job_text: str) -> dict:
+    import database.connection as connection
+    from app.core.metrics import track_usage
+    from app.services.llm_service import llm_service
+
+    db = connection.SessionLocal()
+    try:
+        user, resume, job = harness.seed_pair(db, 0, resume_text, job_text)
+        inputs = {
+            "user_id": user.id,
+            "resume_id": resume.id,
+            "job_id": job.id,
+            "resume_text": resume_text,
+            "job_text": job_text,
+        }
+    finally:
+        db.close()
+
+    if pipeline == "job":
+        inputs["resume_analysis"] = await llm_service.analyze_resume(resume_text, {})
+
+    results = {}
+    for mode in MODES:
+        rows = []
+        for _ in range(iterations):
+            with track_usage() as tally:
+                started = time.perf_counter()
+                finished = await run_once(pipeline, mode, inputs)
+                elapsed = time.perf_counter() - started
+            rows.append((elapsed, tally, finished.status, completeness(finished)))
+        results[mode] = rows
+    return results
+
+
+def report(results: dict) -> None:
+    for mode, rows in results.items():
+        failures = sum(1 for row in rows if row[2] != "completed")
+        tallies = [row[1] for row in rows]
+        runs = len(rows)
+        print(f"\n[{mode}] {runs} runs, {failures} not completed")
+        print(harness.format_row("latency", harness.summarize([row[0] for row in rows])))
+        print(harness.format_row("model time", harness.summarize([t.llm_seconds for t in tallies])))
+        print(f"{'LLM calls per run':<28} {sum(t.calls + t.cache_hits for t in tallies) / runs:.1f} "
+              f"({', '.join(f'{m}={c}' for m, c in tallies[-1].methods.items())})")
+        print(f"{'tokens per run':<28} prompt={sum(t.prompt_tokens for t in tallies) // runs} "
+              f"completion={sum(t.completion_tokens for t in tallies) // runs}")
+        print(f"{'est. cost per run':<28} ${sum(t.cost_usd for t in tallies) / runs:.5f}")
+        print(f"{'completeness':<28} {sum(row[3] for row in rows) / runs:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pipeline", default="job", choices=["job", "full"])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--backend", default="fake", choices=["fake", "openai"])
+    parser.add_argument("--latency", default="fixed:0.2", help="fake backend latency spec")
+    parser.add_argument("--tokens-per-second", default="80", help="fake backend generation speed")
+    parser.add_argument("--resume", help="resume text file (defaults to devtools/samples/resume.txt)")
+    parser.add_argument("--job", help="job description text file")
+    args = parser.parse_args()
+
+    harness.configure_environment(
+        # Pre-generated IPP stages are not part of the pipeline being compared
+        ipp_pregeneration="false",
+        llm_backend=args.backend,
+        llm_fake_latency=args.latency,
+        llm_fake_tokens_per_second=args.tokens_per_second
+    )
+    harness.setup_sqlite_database()
+
+    resume_text = open(args.resume).read() if args.resume else harness.load_sample("resume.txt")
+    job_text = open(args.job).read() if args.job else harness.load_sample("job_description.txt")
+
+    print(f"Comparing {' vs '.join(MODES)} on the {args.pipeline} pipeline with the {args.backend} backend")
+    report(asyncio.run(run(args.pipeline, args.iterations, resume_text, job_text)))
+
+
+if __name__ == "__main__":
+    main()
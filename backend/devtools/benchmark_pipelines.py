@@ -0,0 +1,145 @@
+"""
+Reproducible pipeline benchmarks from recorded LLM traffic
+==========================================================
+
+Times ``_perform_analysis``, ``_perform_resume_only_analysis`` and
+``_perform_job_analysis`` end to end with real recorded payload sizes.
+
+Record once against the real provider (needs OPENAI_API_KEY):
+    python -m devtools.benchmark_pipelines --record --cassettes cassettes/bench
+
+Then replay as often as needed, offline:
+    python -m devtools.benchmark_pipelines --cassettes cassettes/bench --iterations 20
+    python -m devtools.benchmark_pipelines --cassettes cassettes/bench --replay-latency
+
+Use ``--match method`` to run edited prompt templates against the recorded
+corpus (misses fall back to a recording of the same method).
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime
+
+from devtools import harness
+
+PIPELINES = ("full", "resume", "job")
+
+
+async def run_pipeline(name: str, inputs: dict) -> str:
+    import database.connection as connection
+    from app.models.analysis import DocumentAnalysis
+    from app.services.analysis_service import analysis_service
+
+    db = connection.SessionLocal()
+    try:
+        analysis = DocumentAnalysis(
+            user_id=inputs["user_id"],
+            resume_document_id=inputs["resume_id"],
+            job_document_id=inputs["job_id"] if name != "resume" else None,
+            status="pending"
+        )
+        if name == "job":
+            # The job pipeline builds on a stored resume analysis
+            analysis.resume_analysis = inputs["resume_analysis"]
+        db.add(analysis)
+        db.commit()
+        analysis_id = analysis.id
+    finally:
+        db.close()
+
+    if name == "full":
+        await analysis_service._perform_analysis(analysis_id, inputs["resume_text"], inputs["job_text"])
+    elif name == "resume":
+        await analysis_service._perform_resume_only_analysis(analysis_id, inputs["resume_text"])
+    else:
+        await analysis_service._perform_job_analysis(analysis_id, inputs["resume_analysis"], inputs["job_text"])
+
+    finished = await harness.wait_for_analysis(analysis_id, poll_interval=0.01)
+    return finished.status
+
+
+async def stored_resume_analysis(resume_text: str) -> dict:
+    """Resume analysis used as job-pipeline input (served from the cassette too)"""
+    from app.services.llm_service import llm_service
+    return await llm_service.analyze_resume(resume_text, {})
+
+
+async def run(pipelines, iterations: int, resume_text: str, job_text: str) -> dict:
+    import database.connection as connection
+    from app.core.metrics import track_usage
+
+    db = connection.SessionLocal()
+    try:
+        user, resume, job = harness.seed_pair(db, 0, resume_text, job_text)
+        inputs = {
+            "user_id": user.id,
+            "resume_id": resume.id,
+            "job_id": job.id,
+            "resume_text": resume_text,
+            "job_text": job_text,
+        }
+    finally:
+        db.close()
+
+    if "job" in pipelines:
+        inputs["resume_analysis"] = await stored_resume_analysis(resume_text)
+
+    results = {}
+    for name in pipelines:
+        rows = []
+        for _ in range(iterations):
+            with track_usage() as tally:
+                started = time.perf_counter()
+                status = await run_pipeline(name, inputs)
+                elapsed = time.perf_counter() - started
+            rows.append((elapsed, tally, status))
+        results[name] = rows
+    return results
+
+
+def report(results: dict) -> None:
+    for name, rows in results.items():
+        failures = sum(1 for _, _, status in rows if status != "completed")
+        last = rows[-1][1]
+        print(f"\n[{name}] {len(rows)} runs, {failures} not completed")
+        print(harness.format_row("latency", harness.summarize([r[0] for r in rows])))
+        print(f"{'LLM calls per run':<28} {last.calls + last.cache_hits} ({', '.join(f'{m}={c}' for m, c in last.methods.items())})")
+        print(f"{'tokens per run':<28} prompt={last.prompt_tokens} completion={last.completion_tokens}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cassettes", default="cassettes/bench", help="cassette directory")
+    parser.add_argument("--record", action="store_true", help="call the real backend and record")
+    parser.add_argument("--backend", help="backend to record from (default: LLM_BACKEND or openai)")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--pipelines", default=",".join(PIPELINES), help="comma separated: full,resume,job")
+    parser.add_argument("--replay-latency", action="store_true", help="sleep for recorded latencies")
+    parser.add_argument("--match", default="exact", choices=["exact", "method"])
+    parser.add_argument("--resume", help="resume text file (defaults to devtools/samples/resume.txt)")
+    parser.add_argument("--job", help="job description text file")
+    args = parser.parse_args()
+
+    harness.configure_environment(
+        # Pre-generated IPP stages are not part of the pipelines being timed
+        ipp_pregeneration="false",
+        llm_backend=(args.backend or os.environ.get("LLM_BACKEND", "openai")) if args.record else None,
+        llm_cassette_mode="record" if args.record else "replay",
+        llm_cassette_dir=args.cassettes,
+        llm_cassette_match=args.match,
+        llm_cassette_replay_latency=str(args.replay_latency).lower()
+    )
+    harness.setup_sqlite_database()
+
+    resume_text = open(args.resume).read() if args.resume else harness.load_sample("resume.txt")
+    job_text = open(args.job).read() if args.job else harness.load_sample("job_description.txt")
+    pipelines = [p for p in args.pipelines.split(",") if p in PIPELINES]
+
+    print(f"{'Recording' if args.record else 'Replaying'} {args.cassettes} at {datetime.utcnow().isoformat()}")
+    report(asyncio.run(run(pipelines, 1 if args.record else args.iterations, resume_text, job_text)))
+
+
+if __name__ == "__main__":
+    main()
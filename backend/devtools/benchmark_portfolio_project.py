@@ -0,0 +1,89 @@
+"""
+Single-call vs sectioned portfolio project benchmark
+====================================================
+
+Times ``LLMService.generate_portfolio_project`` end to end in "single" mode
+(one large call) and "sectioned" mode (planning call, then sections in
+parallel), with calls, tokens and the share of sections returned.
+
+The fake backend needs a generation speed for the comparison to mean anything:
+    python -m devtools.benchmark_portfolio_project --tokens-per-second 60 --latency fixed:0.5
+
+Against the real provider (needs OPENAI_API_KEY, spends money):
+    python -m devtools.benchmark_portfolio_project --backend openai --iterations 3
+"""
+
+import argparse
+import asyncio
+import time
+
+from devtools import harness
+
+MODES = ("single", "sectioned")
+
+SECTIONS = (
+    "project_overview", "objectives_outcomes", "technical_demonstration", "values_service_integration",
+    "implementation_roadmap", "deliverables_portfolio", "interview_preparation",
+)
+
+REFLECTION_RESPONSES = {
+    "values_alignment_1": "I feel most alive when my analysis helps people who are usually left out of decisions.",
+    "service_to_others_1": "Tutoring showed me that explaining data clearly is a way of serving others.",
+    "personal_mission_1": "I want to use analytics to make education more equitable.",
+}
+
+
+async def run(iterations: int) -> dict:
+    from app.core.metrics import track_usage
+    from app.services.llm_fakes import CANNED_RESPONSES
+    from app.services.llm_service import llm_service
+
+    synthesis = CANNED_RESPONSES["generate_reflection_synthesis"]
+    results = {}
+    for mode in MODES:
+        rows = []
+        for _ in range(iterations):
+            with track_usage() as tally:
+                started = time.perf_counter()
+                project = await llm_service.generate_portfolio_project(synthesis, REFLECTION_RESPONSES, mode=mode)
+                elapsed = time.perf_counter() - started
+            present = sum(1 for name in SECTIONS if project.get(name))
+            rows.append((elapsed, tally, present / len(SECTIONS)))
+        results[mode] = rows
+    return results
+
+
+def report(results: dict) -> None:
+    for mode, rows in results.items():
+        tallies = [row[1] for row in rows]
+        runs = len(rows)
+        print(f"\n[{mode}] {runs} runs")
+        print(harness.format_row("latency", harness.summarize([row[0] for row in rows])))
+        print(harness.format_row("summed model time", harness.summarize([t.llm_seconds for t in tallies])))
+        print(f"{'LLM calls per run':<28} {sum(t.calls + t.cache_hits for t in tallies) / runs:.1f}")
+        print(f"{'tokens per run':<28} prompt={sum(t.prompt_tokens for t in tallies) // runs} "
+              f"completion={sum(t.completion_tokens for t in tallies) // runs}")
+        print(f"{'est. cost per run':<28} ${sum(t.cost_usd for t in tallies) / runs:.5f}")
+        print(f"{'sections returned':<28} {sum(row[2] for row in rows) / runs:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--backend", default="fake", choices=["fake", "openai"])
+    parser.add_argument("--latency", default="fixed:0.5", help="fake backend time to first token")
+    parser.add_argument("--tokens-per-second", default="60", help="fake backend generation speed")
+    args = parser.parse_args()
+
+    harness.configure_environment(
+        llm_backend=args.backend,
+        llm_fake_latency=args.latency,
+        llm_fake_tokens_per_second=args.tokens_per_second
+    )
+
+    print(f"Comparing {' vs '.join(MODES)} portfolio generation with the {args.backend} backend")
+    report(asyncio.run(run(args.iterations)))
+
+
+if __name__ == "__main__":
+    main()
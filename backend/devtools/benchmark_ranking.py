@@ -0,0 +1,109 @@
+"""
+Ranking index benchmark
+=======================
+
+Seeds a SQLite database with synthetic postings and resumes (random skill
+mixes from the taxonomy, each with a completed analysis), then times the
+first query (sync from the database plus matrix build), steady-state
+rank-jobs / rank-resumes queries, and a query right after one more analysis
+completes (incremental sync and rebuild).
+
+    python -m devtools.benchmark_ranking --postings 500 --resumes 300
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime
+
+from devtools import harness
+
+
+def skill_text(rng: random.Random, labels: list, count: int) -> str:
+    picked = rng.sample(labels, count)
+    return "\n".join(f"- Experience with {label} in a team setting" for label in picked)
+
+
+def seed(db, postings: int, resumes: int, seed_value: int):
+    from app.models.analysis import DocumentAnalysis
+
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app", "data", "skills_taxonomy.json")
+    with open(path, encoding="utf-8") as f:
+        labels = [skill["label"] for skill in json.load(f)["skills"] if not skill.get("case_sensitive")]
+
+    rng = random.Random(seed_value)
+    users = [harness.seed_user(db, index) for index in range(max(postings, resumes))]
+    resume_ids, job_ids = [], []
+    for index in range(max(postings, resumes)):
+        resume = harness.seed_document(db, users[index], "resume", skill_text(rng, labels, rng.randint(8, 20))) if index < resumes else None
+        job = harness.seed_document(db, users[index], "job_description", skill_text(rng, labels, rng.randint(6, 15))) if index < postings else None
+        db.add(DocumentAnalysis(
+            user_id=users[index].id,
+            resume_document_id=resume.id if resume else None,
+            job_document_id=job.id if job else None,
+            job_analysis={"job_title": f"Posting {index}", "required_skills": rng.sample(labels, 3)} if job else None,
+            status="completed",
+            completed_at=datetime.utcnow()
+        ))
+        if resume:
+            resume_ids.append(resume.id)
+        if job:
+            job_ids.append(job.id)
+    db.commit()
+    return users, resume_ids, job_ids, labels, rng
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=500)
+    parser.add_argument("--resumes", type=int, default=300)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    harness.configure_environment()
+    harness.setup_sqlite_database()
+    import database.connection as connection
+    from app.models.analysis import DocumentAnalysis
+    from app.services.ranking_index import RankingIndex
+
+    db = connection.SessionLocal()
+    users, resume_ids, job_ids, labels, rng = seed(db, args.postings, args.resumes, 11)
+    index = RankingIndex()
+
+    started = time.perf_counter()
+    first = index.rank_jobs(db, resume_ids[0], args.k)
+    print(f"Seeded {len(job_ids)} postings / {len(resume_ids)} resumes")
+    print(f"{'first query (sync + build)':<28} {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    jobs_for_resume, resumes_for_job = [], []
+    for _ in range(args.queries):
+        started = time.perf_counter()
+        index.rank_jobs(db, rng.choice(resume_ids), args.k)
+        jobs_for_resume.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        index.rank_resumes(db, rng.choice(job_ids), args.k)
+        resumes_for_job.append((time.perf_counter() - started) * 1000)
+    print(harness.format_row("rank jobs for resume", harness.summarize(jobs_for_resume), unit="ms"))
+    print(harness.format_row("rank resumes for job", harness.summarize(resumes_for_job), unit="ms"))
+
+    job = harness.seed_document(db, users[0], "job_description", skill_text(rng, labels, 10))
+    db.add(DocumentAnalysis(user_id=users[0].id, job_document_id=job.id, job_analysis={"job_title": "New posting"},
+                            status="completed", completed_at=datetime.utcnow()))
+    db.commit()
+    started = time.perf_counter()
+    index.rank_jobs(db, resume_ids[0], args.k)
+    print(f"{'query after one new posting':<28} {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    top = first["results"][0]
+    print(f"\nTop posting for resume {resume_ids[0]}: {top['title']} score={top['score']}")
+    matched = ", ".join(f"{item['skill']} ({item['contribution']:.0%})" for item in top["matched_skills"])
+    print(f"  matched: {matched}")
+    print(f"  missing: {', '.join(top['missing_requirements'])}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
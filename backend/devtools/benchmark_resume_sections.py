@@ -0,0 +1,76 @@
+"""
+Single-prompt vs sectioned resume analysis benchmark
+====================================================
+
+Runs the sample resume through ``ResumeSectionService.analyze_resume`` in
+"single" mode, then in "sectioned" mode cold (every section extracted), after
+a one-bullet revision (only that entry re-extracted) and unchanged (synthesis
+only), with latency, calls and tokens per run.
+
+The fake backend needs a generation speed for the comparison to mean anything:
+    python -m devtools.benchmark_resume_sections --tokens-per-second 60 --latency fixed:0.5
+"""
+
+import argparse
+import asyncio
+import time
+
+from devtools import harness
+
+REVISION = ("reducing report preparation time by 40%", "reducing report preparation time by 45% for 6 regional managers")
+
+
+async def run(db, user_id: int, resume_text: str) -> list:
+    from app.core.metrics import track_usage
+    from app.services.resume_section_service import resume_section_service
+
+    revised = resume_text.replace(*REVISION)
+    runs = [
+        ("single", "single", resume_text),
+        ("sectioned, cold", "sectioned", resume_text),
+        ("sectioned, one bullet revised", "sectioned", revised),
+        ("sectioned, unchanged", "sectioned", revised),
+    ]
+    rows = []
+    for label, mode, text in runs:
+        with track_usage() as tally:
+            started = time.perf_counter()
+            analysis = await resume_section_service.analyze_resume(db, user_id, text, mode=mode)
+            elapsed = time.perf_counter() - started
+        sections = (analysis.get("metadata") or {}).get("sections")
+        rows.append((label, elapsed, tally, sections))
+    return rows
+
+
+def report(rows: list) -> None:
+    print(f"\n{'run':<32} {'latency':>8} {'calls':>6} {'prompt':>8} {'completion':>11}  sections")
+    for label, elapsed, tally, sections in rows:
+        detail = f"{sections['analyzed']} analyzed / {sections['cached']} cached" if sections else "-"
+        print(f"{label:<32} {elapsed:>7.2f}s {tally.calls + tally.cache_hits:>6} {tally.prompt_tokens:>8} "
+              f"{tally.completion_tokens:>11}  {detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="fake", choices=["fake", "openai"])
+    parser.add_argument("--latency", default="fixed:0.5", help="fake backend time to first token")
+    parser.add_argument("--tokens-per-second", default="60", help="fake backend generation speed")
+    args = parser.parse_args()
+
+    harness.configure_environment(
+        llm_backend=args.backend,
+        llm_fake_latency=args.latency,
+        llm_fake_tokens_per_second=args.tokens_per_second
+    )
+    session_factory = harness.setup_sqlite_database()
+    db = session_factory()
+    try:
+        user = harness.seed_user(db, 0)
+        print(f"Comparing resume analysis modes with the {args.backend} backend")
+        report(asyncio.run(run(db, user.id, harness.load_sample("resume.txt"))))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Skills taxonomy scale benchmark
+===============================
+
+Generates a synthetic taxonomy at occupational-database scale, compiles it and
+starts several worker processes that each open it and extract skills from the
+sample documents. Reports compile time, per-worker open time, extraction time
+and per-worker memory: RSS counts shared pages in full, PSS splits them between
+the processes mapping them, so with the mmap'd file PSS stays small as workers
+are added.
+
+    python -m devtools.benchmark_taxonomy --skills 200000 --workers 4
+    python -m devtools.benchmark_taxonomy --skills 200000 --workers 4 --in-memory
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import string
+import tempfile
+import time
+
+from devtools import harness
+
+
+def synthetic_taxonomy(skills: int, synonyms: int, seed: int = 7) -> dict:
+    """The shipped taxonomy plus generated multi-word skills with synonyms"""
+    with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), "app", "data", "skills_taxonomy.json"), encoding="utf-8") as f:
+        taxonomy = json.load(f)
+
+    rng = random.Random(seed)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(20000)]
+    base = taxonomy["skills"]
+    generated = []
+    for index in range(skills):
+        label = " ".join(rng.choices(words, k=rng.randint(2, 4)))
+        generated.append({
+            "id": f"gen_{index}",
+            "label": label,
+            "category": rng.choice(["technical", "tool", "business", "soft"]),
+            "synonyms": [" ".join(rng.choices(words, k=rng.randint(1, 3))) + " " + label.split()[0] for _ in range(synonyms)],
+            "parents": [rng.choice(base)["id"]] + ([f"gen_{rng.randrange(index)}"] if index else []),
+        })
+    taxonomy["skills"] = base + generated
+    return taxonomy
+
+
+def memory_kb() -> dict:
+    """RSS and PSS of this process from /proc (Linux)"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss"):
+                values[name.lower()] = int(rest.split()[0])
+    return values
+
+
+def worker(path: str, in_memory: bool, texts: list, start_barrier, results) -> None:
+    from app.services import skill_taxonomy
+    from app.services.skill_extractor import SkillExtractor
+
+    before = memory_kb()
+    started = time.perf_counter()
+    extractor = SkillExtractor(path)
+    if in_memory:
+        with open(path, "rb") as f:
+            extractor._index = skill_taxonomy.TaxonomyIndex(f.read())
+    else:
+        extractor.load()
+    opened = time.perf_counter() - started
+
+    started = time.perf_counter()
+    mentions = sum(len(extractor.extract(text)) for text in texts)
+    extracted = time.perf_counter() - started
+
+    # Measure while every worker still has the taxonomy open
+    start_barrier.wait()
+    after = memory_kb()
+    start_barrier.wait()
+    results.put({
+        "open": opened,
+        "extract": extracted,
+        "mentions": mentions,
+        "rss_mb": (after["rss"] - before["rss"]) / 1024,
+        "pss_mb": (after["pss"] - before["pss"]) / 1024,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skills", type=int, default=200000)
+    parser.add_argument("--synonyms", type=int, default=2, help="generated synonyms per skill")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--in-memory", action="store_true", help="read the file into each worker instead of mapping it")
+    args = parser.parse_args()
+
+    harness.configure_environment()
+    from app.services.skill_taxonomy import compile_file, open_taxonomy
+
+    texts = [harness.load_sample("resume.txt"), harness.load_sample("job_description.txt")]
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "taxonomy.json")
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump(synthetic_taxonomy(args.skills, args.synonyms), f)
+
+        compiled = os.path.join(directory, "taxonomy.bin")
+        started = time.perf_counter()
+        compile_file(source, compiled)
+        index = open_taxonomy(compiled)
+        print(f"Compiled {index.skill_count} skills / {index.form_count} forms / {index.state_count} states "
+              f"in {time.perf_counter() - started:.1f}s ({os.path.getsize(compiled) / 1e6:.1f} MB)")
+
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(args.workers)
+        results = context.Queue()
+        processes = [
+            context.Process(target=worker, args=(compiled, args.in_memory, texts, barrier, results))
+            for _ in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        rows = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    mode = "in-memory copy" if args.in_memory else "mmap"
+    print(f"\n[{mode}] {args.workers} workers")
+    print(harness.format_row("open", harness.summarize([row["open"] * 1000 for row in rows]), unit="ms"))
+    print(harness.format_row("extract (2 docs)", harness.summarize([row["extract"] * 1000 for row in rows]), unit="ms"))
+    print(harness.format_row("RSS delta per worker", harness.summarize([row["rss_mb"] for row in rows]), unit="MB"))
+    print(harness.format_row("PSS delta per worker", harness.summarize([row["pss_mb"] for row in rows]), unit="MB"))
+    print(f"{'mentions found':<28} {rows[0]['mentions']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Compile the skills taxonomy
+===========================
+
+Writes the memory-mapped binary form of a JSON skills taxonomy (see
+app/services/skill_taxonomy.py). Workers rebuild a stale ``.bin`` on their
+own, but compiling at build time keeps a large taxonomy out of startup:
+    python -m devtools.compile_taxonomy
+    python -m devtools.compile_taxonomy path/to/esco_skills.json --output /srv/skills.bin
+"""
+
+import argparse
+import os
+import time
+
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app", "data", "skills_taxonomy.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", default=DEFAULT_SOURCE, help="taxonomy JSON")
+    parser.add_argument("--output", help="defaults to the source path with a .bin extension")
+    args = parser.parse_args()
+
+    from app.services.skill_taxonomy import compile_file, open_taxonomy
+
+    output = args.output or os.path.splitext(args.source)[0] + ".bin"
+    started = time.perf_counter()
+    compile_file(args.source, output)
+    index = open_taxonomy(output)
+    print(f"Compiled {args.source} -> {output} in {time.perf_counter() - started:.2f}s: "
+          f"{index.skill_count} skills, {index.form_count} forms, {index.state_count} states, "
+          f"{os.path.getsize(output) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
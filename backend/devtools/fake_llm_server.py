@@ -0,0 +1,158 @@
+"""
+OpenAI-compatible fake LLM server
+=================================
+
+Serves ``POST /v1/chat/completions`` (plain and streamed) with schema-valid
+canned or recorded responses for every ``LLMService`` method, configurable
+latency distributions and injected 429/500 errors.
+
+Usage:
+    python -m devtools.fake_llm_server --port 8100 --latency lognormal:1.0,0.5 --error-429 0.05
+
+Then point the app at it:
+    LLM_BACKEND=openai LLM_BASE_URL=http://localhost:8100/v1 uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Optional
+
+from devtools.harness import configure_environment
+
+configure_environment()
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse, StreamingResponse  # noqa: E402
+
+from app.services.llm_fakes import (  # noqa: E402
+    FakeResponder,
+    FaultInjector,
+    LatencyModel,
+    estimate_tokens,
+)
+
+CHUNK_SIZE = 48
+
+ERROR_TYPES = {
+    429: ("rate_limit_error", "rate_limit_exceeded", "Rate limit reached (injected by fake server)"),
+    500: ("server_error", "internal_error", "The server had an error (injected by fake server)"),
+}
+
+
+def create_app(responder: FakeResponder) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI-compatible LLM server")
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model", "owned_by": "fake"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        prompt = messages[-1]["content"] if messages else ""
+        system_prompt = messages[0]["content"] if len(messages) > 1 else ""
+        model = body.get("model", "gpt-4o-mini")
+
+        reply = responder.respond(prompt, method=request.headers.get("x-llm-method"))
+
+        if reply.status_code != 200:
+            await asyncio.sleep(reply.latency)
+            error_type, code, message = ERROR_TYPES[reply.status_code]
+            return JSONResponse(
+                status_code=reply.status_code,
+                content={"error": {"message": message, "type": error_type, "code": code}},
+                headers={"retry-after": "1"} if reply.status_code == 429 else None
+            )
+
+        usage = {
+            "prompt_tokens": estimate_tokens(system_prompt) + estimate_tokens(prompt),
+            "completion_tokens": estimate_tokens(reply.content),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-fake-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            await asyncio.sleep(reply.latency)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply.content},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            }
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+        return StreamingResponse(
+            stream_chunks(completion_id, created, model, reply.content, reply.latency,
+                          reply.time_to_first_token or 0.0, usage if include_usage else None),
+            media_type="text/event-stream"
+        )
+
+    return app
+
+
+async def stream_chunks(completion_id: str, created: int, model: str, content: str,
+                        latency: float, time_to_first_token: float, usage: Optional[dict]):
+    """Emit SSE chunks spread over the sampled latency"""
+    pieces = [content[i:i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE)] or [""]
+    per_piece = max(0.0, latency - time_to_first_token) / len(pieces)
+
+    def event(choices, extra=None):
+        payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                   "model": model, "choices": choices}
+        if extra:
+            payload.update(extra)
+        return f"data: {json.dumps(payload)}\n\n"
+
+    await asyncio.sleep(time_to_first_token)
+    for index, piece in enumerate(pieces):
+        delta = {"content": piece}
+        if index == 0:
+            delta["role"] = "assistant"
+        yield event([{"index": 0, "delta": delta, "finish_reason": None}])
+        if per_piece:
+            await asyncio.sleep(per_piece)
+
+    yield event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+    if usage:
+        yield event([], {"usage": usage})
+    yield "data: [DONE]\n\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="fixed:0", help="fixed:S | uniform:A,B | normal:MEAN,SD | lognormal:MU,SIGMA")
+    parser.add_argument("--error-429", type=float, default=0.0, help="fraction of calls answered with 429")
+    parser.add_argument("--error-500", type=float, default=0.0, help="fraction of calls answered with 500")
+    parser.add_argument("--responses-dir", help="directory of recorded <method>.json responses")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible latency and faults")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0,
+                        help="make generation time proportional to response length")
+    args = parser.parse_args()
+
+    responder = FakeResponder(
+        latency=LatencyModel(args.latency),
+        faults=FaultInjector(args.error_429, args.error_500),
+        responses_dir=args.responses_dir,
+        seed=args.seed,
+        tokens_per_second=args.tokens_per_second
+    )
+
+    import uvicorn
+    uvicorn.run(create_app(responder), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
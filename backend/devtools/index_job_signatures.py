@@ -0,0 +1,51 @@
+"""
+Index job descriptions for near-duplicate lookup
+================================================
+
+New uploads get a MinHash signature and LSH buckets at upload time; this
+backfills job descriptions stored before that (or all of them with --all,
+e.g. after changing the shingling), then prints the near-duplicate groups:
+    python -m devtools.index_job_signatures
+    python -m devtools.index_job_signatures --all
+"""
+
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="re-index documents that already have a signature")
+    args = parser.parse_args()
+
+    from database.connection import SessionLocal
+    from app.models.document import Document, DocumentType
+    from app.services.near_duplicate_service import near_duplicate_service
+
+    db = SessionLocal()
+    try:
+        query = db.query(Document).filter(Document.document_type == DocumentType.JOB_DESCRIPTION.value)
+        if not args.all:
+            query = query.filter(Document.minhash_signature.is_(None))
+
+        started = time.perf_counter()
+        documents = query.all()
+        for document in documents:
+            near_duplicate_service.index_document(db, document)
+        print(f"Indexed {len(documents)} job descriptions in {time.perf_counter() - started:.2f}s")
+
+        reported = set()
+        for document in db.query(Document).filter(Document.minhash_signature.isnot(None)).order_by(Document.id):
+            if document.id in reported:
+                continue
+            duplicates = near_duplicate_service.find_duplicates(db, document)
+            if duplicates:
+                reported.update(duplicate["document"].id for duplicate in duplicates)
+                matches = ", ".join(f"{duplicate['document'].id} ({duplicate['similarity']:.2f})" for duplicate in duplicates)
+                print(f"  {document.id} {document.original_filename}: {matches}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
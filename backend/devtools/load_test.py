@@ -0,0 +1,99 @@
+"""
+End-to-end load test for AnalysisService
+========================================
+
+Simulates N students concurrently running the Context (resume-only) and
+Experience (job match) pipelines against a throw-away SQLite database and the
+configured LLM stand-in. Reports pipeline latency split into model time and
+orchestration overhead (everything that is not an LLM call: DB writes,
+progress delays, scheduling).
+
+Usage:
+    python -m devtools.load_test --users 25 --latency lognormal:0.5,0.4
+    python -m devtools.load_test --users 25 --base-url http://localhost:8100/v1
+"""
+
+import argparse
+import asyncio
+import time
+
+from devtools import harness
+
+
+async def run_student(index: int, resume_text: str, job_text: str, results: dict):
+    import database.connection as connection
+    from app.core.metrics import track_usage
+    from app.services.analysis_service import analysis_service
+
+    db = connection.SessionLocal()
+    try:
+        user, resume, job = harness.seed_pair(db, index, resume_text, job_text)
+
+        # Background tasks inherit the tally, so it sums every LLM call of the pipeline
+        with track_usage() as tally:
+            started = time.perf_counter()
+            analysis = await analysis_service.start_resume_analysis(db, user, resume.id)
+            finished = await harness.wait_for_analysis(analysis.id)
+        results["context"].append((time.perf_counter() - started, tally.llm_seconds, finished.status))
+
+        # The pipeline wrote through its own session; each API request would start fresh
+        db.expire_all()
+
+        with track_usage() as tally:
+            started = time.perf_counter()
+            analysis = await analysis_service.start_job_analysis(db, user, analysis.id, job.id)
+            finished = await harness.wait_for_analysis(analysis.id)
+        results["experience"].append((time.perf_counter() - started, tally.llm_seconds, finished.status))
+    finally:
+        db.close()
+
+
+async def run(users: int, resume_text: str, job_text: str) -> dict:
+    results = {"context": [], "experience": []}
+    started = time.perf_counter()
+    await asyncio.gather(*(run_student(i, resume_text, job_text, results) for i in range(users)))
+    results["wall_time"] = time.perf_counter() - started
+    return results
+
+
+def report(results: dict, users: int) -> None:
+    print(f"\n{users} students, total wall time {results['wall_time']:.2f}s")
+    for stage in ("context", "experience"):
+        rows = results[stage]
+        failures = sum(1 for _, _, status in rows if status != "completed")
+        print(f"\n[{stage}] {len(rows)} pipelines, {failures} not completed")
+        print(harness.format_row("pipeline latency", harness.summarize([r[0] for r in rows])))
+        print(harness.format_row("model time", harness.summarize([r[1] for r in rows])))
+        print(harness.format_row("orchestration overhead", harness.summarize([r[0] - r[1] for r in rows])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--latency", default="fixed:0.2", help="latency spec for the in-process fake backend")
+    parser.add_argument("--error-429", type=float, default=0.0)
+    parser.add_argument("--error-500", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--base-url", help="use an OpenAI-compatible server (e.g. devtools.fake_llm_server) instead")
+    args = parser.parse_args()
+
+    harness.configure_environment(
+        llm_backend="openai" if args.base_url else "fake",
+        llm_base_url=args.base_url,
+        llm_fake_latency=args.latency,
+        llm_fake_error_rate_429=args.error_429,
+        llm_fake_error_rate_500=args.error_500,
+        llm_fake_seed=args.seed
+    )
+    harness.setup_sqlite_database()
+
+    results = asyncio.run(run(
+        args.users,
+        harness.load_sample("resume.txt"),
+        harness.load_sample("job_description.txt")
+    ))
+    report(results, args.users)
+
+
+if __name__ == "__main__":
+    main()
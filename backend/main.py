@@ -1,11 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import logging
 
 from config.settings import settings
 from config.logging_config import setup_logging
-from app.api import auth_router, documents_router, analysis_router, questionnaire_router
+from app.api import auth_router, documents_router, analysis_router, questionnaire_router, ipp_router, jobs_router, rankings_router
+from app.core.metrics import render_latest
+from app.services.analysis_sweeper import analysis_sweeper
+from app.services.job_queue import job_queue
 
 # Setup logging based on environment
 logger = setup_logging(settings.environment)
@@ -33,6 +36,23 @@ app.include_router(auth_router, prefix="/api")
 app.include_router(documents_router, prefix="/api")
 app.include_router(analysis_router, prefix="/api")
 app.include_router(questionnaire_router, prefix="/api")
+app.include_router(ipp_router, prefix="/api")
+app.include_router(jobs_router, prefix="/api")
+app.include_router(rankings_router, prefix="/api")
+
+@app.on_event("startup")
+async def start_analysis_sweeper():
+    """Fail analyses stuck past their deadline"""
+    analysis_sweeper.start()
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    """Cancel background job workers"""
+    await job_queue.stop()
+
+@app.on_event("shutdown")
+async def stop_analysis_sweeper():
+    await analysis_sweeper.stop()
 
 @app.get("/")
 async def root():
@@ -51,6 +71,12 @@ async def health_check():
         "environment": settings.environment
     })
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint (LLM latency, tokens, cost, retries)"""
+    content, content_type = render_latest()
+    return Response(content=content, media_type=content_type)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
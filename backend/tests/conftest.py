@@ -0,0 +1,20 @@
+"""Shared test setup: settings are read at import time, so configure them before any app import"""
+
+import pytest
+
+from devtools.harness import configure_environment
+
+configure_environment(DATABASE_URL="sqlite://", LLM_BACKEND="fake")
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Session on a throw-away SQLite database with every table created"""
+    from devtools.harness import setup_sqlite_database
+
+    SessionLocal = setup_sqlite_database(str(tmp_path))
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
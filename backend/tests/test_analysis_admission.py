@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pytest
+from devtools.harness import seed_document, seed_user
+from fastapi.testclient import TestClient
+
+from app.auth.dependencies import get_current_active_user
+from app.models.analysis import DocumentAnalysis
+from app.services.analysis_scheduler import AdmissionRejected, analysis_scheduler
+from app.services.analysis_service import input_fingerprint, questionnaire_context
+from database.connection import get_db
+from main import app
+
+RESUME = "Volunteer tutor and data analyst who built reporting tools for a food bank."
+
+
+@pytest.fixture
+def client(db):
+    user = seed_user(db, 1)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    try:
+        yield TestClient(app), user
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    def reject(user_id, priority=None):
+        raise AdmissionRejected("Analysis queue is full right now. Please try again shortly.", retry_after=12.5)
+
+    monkeypatch.setattr(analysis_scheduler, "admit", reject)
+
+
+def test_reused_analysis_is_returned_while_the_queue_is_saturated(client, db, saturated):
+    http, user = client
+    resume = seed_document(db, user, "resume", RESUME)
+    completed = DocumentAnalysis(
+        user_id=user.id, resume_document_id=resume.id, status="completed", analysis_tier="full",
+        resume_analysis={"summary": "done"}, completed_at=datetime.utcnow(),
+        input_fingerprint=input_fingerprint("resume", RESUME, questionnaire_responses=questionnaire_context(None))
+    )
+    db.add(completed)
+    db.commit()
+
+    response = http.post("/api/analysis/resume/start", json={"resume_document_id": resume.id})
+    assert response.status_code == 200
+    assert response.json()["analysis_id"] == completed.id
+    assert response.json()["status"] == "completed"
+
+
+def test_new_run_is_refused_while_the_queue_is_saturated(client, db, saturated):
+    http, user = client
+    resume = seed_document(db, user, "resume", RESUME)
+
+    response = http.post("/api/analysis/resume/start", json={"resume_document_id": resume.id})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "13"
+    assert db.query(DocumentAnalysis).count() == 0
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from devtools.harness import load_sample, seed_pair
+
+from app.core import metrics
+from app.core.deadline import StepTimeout
+from app.models.analysis import DocumentAnalysis
+from app.services.analysis_service import analysis_service
+from config.settings import settings
+
+
+@pytest.fixture
+def pair(db):
+    return seed_pair(db, 1, load_sample("resume.txt"), load_sample("job_description.txt"))
+
+
+@pytest.fixture
+def scheduled_upgrades(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(settings, "analysis_lite_auto_upgrade", True)
+    monkeypatch.setattr(analysis_service, "_schedule_upgrade", lambda analysis_id, user_id: scheduled.append(analysis_id))
+    return scheduled
+
+
+@pytest.mark.parametrize("complete", ["_complete_full_analysis", "_complete_resume_analysis", "_complete_job_analysis"])
+def test_completing_an_active_analysis_reports_success(db, pair, complete, monkeypatch):
+    monkeypatch.setattr(settings, "ipp_pregeneration", False)
+    user, resume, job = pair
+    analysis = DocumentAnalysis(user_id=user.id, resume_document_id=resume.id, job_document_id=job.id,
+                                status="processing", resume_analysis={"summary": "done"})
+    db.add(analysis)
+    db.commit()
+
+    assert getattr(analysis_service, complete)(db, analysis) is True
+    db.expire_all()
+    assert analysis.status == "completed"
+
+
+def test_lite_analysis_schedules_its_upgrade(db, pair, scheduled_upgrades):
+    user, resume, job = pair
+    analysis = DocumentAnalysis(user_id=user.id, resume_document_id=resume.id, job_document_id=job.id,
+                                status="pending", analysis_tier="lite")
+    db.add(analysis)
+    db.commit()
+
+    asyncio.run(analysis_service._perform_lite_analysis(analysis.id, resume.content_text, job.content_text))
+
+    db.expire_all()
+    assert analysis.status == "completed"
+    assert scheduled_upgrades == [analysis.id]
+
+
+def test_lite_fallback_after_a_timeout_schedules_its_upgrade(db, pair, scheduled_upgrades, monkeypatch):
+    timeouts = []
+    monkeypatch.setattr(metrics, "record_analysis_step_timeout", lambda step, outcome: timeouts.append((step, outcome)))
+    user, resume, job = pair
+    analysis = DocumentAnalysis(user_id=user.id, resume_document_id=resume.id, job_document_id=job.id,
+                                status="processing")
+    db.add(analysis)
+    db.commit()
+
+    asyncio.run(analysis_service._fall_back_after_timeout(
+        db, analysis.id, StepTimeout("find_connections", 30), analysis_service._complete_full_analysis
+    ))
+
+    db.expire_all()
+    assert (analysis.status, analysis.analysis_tier) == ("completed", "lite")
+    assert timeouts == [("find_connections", "lite")]
+    assert scheduled_upgrades == [analysis.id]
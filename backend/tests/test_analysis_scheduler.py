@@ -0,0 +1,92 @@
+import asyncio
+
+from app.services.analysis_scheduler import AnalysisScheduler
+from app.services.job_queue import JobPriority
+
+
+async def _run_in_order(scheduler, submissions):
+    """Queue ``(user_id, priority)`` submissions behind a blocking analysis; returns the start order"""
+    started = []
+    release = asyncio.Event()
+
+    async def blocker():
+        await release.wait()
+
+    def analysis(label):
+        async def run():
+            started.append(label)
+            await asyncio.sleep(0)
+        return run
+
+    tasks = [asyncio.create_task(scheduler.run(0, blocker))]
+    await asyncio.sleep(0)
+    for label, (user_id, priority) in enumerate(submissions):
+        tasks.append(asyncio.create_task(scheduler.run(user_id, analysis(label), priority=priority)))
+        await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+    return started
+
+
+def test_users_take_turns_instead_of_first_come_first_served():
+    scheduler = AnalysisScheduler(concurrency=1, per_user_limit=10)
+    interactive = JobPriority.INTERACTIVE
+    # User 1 queues three analyses before users 2 and 3 queue one each
+    order = asyncio.run(_run_in_order(scheduler, [(1, interactive)] * 3 + [(2, interactive), (3, interactive)]))
+    assert order == [0, 3, 4, 1, 2]
+
+
+def test_higher_priority_class_goes_first():
+    scheduler = AnalysisScheduler(concurrency=1, per_user_limit=10)
+    order = asyncio.run(_run_in_order(scheduler, [
+        (1, JobPriority.BACKGROUND), (2, JobPriority.BACKFILL), (3, JobPriority.INTERACTIVE)
+    ]))
+    assert order == [2, 0, 1]
+
+
+def test_per_user_limit_leaves_slots_to_others():
+    async def run():
+        scheduler = AnalysisScheduler(concurrency=2, per_user_limit=1)
+        release = asyncio.Event()
+        started = []
+
+        def analysis(label):
+            async def run():
+                started.append(label)
+                await release.wait()
+            return run
+
+        tasks = []
+        for label, user_id in enumerate([1, 1, 2]):
+            tasks.append(asyncio.create_task(scheduler.run(user_id, analysis(label))))
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # User 1's second analysis waits although a slot was free when it arrived
+        while_running = list(started), scheduler.queued
+        release.set()
+        await asyncio.gather(*tasks)
+        return while_running, started
+
+    (while_running, queued), started = asyncio.run(run())
+    assert while_running == [0, 2]
+    assert queued == 1
+    assert started == [0, 2, 1]
+
+
+def test_cancelled_waiting_analysis_leaves_the_queue():
+    async def run():
+        scheduler = AnalysisScheduler(concurrency=1, per_user_limit=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(scheduler.run(1, release.wait))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(scheduler.run(2, asyncio.Event().wait))
+        await asyncio.sleep(0)
+        assert scheduler.queued == 1
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        release.set()
+        await holder
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert scheduler.queued == 0 and scheduler.running == 0
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from devtools.harness import seed_document, seed_user
+
+from app.models.analysis import DocumentAnalysis
+from app.services.analysis_service import analysis_service
+from app.services.analysis_sweeper import AnalysisSweeper
+
+
+def _analysis(db, **fields):
+    user = seed_user(db, db.query(DocumentAnalysis).count())
+    resume = seed_document(db, user, "resume", "Resume text")
+    analysis = DocumentAnalysis(user_id=user.id, resume_document_id=resume.id, **fields)
+    db.add(analysis)
+    db.commit()
+    return analysis
+
+
+def test_sweep_fails_runs_past_their_deadline_and_idle_runs(db):
+    long_ago = datetime.utcnow() - timedelta(days=1)
+    overdue = _analysis(db, status="processing", deadline_at=long_ago, execution="realtime")
+    idle = _analysis(db, status="pending", updated_at=long_ago)
+    running = _analysis(db, status="processing", deadline_at=datetime.utcnow() + timedelta(minutes=5),
+                        execution="realtime")
+
+    assert AnalysisSweeper().sweep(db) == 2
+    db.expire_all()
+    assert overdue.status == "failed"
+    assert idle.status == "failed"
+    assert running.status == "processing"
+
+
+def test_sweep_leaves_offline_batch_runs_alone(db):
+    long_ago = datetime.utcnow() - timedelta(days=1)
+    batch = _analysis(db, status="processing", execution="batch", updated_at=long_ago)
+
+    assert AnalysisSweeper().sweep(db) == 0
+    db.expire_all()
+    assert batch.status == "processing"
+
+
+def test_late_completion_keeps_the_swept_status(db):
+    analysis = _analysis(db, status="processing", deadline_at=datetime.utcnow() - timedelta(days=1))
+    AnalysisSweeper().sweep(db)
+    db.expire_all()
+
+    # The pipeline finishes after the sweeper gave up on it
+    analysis.resume_analysis = {"summary": "late"}
+    assert analysis_service._complete_resume_analysis(db, analysis) is False
+    db.expire_all()
+    assert analysis.status == "failed"
+    assert analysis.resume_analysis is None
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from app.core.deadline import StepPlan, StepTimeout, current_budget, no_deadline, pipeline_deadline
+from app.core.tasks import create_detached_task
+from app.services.job_queue import JobQueue
+
+
+def test_step_plan_splits_time_left_by_weight():
+    async def run():
+        with pipeline_deadline(100):
+            plan = StepPlan({"first": 1, "second": 3})
+            async with plan.step("first") as budget:
+                first = budget.remaining()
+            async with plan.step("second") as budget:
+                second = budget.remaining()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == pytest.approx(25, abs=0.5)
+    # The last step gets everything that is left
+    assert second == pytest.approx(100, abs=0.5)
+
+
+def test_step_plan_is_unbounded_without_a_deadline():
+    async def run():
+        async with StepPlan({"only": 1}).step("only") as budget:
+            return budget
+
+    assert asyncio.run(run()) is None
+
+
+def test_step_overrunning_its_budget_raises_step_timeout():
+    async def run():
+        with pipeline_deadline(0.2):
+            async with StepPlan({"slow": 1}).step("slow"):
+                await asyncio.sleep(5)
+
+    with pytest.raises(StepTimeout) as raised:
+        asyncio.run(run())
+    assert raised.value.step == "slow"
+
+
+def test_step_with_refused_call_raises_step_timeout():
+    async def run():
+        with pipeline_deadline(10):
+            async with StepPlan({"step": 1}).step("step") as budget:
+                # What _call_openai does when the budget cannot fit a call
+                budget.exceeded = True
+
+    with pytest.raises(StepTimeout):
+        asyncio.run(run())
+
+
+def test_nested_deadline_never_extends_the_outer_one():
+    async def run():
+        with pipeline_deadline(5):
+            with pipeline_deadline(100) as inner:
+                return inner.remaining()
+
+    assert asyncio.run(run()) <= 5
+
+
+def test_no_deadline_clears_the_inherited_budget():
+    async def run():
+        with pipeline_deadline(5):
+            with no_deadline():
+                return current_budget()
+
+    assert asyncio.run(run()) is None
+
+
+def test_queued_job_does_not_inherit_the_submitters_deadline():
+    async def run():
+        queue = JobQueue(concurrency=1)
+        with pipeline_deadline(5):
+            # The first submit starts the workers from inside the pipeline
+            future = queue.submit("job", lambda: asyncio.sleep(0, result=current_budget()))
+        budget = await future
+        await queue.stop()
+        return budget
+
+    assert asyncio.run(run()) is None
+
+
+def test_detached_task_starts_from_an_empty_context():
+    async def run():
+        with pipeline_deadline(5):
+            task = create_detached_task(asyncio.sleep(0))
+            inherited = asyncio.create_task(asyncio.sleep(0))
+        await asyncio.gather(task, inherited)
+        with pipeline_deadline(5):
+            return await create_detached_task(_budget_in_task())
+
+    assert asyncio.run(run()) is None
+
+
+async def _budget_in_task():
+    return current_budget()
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import pytest
+from devtools.harness import seed_user
+
+from app.models.idempotency import IdempotencyKey
+from app.services.idempotency_service import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyMismatch,
+    fingerprint,
+    idempotency_service
+)
+
+# A deleted key left in the session would be silently replaced by a re-claim
+pytestmark = pytest.mark.filterwarnings("error::sqlalchemy.exc.SAWarning")
+
+ENDPOINT = "analysis/start"
+REQUEST = fingerprint('{"resume_document_id": 1, "job_document_id": 2}')
+
+
+def test_no_key_means_no_claim(db):
+    assert idempotency_service.claim(db, 1, None, ENDPOINT, REQUEST) is None
+
+
+def test_completed_request_is_replayed(db):
+    user = seed_user(db, 1)
+    record = idempotency_service.claim(db, user.id, "key-1", ENDPOINT, REQUEST)
+    assert record.response is None
+    idempotency_service.complete(db, record, {"analysis_id": 7})
+
+    replay = idempotency_service.claim(db, user.id, "key-1", ENDPOINT, REQUEST)
+    assert replay.id == record.id
+    assert replay.response == {"analysis_id": 7}
+
+
+def test_keys_are_scoped_to_the_user(db):
+    first, second = seed_user(db, 1), seed_user(db, 2)
+    idempotency_service.complete(db, idempotency_service.claim(db, first.id, "key-1", ENDPOINT, REQUEST), {"analysis_id": 7})
+
+    assert idempotency_service.claim(db, second.id, "key-1", ENDPOINT, REQUEST).response is None
+
+
+def test_key_reused_for_another_request_is_rejected(db):
+    user = seed_user(db, 1)
+    idempotency_service.claim(db, user.id, "key-1", ENDPOINT, REQUEST)
+
+    with pytest.raises(IdempotencyKeyMismatch):
+        idempotency_service.claim(db, user.id, "key-1", ENDPOINT, fingerprint("another body"))
+    with pytest.raises(IdempotencyKeyMismatch):
+        idempotency_service.claim(db, user.id, "key-1", "analysis/resume/start", REQUEST)
+    with pytest.raises(IdempotencyKeyMismatch):
+        idempotency_service.claim(db, user.id, "k" * 256, ENDPOINT, REQUEST)
+
+
+def test_repeat_while_in_progress_conflicts_until_abandoned(db):
+    user = seed_user(db, 1)
+    record = idempotency_service.claim(db, user.id, "key-1", ENDPOINT, REQUEST)
+
+    with pytest.raises(IdempotencyKeyInProgress):
+        idempotency_service.claim(db, user.id, "key-1", ENDPOINT, REQUEST)
+
+    record.created_at = datetime.utcnow() - timedelta(minutes=10)
+    db.commit()
+    assert idempotency_service.claim(db, user.id, "key-1", ENDPOINT, REQUEST).id == record.id
+
+
+def test_failed_request_releases_its_key(db):
+    user = seed_user(db, 1)
+    record = idempotency_service.claim(db, user.id, "key-1", ENDPOINT, REQUEST)
+
+    with pytest.raises(ValueError):
+        with idempotency_service.release_on_error(db, record):
+            raise ValueError("Resume document not found")
+
+    assert db.query(IdempotencyKey).count() == 0
+    reclaimed = idempotency_service.claim(db, user.id, "key-1", ENDPOINT, REQUEST)
+    assert reclaimed is not record
+    assert reclaimed.response is None
+
+
+def test_successful_request_keeps_its_key(db):
+    user = seed_user(db, 1)
+    record = idempotency_service.claim(db, user.id, "key-1", ENDPOINT, REQUEST)
+
+    with idempotency_service.release_on_error(db, record):
+        idempotency_service.complete(db, record, {"analysis_id": 7})
+
+    assert db.query(IdempotencyKey).one().response == {"analysis_id": 7}
+
+
+def test_expired_keys_are_dropped(db):
+    user = seed_user(db, 1)
+    record = idempotency_service.claim(db, user.id, "key-1", ENDPOINT, REQUEST)
+    idempotency_service.complete(db, record, {"analysis_id": 7})
+    record.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    reclaimed = idempotency_service.claim(db, user.id, "key-1", ENDPOINT, REQUEST)
+    assert reclaimed is not record
+    assert reclaimed.response is None
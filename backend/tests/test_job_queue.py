@@ -0,0 +1,23 @@
+import asyncio
+
+from app.core.metrics import _active_tallies, track_usage
+from app.core.rate_limit import current_priority
+from app.services.job_queue import JobPriority, JobQueue
+
+
+def test_queued_job_is_not_tallied_or_prioritized_by_the_submitter():
+    async def run():
+        queue = JobQueue(concurrency=1)
+        with track_usage():
+            # Pre-generation is queued like this from inside a tracked pipeline
+            future = queue.submit("pregenerate", lambda: asyncio.sleep(0, result=_active_tallies.get()),
+                                  priority=JobPriority.BACKGROUND)
+        tallies = await future
+        priority = await queue.submit("job", lambda: asyncio.sleep(0, result=current_priority()),
+                                      priority=JobPriority.BACKGROUND)
+        await queue.stop()
+        return tallies, priority
+
+    tallies, priority = asyncio.run(run())
+    assert tallies == ()
+    assert priority == JobPriority.BACKGROUND
@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from app.core.deadline import current_budget, pipeline_deadline
+from app.services.analysis_service import analysis_service
+from config.settings import settings
+
+
+def test_upgrade_gets_its_own_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "analysis_deadline_seconds", 300)
+    seen = []
+
+    async def run_upgrade(analysis_id):
+        seen.append(current_budget().remaining())
+
+    monkeypatch.setattr(analysis_service, "_run_upgrade", run_upgrade)
+
+    async def run():
+        # A lite run that is nearly out of time schedules the upgrade
+        with pipeline_deadline(1):
+            analysis_service._schedule_upgrade(1, 1)
+        await asyncio.gather(*analysis_service._upgrades)
+
+    asyncio.run(run())
+    assert seen == [pytest.approx(300, abs=1)]
@@ -0,0 +1,50 @@
+import pytest
+
+from app.services.llm_backends import LLMBackendError, LLMRequest
+from app.services.llm_batch import method_of, parse_result_line, request_line
+
+
+def _result(status_code=200, body=None, error=None):
+    return {"id": "batch_req_1", "custom_id": "analyze_resume:1",
+            "response": {"status_code": status_code, "body": body or {}}, "error": error}
+
+
+def test_successful_line_becomes_a_completion():
+    completion = parse_result_line(_result(body={
+        "choices": [{"message": {"role": "assistant", "content": "{\"summary\": \"ok\"}"}}],
+        "usage": {"prompt_tokens": 120, "completion_tokens": 30}
+    }))
+
+    assert completion.content == "{\"summary\": \"ok\"}"
+    assert completion.prompt_tokens == 120
+    assert completion.completion_tokens == 30
+
+
+def test_empty_body_becomes_an_empty_completion():
+    completion = parse_result_line(_result())
+    assert (completion.content, completion.prompt_tokens, completion.completion_tokens) == ("", 0, 0)
+
+
+@pytest.mark.parametrize("status_code, retryable", [(429, True), (500, True), (503, True), (400, False)])
+def test_failed_request_raises_with_retryability(status_code, retryable):
+    with pytest.raises(LLMBackendError) as raised:
+        parse_result_line(_result(status_code, error={"code": str(status_code), "message": "Provider said no"}))
+
+    assert str(raised.value) == "Provider said no"
+    assert raised.value.status_code == status_code
+    assert raised.value.retryable is retryable
+
+
+def test_line_without_a_response_is_retryable():
+    with pytest.raises(LLMBackendError) as raised:
+        parse_result_line({"custom_id": "analyze_resume:1", "error": {"message": "Batch expired"}})
+    assert raised.value.retryable
+
+
+def test_request_line_round_trips_the_method():
+    request = LLMRequest(method="analyze_resume", model="gpt-4o-mini", system_prompt="system", prompt="resume")
+    line = request_line("analyze_resume:7", request)
+
+    assert line["url"] == "/v1/chat/completions"
+    assert [message["role"] for message in line["body"]["messages"]] == ["system", "user"]
+    assert method_of(line["custom_id"]) == "analyze_resume"
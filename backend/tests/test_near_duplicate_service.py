@@ -0,0 +1,70 @@
+from devtools.harness import load_sample, seed_document, seed_user
+
+from app.models.analysis import PrecomputedJobAnalysis
+from app.services.llm_service import llm_service
+from app.services.near_duplicate_service import (
+    band_buckets,
+    decode_signature,
+    encode_signature,
+    estimate_similarity,
+    minhash_signature,
+    near_duplicate_service,
+    shingles,
+)
+
+POSTING = load_sample("job_description.txt")
+# The same posting copied from another site: a changed line and trailing boilerplate
+NEAR_COPY = POSTING.replace("\n", " ", 3) + "\nApply through our careers page. We are an equal opportunity employer."
+UNRELATED = ("Line cook wanted for a busy downtown restaurant. Prepare sauces, grill proteins, "
+             "keep the station clean and work weekend brunch shifts with the kitchen team.")
+
+
+def test_shingles_are_distinct_word_trigrams():
+    assert shingles("The cat, the cat; the CAT") == ["the cat the", "cat the cat"]
+    assert shingles("Two words") == ["two words"]
+    assert shingles("  ") == []
+
+
+def test_similarity_separates_near_copies_from_other_postings():
+    signature = minhash_signature(POSTING)
+    assert estimate_similarity(signature, minhash_signature(POSTING)) == 1.0
+    assert estimate_similarity(signature, minhash_signature(NEAR_COPY)) >= 0.8
+    assert estimate_similarity(signature, minhash_signature(UNRELATED)) < 0.2
+    assert minhash_signature("") is None
+
+
+def test_near_copies_share_a_band_and_signatures_round_trip():
+    signature = minhash_signature(POSTING)
+    assert set(band_buckets(signature)) & set(band_buckets(minhash_signature(NEAR_COPY)))
+    assert not set(band_buckets(signature)) & set(band_buckets(minhash_signature(UNRELATED)))
+    assert (decode_signature(encode_signature(signature)) == signature).all()
+
+
+def test_find_duplicates_uses_the_stored_buckets(db):
+    user = seed_user(db, 1)
+    original = seed_document(db, user, "job_description", POSTING)
+    other = seed_document(db, user, "job_description", UNRELATED)
+    copy = seed_document(db, user, "job_description", NEAR_COPY)
+    for document in (original, other):
+        near_duplicate_service.index_document(db, document)
+
+    duplicates = near_duplicate_service.find_duplicates(db, copy)
+    assert [duplicate["document"].id for duplicate in duplicates] == [original.id]
+
+
+def test_stored_error_analysis_is_not_reused(db):
+    user = seed_user(db, 1)
+    original = seed_document(db, user, "job_description", POSTING)
+    near_duplicate_service.index_document(db, original)
+    copy = seed_document(db, user, "job_description", NEAR_COPY)
+    precomputed = PrecomputedJobAnalysis(document_id=original.id, prompt_version=llm_service.prompt_version,
+                                         status="completed", job_analysis={"error": "Job analysis failed"})
+    db.add(precomputed)
+    db.commit()
+    assert near_duplicate_service.reusable_job_analysis(db, copy.id) is None
+
+    precomputed.job_analysis = {"summary": "Posting analysis", "metadata": {}}
+    db.commit()
+    reused = near_duplicate_service.reusable_job_analysis(db, copy.id)
+    assert reused["summary"] == "Posting analysis"
+    assert reused["metadata"]["near_duplicate_similarity"] >= 0.8
@@ -0,0 +1,62 @@
+import pytest
+
+from app.services.overlap_service import compute_overlap
+
+
+def test_overlap_of_three_jobs():
+    result = compute_overlap(
+        [["python", "sql", "excel"], ["python", "sql", "tableau"], ["python", "writing"]],
+        ["python", "excel", "spanish"]
+    )
+
+    first, second, third = result["jobs"]
+    assert first == {
+        "requirements": ["excel", "python", "sql"],
+        "matched": ["excel", "python"],
+        "missing": ["sql"],
+        "unique": ["excel"],
+        "coverage": pytest.approx(2 / 3),
+    }
+    assert third["unique"] == ["writing"]
+
+    pairs = {tuple(pair["jobs"]): pair for pair in result["pairwise"]}
+    assert pairs[(0, 1)]["shared"] == ["python", "sql"]
+    assert pairs[(0, 1)]["jaccard"] == pytest.approx(2 / 4)
+    assert pairs[(1, 2)]["jaccard"] == pytest.approx(1 / 4)
+
+    assert result["common"] == ["python"]
+    # Required by exactly one, two and three jobs
+    assert result["shared_by"] == [3, 1, 1]
+    assert result["overall_coverage"] == pytest.approx(2 / 5)
+    # Gaps most in demand first; the resume-only skill never shows up
+    assert result["gaps"] == [
+        {"skill": "sql", "jobs": [0, 1]},
+        {"skill": "tableau", "jobs": [1]},
+        {"skill": "writing", "jobs": [2]},
+    ]
+
+
+def test_every_required_skill_lands_in_exactly_one_region():
+    job_skills = [["a", "b", "c"], ["b", "c", "d"], ["c", "e"]]
+    result = compute_overlap(job_skills, ["c", "d"])
+
+    regions = {tuple(region["jobs"]): region for region in result["regions"]}
+    assert regions[(0,)]["skills"] == ["a"]
+    assert regions[(0, 1)]["skills"] == ["b"]
+    assert regions[(0, 1, 2)] == {"jobs": [0, 1, 2], "skills": ["c"], "covered": ["c"]}
+    placed = [skill for region in result["regions"] for skill in region["skills"]]
+    assert sorted(placed) == ["a", "b", "c", "d", "e"]
+
+
+def test_jobs_without_requirements():
+    result = compute_overlap([[], []], ["python"])
+
+    assert result["jobs"][0]["coverage"] == 0.0
+    assert result["pairwise"][0]["jaccard"] == 0.0
+    assert result["regions"] == []
+    assert result["overall_coverage"] == 0.0
+
+
+def test_too_many_jobs_is_rejected():
+    with pytest.raises(ValueError):
+        compute_overlap([["python"]] * 63, [])
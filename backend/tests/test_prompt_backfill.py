@@ -0,0 +1,37 @@
+from app.models.analysis import DocumentAnalysis
+from app.services.prompt_backfill_service import outdated_steps, stamp_version, step_version
+
+
+def _step(version, **metadata):
+    return {"summary": "...", "metadata": {"analysis_version": version, **metadata}}
+
+
+def test_nothing_to_do_at_the_target_version():
+    analysis = DocumentAnalysis(resume_analysis=_step("v2"), job_analysis=_step("v2"), connections_analysis=_step("v2"))
+    assert outdated_steps(analysis, "v2") == []
+
+
+def test_outdated_job_analysis_invalidates_the_match():
+    analysis = DocumentAnalysis(resume_analysis=_step("v2"), job_analysis=_step("v1"), connections_analysis=_step("v2"))
+    assert outdated_steps(analysis, "v2") == ["job_analysis", "connections_analysis"]
+
+
+def test_outdated_match_alone_is_rerun_alone():
+    analysis = DocumentAnalysis(resume_analysis=_step("v2"), job_analysis=_step("v2"), connections_analysis={"summary": "..."})
+    assert outdated_steps(analysis, "v2") == ["connections_analysis"]
+
+
+def test_lite_steps_count_as_outdated():
+    analysis = DocumentAnalysis(resume_analysis=_step("v2", analysis_tier="lite"))
+    assert outdated_steps(analysis, "v2") == ["resume_analysis"]
+
+
+def test_missing_steps_are_not_created():
+    assert outdated_steps(DocumentAnalysis(resume_analysis=_step("v1")), "v2") == ["resume_analysis"]
+
+
+def test_stamp_version_keeps_other_metadata():
+    step = stamp_version({"metadata": {"analysis_tier": "full"}}, "v3")
+    assert step["metadata"] == {"analysis_tier": "full", "analysis_version": "v3"}
+    assert step_version(stamp_version({"metadata": None}, "v3")) == "v3"
+    assert step_version("not a step") is None
@@ -0,0 +1,59 @@
+import asyncio
+
+from devtools.harness import seed_document, seed_user
+
+from app.models.analysis import PrecomputedJobAnalysis
+from app.services.llm_service import llm_service
+from app.services.speculative_analysis_service import speculative_analysis_service
+
+
+def _job(db):
+    return seed_document(db, seed_user(db, 1), "job_description", "Software engineer at a nonprofit")
+
+
+def test_error_result_is_recorded_as_failed(db, monkeypatch):
+    job = _job(db)
+    prompt_version = llm_service.prompt_version
+    db.add(PrecomputedJobAnalysis(document_id=job.id, prompt_version=prompt_version, status="processing"))
+    db.commit()
+
+    async def failing_analysis(job_text):
+        return {"error": "Job analysis failed: provider unavailable"}
+
+    monkeypatch.setattr(llm_service, "analyze_job_description", failing_analysis)
+    result = asyncio.run(speculative_analysis_service._run_job_analysis(job.id, prompt_version, job.content_text))
+
+    assert result is None
+    precomputed = db.query(PrecomputedJobAnalysis).filter(PrecomputedJobAnalysis.document_id == job.id).one()
+    assert precomputed.status == "failed"
+    assert precomputed.job_analysis is None
+
+
+def test_stored_error_payload_is_not_reused(db, monkeypatch):
+    job = _job(db)
+    db.add(PrecomputedJobAnalysis(document_id=job.id, prompt_version=llm_service.prompt_version,
+                                  status="completed", job_analysis={"error": "old failure"}))
+    db.commit()
+
+    async def fresh_analysis(job_text):
+        return {"summary": "fresh"}
+
+    monkeypatch.setattr(llm_service, "analyze_job_description", fresh_analysis)
+    assert speculative_analysis_service.completed_job_analysis(db, job.id) is None
+    assert asyncio.run(speculative_analysis_service.get_job_analysis(db, job.id, job.content_text)) == {"summary": "fresh"}
+
+
+def test_store_job_analysis_replaces_failed_rows_and_keeps_completed_ones(db):
+    job = _job(db)
+    db.add(PrecomputedJobAnalysis(document_id=job.id, prompt_version=llm_service.prompt_version,
+                                  status="failed", error_message="timed out"))
+    db.commit()
+
+    speculative_analysis_service.store_job_analysis(db, job.id, {"summary": "first"})
+    speculative_analysis_service.store_job_analysis(db, job.id, {"summary": "second"})
+    speculative_analysis_service.store_job_analysis(db, job.id, {"error": "ignored"})
+
+    precomputed = db.query(PrecomputedJobAnalysis).filter(PrecomputedJobAnalysis.document_id == job.id).one()
+    assert precomputed.status == "completed"
+    assert precomputed.error_message is None
+    assert speculative_analysis_service.completed_job_analysis(db, job.id) == {"summary": "first"}